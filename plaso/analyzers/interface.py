@@ -20,6 +20,10 @@ class BaseAnalyzer(object):
   INCREMENTAL_ANALYZER = False
   SIZE_LIMIT = 32 * 1024 * 1024
 
+  # Analyzers that support file paths can analyze a file that is stored
+  # on the operating system by its path, without the data being read.
+  SUPPORTS_FILE_PATH = False
+
   @abc.abstractmethod
   def Analyze(self, data):
     """Analyzes a block of data, updating the state of the analyzer
@@ -28,6 +32,17 @@ class BaseAnalyzer(object):
       data(bytes): block of data to process.
     """
 
+  def AnalyzeFilePath(self, path):
+    """Analyzes a file by its path, updating the state of the analyzer.
+
+    Args:
+      path (str): path of the file to process.
+
+    Raises:
+      NotImplementedError: if the analyzer does not support file paths.
+    """
+    raise NotImplementedError
+
   @abc.abstractmethod
   def GetResults(self):
     """Retrieves the results of the analysis.
@@ -3,6 +3,10 @@
 
 from __future__ import unicode_literals
 
+import io
+import re
+import time
+
 import yara
 
 from plaso.analyzers import interface
@@ -13,7 +17,22 @@ from plaso.lib import definitions
 
 
 class YaraAnalyzer(interface.BaseAnalyzer):
-  """Analyzer that matches Yara rules."""
+  """Analyzer that matches Yara rules.
+
+  Rules are matched in blocks if the condition of every rule is a disjunction
+  of string references, such as "any of them" or "$a or $b", since such
+  a condition is true for the data as a whole if it is true for any block.
+  The end of the previous block is matched again with the next block, so
+  that strings that span the boundary between two blocks are matched.
+  Otherwise, for example with conditions such as "$a and $b", "not $a" or
+  "filesize < 32", the data is matched as a whole and files that exceed
+  the size limit are not matched. Files that can be accessed by path are
+  matched as a whole by libyara, which maps the file into memory.
+
+  Attributes:
+    match_time (float): time in seconds spent matching the Yara rules since
+        the most recent reset.
+  """
 
   # pylint: disable=no-member
 
@@ -23,32 +42,257 @@ class YaraAnalyzer(interface.BaseAnalyzer):
   PROCESSING_STATUS_HINT = definitions.PROCESSING_STATUS_YARA_SCAN
 
   INCREMENTAL_ANALYZER = False
+  SUPPORTS_FILE_PATH = True
 
   _ATTRIBUTE_NAME = 'yara_match'
   _MATCH_TIMEOUT = 60
 
+  # Tokens of Yara rule definitions. Text strings, regular expressions and
+  # hexadecimal strings are read as a single token, so that their contents
+  # are not mistaken for keywords.
+  _TOKEN_RE = re.compile((
+      r'(?P<space>\s+)|'
+      r'(?P<comment>//[^\n]*|/\*.*?\*/)|'
+      r'(?P<text>"(?:\\.|[^"\\\n])*")|'
+      r'(?P<string_identifier>[$#@!][A-Za-z0-9_]*\*?)|'
+      r'(?P<identifier>[A-Za-z_][A-Za-z0-9_.]*)|'
+      r'(?P<number>0x[0-9A-Fa-f]+|[0-9]+(?:KB|MB)?)|'
+      r'(?P<operator>\.\.|==|!=|<=|>=|<<|>>|[-+*\\%&|^~<>=:(),.\[\]{}])'),
+      re.DOTALL)
+
+  # Regular expression and hexadecimal string values, which follow an "="
+  # in the strings section of a rule.
+  _STRING_VALUE_RE = re.compile(
+      r'/(?:\\.|[^/\\\n])*/[is]*|\{[^{}]*\}')
+
+  # Size of the end of the previous block of data that is matched again
+  # with the next block.
+  _OVERLAP_SIZE = 64 * 1024
+
   def __init__(self):
     """Initializes the Yara analyzer."""
     super(YaraAnalyzer, self).__init__()
-    self._matches = []
+    self._matched_rule_names = []
+    self._overlap_data = b''
     self._rules = None
 
-  def Analyze(self, data):
-    """Analyzes a block of data, attempting to match Yara rules to it.
+    self.match_time = 0.0
+
+  def _CheckIncrementalMatching(self, rules_string):
+    """Determines if the rules can be matched in blocks.
 
     Args:
-      data(bytes): a block of data.
+      rules_string (str): Yara rule definitions or None if not available.
     """
-    if not self._rules:
-      return
+    conditions = None
+    if rules_string:
+      conditions = self._GetRuleConditions(rules_string)
+
+    # pylint: disable=invalid-name
+    self.INCREMENTAL_ANALYZER = bool(conditions) and all(
+        self._IsStringDisjunction(condition) for condition in conditions)
+
+  def _GetRuleConditions(self, rules_string):
+    """Retrieves the conditions of the rules.
+
+    Args:
+      rules_string (str): Yara rule definitions.
+
+    Returns:
+      list[list[str]]: tokens of the condition of every rule or None if
+          the rule definitions contain imports, includes or global rules,
+          which can affect the evaluation of every rule, or cannot be read.
+    """
+    tokens = []
+    previous_token = None
+    offset = 0
+    while offset < len(rules_string):
+      if previous_token == '=':
+        match = self._STRING_VALUE_RE.match(rules_string, offset)
+        if match:
+          previous_token = match.group(0)
+          tokens.append(previous_token)
+          offset = match.end()
+          continue
+
+      match = self._TOKEN_RE.match(rules_string, offset)
+      if not match:
+        return None
+
+      offset = match.end()
+      if match.lastgroup not in ('comment', 'space'):
+        previous_token = match.group(0)
+        tokens.append(previous_token)
+
+    conditions = []
+    condition = None
+    in_rule = False
+    for index, token in enumerate(tokens):
+      if not in_rule:
+        if token in ('global', 'import', 'include'):
+          return None
+
+        in_rule = token == '{'
+
+      elif token == '}':
+        if condition is None:
+          return None
+
+        # The first token of the condition is the colon that follows
+        # the "condition" keyword.
+        conditions.append(condition[1:])
+        condition = None
+        in_rule = False
+
+      elif condition is not None:
+        condition.append(token)
+
+      elif (token == 'condition' and index + 1 < len(tokens) and
+            tokens[index + 1] == ':'):
+        condition = []
+
+    if in_rule:
+      return None
+
+    return conditions
+
+  def _IsStringDisjunction(self, condition):
+    """Determines if a rule condition is a disjunction of string references.
+
+    Args:
+      condition (list[str]): tokens of the rule condition.
+
+    Returns:
+      bool: True if the condition is a disjunction of string references, such
+          as "any of them", "any of ($a*)" or "$a or ($b or $c)".
+    """
+    index = self._ParseStringDisjunction(condition, 0)
+    return bool(condition) and index == len(condition)
+
+  def _Match(self, **kwargs):
+    """Matches the Yara rules.
+
+    Args:
+      kwargs (dict[str, object]): data or file path keyword argument of
+          the Yara match function.
+    """
+    start_time = time.time()
     try:
-      self._matches = self._rules.match(data=data, timeout=self._MATCH_TIMEOUT)
-    except yara.YaraTimeoutError:
+      matches = self._rules.match(timeout=self._MATCH_TIMEOUT, **kwargs)
+
+    except yara.TimeoutError:
       logger.error('Could not process file within timeout: {0:d}'.format(
           self._MATCH_TIMEOUT))
-    except yara.YaraError as exception:
+      return
+
+    except yara.Error as exception:
       logger.error('Error processing file with Yara: {0!s}.'.format(
           exception))
+      return
+
+    finally:
+      self.match_time += time.time() - start_time
+
+    for match in matches:
+      if match.rule not in self._matched_rule_names:
+        self._matched_rule_names.append(match.rule)
+
+  def _ParseStringDisjunction(self, tokens, index):
+    """Parses a disjunction of string references.
+
+    Args:
+      tokens (list[str]): tokens of a rule condition.
+      index (int): index of the first token of the disjunction.
+
+    Returns:
+      int: index of the token that follows the disjunction or None if
+          the tokens are not a disjunction of string references.
+    """
+    index = self._ParseStringReference(tokens, index)
+    while index is not None and tokens[index:index + 1] == ['or']:
+      index = self._ParseStringReference(tokens, index + 1)
+
+    return index
+
+  def _ParseStringReference(self, tokens, index):
+    """Parses a string reference.
+
+    A string reference is a string identifier, "any of" a set of strings or
+    a disjunction of string references in parentheses.
+
+    Args:
+      tokens (list[str]): tokens of a rule condition.
+      index (int): index of the first token of the string reference.
+
+    Returns:
+      int: index of the token that follows the string reference or None if
+          the tokens are not a string reference.
+    """
+    token = tokens[index] if index < len(tokens) else ''
+
+    if token == '(':
+      index = self._ParseStringDisjunction(tokens, index + 1)
+      if index is None or tokens[index:index + 1] != [')']:
+        return None
+
+      return index + 1
+
+    if token.startswith('$'):
+      if token == '$' or token.endswith('*'):
+        return None
+
+      return index + 1
+
+    if tokens[index:index + 2] != ['any', 'of']:
+      return None
+
+    index += 2
+    if tokens[index:index + 1] == ['them']:
+      return index + 1
+
+    if tokens[index:index + 1] != ['(']:
+      return None
+
+    index += 1
+    while index < len(tokens) and tokens[index].startswith('$'):
+      index += 1
+      if tokens[index:index + 1] == [')']:
+        return index + 1
+
+      if tokens[index:index + 1] != [',']:
+        return None
+
+      index += 1
+
+    return None
+
+  def Analyze(self, data):
+    """Analyzes a block of data, attempting to match Yara rules to it.
+
+    Args:
+      data(bytes): a block of data.
+    """
+    if not self._rules:
+      return
+
+    if self._overlap_data:
+      data = b''.join([self._overlap_data, data])
+
+    self._Match(data=data)
+
+    if self.INCREMENTAL_ANALYZER:
+      self._overlap_data = data[-self._OVERLAP_SIZE:]
+
+  def AnalyzeFilePath(self, path):
+    """Analyzes a file, attempting to match Yara rules to its contents.
+
+    Args:
+      path (str): path of the file.
+    """
+    if not self._rules:
+      return
+
+    self._Match(filepath=path)
 
   def GetResults(self):
     """Retrieves results of the most recent analysis.
@@ -59,13 +303,46 @@ class YaraAnalyzer(interface.BaseAnalyzer):
     result = analyzer_result.AnalyzerResult()
     result.analyzer_name = self.NAME
     result.attribute_name = self._ATTRIBUTE_NAME
-    rule_names = [match.rule for match in self._matches]
-    result.attribute_value = ','.join(rule_names)
+    result.attribute_value = ','.join(self._matched_rule_names)
     return [result]
 
+  def GetRulesCost(self):
+    """Retrieves the cost of the individual rules.
+
+    The cost is accumulated by libyara over all matches, but only if libyara
+    was compiled with profiling support.
+
+    Returns:
+      dict[str, int]: cost per rule name or None if not available.
+    """
+    if not self._rules:
+      return None
+
+    try:
+      return self._rules.profiling_info()
+    except (AttributeError, yara.Error):
+      return None
+
   def Reset(self):
     """Resets the internal state of the analyzer."""
-    self._matches = []
+    self._matched_rule_names = []
+    self._overlap_data = b''
+
+    self.match_time = 0.0
+
+  def SetCompiledRules(self, compiled_rules, rules_string=None):
+    """Sets the compiled rules that the Yara analyzer will use.
+
+    Loading compiled rules is faster than compiling the rule definitions,
+    which otherwise would be done by every worker.
+
+    Args:
+      compiled_rules (bytes): Yara rules compiled and saved by libyara.
+      rules_string (Optional[str]): Yara rule definitions of the compiled
+          rules, where None represents rules that are not matched in blocks.
+    """
+    self._rules = yara.load(file=io.BytesIO(compiled_rules))
+    self._CheckIncrementalMatching(rules_string)
 
   def SetRules(self, rules_string):
     """Sets the rules that the Yara analyzer will use.
@@ -74,6 +351,7 @@ class YaraAnalyzer(interface.BaseAnalyzer):
       rules_string(str): Yara rule definitions
     """
     self._rules = yara.compile(source=rules_string)
+    self._CheckIncrementalMatching(rules_string)
 
 
 manager.AnalyzersManager.RegisterAnalyzer(YaraAnalyzer)
@@ -48,6 +48,8 @@ class ExtractionTool(
         input_reader=input_reader, output_writer=output_writer)
     self._artifacts_registry = None
     self._buffer_size = 0
+    self._compiled_yara_rules = None
+    self._deduplicate_content = False
     self._mount_path = None
     self._operating_system = None
     self._preferred_year = None
@@ -80,12 +82,14 @@ class ExtractionTool(
     configuration.credentials = self._credential_configurations
     configuration.debug_output = self._debug_mode
     configuration.event_extraction.text_prepend = self._text_prepend
+    configuration.extraction.deduplicate_content = self._deduplicate_content
     configuration.extraction.hasher_file_size_limit = (
         self._hasher_file_size_limit)
     configuration.extraction.hasher_names_string = self._hasher_names_string
     configuration.extraction.process_archives = self._process_archives
     configuration.extraction.process_compressed_streams = (
         self._process_compressed_streams)
+    configuration.extraction.compiled_yara_rules = self._compiled_yara_rules
     configuration.extraction.yara_rules_string = self._yara_rules_string
     configuration.filter_file = self._filter_file
     configuration.input_source.mount_path = self._mount_path
@@ -26,6 +26,15 @@ class ExtractionArgumentsHelper(interface.ArgumentsHelper):
       argument_group (argparse._ArgumentGroup|argparse.ArgumentParser):
           argparse group.
     """
+    argument_group.add_argument(
+        '--deduplicate_content', '--deduplicate-content',
+        dest='deduplicate_content', action='store_true', default=False, help=(
+            'Reproduce the events of file content that is identical to the '
+            'content of a previously parsed file, such as the same Windows '
+            'Registry file in multiple Volume Shadow Snapshots, instead of '
+            'parsing it again. The content of files up to 256 MiB is '
+            'hashed to detect identical content.'))
+
     argument_group.add_argument(
         '--preferred_year', '--preferred-year', dest='preferred_year',
         type=int, action='store', default=None, metavar='YEAR', help=(
@@ -63,12 +72,15 @@ class ExtractionArgumentsHelper(interface.ArgumentsHelper):
       raise errors.BadConfigObject(
           'Configuration object is not an instance of CLITool')
 
+    deduplicate_content = getattr(options, 'deduplicate_content', False)
+
     preferred_year = cls._ParseNumericOption(options, 'preferred_year')
 
     process_archives = getattr(options, 'process_archives', False)
     process_compressed_streams = getattr(
         options, 'process_compressed_streams', True)
 
+    setattr(configuration_object, '_deduplicate_content', deduplicate_content)
     setattr(configuration_object, '_preferred_year', preferred_year)
     setattr(configuration_object, '_process_archives', process_archives)
     setattr(
@@ -27,7 +27,8 @@ class ProfilingArgumentsHelper(interface.ArgumentsHelper):
       'serializers': 'Profile CPU time of serialization',
       'storage': 'Profile storage reads and writes',
       'task_queue': 'Profile task queue status (multi-processing only)',
-      'tasks': 'Profile the status of tasks (multi-processing only)'}
+      'tasks': 'Profile the status of tasks (multi-processing only)',
+      'yara_rules': 'Profile time spent matching Yara rules'}
 
   if engine.BaseEngine.SupportsGuppyMemoryProfiling():
     PROFILERS_INFORMATION['guppy'] = (
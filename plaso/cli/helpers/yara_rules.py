@@ -51,6 +51,7 @@ class YaraRulesArgumentsHelper(interface.ArgumentsHelper):
       raise errors.BadConfigObject(
           'Configuration object is not an instance of CLITool')
 
+    compiled_yara_rules = None
     yara_rules_string = None
 
     path = getattr(options, 'yara_rules_path', None)
@@ -68,13 +69,20 @@ class YaraRulesArgumentsHelper(interface.ArgumentsHelper):
         # We try to parse the rules here, to check that the definitions are
         # valid. We then pass the string definitions along to the workers, so
         # that they don't need read access to the rules file.
-        yara.compile(source=yara_rules_string)
+        yara_rules = yara.compile(source=yara_rules_string)
 
       except yara.Error as exception:
         raise errors.BadConfigObject(
             'Unable to parse Yara rules in: {0:s} with error: {1!s}'.format(
                 path, exception))
 
+      # The compiled rules are passed along to the workers as well, so that
+      # the workers load the rules instead of compiling them again.
+      compiled_rules_file = io.BytesIO()
+      yara_rules.save(file=compiled_rules_file)
+      compiled_yara_rules = compiled_rules_file.getvalue()
+
+    setattr(configuration_object, '_compiled_yara_rules', compiled_yara_rules)
     setattr(configuration_object, '_yara_rules_string', yara_rules_string)
 
 
@@ -4,6 +4,7 @@
 from __future__ import unicode_literals
 
 import argparse
+import os
 import sys
 import time
 import textwrap
@@ -22,6 +23,7 @@ from plaso.cli import status_view
 from plaso.cli import tools
 from plaso.cli import views
 from plaso.cli.helpers import manager as helpers_manager
+from plaso.containers import manager as containers_manager
 from plaso.engine import engine
 from plaso.engine import single_process as single_process_engine
 from plaso.lib import definitions
@@ -29,6 +31,7 @@ from plaso.lib import errors
 from plaso.lib import loggers
 from plaso.multi_processing import task_engine as multi_process_engine
 from plaso.parsers import manager as parsers_manager
+from plaso.storage import compression
 from plaso.storage import factory as storage_factory
 
 
@@ -96,9 +99,14 @@ class Log2TimelineTool(extraction_tool.ExtractionTool):
     """
     super(Log2TimelineTool, self).__init__(
         input_reader=input_reader, output_writer=output_writer)
+    self._append_session = False
     self._command_line_arguments = None
     self._enable_sigsegv_handler = False
     self._number_of_extraction_workers = 0
+    self._resume_session = False
+    self._storage_compression_dictionaries = False
+    self._storage_compression_format = None
+    self._storage_compression_formats = None
     self._storage_serializer_format = definitions.SERIALIZER_FORMAT_JSON
     self._source_type = None
     self._status_view = status_view.StatusView(self._output_writer, self.NAME)
@@ -113,6 +121,152 @@ class Log2TimelineTool(extraction_tool.ExtractionTool):
     self.list_profilers = False
     self.show_info = False
 
+  def _CheckAppendableStorageFile(self):
+    """Checks if a session can be appended to the storage file.
+
+    Returns:
+      set[str]: parser and parser plugin names enabled by the previous
+          sessions.
+
+    Raises:
+      BadConfigOption: if the storage file does not contain event sources
+          of previous sessions to process.
+    """
+    if not os.path.isfile(self._storage_file_path):
+      raise errors.BadConfigOption(
+          'Unable to append session, no such storage file: {0:s}.'.format(
+              self._storage_file_path))
+
+    storage_file = storage_factory.StorageFactory.CreateStorageFileForFile(
+        self._storage_file_path)
+    if not storage_file:
+      raise errors.BadConfigOption(
+          'Format of storage file: {0:s} not supported.'.format(
+              self._storage_file_path))
+
+    try:
+      storage_file.Open(path=self._storage_file_path, read_only=True)
+
+      try:
+        number_of_event_sources = storage_file.GetNumberOfEventSources()
+
+        enabled_parser_names = set()
+        for session in storage_file.GetSessions():
+          enabled_parser_names.update(session.enabled_parser_names or [])
+
+      finally:
+        storage_file.Close()
+
+    except IOError as exception:
+      raise errors.BadConfigOption(
+          'Unable to read storage file: {0:s} with error: {1!s}'.format(
+              self._storage_file_path, exception))
+
+    if not number_of_event_sources:
+      raise errors.BadConfigOption((
+          'Unable to append session, storage file: {0:s} contains no event '
+          'sources.').format(self._storage_file_path))
+
+    return enabled_parser_names
+
+  def _GetAppendedSessionParserFilterExpression(
+      self, parser_filter_expression, enabled_parser_names):
+    """Retrieves the parser filter expression of an appended session.
+
+    The parsers and parser plugins that were enabled by the previous sessions
+    are removed, since parsing the event sources again with these would
+    produce duplicate events.
+
+    Args:
+      parser_filter_expression (str): parser filter expression, where None
+          represents all parsers and plugins.
+      enabled_parser_names (set[str]): parser and parser plugin names enabled
+          by the previous sessions.
+
+    Returns:
+      str: parser filter expression of the parsers and parser plugins that
+          were not enabled by the previous sessions.
+
+    Raises:
+      BadConfigOption: if all the parsers and parser plugins were already
+          enabled by the previous sessions.
+    """
+    parser_and_plugin_names = [
+        parser_name for parser_name in (
+            parsers_manager.ParsersManager.GetParserAndPluginNames(
+                parser_filter_expression=parser_filter_expression))
+        if parser_name not in enabled_parser_names]
+
+    if not parser_and_plugin_names:
+      raise errors.BadConfigOption((
+          'Unable to append session, all parsers and plugins were already '
+          'enabled by the previous sessions of storage file: {0:s}.').format(
+              self._storage_file_path))
+
+    return ','.join(parser_and_plugin_names)
+
+  def _GetResumableSessionCheckpoint(self):
+    """Retrieves the last checkpoint of the interrupted session to resume.
+
+    Returns:
+      SessionCheckpoint: last session checkpoint of the interrupted session.
+
+    Raises:
+      BadConfigOption: if the storage file does not contain an interrupted
+          session that can be resumed or if the interrupted session was
+          appended to the event sources of previous sessions.
+    """
+    if not os.path.isfile(self._storage_file_path):
+      raise errors.BadConfigOption(
+          'Unable to resume session, no such storage file: {0:s}.'.format(
+              self._storage_file_path))
+
+    storage_file = storage_factory.StorageFactory.CreateStorageFileForFile(
+        self._storage_file_path)
+    if not storage_file:
+      raise errors.BadConfigOption(
+          'Format of storage file: {0:s} not supported.'.format(
+              self._storage_file_path))
+
+    try:
+      storage_file.Open(path=self._storage_file_path, read_only=True)
+
+      try:
+        session_checkpoint = None
+        for session_checkpoint in storage_file.GetSessionCheckpoints():
+          pass
+
+        completed_session_identifiers = set([
+            session.identifier for session in storage_file.GetSessions()])
+
+      finally:
+        storage_file.Close()
+
+    except IOError as exception:
+      raise errors.BadConfigOption(
+          'Unable to read storage file: {0:s} with error: {1!s}'.format(
+              self._storage_file_path, exception))
+
+    if not session_checkpoint:
+      raise errors.BadConfigOption((
+          'Unable to resume session, storage file: {0:s} contains no session '
+          'checkpoints.').format(self._storage_file_path))
+
+    if session_checkpoint.identifier in completed_session_identifiers:
+      raise errors.BadConfigOption((
+          'Unable to resume session, last session in storage file: {0:s} '
+          'was completed.').format(self._storage_file_path))
+
+    # The parser filter expression of an appended session depends on
+    # the parsers enabled by the previous sessions and is not restored.
+    if session_checkpoint.append_session:
+      raise errors.BadConfigOption((
+          'Unable to resume session, last session in storage file: {0:s} '
+          'was appended to previous sessions.').format(
+              self._storage_file_path))
+
+    return session_checkpoint
+
   def _GetPluginData(self):
     """Retrieves the version and various plugin information.
 
@@ -138,6 +292,80 @@ class Log2TimelineTool(extraction_tool.ExtractionTool):
 
     return return_dict
 
+  def _ReadStoredPreprocessingInformation(self, knowledge_base):
+    """Reads the preprocessing information stored by the previous sessions.
+
+    Args:
+      knowledge_base (KnowledgeBase): knowledge base to store
+          the preprocessing information.
+
+    Raises:
+      BadConfigOption: if the storage file cannot be read.
+    """
+    storage_reader = storage_factory.StorageFactory.CreateStorageReaderForFile(
+        self._storage_file_path)
+    if not storage_reader:
+      raise errors.BadConfigOption(
+          'Format of storage file: {0:s} not supported.'.format(
+              self._storage_file_path))
+
+    try:
+      storage_reader.ReadPreprocessingInformation(knowledge_base)
+
+    except IOError as exception:
+      raise errors.BadConfigOption(
+          'Unable to read storage file: {0:s} with error: {1!s}'.format(
+              self._storage_file_path, exception))
+
+    finally:
+      storage_reader.Close()
+
+  def _ParseCompressionOptions(self, options):
+    """Parses the storage compression options.
+
+    Args:
+      options (argparse.Namespace): command line arguments.
+
+    Raises:
+      BadConfigOption: if the options are invalid.
+    """
+    self._storage_compression_dictionaries = getattr(
+        options, 'compression_dictionaries', False)
+
+    compression_format_string = getattr(options, 'compression_format', None)
+    if not compression_format_string:
+      return
+
+    supported_compression_formats = (
+        compression.CompressionCodecsManager.GetCompressionFormats())
+
+    compression_formats = {}
+    for value in compression_format_string.split(','):
+      container_type, _, compression_format = value.strip().rpartition('=')
+      container_type = container_type.strip()
+      compression_format = compression_format.strip().lower()
+
+      if compression_format not in supported_compression_formats:
+        raise errors.BadConfigOption(
+            'Unsupported storage compression format: {0:s}.'.format(
+                compression_format))
+
+      if not container_type:
+        self._storage_compression_format = compression_format
+        continue
+
+      attribute_container_class = (
+          containers_manager.AttributeContainersManager.GetAttributeContainer(
+              container_type))
+      if not attribute_container_class:
+        raise errors.BadConfigOption(
+            'Unsupported attribute container type: {0:s}.'.format(
+                container_type))
+
+      compression_formats[container_type] = compression_format
+
+    self._storage_compression_formats = compression_formats or None
+
   def ParseArguments(self):
     """Parses the command line arguments.
 
@@ -229,6 +457,58 @@ class Log2TimelineTool(extraction_tool.ExtractionTool):
     helpers_manager.ArgumentHelperManager.AddCommandLineArguments(
         storage_group, names=['storage_format'])
 
+    serializer_formats = sorted(definitions.SERIALIZER_FORMATS)
+
+    storage_group.add_argument(
+        '--serializer_format', '--serializer-format', action='store',
+        choices=serializer_formats, dest='serializer_format', type=str,
+        default=definitions.SERIALIZER_FORMAT_JSON, metavar='FORMAT', help=(
+            'Format in which the attribute containers are serialized in '
+            'a newly created storage file, supported formats are: {0:s}. '
+            'The binary format is more compact and faster to read and write '
+            'than JSON.').format(', '.join(serializer_formats)))
+
+    compression_formats = (
+        compression.CompressionCodecsManager.GetCompressionFormats())
+
+    storage_group.add_argument(
+        '--compression_format', '--compression-format', action='store',
+        dest='compression_format', type=str, default=None,
+        metavar='FORMAT[,TYPE=FORMAT,...]', help=(
+            'Format in which the attribute containers are compressed in '
+            'a newly created storage file, supported formats are: {0:s}. '
+            'The format can be overridden per attribute container type, '
+            'for example "zlib,event=lz4,event_data=zstd" compresses events '
+            'with the faster lz4 and event data with the more compact '
+            'zstd.').format(', '.join(compression_formats)))
+
+    storage_group.add_argument(
+        '--append', dest='append', action='store_true', default=False, help=(
+            'Append a session to an existing storage file that processes '
+            'the event sources and uses the preprocessing information stored '
+            'by its previous sessions. Only the content of the files is '
+            'parsed, without hashing and file system metadata, which is '
+            'intended to parse an existing case with newly enabled parsers, '
+            'for example: "--append --parsers new_parser". Parsers and '
+            'plugins enabled by the previous sessions are not used again.'))
+
+    storage_group.add_argument(
+        '--resume', dest='resume', action='store_true', default=False, help=(
+            'Resume the interrupted extraction session of an existing '
+            'storage file from its last checkpoint. The source and '
+            'extraction options must be the same as those of the interrupted '
+            'session. Only supported in multi process mode and not for '
+            'appended sessions.'))
+
+    storage_group.add_argument(
+        '--compression_dictionaries', '--compression-dictionaries',
+        dest='compression_dictionaries', action='store_true', default=False,
+        help=(
+            'Train a shared compression dictionary per attribute container '
+            'type on the first attribute containers written, for compression '
+            'formats that support dictionaries. This improves compression of '
+            'small attribute containers, such as events.'))
+
     argument_parser.add_argument(
         self._SOURCE_OPTION, action='store', metavar='SOURCE', nargs='?',
         default=None, type=str, help=(
@@ -341,6 +621,19 @@ class Log2TimelineTool(extraction_tool.ExtractionTool):
               serializer_format))
     self._storage_serializer_format = serializer_format
 
+    self._ParseCompressionOptions(options)
+
+    self._append_session = getattr(options, 'append', False)
+
+    self._resume_session = getattr(options, 'resume', False)
+    if self._resume_session and self._single_process_mode:
+      raise errors.BadConfigOption(
+          'Resuming a session is not supported in single process mode.')
+
+    if self._resume_session and self._append_session:
+      raise errors.BadConfigOption(
+          'Appending and resuming a session cannot be combined.')
+
     # TODO: where is this defined?
     self._operating_system = getattr(options, 'os', None)
 
@@ -364,11 +657,24 @@ class Log2TimelineTool(extraction_tool.ExtractionTool):
           file system.
       UserAbort: if the user initiated an abort.
     """
-    self._CheckStorageFile(self._storage_file_path, warn_about_existing=True)
+    enabled_parser_names = None
+    session_checkpoint = None
+    if self._resume_session:
+      session_checkpoint = self._GetResumableSessionCheckpoint()
+    elif self._append_session:
+      enabled_parser_names = self._CheckAppendableStorageFile()
+    else:
+      self._CheckStorageFile(
+          self._storage_file_path, warn_about_existing=True)
 
     scan_context = self.ScanSource(self._source_path)
     self._source_type = scan_context.source_type
 
+    if (self._resume_session and
+        self._source_type == dfvfs_definitions.SOURCE_TYPE_FILE):
+      raise errors.BadConfigOption(
+          'Resuming a session is not supported for a single file source.')
+
     self._status_view.SetMode(self._status_view_mode)
     self._status_view.SetSourceInformation(
         self._source_path, self._source_type,
@@ -391,8 +697,17 @@ class Log2TimelineTool(extraction_tool.ExtractionTool):
         preferred_time_zone=self._preferred_time_zone,
         preferred_year=self._preferred_year)
 
+    if session_checkpoint:
+      # The resumed session continues the interrupted session, hence it
+      # takes over its identifier.
+      session.identifier = session_checkpoint.identifier
+
     storage_writer = storage_factory.StorageFactory.CreateStorageWriter(
-        self._storage_format, session, self._storage_file_path)
+        self._storage_format, session, self._storage_file_path,
+        serialization_format=self._storage_serializer_format,
+        compression_format=self._storage_compression_format,
+        compression_formats=self._storage_compression_formats,
+        compression_dictionaries=self._storage_compression_dictionaries)
     if not storage_writer:
       raise errors.BadConfigOption(
           'Unsupported storage format: {0:s}'.format(self._storage_format))
@@ -408,13 +723,23 @@ class Log2TimelineTool(extraction_tool.ExtractionTool):
       extraction_engine = multi_process_engine.TaskMultiProcessEngine(
           use_zeromq=self._use_zeromq)
 
-    # If the source is a directory or a storage media image
+    # An appended session uses the preprocessing information of the previous
+    # sessions. If the source is a directory or a storage media image
     # run pre-processing.
-    if self._source_type in self._SOURCE_TYPES_TO_PREPROCESS:
+    if self._append_session:
+      self._ReadStoredPreprocessingInformation(extraction_engine.knowledge_base)
+
+    elif self._source_type in self._SOURCE_TYPES_TO_PREPROCESS:
       self._PreprocessSources(extraction_engine)
 
     configuration = self._CreateProcessingConfiguration(
         extraction_engine.knowledge_base)
+    configuration.extraction.append_session = self._append_session
+
+    if self._append_session:
+      configuration.parser_filter_expression = (
+          self._GetAppendedSessionParserFilterExpression(
+              configuration.parser_filter_expression, enabled_parser_names))
 
     self._SetExtractionParsersAndPlugins(configuration, session)
     self._SetExtractionPreferredTimeZone(extraction_engine.knowledge_base)
@@ -441,6 +766,7 @@ class Log2TimelineTool(extraction_tool.ExtractionTool):
           configuration, enable_sigsegv_handler=self._enable_sigsegv_handler,
           filter_find_specs=filter_find_specs,
           number_of_worker_processes=self._number_of_extraction_workers,
+          resume=self._resume_session,
           status_update_callback=status_update_callback,
           worker_memory_limit=self._worker_memory_limit)
 
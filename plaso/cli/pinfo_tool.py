@@ -245,6 +245,69 @@ class PinfoTool(
 
     table_view.Write(self._output_writer)
 
+  def _PrintParserStatistics(self, storage):
+    """Prints the parser statistics ranked by CPU time.
+
+    Note that the CPU time of a parser includes that of its plugins.
+
+    Args:
+      storage (BaseStore): storage.
+    """
+    parser_statistics_per_name = {}
+    for parser_statistics in storage.GetParserStatistics():
+      aggregated_parser_statistics = parser_statistics_per_name.get(
+          parser_statistics.name, None)
+      if aggregated_parser_statistics:
+        aggregated_parser_statistics.Merge(parser_statistics)
+      else:
+        parser_statistics_per_name[parser_statistics.name] = (
+            parser_statistics)
+
+    if not parser_statistics_per_name:
+      self._output_writer.Write('No parser statistics stored.\n\n')
+      return
+
+    ranked_parser_statistics = sorted(
+        parser_statistics_per_name.values(),
+        key=lambda parser_statistics: parser_statistics.cpu_time,
+        reverse=True)
+
+    table_view = views.ViewsFactory.GetTableView(
+        self._views_format_type,
+        column_names=[
+            'Parser (plugin) name',
+            'CPU time, matched/attempted files, events, bytes read'],
+        title='Parsers ranked by CPU time')
+
+    for parser_statistics in ranked_parser_statistics:
+      value_string = (
+          '{0:.3f}s, {1:d}/{2:d} files, {3:d} events, {4:d} bytes').format(
+              parser_statistics.cpu_time,
+              parser_statistics.number_of_matched_files,
+              parser_statistics.number_of_attempted_files,
+              parser_statistics.number_of_produced_events,
+              parser_statistics.number_of_read_bytes)
+      table_view.AddRow([parser_statistics.name, value_string])
+
+    table_view.Write(self._output_writer)
+
+    if not self._verbose:
+      return
+
+    for parser_statistics in ranked_parser_statistics:
+      if not parser_statistics.slowest_files:
+        continue
+
+      title = 'Slowest files: {0:s}'.format(parser_statistics.name)
+      table_view = views.ViewsFactory.GetTableView(
+          self._views_format_type, column_names=['CPU time', 'File'],
+          title=title)
+
+      for cpu_time, display_name in parser_statistics.slowest_files:
+        table_view.AddRow(['{0:.3f}'.format(cpu_time), display_name])
+
+      table_view.Write(self._output_writer)
+
   def _PrintParsersCounter(self, parsers_counter, session_identifier=None):
     """Prints the parsers counter
 
@@ -435,6 +498,8 @@ class PinfoTool(
       else:
         self._PrintParsersCounter(storage_counters['parsers'])
 
+      self._PrintParserStatistics(storage)
+
       if 'analysis_reports' not in storage_counters:
         self._output_writer.Write(
             'Unable to determine number of reports generated per plugin.\n')
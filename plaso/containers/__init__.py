@@ -6,6 +6,8 @@ from plaso.containers import artifacts
 from plaso.containers import errors
 from plaso.containers import event_sources
 from plaso.containers import events
+from plaso.containers import parser_statistics
+from plaso.containers import path_specs
 from plaso.containers import reports
 from plaso.containers import sessions
 from plaso.containers import storage_media
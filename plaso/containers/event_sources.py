@@ -16,8 +16,14 @@ class EventSource(interface.AttributeContainer):
 
   Attributes:
     data_type (str): attribute container type indicator.
+    expected_processing_cost (int): estimate of the relative cost to process
+        the event source or None if not known.
     file_entry_type (str): dfVFS file entry type.
+    file_size (int): size of the file entry data in bytes or None if not
+        known.
     path_spec (dfvfs.PathSpec): path specification.
+    path_spec_row_identifier (int): row identifier of the path specification
+        node, which the storage file stores instead of the path specification.
   """
   CONTAINER_TYPE = 'event_source'
   DATA_TYPE = None
@@ -30,8 +36,11 @@ class EventSource(interface.AttributeContainer):
     """
     super(EventSource, self).__init__()
     self.data_type = self.DATA_TYPE
+    self.expected_processing_cost = None
     self.file_entry_type = None
+    self.file_size = None
     self.path_spec = path_spec
+    self.path_spec_row_identifier = None
 
   # This method is necessary for heap sort.
   def __lt__(self, other):
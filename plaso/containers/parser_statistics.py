@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""Parser statistics related attribute container definitions."""
+
+from __future__ import unicode_literals
+
+from plaso.containers import interface
+from plaso.containers import manager
+
+
+class ParserStatistics(interface.AttributeContainer):
+  """Parser statistics attribute container.
+
+  The parser statistics contain the aggregated throughput of a parser or
+  parser plugin.
+
+  Attributes:
+    cpu_time (float): CPU time, in seconds, spent in the parser.
+    name (str): name of the parser or parser plugin.
+    number_of_attempted_files (int): number of files the parser was
+        applied to.
+    number_of_matched_files (int): number of files the parser was able to
+        parse.
+    number_of_produced_events (int): number of events the parser produced.
+    number_of_read_bytes (int): number of bytes read by the parser.
+    slowest_files (list[list[float, str]]): CPU time, in seconds, and
+        display name of the files that took the parser the most CPU time,
+        slowest first.
+  """
+  CONTAINER_TYPE = 'parser_statistics'
+
+  # The maximum number of slowest files.
+  MAXIMUM_NUMBER_OF_SLOWEST_FILES = 10
+
+  def __init__(self, name=None):
+    """Initializes a parser statistics attribute container.
+
+    Args:
+      name (Optional[str]): name of the parser or parser plugin.
+    """
+    super(ParserStatistics, self).__init__()
+    self.cpu_time = 0.0
+    self.name = name
+    self.number_of_attempted_files = 0
+    self.number_of_matched_files = 0
+    self.number_of_produced_events = 0
+    self.number_of_read_bytes = 0
+    self.slowest_files = []
+
+  def _AddSlowestFiles(self, slowest_files):
+    """Adds files to the slowest files.
+
+    Args:
+      slowest_files (list[list[float, str]]): CPU time, in seconds, and
+          display name of the files.
+    """
+    slowest_files = list(self.slowest_files) + [
+        [cpu_time, display_name] for cpu_time, display_name in slowest_files]
+    slowest_files.sort(key=lambda slowest_file: slowest_file[0], reverse=True)
+    self.slowest_files = slowest_files[:self.MAXIMUM_NUMBER_OF_SLOWEST_FILES]
+
+  def AddFile(self, cpu_time, matched, number_of_read_bytes=0):
+    """Adds the measurement of the parser being applied to a file.
+
+    Args:
+      cpu_time (float): CPU time, in seconds, spent in the parser.
+      matched (bool): True if the parser was able to parse the file.
+      number_of_read_bytes (Optional[int]): number of bytes read by the parser.
+    """
+    self.cpu_time += cpu_time
+    self.number_of_attempted_files += 1
+    if matched:
+      self.number_of_matched_files += 1
+    self.number_of_read_bytes += number_of_read_bytes
+
+  def AddSlowestFile(self, cpu_time, display_name):
+    """Adds a file to the slowest files.
+
+    Args:
+      cpu_time (float): CPU time, in seconds, spent in the parser.
+      display_name (str): display name of the file.
+    """
+    self._AddSlowestFiles([[cpu_time, display_name]])
+
+  def IsSlowestFile(self, cpu_time):
+    """Determines if a CPU time qualifies for the slowest files.
+
+    Args:
+      cpu_time (float): CPU time, in seconds, spent in the parser.
+
+    Returns:
+      bool: True if a file with the CPU time would be added to the slowest
+          files.
+    """
+    if len(self.slowest_files) < self.MAXIMUM_NUMBER_OF_SLOWEST_FILES:
+      return True
+
+    return cpu_time > self.slowest_files[-1][0]
+
+  def Merge(self, parser_statistics):
+    """Merges the statistics of the same parser into the statistics.
+
+    Args:
+      parser_statistics (ParserStatistics): parser statistics to merge.
+
+    Raises:
+      ValueError: if the name of the parser statistics does not match.
+    """
+    if parser_statistics.name != self.name:
+      raise ValueError('Parser name mismatch.')
+
+    self.cpu_time += parser_statistics.cpu_time
+    self.number_of_attempted_files += (
+        parser_statistics.number_of_attempted_files)
+    self.number_of_matched_files += parser_statistics.number_of_matched_files
+    self.number_of_produced_events += (
+        parser_statistics.number_of_produced_events)
+    self.number_of_read_bytes += parser_statistics.number_of_read_bytes
+    self._AddSlowestFiles(parser_statistics.slowest_files or [])
+
+
+manager.AttributeContainersManager.RegisterAttributeContainer(ParserStatistics)
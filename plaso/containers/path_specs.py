@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""Path specification attribute containers."""
+
+from __future__ import unicode_literals
+
+from dfvfs.path import factory as dfvfs_path_spec_factory
+
+from plaso.containers import interface
+from plaso.containers import manager
+
+
+class PathSpecNode(interface.AttributeContainer):
+  """Path specification node attribute container.
+
+  The path specification node contains a single path specification of
+  a path specification chain, where the parent path specification is
+  referenced by its row identifier. This allows the storage to store every
+  distinct path specification, and every distinct parent chain, only once.
+
+  Attributes:
+    parent_row_identifier (int): row identifier of the parent path
+        specification node or None if the path specification has no parent.
+    properties (list[list[str, object]]): property names and values of
+        the path specification, without the parent.
+    type_indicator (str): type indicator of the path specification.
+  """
+  CONTAINER_TYPE = 'path_spec'
+
+  def __init__(self, parent_row_identifier=None, path_spec=None):
+    """Initializes a path specification node.
+
+    Args:
+      parent_row_identifier (Optional[int]): row identifier of the parent
+          path specification node.
+      path_spec (Optional[dfvfs.PathSpec]): path specification, of which
+          the parent is ignored.
+    """
+    super(PathSpecNode, self).__init__()
+    self.parent_row_identifier = parent_row_identifier
+    self.properties = None
+    self.type_indicator = None
+
+    if path_spec:
+      # The property names are sorted so that identical path specifications
+      # are serialized identically.
+      self.properties = []
+      for property_name in sorted(
+          dfvfs_path_spec_factory.Factory.PROPERTY_NAMES):
+        property_value = getattr(path_spec, property_name, None)
+        if property_value is not None:
+          self.properties.append([property_name, property_value])
+
+      self.type_indicator = path_spec.type_indicator
+
+  def GetPathSpec(self, parent=None):
+    """Retrieves the path specification.
+
+    Args:
+      parent (Optional[dfvfs.PathSpec]): parent path specification.
+
+    Returns:
+      dfvfs.PathSpec: path specification.
+    """
+    properties = dict(self.properties or [])
+    if parent:
+      properties['parent'] = parent
+
+    return dfvfs_path_spec_factory.Factory.NewPathSpec(
+        self.type_indicator, **properties)
+
+
+manager.AttributeContainersManager.RegisterAttributeContainer(PathSpecNode)
@@ -66,6 +66,22 @@ class Session(interface.AttributeContainer):
     self.product_version = plaso.__version__
     self.start_time = int(time.time() * 1000000)
 
+  def CopyAttributesFromSessionCheckpoint(self, session_checkpoint):
+    """Copies attributes from a session checkpoint.
+
+    This is used to resume an interrupted session, hence the session takes
+    over the identifier of the session checkpoint.
+
+    Args:
+      session_checkpoint (SessionCheckpoint): session checkpoint attribute
+          container.
+    """
+    self.identifier = session_checkpoint.identifier
+
+    if session_checkpoint.parsers_counter:
+      self.parsers_counter = collections.Counter(
+          session_checkpoint.parsers_counter)
+
   def CopyAttributesFromSessionCompletion(self, session_completion):
     """Copies attributes from a session completion.
 
@@ -113,6 +129,19 @@ class Session(interface.AttributeContainer):
     self.product_version = session_start.product_version
     self.start_time = session_start.timestamp
 
+  def CreateSessionCheckpoint(self):
+    """Creates a session checkpoint.
+
+    Returns:
+      SessionCheckpoint: session checkpoint attribute container.
+    """
+    session_checkpoint = SessionCheckpoint()
+    session_checkpoint.identifier = self.identifier
+    session_checkpoint.parsers_counter = collections.Counter(
+        self.parsers_counter)
+    session_checkpoint.timestamp = int(time.time() * 1000000)
+    return session_checkpoint
+
   def CreateSessionCompletion(self):
     """Creates a session completion.
 
@@ -152,6 +181,55 @@ class Session(interface.AttributeContainer):
     return session_start
 
 
+class SessionCheckpoint(interface.AttributeContainer):
+  """Session checkpoint attribute container.
+
+  A session checkpoint contains the state of an extraction session that is
+  needed to resume the session when it was interrupted. The state corresponds
+  with the content of the storage at the time the checkpoint was written.
+
+  Attributes:
+    append_session (bool): True if the session was appended to the event
+        sources of the previous sessions.
+    completed_path_specs (list[dfvfs.PathSpec]): path specifications of
+        the event sources of which the results were merged since the previous
+        checkpoint of the session.
+    first_event_source_index (int): index of the first event source written
+        by the session.
+    identifier (str): unique identifier of the session.
+    parser_statistics (list[ParserStatistics]): parser statistics of
+        the session.
+    parsers_counter (collections.Counter): number of events per parser or
+        parser plugin.
+    pending_merge_tasks (list[Task]): tasks of which the results were
+        processed but not yet merged.
+    task_storage_path (str): path of the task storage of the session, which
+        contains the task storage files of the pending merge tasks.
+    timestamp (int): time that the checkpoint was written. Contains the number
+        of micro seconds since January 1, 1970, 00:00:00 UTC.
+  """
+  CONTAINER_TYPE = 'session_checkpoint'
+
+  def __init__(self, identifier=None):
+    """Initializes a session checkpoint attribute container.
+
+    Args:
+      identifier (Optional[str]): unique identifier of the session.
+          The identifier should match that of the corresponding
+          session start information.
+    """
+    super(SessionCheckpoint, self).__init__()
+    self.append_session = None
+    self.completed_path_specs = None
+    self.first_event_source_index = None
+    self.identifier = identifier
+    self.parser_statistics = None
+    self.parsers_counter = None
+    self.pending_merge_tasks = None
+    self.task_storage_path = None
+    self.timestamp = None
+
+
 class SessionCompletion(interface.AttributeContainer):
   """Session completion attribute container.
 
@@ -234,4 +312,4 @@ class SessionStart(interface.AttributeContainer):
 
 
 manager.AttributeContainersManager.RegisterAttributeContainers([
-    Session, SessionCompletion, SessionStart])
+    Session, SessionCheckpoint, SessionCompletion, SessionStart])
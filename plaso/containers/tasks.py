@@ -30,7 +30,11 @@ class Task(interface.AttributeContainer):
         processed as number of milliseconds since January 1, 1970, 00:00:00 UTC.
     merge_priority (int): priority used for the task storage file merge, where
         a lower value indicates a higher priority to merge.
-    path_spec (dfvfs.PathSpec): path specification.
+    path_spec (dfvfs.PathSpec): path specification or None if the task
+        contains multiple path specifications.
+    path_specs (list[dfvfs.PathSpec]): path specifications of a task that
+        combines multiple event sources or None if the task contains a single
+        path specification.
     session_identifier (str): the identifier of the session the task is part of.
     start_time (int): time that the task was started. Contains the number
         of micro seconds since January 1, 1970, 00:00:00 UTC.
@@ -54,6 +58,7 @@ class Task(interface.AttributeContainer):
     self.last_processing_time = None
     self.merge_priority = None
     self.path_spec = None
+    self.path_specs = None
     self.session_identifier = session_identifier
     self.start_time = int(time.time() * definitions.MICROSECONDS_PER_SECOND)
     self.storage_file_size = None
@@ -89,6 +94,28 @@ class Task(interface.AttributeContainer):
 
     return retry_task
 
+  def CreateRetryTasks(self):
+    """Creates new tasks to retry a previously abandoned task.
+
+    A task that contains multiple path specifications is retried with a task
+    per path specification, such that a path specification that causes a
+    worker to fail does not prevent the other path specifications from being
+    processed.
+
+    Returns:
+      list[Task]: tasks to retry a previously abandoned task.
+    """
+    if not self.path_specs:
+      return [self.CreateRetryTask()]
+
+    retry_tasks = []
+    for path_spec in self.path_specs:
+      retry_task = self.CreateRetryTask()
+      retry_task.path_spec = path_spec
+      retry_tasks.append(retry_task)
+
+    return retry_tasks
+
   def CreateTaskCompletion(self):
     """Creates a task completion.
 
@@ -117,6 +144,20 @@ class Task(interface.AttributeContainer):
     task_start.timestamp = self.start_time
     return task_start
 
+  def GetPathSpecs(self):
+    """Retrieves the path specifications to process.
+
+    Returns:
+      list[dfvfs.PathSpec]: path specifications.
+    """
+    if self.path_specs:
+      return list(self.path_specs)
+
+    if self.path_spec:
+      return [self.path_spec]
+
+    return []
+
   def UpdateProcessingTime(self):
     """Updates the processing time to now."""
     self.last_processing_time = int(
@@ -39,6 +39,7 @@ PYTHON_DEPENDENCIES = {
     'hachoir_metadata': ('__version__', '1.3.3', None, False),
     'hachoir_parser': ('__version__', '1.3.4', None, False),
     'idna': ('', '2.5', None, True),
+    'lz4': ('__version__', '2.1.0', None, False),
     'lzma': ('__version__', '', None, False),
     'pefile': ('__version__', '2017.5.26', None, True),
     'psutil': ('__version__', '5.4.3', None, True),
@@ -74,7 +75,8 @@ PYTHON_DEPENDENCIES = {
     'xlsxwriter': ('__version__', '0.9.3', None, True),
     'yaml': ('__version__', '3.10', None, True),
     'yara': ('YARA_VERSION', '3.4.0', None, True),
-    'zmq': ('__version__', '2.1.11', None, True)}
+    'zmq': ('__version__', '2.1.11', None, True),
+    'zstandard': ('__version__', '0.9.0', None, False)}
 
 _VERSION_SPLIT_REGEX = re.compile(r'\.|\-')
 
@@ -0,0 +1,277 @@
+# -*- coding: utf-8 -*-
+"""Block cache to share the data of a data stream between readers.
+
+The data of a data stream is read by the analyzers, the signature scanner
+and the parsers. The data is read in fixed size blocks that are cached,
+so that the data is only read, and decoded by the underlying dfVFS file-like
+object, once, for as far as it fits in the cache.
+"""
+
+from __future__ import unicode_literals
+
+import collections
+import os
+
+
+class BlockCache(object):
+  """Block cache with least recently used (LRU) eviction.
+
+  Attributes:
+    block_size (int): size of a block in bytes.
+    maximum_size (int): maximum size of the cached data in bytes.
+    number_of_hits (int): number of block lookups that were in the cache.
+    number_of_misses (int): number of block lookups that were not in
+        the cache.
+  """
+
+  def __init__(self, block_size=65536, maximum_size=32 * 1024 * 1024):
+    """Initializes a block cache.
+
+    Args:
+      block_size (Optional[int]): size of a block in bytes.
+      maximum_size (Optional[int]): maximum size of the cached data in bytes.
+
+    Raises:
+      ValueError: if the block size or maximum size is not valid.
+    """
+    if block_size <= 0:
+      raise ValueError('Invalid block size: {0:d}.'.format(block_size))
+
+    if maximum_size < block_size:
+      raise ValueError('Invalid maximum size: {0:d}.'.format(maximum_size))
+
+    super(BlockCache, self).__init__()
+    self._blocks = collections.OrderedDict()
+    self._size = 0
+
+    self.block_size = block_size
+    self.maximum_size = maximum_size
+    self.number_of_hits = 0
+    self.number_of_misses = 0
+
+  def Empty(self):
+    """Empties the cache."""
+    self._blocks = collections.OrderedDict()
+    self._size = 0
+
+  def GetBlock(self, block_index):
+    """Retrieves a block from the cache.
+
+    Args:
+      block_index (int): index of the block.
+
+    Returns:
+      bytes: data of the block or None if the block is not in the cache.
+    """
+    block_data = self._blocks.pop(block_index, None)
+    if block_data is None:
+      self.number_of_misses += 1
+      return None
+
+    # Reinserting the block marks it as most recently used.
+    self._blocks[block_index] = block_data
+    self.number_of_hits += 1
+    return block_data
+
+  def SetBlock(self, block_index, block_data):
+    """Stores a block in the cache.
+
+    The least recently used blocks are evicted when the size of the cached
+    data would exceed the maximum size.
+
+    Args:
+      block_index (int): index of the block.
+      block_data (bytes): data of the block.
+    """
+    existing_block_data = self._blocks.pop(block_index, None)
+    if existing_block_data is not None:
+      self._size -= len(existing_block_data)
+
+    while self._blocks and self._size + len(block_data) > self.maximum_size:
+      _, evicted_block_data = self._blocks.popitem(last=False)
+      self._size -= len(evicted_block_data)
+
+    self._blocks[block_index] = block_data
+    self._size += len(block_data)
+
+
+class BlockCacheFileObject(object):
+  """File-like object that reads the data of a file-like object via a cache.
+
+  The file-like object supports the subset of the dfVFS file-like object
+  interface used by the analyzers, the signature scanner and the parsers.
+
+  Attributes:
+    number_of_read_bytes (int): number of bytes read from the file-like object
+        by its users, which includes bytes read from the cache.
+  """
+
+  def __init__(self, file_object, block_cache):
+    """Initializes a block cache file-like object.
+
+    Args:
+      file_object (dfvfs.FileIO): file-like object to read the data from.
+      block_cache (BlockCache): cache of the blocks of the data of the
+          file-like object.
+    """
+    super(BlockCacheFileObject, self).__init__()
+    self._block_cache = block_cache
+    self._current_offset = 0
+    self._file_object = file_object
+    self._size = file_object.get_size()
+
+    self.number_of_read_bytes = 0
+
+  def _ReadBlocks(self, first_block_index, number_of_blocks):
+    """Reads consecutive blocks from the file-like object into the cache.
+
+    Args:
+      first_block_index (int): index of the first block to read.
+      number_of_blocks (int): number of blocks to read.
+
+    Returns:
+      list[bytes]: data of the blocks that were read.
+    """
+    block_size = self._block_cache.block_size
+
+    self._file_object.seek(first_block_index * block_size, os.SEEK_SET)
+    data = self._file_object.read(number_of_blocks * block_size)
+
+    blocks = []
+    for data_offset in range(0, len(data), block_size):
+      block_data = data[data_offset:data_offset + block_size]
+      self._block_cache.SetBlock(len(blocks) + first_block_index, block_data)
+      blocks.append(block_data)
+
+    return blocks
+
+  # Note: that the following functions do not follow the style guide
+  # because they are part of the file-like object interface.
+  # pylint: disable=invalid-name
+
+  def close(self):
+    """Closes the file-like object."""
+    if self._file_object:
+      self._file_object.close()
+      self._file_object = None
+
+  def get_offset(self):
+    """Retrieves the current offset into the file-like object.
+
+    Returns:
+      int: current offset into the file-like object.
+    """
+    return self._current_offset
+
+  def get_size(self):
+    """Retrieves the size of the file-like object.
+
+    Returns:
+      int: size of the file-like object data.
+    """
+    return self._size
+
+  def read(self, size=None):
+    """Reads a byte string from the file-like object at the current offset.
+
+    The function will read a byte string of the specified size or
+    all of the remaining data if no size was specified.
+
+    Args:
+      size (Optional[int]): number of bytes to read, where None is all
+          remaining data.
+
+    Returns:
+      bytes: data read.
+
+    Raises:
+      IOError: if the read failed.
+    """
+    if not self._file_object:
+      raise IOError('File-like object not open.')
+
+    if self._current_offset < 0:
+      raise IOError('Invalid current offset value less than zero.')
+
+    if size is None or size < 0:
+      size = self._size - self._current_offset
+
+    size = min(size, self._size - self._current_offset)
+    if size <= 0:
+      return b''
+
+    block_size = self._block_cache.block_size
+    first_block_index, block_offset = divmod(self._current_offset, block_size)
+    last_block_index = (self._current_offset + size - 1) // block_size
+
+    blocks = []
+    missing_block_index = None
+    for block_index in range(first_block_index, last_block_index + 2):
+      block_data = None
+      if block_index <= last_block_index:
+        block_data = self._block_cache.GetBlock(block_index)
+        if block_data is None:
+          if missing_block_index is None:
+            missing_block_index = block_index
+          continue
+
+      if missing_block_index is not None:
+        # Consecutive blocks that are not cached are read with a single read.
+        number_of_blocks = block_index - missing_block_index
+        read_blocks = self._ReadBlocks(missing_block_index, number_of_blocks)
+        blocks.extend(read_blocks)
+        missing_block_index = None
+
+        if (len(read_blocks) < number_of_blocks or
+            len(read_blocks[-1]) < self._block_cache.block_size):
+          break
+
+      if block_data is not None:
+        blocks.append(block_data)
+
+    data = b''.join(blocks)[block_offset:block_offset + size]
+    self._current_offset += len(data)
+    self.number_of_read_bytes += len(data)
+    return data
+
+  def seek(self, offset, whence=os.SEEK_SET):
+    """Seeks to an offset within the file-like object.
+
+    Args:
+      offset (int): offset to seek to.
+      whence (Optional(int)): value that indicates whether offset is an
+          absolute or relative position within the file.
+
+    Raises:
+      IOError: if the seek failed.
+    """
+    if not self._file_object:
+      raise IOError('File-like object not open.')
+
+    if whence == os.SEEK_CUR:
+      offset += self._current_offset
+    elif whence == os.SEEK_END:
+      offset += self._size
+    elif whence != os.SEEK_SET:
+      raise IOError('Unsupported whence.')
+
+    if offset < 0:
+      raise IOError('Invalid offset value less than zero.')
+
+    self._current_offset = offset
+
+  def seekable(self):
+    """Determines if a file-like object is seekable.
+
+    Returns:
+      bool: True, since the file-like object is seekable.
+    """
+    return True
+
+  def tell(self):
+    """Retrieves the current offset into the file-like object.
+
+    Returns:
+      int: current offset into the file-like object.
+    """
+    return self._current_offset
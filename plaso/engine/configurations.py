@@ -56,6 +56,16 @@ class ExtractionConfiguration(interface.AttributeContainer):
   These settings are primarily used by the extraction worker.
 
   Attributes:
+    append_session (bool): True if the event sources of the previous
+        sessions in the storage are processed again, in which case only
+        the content of the data streams is extracted and no event sources,
+        file entry metadata or analyzer results are produced.
+    compiled_yara_rules (bytes): Yara rules compiled and saved by libyara,
+        which workers load instead of compiling the Yara rule definitions.
+    deduplicate_content (bool): True if the events of a data stream with
+        the same content as a previously parsed data stream should be
+        reproduced from the events of that data stream, instead of parsing
+        the data stream again.
     hasher_file_size_limit (int): maximum file size that hashers
         should process, where 0 or None represents unlimited.
     hasher_names_string (str): comma separated string of names
@@ -71,6 +81,9 @@ class ExtractionConfiguration(interface.AttributeContainer):
   def __init__(self):
     """Initializes an extraction configuration object."""
     super(ExtractionConfiguration, self).__init__()
+    self.append_session = False
+    self.compiled_yara_rules = None
+    self.deduplicate_content = False
     self.hasher_file_size_limit = None
     self.hasher_names_string = None
     self.process_archives = False
@@ -109,6 +122,7 @@ class ProfilingConfiguration(interface.AttributeContainer):
         * 'serializers', which profiles CPU time consumed by individual
           serializers.
         * 'storage', which profiles storage reads and writes.
+        * 'yara_rules', which profiles the time spent matching Yara rules.
     sample_rate (int): the profiling sample rate. Contains the number of event
         sources processed.
   """
@@ -185,6 +199,14 @@ class ProfilingConfiguration(interface.AttributeContainer):
     """
     return 'tasks' in self.profilers
 
+  def HaveProfileYaraRules(self):
+    """Determines if Yara rules profiling is configured.
+
+    Returns:
+      bool: True if Yara rules profiling is configured.
+    """
+    return 'yara_rules' in self.profilers
+
 
 class ProcessingConfiguration(interface.AttributeContainer):
   """Configuration settings for processing.
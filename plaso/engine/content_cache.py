@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""Cache of the events produced by parsing the content of data streams.
+
+Identical data streams, such as the same Windows Registry file in multiple
+Volume Shadow Snapshots (VSS), produce identical events. The content cache
+allows the events of a data stream to be reproduced, for the file entry of
+another data stream with identical content, without parsing it again.
+"""
+
+from __future__ import unicode_literals
+
+import collections
+
+
+class ContentCache(object):
+  """Cache of the events produced by parsing the content of data streams.
+
+  The cache uses least recently used (LRU) eviction, where the size of the
+  cache is bound by the total number of events.
+
+  Attributes:
+    maximum_number_of_events (int): maximum number of events in the cache.
+    number_of_hits (int): number of lookups that were in the cache.
+    number_of_misses (int): number of lookups that were not in the cache.
+  """
+
+  def __init__(self, maximum_number_of_events=100000):
+    """Initializes a content cache.
+
+    Args:
+      maximum_number_of_events (Optional[int]): maximum number of events
+          in the cache.
+    """
+    super(ContentCache, self).__init__()
+    self._number_of_events = 0
+    self._recorded_events_per_identifier = collections.OrderedDict()
+
+    self.maximum_number_of_events = maximum_number_of_events
+    self.number_of_hits = 0
+    self.number_of_misses = 0
+
+  def _GetNumberOfEvents(self, recorded_events):
+    """Retrieves the number of events of a cache entry.
+
+    Args:
+      recorded_events (list[tuple[str, EventObject, EventData]]): parser
+          chain, event and event data of the events.
+
+    Returns:
+      int: number of events of the cache entry, where a cache entry without
+          events is counted as one event.
+    """
+    return max(len(recorded_events), 1)
+
+  def GetEvents(self, content_identifier):
+    """Retrieves the events produced by parsing a data stream.
+
+    Args:
+      content_identifier (str): identifier of the content of the data stream.
+
+    Returns:
+      list[tuple[str, EventObject, EventData]]: parser chain, event and event
+          data of the events or None if the content is not in the cache.
+    """
+    recorded_events = self._recorded_events_per_identifier.pop(
+        content_identifier, None)
+    if recorded_events is None:
+      self.number_of_misses += 1
+      return None
+
+    # Reinserting the events marks them as most recently used.
+    self._recorded_events_per_identifier[content_identifier] = recorded_events
+    self.number_of_hits += 1
+    return recorded_events
+
+  def SetEvents(self, content_identifier, recorded_events):
+    """Stores the events produced by parsing a data stream.
+
+    The least recently used events are evicted when the number of events
+    would exceed the maximum number of events. Events that exceed the maximum
+    number of events by themselves are not stored.
+
+    Args:
+      content_identifier (str): identifier of the content of the data stream.
+      recorded_events (list[tuple[str, EventObject, EventData]]): parser
+          chain, event and event data of the events.
+    """
+    number_of_events = self._GetNumberOfEvents(recorded_events)
+    if number_of_events > self.maximum_number_of_events:
+      return
+
+    existing_recorded_events = self._recorded_events_per_identifier.pop(
+        content_identifier, None)
+    if existing_recorded_events is not None:
+      self._number_of_events -= self._GetNumberOfEvents(
+          existing_recorded_events)
+
+    while (self._recorded_events_per_identifier and
+           self._number_of_events + number_of_events >
+           self.maximum_number_of_events):
+      _, evicted_recorded_events = (
+          self._recorded_events_per_identifier.popitem(last=False))
+      self._number_of_events -= self._GetNumberOfEvents(
+          evicted_recorded_events)
+
+    self._recorded_events_per_identifier[content_identifier] = recorded_events
+    self._number_of_events += number_of_events
@@ -49,6 +49,7 @@ class BaseEngine(object):
     self._serializers_profiler = None
     self._storage_profiler = None
     self._task_queue_profiler = None
+    self._yara_rules_profiler = None
 
     self.knowledge_base = knowledge_base.KnowledgeBase()
 
@@ -143,6 +144,11 @@ class BaseEngine(object):
           self._name, configuration)
       self._task_queue_profiler.Start()
 
+    if configuration.HaveProfileYaraRules():
+      self._yara_rules_profiler = profilers.YaraRulesProfiler(
+          self._name, configuration)
+      self._yara_rules_profiler.Start()
+
   def _StopProfiling(self):
     """Stops profiling."""
     if self._guppy_memory_profiler:
@@ -170,6 +176,10 @@ class BaseEngine(object):
       self._task_queue_profiler.Stop()
       self._task_queue_profiler = None
 
+    if self._yara_rules_profiler:
+      self._yara_rules_profiler.Stop()
+      self._yara_rules_profiler = None
+
   @classmethod
   def CreateSession(
       cls, artifact_filter_names=None, command_line_arguments=None,
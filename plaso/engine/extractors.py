@@ -16,6 +16,7 @@ from dfvfs.lib import definitions as dfvfs_definitions
 from dfvfs.lib import errors as dfvfs_errors
 from dfvfs.resolver import resolver as path_spec_resolver
 
+from plaso.engine import block_cache as engine_block_cache
 from plaso.engine import logger
 from plaso.lib import errors
 from plaso.parsers import interface as parsers_interface
@@ -202,7 +203,11 @@ class EventExtractor(object):
         parser_mediator.resolver_context.GetFileObjectReferenceCount(
             file_entry.path_spec))
 
+    number_of_read_bytes = getattr(file_object, 'number_of_read_bytes', 0)
+    result = self._PARSE_RESULT_FAILURE
+
     parser_mediator.SampleStartTiming(parser.NAME)
+    parser_mediator.StartParserMeasurement(parser.NAME)
 
     try:
       if isinstance(parser, parsers_interface.FileEntryParser):
@@ -213,20 +218,28 @@ class EventExtractor(object):
 
     # We catch IOError so we can determine the parser that generated the error.
     except (IOError, dfvfs_errors.BackEndError) as exception:
-      display_name = parser_mediator.GetDisplayName(file_entry)
+      display_name = parser_mediator.GetDisplayNameForPathSpec(
+          file_entry.path_spec)
       logger.warning(
           '{0:s} unable to parse file: {1:s} with error: {2!s}'.format(
               parser.NAME, display_name, exception))
       result = self._PARSE_RESULT_FAILURE
 
     except errors.UnableToParseFile as exception:
-      display_name = parser_mediator.GetDisplayName(file_entry)
+      display_name = parser_mediator.GetDisplayNameForPathSpec(
+          file_entry.path_spec)
       logger.debug(
           '{0:s} unable to parse file: {1:s} with error: {2!s}'.format(
               parser.NAME, display_name, exception))
       result = self._PARSE_RESULT_UNSUPPORTED
 
     finally:
+      number_of_read_bytes = getattr(
+          file_object, 'number_of_read_bytes', 0) - number_of_read_bytes
+
+      parser_mediator.StopParserMeasurement(
+          parser.NAME, result == self._PARSE_RESULT_SUCCESS,
+          number_of_read_bytes=number_of_read_bytes)
       parser_mediator.SampleStopTiming(parser.NAME)
       parser_mediator.SampleMemoryUsage(parser.NAME)
 
@@ -234,7 +247,8 @@ class EventExtractor(object):
           parser_mediator.resolver_context.GetFileObjectReferenceCount(
               file_entry.path_spec))
       if reference_count != new_reference_count:
-        display_name = parser_mediator.GetDisplayName(file_entry)
+        display_name = parser_mediator.GetDisplayNameForPathSpec(
+            file_entry.path_spec)
         logger.warning((
             '[{0:s}] did not explicitly close file-object for file: '
             '{1:s}.').format(parser.NAME, display_name))
@@ -274,7 +288,8 @@ class EventExtractor(object):
           parse_results = self._PARSE_RESULT_SUCCESS
           continue
 
-      display_name = parser_mediator.GetDisplayName(file_entry)
+      display_name = parser_mediator.GetDisplayNameForPathSpec(
+          file_entry.path_spec)
       logger.debug((
           '[ParseFileEntryWithParsers] parsing file: {0:s} with parser: '
           '{1:s}').format(display_name, parser_name))
@@ -289,13 +304,44 @@ class EventExtractor(object):
 
     return parse_results
 
-  def ParseDataStream(self, parser_mediator, file_entry, data_stream_name):
+  def CanParseFileEntryContent(self, file_entry):
+    """Determines if the enabled parsers can parse the content of a file entry.
+
+    Parsers with signatures can only be ruled out by scanning the content of
+    the file entry. Parsers without signatures are ruled out, without reading
+    the content, if none of their filters match the file entry.
+
+    Args:
+      file_entry (dfvfs.FileEntry): file entry.
+
+    Returns:
+      bool: True if at least one of the enabled parsers can parse the content
+          of the file entry.
+    """
+    for _ in self._formats_with_signatures.specifications:
+      return True
+
+    for parser_name in self._non_sigscan_parser_names:
+      parser = self._parsers.get(parser_name, None)
+      if not parser:
+        continue
+
+      if (not parser.FILTERS or
+          self._CheckParserCanProcessFileEntry(parser, file_entry)):
+        return True
+
+    return False
+
+  def ParseDataStream(
+      self, parser_mediator, file_entry, data_stream_name, block_cache=None):
     """Parses a data stream of a file entry with the enabled parsers.
 
     Args:
       parser_mediator (ParserMediator): parser mediator.
       file_entry (dfvfs.FileEntry): file entry.
       data_stream_name (str): data stream name.
+      block_cache (Optional[BlockCache]): cache of the blocks of the data
+          stream, which is shared by the signature scanner and the parsers.
 
     Raises:
       RuntimeError: if the file-like object or the parser object is missing.
@@ -305,6 +351,10 @@ class EventExtractor(object):
       raise RuntimeError(
           'Unable to retrieve file-like object from file entry.')
 
+    if block_cache is not None:
+      file_object = engine_block_cache.BlockCacheFileObject(
+          file_object, block_cache)
+
     try:
       parser_names = self._GetSignatureMatchParserNames(file_object)
 
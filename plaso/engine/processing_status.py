@@ -15,6 +15,10 @@ class ProcessStatus(object):
     identifier (str): process identifier.
     last_running_time (int): timestamp of the last update when the process had
         a running process status.
+    number_of_block_cache_hits (int): total number of reads of data stream
+        blocks that were served by the block cache of the process.
+    number_of_block_cache_misses (int): total number of reads of data stream
+        blocks that were not served by the block cache of the process.
     number_of_consumed_errors (int): total number of errors consumed by
         the process.
     number_of_consumed_errors_delta (int): number of errors consumed by
@@ -66,6 +70,8 @@ class ProcessStatus(object):
     self.display_name = None
     self.identifier = None
     self.last_running_time = 0
+    self.number_of_block_cache_hits = 0
+    self.number_of_block_cache_misses = 0
     self.number_of_consumed_errors = 0
     self.number_of_consumed_errors_delta = 0
     self.number_of_consumed_event_tags = 0
@@ -464,7 +470,8 @@ class ProcessingStatus(object):
       number_of_consumed_events, number_of_produced_events,
       number_of_consumed_event_tags, number_of_produced_event_tags,
       number_of_consumed_errors, number_of_produced_errors,
-      number_of_consumed_reports, number_of_produced_reports):
+      number_of_consumed_reports, number_of_produced_reports,
+      number_of_block_cache_hits=None, number_of_block_cache_misses=None):
     """Updates the status of a worker.
 
     Args:
@@ -494,6 +501,11 @@ class ProcessingStatus(object):
           by the process.
       number_of_produced_reports (int): total number of event reports produced
           by the process.
+      number_of_block_cache_hits (Optional[int]): total number of reads of
+          data stream blocks that were served by the block cache of the worker.
+      number_of_block_cache_misses (Optional[int]): total number of reads of
+          data stream blocks that were not served by the block cache of
+          the worker.
     """
     if identifier not in self._workers_status:
       self._workers_status[identifier] = ProcessStatus()
@@ -507,6 +519,13 @@ class ProcessingStatus(object):
         number_of_consumed_errors, number_of_produced_errors,
         number_of_consumed_reports, number_of_produced_reports)
 
+    if number_of_block_cache_hits is not None:
+      process_status.number_of_block_cache_hits = number_of_block_cache_hits
+
+    if number_of_block_cache_misses is not None:
+      process_status.number_of_block_cache_misses = (
+          number_of_block_cache_misses)
+
 
 class TasksStatus(object):
   """The status of the tasks.
@@ -516,6 +535,8 @@ class TasksStatus(object):
     number_of_queued_tasks (int): number of active tasks.
     number_of_tasks_pending_merge (int): number of tasks pending merge.
     number_of_tasks_processing (int): number of tasks processing.
+    size_of_tasks_pending_merge (int): total size of the task storage files
+        of the tasks pending merge, in bytes.
     total_number_of_tasks (int): total number of tasks.
   """
 
@@ -526,4 +547,5 @@ class TasksStatus(object):
     self.number_of_queued_tasks = 0
     self.number_of_tasks_pending_merge = 0
     self.number_of_tasks_processing = 0
+    self.size_of_tasks_pending_merge = 0
     self.total_number_of_tasks = 0
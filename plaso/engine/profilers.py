@@ -241,7 +241,7 @@ class StorageProfiler(SampleFileProfiler):
     """Takes a sample of data read or written for profiling.
 
     Args:
-      operation (str): operation, either 'read' or 'write'.
+      operation (str): operation, either 'copy', 'read' or 'write'.
       description (str): description of the data read.
       data_size (int): size of the data read in bytes.
       compressed_data_size (int): size of the compressed data read in bytes.
@@ -258,7 +258,8 @@ class TaskQueueProfiler(SampleFileProfiler):
   _FILENAME_PREFIX = 'task_queue'
 
   _FILE_HEADER = (
-      'Time\tQueued\tProcessing\tTo merge\tAbandoned\tTotal\n')
+      'Time\tQueued\tProcessing\tTo merge\tAbandoned\tTotal\t'
+      'To merge size\n')
 
   def Sample(self, tasks_status):
     """Takes a sample of the status of queued tasks for profiling.
@@ -267,22 +268,91 @@ class TaskQueueProfiler(SampleFileProfiler):
       tasks_status (TasksStatus): status information about tasks.
     """
     sample_time = time.time()
-    sample = '{0:f}\t{1:d}\t{2:d}\t{3:d}\t{4:d}\t{5:d}\n'.format(
+    sample = '{0:f}\t{1:d}\t{2:d}\t{3:d}\t{4:d}\t{5:d}\t{6:d}\n'.format(
         sample_time, tasks_status.number_of_queued_tasks,
         tasks_status.number_of_tasks_processing,
         tasks_status.number_of_tasks_pending_merge,
         tasks_status.number_of_abandoned_tasks,
-        tasks_status.total_number_of_tasks)
+        tasks_status.total_number_of_tasks,
+        tasks_status.size_of_tasks_pending_merge)
     self._WritesString(sample)
 
 
 class TasksProfiler(SampleFileProfiler):
-  """The tasks profiler."""
+  """The tasks profiler.
+
+  Besides the samples of the status of the tasks, the tasks profiler tracks
+  the latency of the tasks, which is the time between the first status of
+  a task, such as "created" or "processing_started", and its completion.
+  Latency statistics, such as percentiles, are written to a separate file
+  when the profiler is stopped, to determine the tail latency of the tasks.
+  """
 
   _FILENAME_PREFIX = 'tasks'
 
   _FILE_HEADER = 'Time\tIdentifier\tStatus\n'
 
+  _LATENCY_FILENAME_PREFIX = 'tasks_latency'
+
+  _LATENCY_FILE_HEADER = 'Statistic\tValue\n'
+
+  _LATENCY_PERCENTILES = (50, 90, 95, 99)
+
+  # Statuses that indicate a task was completed by the foreman or worker.
+  _COMPLETED_STATUSES = frozenset([
+      'completed', 'processing_completed'])
+
+  def __init__(self, identifier, configuration):
+    """Initializes a tasks profiler.
+
+    Args:
+      identifier (str): identifier of the profiling session used to create
+          the sample filename.
+      configuration (ProfilingConfiguration): profiling configuration.
+    """
+    super(TasksProfiler, self).__init__(identifier, configuration)
+    self._latencies = []
+    self._task_start_times = {}
+
+  def _WriteLatencyStatistics(self):
+    """Writes the latency statistics to the latency statistics file."""
+    filename = '{0:s}-{1:s}.csv.gz'.format(
+        self._LATENCY_FILENAME_PREFIX, self._identifier)
+    if self._path:
+      filename = os.path.join(self._path, filename)
+
+    with gzip.open(filename, 'wb') as latency_file:
+      lines = [self._LATENCY_FILE_HEADER]
+      for name, value in self.GetLatencyStatistics():
+        lines.append('{0:s}\t{1:f}\n'.format(name, value))
+
+      latency_file.write(codecs.encode(''.join(lines), 'utf-8'))
+
+  def GetLatencyStatistics(self):
+    """Retrieves the latency statistics of the completed tasks.
+
+    Returns:
+      list[tuple[str, float]]: names and values of the latency statistics,
+          where the latencies are in seconds.
+    """
+    number_of_tasks = len(self._latencies)
+    if not number_of_tasks:
+      return [('number_of_tasks', 0.0)]
+
+    latencies = sorted(self._latencies)
+
+    statistics = [
+        ('number_of_tasks', float(number_of_tasks)),
+        ('mean', sum(latencies) / number_of_tasks)]
+
+    for percentile in self._LATENCY_PERCENTILES:
+      # Nearest-rank percentile.
+      index = max(0, (percentile * number_of_tasks + 99) // 100 - 1)
+      statistics.append(('p{0:d}'.format(percentile), latencies[index]))
+
+    statistics.append(('maximum', latencies[-1]))
+    return statistics
+
   def Sample(self, task, status):
     """Takes a sample of the status of a task for profiling.
 
@@ -294,3 +364,91 @@ class TasksProfiler(SampleFileProfiler):
     sample = '{0:f}\t{1:s}\t{2:s}\n'.format(
         sample_time, task.identifier, status)
     self._WritesString(sample)
+
+    if status in self._COMPLETED_STATUSES:
+      start_time = self._task_start_times.pop(task.identifier, None)
+      if start_time is not None:
+        self._latencies.append(sample_time - start_time)
+
+    elif task.identifier not in self._task_start_times:
+      self._task_start_times[task.identifier] = sample_time
+
+  def Stop(self):
+    """Stops the profiler."""
+    super(TasksProfiler, self).Stop()
+
+    self._WriteLatencyStatistics()
+
+
+class YaraRulesProfiler(SampleFileProfiler):
+  """The Yara rules profiler.
+
+  Besides the samples of the time spent matching the Yara rules against
+  the data of individual files, the Yara rules profiler writes the cost
+  of the individual rules to a separate file when the profiler is stopped.
+  The cost of the individual rules is only available if libyara was compiled
+  with profiling support.
+  """
+
+  _FILENAME_PREFIX = 'yara_rules'
+
+  _FILE_HEADER = 'Time\tName\tMatch time\tMatched rules\n'
+
+  _RULES_COST_FILENAME_PREFIX = 'yara_rules_cost'
+
+  _RULES_COST_FILE_HEADER = 'Rule\tCost\n'
+
+  def __init__(self, identifier, configuration):
+    """Initializes a Yara rules profiler.
+
+    Args:
+      identifier (str): identifier of the profiling session used to create
+          the sample filename.
+      configuration (ProfilingConfiguration): profiling configuration.
+    """
+    super(YaraRulesProfiler, self).__init__(identifier, configuration)
+    self._rules_cost = None
+
+  def _WriteRulesCost(self):
+    """Writes the cost of the rules to the rules cost file."""
+    filename = '{0:s}-{1:s}.csv.gz'.format(
+        self._RULES_COST_FILENAME_PREFIX, self._identifier)
+    if self._path:
+      filename = os.path.join(self._path, filename)
+
+    with gzip.open(filename, 'wb') as rules_cost_file:
+      lines = [self._RULES_COST_FILE_HEADER]
+      # The most costly rules are written first.
+      for rule_name, cost in sorted(
+          self._rules_cost.items(), key=lambda item: item[1], reverse=True):
+        lines.append('{0:s}\t{1:d}\n'.format(rule_name, cost))
+
+      rules_cost_file.write(codecs.encode(''.join(lines), 'utf-8'))
+
+  def Sample(self, display_name, match_time, matched_rules):
+    """Takes a sample of matching the Yara rules against a file.
+
+    Args:
+      display_name (str): display name of the file.
+      match_time (float): time in seconds spent matching the rules.
+      matched_rules (str): comma separated names of the matched rules.
+    """
+    sample_time = time.time()
+    sample = '{0:f}\t{1:s}\t{2:f}\t{3:s}\n'.format(
+        sample_time, display_name, match_time, matched_rules)
+    self._WritesString(sample)
+
+  def SetRulesCost(self, rules_cost):
+    """Sets the cost of the individual rules.
+
+    Args:
+      rules_cost (dict[str, int]): cost per rule name.
+    """
+    self._rules_cost = rules_cost
+
+  def Stop(self):
+    """Stops the profiler."""
+    super(YaraRulesProfiler, self).Stop()
+
+    if self._rules_cost:
+      self._WriteRulesCost()
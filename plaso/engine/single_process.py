@@ -80,7 +80,7 @@ class SingleProcessEngine(engine.BaseEngine):
 
   def _ProcessSources(
       self, source_path_specs, extraction_worker, parser_mediator,
-      storage_writer, filter_find_specs=None):
+      storage_writer, append=False, filter_find_specs=None):
     """Processes the sources.
 
     Args:
@@ -89,6 +89,8 @@ class SingleProcessEngine(engine.BaseEngine):
       extraction_worker (worker.ExtractionWorker): extraction worker.
       parser_mediator (ParserMediator): parser mediator.
       storage_writer (StorageWriter): storage writer for a session storage.
+      append (Optional[bool]): True if a session is appended, which processes
+          the path specifications stored by the previous sessions.
       filter_find_specs (Optional[list[dfvfs.FindSpec]]): find specifications
           used in path specification extraction.
     """
@@ -102,10 +104,13 @@ class SingleProcessEngine(engine.BaseEngine):
         number_of_consumed_sources, storage_writer)
 
     display_name = ''
-    path_spec_generator = self._path_spec_extractor.ExtractPathSpecs(
-        source_path_specs, find_specs=filter_find_specs,
-        recurse_file_system=False,
-        resolver_context=parser_mediator.resolver_context)
+    if append:
+      path_spec_generator = []
+    else:
+      path_spec_generator = self._path_spec_extractor.ExtractPathSpecs(
+          source_path_specs, find_specs=filter_find_specs,
+          recurse_file_system=False,
+          resolver_context=parser_mediator.resolver_context)
 
     for path_spec in path_spec_generator:
       if self._abort:
@@ -214,6 +219,10 @@ class SingleProcessEngine(engine.BaseEngine):
       status_update_callback=None):
     """Processes the sources.
 
+    When the extraction configuration is set to append a session, the event
+    sources stored by the previous sessions are processed again, instead of
+    the event sources extracted from the sources.
+
     Args:
       source_path_specs (list[dfvfs.PathSpec]): path specifications of
           the sources to process.
@@ -261,23 +270,40 @@ class SingleProcessEngine(engine.BaseEngine):
     if self._processing_profiler:
       extraction_worker.SetProcessingProfiler(self._processing_profiler)
 
+    if self._yara_rules_profiler:
+      extraction_worker.SetYaraRulesProfiler(self._yara_rules_profiler)
+
     if self._serializers_profiler:
       storage_writer.SetSerializersProfiler(self._serializers_profiler)
 
     if self._storage_profiler:
+      parser_mediator.SetStorageProfiler(self._storage_profiler)
       storage_writer.SetStorageProfiler(self._storage_profiler)
 
+    append = processing_configuration.extraction.append_session
+
     storage_writer.Open()
     storage_writer.WriteSessionStart()
 
+    if append:
+      storage_writer.RewindWrittenEventSources()
+
     try:
-      storage_writer.WritePreprocessingInformation(self.knowledge_base)
+      # An appended session uses the preprocessing information stored by
+      # the previous sessions.
+      if not append:
+        storage_writer.WritePreprocessingInformation(self.knowledge_base)
 
       self._ProcessSources(
           source_path_specs, extraction_worker, parser_mediator,
-          storage_writer, filter_find_specs=filter_find_specs)
+          storage_writer, append=append, filter_find_specs=filter_find_specs)
 
     finally:
+      for parser_statistics in parser_mediator.GetParserStatistics():
+        storage_writer.AddParserStatistics(parser_statistics)
+
+      parser_mediator.ResetParserStatistics()
+
       storage_writer.WriteSessionCompletion(aborted=self._abort)
 
       storage_writer.Close()
@@ -285,10 +311,14 @@ class SingleProcessEngine(engine.BaseEngine):
       if self._processing_profiler:
         extraction_worker.SetProcessingProfiler(None)
 
+      if self._yara_rules_profiler:
+        extraction_worker.SetYaraRulesProfiler(None)
+
       if self._serializers_profiler:
         storage_writer.SetSerializersProfiler(None)
 
       if self._storage_profiler:
+        parser_mediator.SetStorageProfiler(None)
         storage_writer.SetStorageProfiler(None)
 
       self._StopProfiling()
@@ -4,6 +4,7 @@
 from __future__ import unicode_literals
 
 import copy
+import hashlib
 import os
 import re
 import time
@@ -16,7 +17,10 @@ from dfvfs.resolver import resolver as path_spec_resolver
 
 from plaso.analyzers import hashing_analyzer
 from plaso.analyzers import manager as analyzers_manager
+from plaso.analyzers import yara_analyzer
 from plaso.containers import event_sources
+from plaso.engine import block_cache
+from plaso.engine import content_cache
 from plaso.engine import extractors
 from plaso.engine import logger
 from plaso.lib import definitions
@@ -74,6 +78,41 @@ class EventExtractionWorker(object):
   _TYPES_WITH_ROOT_METADATA = frozenset([
       dfvfs_definitions.TYPE_INDICATOR_GZIP])
 
+  # Maximum size of the data streams of which the content is deduplicated,
+  # since the content of the data stream needs to be hashed before parsing.
+  _MAXIMUM_DEDUPLICATED_DATA_STREAM_SIZE = 256 * 1024 * 1024
+
+  _CONTENT_HASH_READ_SIZE = 1024 * 1024
+
+  # Relative cost of parsing a byte of data per parser, compared to parsers
+  # that are not listed, which have a cost of 1.
+  _PARSER_PROCESSING_COST_FACTORS = {
+      'esedb': 4,
+      'mft': 4,
+      'sqlite': 4,
+      'usnjrnl': 2,
+      'winevtx': 8,
+      'winreg': 4}
+
+  # Parsers that are expected to parse file entries, by lower case name or
+  # name extension.
+  _EXPECTED_PARSER_PER_FILE_NAME = {
+      '$mft': 'mft',
+      '$usnjrnl': 'usnjrnl',
+      'amcache.hve': 'winreg',
+      'ntuser.dat': 'winreg',
+      'sam': 'winreg',
+      'security': 'winreg',
+      'software': 'winreg',
+      'system': 'winreg',
+      'usrclass.dat': 'winreg'}
+
+  _EXPECTED_PARSER_PER_FILE_NAME_EXTENSION = {
+      '.db': 'sqlite',
+      '.edb': 'esedb',
+      '.evtx': 'winevtx',
+      '.sqlite': 'sqlite'}
+
   def __init__(self, parser_filter_expression=None):
     """Initializes an event extraction worker.
 
@@ -93,17 +132,34 @@ class EventExtractionWorker(object):
     super(EventExtractionWorker, self).__init__()
     self._abort = False
     self._analyzers = []
+    self._append_session = False
+    # The block cache is shared by the analyzers, the signature scanner and
+    # the parsers, so that the data of a data stream is only read once.
+    self._block_cache = block_cache.BlockCache()
+    self._content_cache = None
     self._event_extractor = extractors.EventExtractor(
         parser_filter_expression=parser_filter_expression)
     self._hasher_file_size_limit = None
+    self._parser_filter_expression = parser_filter_expression
     self._path_spec_extractor = extractors.PathSpecExtractor()
     self._process_archives = None
     self._process_compressed_streams = None
     self._processing_profiler = None
+    self._yara_rules_profiler = None
 
     self.last_activity_timestamp = 0.0
     self.processing_status = definitions.PROCESSING_STATUS_IDLE
 
+  @property
+  def number_of_block_cache_hits(self):
+    """int: number of reads of data stream blocks served by the cache."""
+    return self._block_cache.number_of_hits
+
+  @property
+  def number_of_block_cache_misses(self):
+    """int: number of reads of data stream blocks not served by the cache."""
+    return self._block_cache.number_of_misses
+
   def _AnalyzeDataStream(self, mediator, file_entry, data_stream_name):
     """Analyzes the contents of a specific data stream of a file entry.
 
@@ -136,8 +192,18 @@ class EventExtractionWorker(object):
             'Unable to retrieve file-like object for file entry: '
             '{0:s}.').format(display_name))
 
+      file_object = block_cache.BlockCacheFileObject(
+          file_object, self._block_cache)
+
+      # The default data stream of a file stored on the operating system can
+      # be analyzed by path by analyzers that support it.
+      file_path = None
+      if (not data_stream_name and
+          file_entry.type_indicator == dfvfs_definitions.TYPE_INDICATOR_OS):
+        file_path = getattr(file_entry.path_spec, 'location', None)
+
       try:
-        self._AnalyzeFileObject(mediator, file_object)
+        self._AnalyzeFileObject(mediator, file_object, file_path=file_path)
       finally:
         file_object.close()
 
@@ -149,13 +215,16 @@ class EventExtractionWorker(object):
         '[AnalyzeDataStream] completed analyzing file: {0:s}'.format(
             display_name))
 
-  def _AnalyzeFileObject(self, mediator, file_object):
+  def _AnalyzeFileObject(self, mediator, file_object, file_path=None):
     """Processes a file-like object with analyzers.
 
     Args:
       mediator (ParserMediator): mediates the interactions between
           parsers and other components, such as storage and abort signals.
       file_object (dfvfs.FileIO): file-like object to process.
+      file_path (Optional[str]): path of the file on the operating system,
+          which analyzers that support file paths analyze instead of
+          the data read from the file-like object.
     """
     maximum_read_size = max([
         analyzer_object.SIZE_LIMIT for analyzer_object in self._analyzers])
@@ -172,9 +241,28 @@ class EventExtractionWorker(object):
         file_size > self._hasher_file_size_limit):
       return
 
+    analyzers_by_file_path = []
+    if file_path:
+      for analyzer_object in self._analyzers:
+        if self._abort:
+          break
+
+        if not analyzer_object.SUPPORTS_FILE_PATH:
+          continue
+
+        self.processing_status = analyzer_object.PROCESSING_STATUS_HINT
+
+        analyzer_object.AnalyzeFilePath(file_path)
+        analyzers_by_file_path.append(analyzer_object)
+
+        self.last_activity_timestamp = time.time()
+
     file_object.seek(0, os.SEEK_SET)
 
-    data = file_object.read(maximum_read_size)
+    data = None
+    if len(analyzers_by_file_path) < len(self._analyzers):
+      data = file_object.read(maximum_read_size)
+
     while data:
       if self._abort:
         break
@@ -183,6 +271,9 @@ class EventExtractionWorker(object):
         if self._abort:
           break
 
+        if analyzer_object in analyzers_by_file_path:
+          continue
+
         if (not analyzer_object.INCREMENTAL_ANALYZER and
             file_size > analyzer_object.SIZE_LIMIT):
           continue
@@ -214,6 +305,12 @@ class EventExtractionWorker(object):
         mediator.AddEventAttribute(
             result.attribute_name, result.attribute_value)
 
+        if (self._yara_rules_profiler and
+            isinstance(analyzer_object, yara_analyzer.YaraAnalyzer)):
+          self._yara_rules_profiler.Sample(
+              display_name, analyzer_object.match_time,
+              result.attribute_value)
+
       analyzer_object.Reset()
 
     self.processing_status = definitions.PROCESSING_STATUS_RUNNING
@@ -325,8 +422,37 @@ class EventExtractionWorker(object):
     if self._processing_profiler:
       self._processing_profiler.StartTiming('extracting')
 
-    self._event_extractor.ParseDataStream(
-        mediator, file_entry, data_stream_name)
+    content_identifier = None
+    if self._content_cache:
+      content_identifier = self._GetContentIdentifier(
+          mediator, file_entry, data_stream_name)
+
+    recorded_events = None
+    if content_identifier:
+      recorded_events = self._content_cache.GetEvents(content_identifier)
+
+    if recorded_events is not None:
+      logger.debug((
+          '[ExtractContentFromDataStream] reproducing events of identical '
+          'content for file: {0:s}').format(mediator.GetDisplayName()))
+
+      mediator.ProduceRecordedEvents(recorded_events)
+
+    else:
+      if content_identifier:
+        mediator.StartRecordingEvents(
+            self._content_cache.maximum_number_of_events)
+
+      try:
+        self._event_extractor.ParseDataStream(
+            mediator, file_entry, data_stream_name,
+            block_cache=self._block_cache)
+
+      finally:
+        if content_identifier:
+          recorded_events = mediator.StopRecordingEvents()
+          if recorded_events is not None and not self._abort:
+            self._content_cache.SetEvents(content_identifier, recorded_events)
 
     if self._processing_profiler:
       self._processing_profiler.StopTiming('extracting')
@@ -422,6 +548,83 @@ class EventExtractionWorker(object):
 
     return type_indicators
 
+  def _GetContentIdentifier(self, mediator, file_entry, data_stream_name):
+    """Retrieves an identifier of the content of a data stream.
+
+    The identifier consists of the SHA-256 of the content of the data stream,
+    the name of the file entry and the parser filter expression, since these
+    determine which parsers are used to parse the content.
+
+    Args:
+      mediator (ParserMediator): mediates the interactions between
+          parsers and other components, such as storage and abort signals.
+      file_entry (dfvfs.FileEntry): file entry.
+      data_stream_name (str): name of the data stream.
+
+    Returns:
+      str: identifier of the content or None if the content of the data
+          stream is not deduplicated, for example because it is too large.
+    """
+    file_object = file_entry.GetFileObject(data_stream_name=data_stream_name)
+    if not file_object:
+      return None
+
+    file_object = block_cache.BlockCacheFileObject(
+        file_object, self._block_cache)
+
+    try:
+      if (file_object.get_size() >
+          self._MAXIMUM_DEDUPLICATED_DATA_STREAM_SIZE):
+        return None
+
+      hasher = hashlib.sha256()
+
+      data = file_object.read(self._CONTENT_HASH_READ_SIZE)
+      while data:
+        hasher.update(data)
+        data = file_object.read(self._CONTENT_HASH_READ_SIZE)
+
+    except IOError as exception:
+      logger.debug((
+          '[GetContentIdentifier] unable to hash file: {0:s} with error: '
+          '{1!s}').format(mediator.GetDisplayName(), exception))
+      return None
+
+    finally:
+      file_object.close()
+
+    return '{0:s}:{1:s}:{2:s}'.format(
+        hasher.hexdigest(), mediator.GetFilename() or '',
+        self._parser_filter_expression or '')
+
+  def _GetExpectedProcessingCost(self, file_entry_name, file_size):
+    """Estimates the relative cost to process a file entry.
+
+    The estimate is based on the file size and the parser that is expected
+    to parse the file entry, based on its name.
+
+    Args:
+      file_entry_name (str): name of the file entry.
+      file_size (int): size of the file entry data in bytes.
+
+    Returns:
+      int: estimate of the relative cost to process the file entry or None
+          if the file size is not known.
+    """
+    if file_size is None:
+      return None
+
+    file_entry_name = (file_entry_name or '').lower()
+    parser_name = self._EXPECTED_PARSER_PER_FILE_NAME.get(
+        file_entry_name, None)
+    if not parser_name:
+      _, file_name_extension = os.path.splitext(file_entry_name)
+      parser_name = self._EXPECTED_PARSER_PER_FILE_NAME_EXTENSION.get(
+          file_name_extension, None)
+
+    cost_factor = self._PARSER_PROCESSING_COST_FACTORS.get(parser_name, 1)
+    return file_size * cost_factor
+
   def _IsMetadataFile(self, file_entry):
     """Determines if the file entry is a metadata file.
 
@@ -596,6 +799,13 @@ class EventExtractionWorker(object):
       stat_object = sub_file_entry.GetStat()
       if stat_object:
         event_source.file_entry_type = stat_object.type
+        event_source.file_size = getattr(stat_object, 'size', None)
+
+        if event_source.file_entry_type == (
+            dfvfs_definitions.FILE_ENTRY_TYPE_FILE):
+          event_source.expected_processing_cost = (
+              self._GetExpectedProcessingCost(
+                  sub_file_entry.name, event_source.file_size))
 
       mediator.ProduceEventSource(event_source)
 
@@ -680,12 +890,18 @@ class EventExtractionWorker(object):
 
     mediator.ClearEventAttributes()
 
+    # The cached blocks belong to the previously processed data stream.
+    self._block_cache.Empty()
+
     if data_stream and self._analyzers:
       # Since AnalyzeDataStream generates event attributes it needs to be
       # called before producing events.
       self._AnalyzeDataStream(mediator, file_entry, data_stream.name)
 
-    self._ExtractMetadataFromFileEntry(mediator, file_entry, data_stream)
+    # The file entry metadata was already extracted by the session that
+    # produced the event sources that are processed again.
+    if not self._append_session:
+      self._ExtractMetadataFromFileEntry(mediator, file_entry, data_stream)
 
     # Not every file entry has a data stream. In such cases we want to
     # extract the metadata only.
@@ -701,6 +917,13 @@ class EventExtractionWorker(object):
       self.processing_status = definitions.PROCESSING_STATUS_IDLE
       return
 
+    if (self._append_session and
+        not self._event_extractor.CanParseFileEntryContent(file_entry)):
+      logger.debug(
+          'Skipping content extraction of: {0:s}, no matching parsers.'.format(
+              display_name))
+      return
+
     path_spec = copy.deepcopy(file_entry.path_spec)
     if data_stream and not data_stream.IsDefault():
       path_spec.data_stream = data_stream.name
@@ -716,7 +939,9 @@ class EventExtractionWorker(object):
       archive_types = self._GetArchiveTypes(mediator, path_spec)
 
     if archive_types:
-      if self._process_archives:
+      # The event sources of the archive file entries were already produced
+      # by the session that is appended to.
+      if self._process_archives and not self._append_session:
         self._ProcessArchiveTypes(mediator, path_spec, archive_types)
 
       if dfvfs_definitions.TYPE_INDICATOR_ZIP in archive_types:
@@ -725,8 +950,9 @@ class EventExtractionWorker(object):
             mediator, file_entry, data_stream.name)
 
     elif compressed_stream_types:
-      self._ProcessCompressedStreamTypes(
-          mediator, path_spec, compressed_stream_types)
+      if not self._append_session:
+        self._ProcessCompressedStreamTypes(
+            mediator, path_spec, compressed_stream_types)
 
     else:
       self._ExtractContentFromDataStream(
@@ -742,7 +968,9 @@ class EventExtractionWorker(object):
     """
     self.processing_status = definitions.PROCESSING_STATUS_EXTRACTING
 
-    self._event_extractor.ParseFileEntryMetadata(mediator, file_entry)
+    if not self._append_session:
+      self._event_extractor.ParseFileEntryMetadata(mediator, file_entry)
+
     for data_stream in file_entry.data_streams:
       if self._abort:
         break
@@ -766,18 +994,25 @@ class EventExtractionWorker(object):
     analyzer_object.SetHasherNames(hasher_names_string)
     self._analyzers.append(analyzer_object)
 
-  def _SetYaraRules(self, yara_rules_string):
+  def _SetYaraRules(self, yara_rules_string, compiled_yara_rules=None):
     """Sets the Yara rules.
 
     Args:
       yara_rules_string (str): unparsed Yara rule definitions.
+      compiled_yara_rules (Optional[bytes]): Yara rules compiled and saved
+          by libyara, which are loaded instead of compiling the Yara rule
+          definitions.
     """
     if not yara_rules_string:
       return
 
     analyzer_object = analyzers_manager.AnalyzersManager.GetAnalyzerInstance(
         'yara')
-    analyzer_object.SetRules(yara_rules_string)
+    if compiled_yara_rules:
+      analyzer_object.SetCompiledRules(
+          compiled_yara_rules, rules_string=yara_rules_string)
+    else:
+      analyzer_object.SetRules(yara_rules_string)
     self._analyzers.append(analyzer_object)
 
   def GetAnalyzerNames(self):
@@ -813,13 +1048,18 @@ class EventExtractionWorker(object):
     mediator.SetFileEntry(file_entry)
 
     try:
-      if file_entry.IsDirectory():
+      # The event sources of the sub file entries were already produced by
+      # the session that is appended to.
+      if file_entry.IsDirectory() and not self._append_session:
         self._ProcessDirectory(mediator, file_entry)
       self._ProcessFileEntry(mediator, file_entry)
 
     finally:
       mediator.ResetFileEntry()
 
+      # Release the memory used by the cached blocks of the data streams.
+      self._block_cache.Empty()
+
       self.last_activity_timestamp = time.time()
       self.processing_status = definitions.PROCESSING_STATUS_IDLE
 
@@ -830,11 +1070,23 @@ class EventExtractionWorker(object):
     Args:
       configuration (ExtractionConfiguration): extraction configuration.
     """
+    self._append_session = configuration.append_session
     self._hasher_file_size_limit = configuration.hasher_file_size_limit
-    self._SetHashers(configuration.hasher_names_string)
     self._process_archives = configuration.process_archives
     self._process_compressed_streams = configuration.process_compressed_streams
-    self._SetYaraRules(configuration.yara_rules_string)
+
+    # The analyzer results of the data streams were already produced by
+    # the session that is appended to.
+    if not self._append_session:
+      self._SetHashers(configuration.hasher_names_string)
+      self._SetYaraRules(
+          configuration.yara_rules_string,
+          compiled_yara_rules=configuration.compiled_yara_rules)
+
+    if configuration.deduplicate_content:
+      self._content_cache = content_cache.ContentCache()
+    else:
+      self._content_cache = None
 
   def SetProcessingProfiler(self, processing_profiler):
     """Sets the parsers profiler.
@@ -844,6 +1096,23 @@ class EventExtractionWorker(object):
     """
     self._processing_profiler = processing_profiler
 
+  def SetYaraRulesProfiler(self, yara_rules_profiler):
+    """Sets the Yara rules profiler.
+
+    Args:
+      yara_rules_profiler (YaraRulesProfiler): Yara rules profiler.
+    """
+    if self._yara_rules_profiler:
+      # The cost of the individual rules is accumulated by libyara over all
+      # matches and is therefore passed to the profiler only once.
+      for analyzer_object in self._analyzers:
+        if isinstance(analyzer_object, yara_analyzer.YaraAnalyzer):
+          rules_cost = analyzer_object.GetRulesCost()
+          if rules_cost:
+            self._yara_rules_profiler.SetRulesCost(rules_cost)
+
+    self._yara_rules_profiler = yara_rules_profiler
+
   def SignalAbort(self):
     """Signals the extraction worker to abort."""
     self._abort = True
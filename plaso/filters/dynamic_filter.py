@@ -190,6 +190,7 @@ class DynamicFilter(event_filter.EventObjectFilter):
     if lexer_object.lex_filter:
       super(DynamicFilter, self).CompileFilter(lexer_object.lex_filter)
     else:
+      self._match_function = None
       self._matcher = None
     self._filter_expression = filter_expression
 
@@ -15,6 +15,7 @@ class EventObjectFilter(interface.FilterObject):
     """Initializes an event filter."""
     super(EventObjectFilter, self).__init__()
     self._decision = None
+    self._match_function = None
 
   def CompileFilter(self, filter_expression):
     """Compiles the filter expression.
@@ -32,6 +33,7 @@ class EventObjectFilter(interface.FilterObject):
       raise errors.WrongPlugin('Malformed filter expression.')
 
     self._filter_expression = filter_expression
+    self._match_function = matcher.CompileMatchFunction()
     self._matcher = matcher
 
   def Match(self, event):
@@ -46,7 +48,7 @@ class EventObjectFilter(interface.FilterObject):
     if not self._matcher:
       return True
 
-    self._decision = self._matcher.Matches(event)
+    self._decision = self._match_function(event)
     return self._decision
 
 
@@ -19,6 +19,7 @@ class ObjectFilterList(interface.FilterObject):
   def __init__(self):
     """Initializes an object-filter list object."""
     super(ObjectFilterList, self).__init__()
+    self._match_functions = []
     self.filters = None
 
   def _IncludeKeyword(self, loader, node):
@@ -72,6 +73,7 @@ class ObjectFilterList(interface.FilterObject):
             'Filter entry [{0:s}] malformed for rule: <{1:s}>'.format(
                 meta_filter, name))
 
+      self._match_functions.append(matcher.CompileMatchFunction())
       self.filters.append((name, matcher, meta))
 
   def CompileFilter(self, filter_expression):
@@ -101,6 +103,7 @@ class ObjectFilterList(interface.FilterObject):
         raise errors.WrongPlugin(
             'Unable to parse YAML file with error: {0!s}.'.format(exception))
 
+    self._match_functions = []
     self.filters = []
     results_type = type(results)
     if results_type is dict:
@@ -130,8 +133,8 @@ class ObjectFilterList(interface.FilterObject):
     if not self.filters:
       return True
 
-    for _, matcher, _ in self.filters:
-      if matcher.Matches(event_object):
+    for match_function in self._match_functions:
+      if match_function(event_object):
         return True
 
     return False
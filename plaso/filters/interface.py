@@ -6,12 +6,23 @@ from __future__ import unicode_literals
 import abc
 
 from plaso.lib import errors
+from plaso.lib import objectfilter
 from plaso.lib import pfilter
 
 
 class FilterObject(object):
   """Filter object interface."""
 
+  # Comparison operators per objectfilter operator class, of the comparisons
+  # that can be used as filter conditions. Note that subclasses, such as
+  # NotEquals, are intentionally not supported.
+  _FILTER_CONDITION_OPERATORS = {
+      objectfilter.Equals: '==',
+      objectfilter.Greater: '>',
+      objectfilter.GreaterEqual: '>=',
+      objectfilter.Less: '<',
+      objectfilter.LessEqual: '<='}
+
   def __init__(self):
     """Initializes a filter object."""
     super(FilterObject, self).__init__()
@@ -46,6 +57,36 @@ class FilterObject(object):
     """str: output field separator."""
     return ','
 
+  def _GetFilterConditions(self, matcher):
+    """Retrieves filter conditions from a matcher.
+
+    Args:
+      matcher (objectfilter.Filter): matcher.
+
+    Returns:
+      list[tuple[str, str, object]]: filter conditions, each containing
+          an attribute name, a comparison operator and a value.
+    """
+    if isinstance(matcher, objectfilter.AndFilter):
+      filter_conditions = []
+      for argument in matcher.args:
+        filter_conditions.extend(self._GetFilterConditions(argument))
+      return filter_conditions
+
+    operator = self._FILTER_CONDITION_OPERATORS.get(type(matcher), None)
+    if not operator or not matcher.bool_value:
+      return []
+
+    attribute_name = matcher.left_operand.lower()
+    if '.' in attribute_name:
+      return []
+
+    value = matcher.right_operand
+    if isinstance(value, pfilter.DateCompareObject):
+      value = value.data
+
+    return [(attribute_name, operator, value)]
+
   def _GetMatcher(self, filter_expression):
     """Retrieves a filter object for a specific filter expression.
 
@@ -73,6 +114,24 @@ class FilterObject(object):
       WrongPlugin: if the filter could not be compiled.
     """
 
+  def GetFilterConditions(self):
+    """Retrieves the conditions an event must meet to match the filter.
+
+    The filter conditions are derived from the comparisons in the filter
+    expression that must all be true for an event to match. Storage can use
+    them to skip events that cannot match the filter, for example by
+    evaluating them in SQL, but the filter must still be applied to
+    the remaining events.
+
+    Returns:
+      list[tuple[str, str, object]]: filter conditions, each containing
+          an attribute name, a comparison operator and a value.
+    """
+    if not self._matcher:
+      return []
+
+    return self._GetFilterConditions(self._matcher)
+
   def Match(self, unused_event):
     """Determines if an event matches the filter.
 
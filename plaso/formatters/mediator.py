@@ -21,6 +21,12 @@ class FormatterMediator(object):
 
   _WINEVT_RC_DATABASE = 'winevt-rc.db'
 
+  # Event Log sources of which the message strings are preloaded when
+  # the Windows Event Log resource database is opened, since they tend
+  # to account for most of the events in Windows Event Log files.
+  _WINEVT_PRELOADED_LOG_SOURCES = frozenset([
+      'Microsoft-Windows-Security-Auditing'])
+
   def __init__(self, data_location=None):
     """Initializes a formatter mediator object.
 
@@ -51,8 +57,23 @@ class FormatterMediator(object):
       if not self._winevt_database_reader.Open(database_path):
         self._winevt_database_reader = None
 
+      else:
+        self._PreloadWindowsEventMessages()
+
     return self._winevt_database_reader
 
+  def _PreloadWindowsEventMessages(self):
+    """Preloads the message strings of frequently occurring Event Log sources.
+
+    The message strings are preloaded for the preferred and the default
+    language code identifier (LCID), since GetWindowsEventMessage falls back
+    to the latter.
+    """
+    lcids = set([self._lcid, self.DEFAULT_LCID])
+    for log_source in self._WINEVT_PRELOADED_LOG_SOURCES:
+      for lcid in lcids:
+        self._winevt_database_reader.PreloadMessages(log_source, lcid)
+
   @property
   def lcid(self):
     """int: preferred Language Code identifier (LCID)."""
@@ -81,6 +102,20 @@ class FormatterMediator(object):
     return database_reader.GetMessage(
         log_source, self.DEFAULT_LCID, message_identifier)
 
+  def GetWindowsEventMessageCacheStatistics(self):
+    """Retrieves the Windows Event Log message string cache statistics.
+
+    Returns:
+      tuple[int, int]: number of message strings that were in the cache and
+          number of message strings that were not in the cache.
+    """
+    if not self._winevt_database_reader:
+      return 0, 0
+
+    return (
+        self._winevt_database_reader.number_of_message_cache_hits,
+        self._winevt_database_reader.number_of_message_cache_misses)
+
   def SetPreferredLanguageIdentifier(self, language_identifier):
     """Sets the preferred language identifier.
 
@@ -3,6 +3,7 @@
 
 from __future__ import unicode_literals
 
+import collections
 import re
 
 try:
@@ -163,7 +164,22 @@ class Sqlite3DatabaseReader(object):
 
 
 class WinevtResourcesSqlite3DatabaseReader(Sqlite3DatabaseReader):
-  """Class to represent a sqlite3 Event Log resources database reader."""
+  """Class to represent a sqlite3 Event Log resources database reader.
+
+  The message strings are cached per Event Log source, language code
+  identifier (LCID) and message identifier, including message strings
+  that are not available, since Windows Event Log files tend to contain
+  many events with the same message.
+
+  Attributes:
+    number_of_message_cache_hits (int): number of message strings that
+        were in the cache.
+    number_of_message_cache_misses (int): number of message strings that
+        were not in the cache.
+  """
+
+  # Maximum number of message strings in the cache.
+  _MAXIMUM_NUMBER_OF_CACHED_MESSAGES = 16 * 1024
 
   # Message string specifiers that are considered white space.
   _WHITE_SPACE_SPECIFIER_RE = re.compile(r'(%[0b]|[\r\n])')
@@ -177,8 +193,28 @@ class WinevtResourcesSqlite3DatabaseReader(Sqlite3DatabaseReader):
   def __init__(self):
     """Initializes the database reader object."""
     super(WinevtResourcesSqlite3DatabaseReader, self).__init__()
+    self._message_file_keys_per_log_source = {}
+    self._messages_cache = collections.OrderedDict()
     self._string_format = 'wrc'
 
+    self.number_of_message_cache_hits = 0
+    self.number_of_message_cache_misses = 0
+
+  def _CacheMessage(self, lookup_key, message_string):
+    """Caches a message string.
+
+    The least recently used message string is evicted when the cache is full.
+
+    Args:
+      lookup_key (tuple[str, int, int]): Event Log source, language code
+          identifier (LCID) and message identifier.
+      message_string (str): message string or None if not available.
+    """
+    if len(self._messages_cache) >= self._MAXIMUM_NUMBER_OF_CACHED_MESSAGES:
+      self._messages_cache.popitem(last=False)
+
+    self._messages_cache[lookup_key] = message_string
+
   def _GetEventLogProviderKey(self, log_source):
     """Retrieves the Event Log provider key.
 
@@ -262,6 +298,31 @@ class WinevtResourcesSqlite3DatabaseReader(Sqlite3DatabaseReader):
     for values in generator:
       yield values['message_file_key']
 
+  def _GetMessageFileKeysByLogSource(self, log_source):
+    """Retrieves the message file keys of a specific Event Log source.
+
+    The message file keys are cached per Event Log source.
+
+    Args:
+      log_source (str): Event Log source.
+
+    Returns:
+      list[int]: message file keys.
+    """
+    message_file_keys = self._message_file_keys_per_log_source.get(
+        log_source, None)
+    if message_file_keys is None:
+      message_file_keys = []
+
+      event_log_provider_key = self._GetEventLogProviderKey(log_source)
+      if event_log_provider_key:
+        message_file_keys = list(
+            self._GetMessageFileKeys(event_log_provider_key))
+
+      self._message_file_keys_per_log_source[log_source] = message_file_keys
+
+    return message_file_keys
+
   def _ReformatMessageString(self, message_string):
     """Reformats the message string.
 
@@ -305,17 +366,18 @@ class WinevtResourcesSqlite3DatabaseReader(Sqlite3DatabaseReader):
     Returns:
       str: message string or None if not available.
     """
-    event_log_provider_key = self._GetEventLogProviderKey(log_source)
-    if not event_log_provider_key:
-      return None
+    lookup_key = (log_source, lcid, message_identifier)
+    if lookup_key in self._messages_cache:
+      # Reinserting the message string marks it as most recently used.
+      message_string = self._messages_cache.pop(lookup_key)
+      self._messages_cache[lookup_key] = message_string
+      self.number_of_message_cache_hits += 1
+      return message_string
 
-    generator = self._GetMessageFileKeys(event_log_provider_key)
-    if not generator:
-      return None
+    self.number_of_message_cache_misses += 1
 
-    # TODO: cache a number of message strings.
     message_string = None
-    for message_file_key in generator:
+    for message_file_key in self._GetMessageFileKeysByLogSource(log_source):
       message_string = self._GetMessage(
           message_file_key, lcid, message_identifier)
 
@@ -325,6 +387,7 @@ class WinevtResourcesSqlite3DatabaseReader(Sqlite3DatabaseReader):
     if self._string_format == 'wrc':
       message_string = self._ReformatMessageString(message_string)
 
+    self._CacheMessage(lookup_key, message_string)
     return message_string
 
   def GetMetadataAttribute(self, attribute_name):
@@ -388,5 +451,56 @@ class WinevtResourcesSqlite3DatabaseReader(Sqlite3DatabaseReader):
       raise RuntimeError('Unsupported string format: {0:s}'.format(
           string_format))
 
+    self._message_file_keys_per_log_source = {}
+    self._messages_cache = collections.OrderedDict()
     self._string_format = string_format
     return True
+
+  def PreloadMessages(self, log_source, lcid):
+    """Preloads the message strings of a specific Event Log source.
+
+    Preloading reads the message tables of frequently occurring Event Log
+    sources, such as "Microsoft-Windows-Security-Auditing", with a single
+    query per message table instead of a query per message identifier.
+
+    Args:
+      log_source (str): Event Log source.
+      lcid (int): language code identifier (LCID).
+
+    Returns:
+      int: number of message strings that were preloaded.
+    """
+    message_strings = {}
+    for message_file_key in self._GetMessageFileKeysByLogSource(log_source):
+      table_name = 'message_table_{0:d}_0x{1:08x}'.format(
+          message_file_key, lcid)
+
+      if not self._database_file.HasTable(table_name):
+        continue
+
+      column_names = ['message_identifier', 'message_string']
+      for values in self._database_file.GetValues(
+          [table_name], column_names, ''):
+        message_string = values['message_string']
+        if not message_string:
+          continue
+
+        try:
+          message_identifier = int(values['message_identifier'], 16)
+        except (TypeError, ValueError):
+          continue
+
+        # The first message file that defines a message string takes
+        # precedence, as in GetMessage.
+        if message_identifier not in message_strings:
+          message_strings[message_identifier] = message_string
+
+    for message_identifier, message_string in message_strings.items():
+      if self._string_format == 'wrc':
+        message_string = self._ReformatMessageString(message_string)
+
+      lookup_key = (log_source, lcid, message_identifier)
+      self._messages_cache.pop(lookup_key, None)
+      self._CacheMessage(lookup_key, message_string)
+
+    return len(message_strings)
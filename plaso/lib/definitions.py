@@ -7,12 +7,18 @@ from __future__ import unicode_literals
 MICROSECONDS_PER_SECOND = 1000000
 MICROSECONDS_PER_MINUTE = 60000000
 
+COMPRESSION_FORMAT_LZ4 = 'lz4'
+COMPRESSION_FORMAT_LZMA = 'lzma'
 COMPRESSION_FORMAT_NONE = 'none'
 COMPRESSION_FORMAT_ZLIB = 'zlib'
+COMPRESSION_FORMAT_ZSTD = 'zstd'
 
 COMPRESSION_FORMATS = frozenset([
+    COMPRESSION_FORMAT_LZ4,
+    COMPRESSION_FORMAT_LZMA,
     COMPRESSION_FORMAT_NONE,
-    COMPRESSION_FORMAT_ZLIB])
+    COMPRESSION_FORMAT_ZLIB,
+    COMPRESSION_FORMAT_ZSTD])
 
 DEFAULT_WORKER_MEMORY_LIMIT = 2048 * 1024 * 1024
 
@@ -80,9 +86,12 @@ RESERVED_VARIABLE_NAMES = frozenset([
     'timezone',
     'username'])
 
+SERIALIZER_FORMAT_BINARY = 'binary'
 SERIALIZER_FORMAT_JSON = 'json'
 
-SERIALIZER_FORMATS = frozenset([SERIALIZER_FORMAT_JSON])
+SERIALIZER_FORMATS = frozenset([
+    SERIALIZER_FORMAT_BINARY,
+    SERIALIZER_FORMAT_JSON])
 
 STORAGE_FORMAT_SQLITE = 'sqlite'
 
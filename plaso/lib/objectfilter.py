@@ -165,6 +165,18 @@ class Filter(object):
   def Matches(self, obj):
     """Whether object obj matches this filter."""
 
+  def CompileMatchFunction(self):
+    """Compiles the filter into a match function.
+
+    The match function is equivalent to Matches, but determines constant
+    values, such as operands, when compiled instead of for every object.
+
+    Returns:
+      function: function that takes an object and returns a boolean value
+          that indicates if the object matches the filter.
+    """
+    return self.Matches
+
   def Filter(self, objects):
     """Returns a list of objects that pass the filter."""
     return filter(self.Matches, objects)
@@ -173,12 +185,50 @@ class Filter(object):
     return '{0:s}({1:s})'.format(
         self.__class__.__name__, ', '.join([str(arg) for arg in self.args]))
 
+  def GetMatchCost(self):
+    """Estimates the relative cost of matching an object against the filter.
+
+    Returns:
+      int: estimated relative cost of matching an object.
+    """
+    return 1
+
 
 class AndFilter(Filter):
   """Performs a boolean AND of the given Filter instances as arguments.
 
     Note that if no conditions are passed, all objects will pass.
   """
+  def CompileMatchFunction(self):
+    """Compiles the filter into a match function.
+
+    The child filters are evaluated in order of their estimated cost, so that
+    the least costly child filter that does not match short-circuits.
+
+    Returns:
+      function: function that takes an object and returns a boolean value
+          that indicates if the object matches the filter.
+    """
+    match_functions = [
+        child_filter.CompileMatchFunction() for child_filter in sorted(
+            self.args, key=lambda child_filter: child_filter.GetMatchCost())]
+
+    def MatchFunction(obj):
+      for match_function in match_functions:
+        if not match_function(obj):
+          return False
+      return True
+
+    return MatchFunction
+
+  def GetMatchCost(self):
+    """Estimates the relative cost of matching an object against the filter.
+
+    Returns:
+      int: estimated relative cost of matching an object.
+    """
+    return sum([child_filter.GetMatchCost() for child_filter in self.args])
+
   def Matches(self, obj):
     for child_filter in self.args:
       if not child_filter.Matches(obj):
@@ -191,6 +241,39 @@ class OrFilter(Filter):
 
   Note that if no conditions are passed, all objects will pass.
   """
+  def CompileMatchFunction(self):
+    """Compiles the filter into a match function.
+
+    The child filters are evaluated in order of their estimated cost, so that
+    the least costly child filter that matches short-circuits.
+
+    Returns:
+      function: function that takes an object and returns a boolean value
+          that indicates if the object matches the filter.
+    """
+    if not self.args:
+      return IdentityFilter().Matches
+
+    match_functions = [
+        child_filter.CompileMatchFunction() for child_filter in sorted(
+            self.args, key=lambda child_filter: child_filter.GetMatchCost())]
+
+    def MatchFunction(obj):
+      for match_function in match_functions:
+        if match_function(obj):
+          return True
+      return False
+
+    return MatchFunction
+
+  def GetMatchCost(self):
+    """Estimates the relative cost of matching an object against the filter.
+
+    Returns:
+      int: estimated relative cost of matching an object.
+    """
+    return sum([child_filter.GetMatchCost() for child_filter in self.args])
+
   def Matches(self, obj):
     if not self.args:
       return True
@@ -207,6 +290,14 @@ class Operator(Filter):
 
 
 class IdentityFilter(Operator):
+  def GetMatchCost(self):
+    """Estimates the relative cost of matching an object against the filter.
+
+    Returns:
+      int: estimated relative cost of matching an object.
+    """
+    return 0
+
   def Matches(self, _):
     return True
 
@@ -244,10 +335,37 @@ class BinaryOperator(Operator):
 class GenericBinaryOperator(BinaryOperator):
   """Allows easy implementations of operators."""
 
+  # Estimated relative cost of the operation on a single value.
+  _OPERATION_COST = 1
+
   def __init__(self, **kwargs):
     super(GenericBinaryOperator, self).__init__(**kwargs)
     self.bool_value = True
 
+  def CompileMatchFunction(self):
+    """Compiles the filter into a match function.
+
+    Returns:
+      function: function that takes an object and returns a boolean value
+          that indicates if the object matches the filter.
+    """
+    bool_value = self.bool_value
+    expand_function = self.value_expander.CompileExpandFunction(
+        self.left_operand)
+    operation = self.Operation
+    right_operand = self.right_operand
+
+    def MatchFunction(obj):
+      for value in expand_function(obj):
+        try:
+          if operation(value, right_operand):
+            return bool_value
+        except (ValueError, TypeError):
+          continue
+      return not bool_value
+
+    return MatchFunction
+
   def FlipBool(self):
     logging.debug('Negative matching.')
     self.bool_value = not self.bool_value
@@ -267,6 +385,16 @@ class GenericBinaryOperator(BinaryOperator):
         continue
     return False
 
+  def GetMatchCost(self):
+    """Estimates the relative cost of matching an object against the filter.
+
+    Returns:
+      int: estimated relative cost of matching an object.
+    """
+    return (
+        self.value_expander.GetExpandCost(self.left_operand) +
+        self._OPERATION_COST)
+
   def Matches(self, obj):
     key = self.left_operand
     values = self.value_expander.Expand(obj, key)
@@ -322,9 +450,22 @@ class GreaterEqual(GenericBinaryOperator):
 class Contains(GenericBinaryOperator):
   """Whether the right operand is contained in the value."""
 
+  _OPERATION_COST = 2
+
+  def __init__(self, **kwargs):
+    super(Contains, self).__init__(**kwargs)
+    # The lower case right operand is determined once, instead of for
+    # every value.
+    self._lower_case_right_operand = None
+    if isinstance(self.right_operand, py2to3.STRING_TYPES):
+      self._lower_case_right_operand = self.right_operand.lower()
+
   def Operation(self, x, y):
     if isinstance(x, py2to3.STRING_TYPES):
-      return y.lower() in x.lower()
+      if self._lower_case_right_operand is None:
+        return y.lower() in x.lower()
+
+      return self._lower_case_right_operand in x.lower()
 
     return y in x
 
@@ -333,6 +474,8 @@ class InSet(GenericBinaryOperator):
   # TODO(user): Change to an N-ary Operator?
   """Whether all values are contained within the right operand."""
 
+  _OPERATION_COST = 2
+
   def Operation(self, x, y):
     """Whether x is fully contained in y."""
     if x in y:
@@ -356,6 +499,8 @@ class InSet(GenericBinaryOperator):
 class Regexp(GenericBinaryOperator):
   """Whether the value matches the regexp in the right operand."""
 
+  _OPERATION_COST = 4
+
   def __init__(self, *children, **kwargs):
     super(Regexp, self).__init__(*children, **kwargs)
     # Note that right_operand is not necessarily a string.
@@ -470,6 +615,35 @@ class Context(Operator):
     super(Context, self).__init__(arguments=arguments, **kwargs)
     self.context, self.condition = self.args
 
+  def CompileMatchFunction(self):
+    """Compiles the filter into a match function.
+
+    Returns:
+      function: function that takes an object and returns a boolean value
+          that indicates if the object matches the filter.
+    """
+    condition_match_function = self.condition.CompileMatchFunction()
+    expand_function = self.value_expander.CompileExpandFunction(self.context)
+
+    def MatchFunction(obj):
+      for object_list in expand_function(obj):
+        for sub_object in object_list:
+          if condition_match_function(sub_object):
+            return True
+      return False
+
+    return MatchFunction
+
+  def GetMatchCost(self):
+    """Estimates the relative cost of matching an object against the filter.
+
+    Returns:
+      int: estimated relative cost of matching an object.
+    """
+    return (
+        self.value_expander.GetExpandCost(self.context) +
+        self.condition.GetMatchCost())
+
   def Matches(self, obj):
     for object_list in self.value_expander.Expand(obj, self.context):
       for sub_object in object_list:
@@ -530,6 +704,38 @@ class ValueExpander(object):
       for value in self.Expand(attr_value, path[1:]):
         yield value
 
+  def CompileExpandFunction(self, path):
+    """Compiles the expansion of a path into an expand function.
+
+    The expand function is equivalent to Expand, but splits the path and
+    determines the attribute name when compiled instead of for every object.
+
+    Args:
+      path (str|list[str]): path of the values.
+
+    Returns:
+      function: function that takes an object and returns an iterable of
+          the values for the path in the object.
+    """
+    if isinstance(path, py2to3.STRING_TYPES):
+      path = path.split(self.FIELD_SEPARATOR)
+
+    if len(path) != 1:
+      def ExpandFunction(obj):
+        return self.Expand(obj, path)
+
+      return ExpandFunction
+
+    attr_name = self._GetAttributeName(path)
+
+    def ExpandAttributeFunction(obj):
+      attr_value = self._GetValue(obj, attr_name)
+      if attr_value is None:
+        return ()
+      return self._AtLeaf(attr_value)
+
+    return ExpandAttributeFunction
+
   def Expand(self, obj, path):
     """Returns a list of all the values for the given path in the object obj.
 
@@ -563,6 +769,20 @@ class ValueExpander(object):
       for value in self._AtNonLeaf(attr_value, path):
         yield value
 
+  def GetExpandCost(self, path):
+    """Estimates the relative cost of expanding the values of a path.
+
+    Args:
+      path (str|list[str]): path of the values.
+
+    Returns:
+      int: estimated relative cost of expanding the values of the path.
+    """
+    if isinstance(path, py2to3.STRING_TYPES):
+      path = path.split(self.FIELD_SEPARATOR)
+
+    return len(path)
+
 
 class AttributeValueExpander(ValueExpander):
   """An expander that gives values based on object attribute names."""
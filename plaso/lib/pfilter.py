@@ -85,6 +85,20 @@ class DictObject(object):
 class PlasoValueExpander(objectfilter.AttributeValueExpander):
   """An expander that gives values based on object attribute names."""
 
+  # Estimated relative cost of the attributes that are determined with
+  # the formatters, when not stored in the event.
+  _FORMATTED_ATTRIBUTES_COST = {
+      'message': 100,
+      'source': 10,
+      'source_long': 10,
+      'source_short': 10,
+      'sourcetype': 10}
+
+  def __init__(self):
+    """Initializes a plaso value expander."""
+    super(PlasoValueExpander, self).__init__()
+    self._formatter_mediator = None
+
   def _GetMessage(self, event_object):
     """Returns a properly formatted message string.
 
@@ -94,13 +108,13 @@ class PlasoValueExpander(objectfilter.AttributeValueExpander):
     Returns:
       A formatted message string.
     """
-    # TODO: move this somewhere where the mediator can be instantiated once.
-    formatter_mediator = formatters_mediator.FormatterMediator()
+    if not self._formatter_mediator:
+      self._formatter_mediator = formatters_mediator.FormatterMediator()
 
     result = ''
     try:
       result, _ = formatters_manager.FormattersManager.GetMessageStrings(
-          formatter_mediator, event_object)
+          self._formatter_mediator, event_object)
     except KeyError as exception:
       logging.warning('Unable to correctly assemble event: {0:s}'.format(
           exception))
@@ -153,6 +167,26 @@ class PlasoValueExpander(objectfilter.AttributeValueExpander):
   def _GetAttributeName(self, path):
     return path[0].lower()
 
+  def GetExpandCost(self, path):
+    """Estimates the relative cost of expanding the values of a path.
+
+    Attributes that are determined with the formatters, such as the message,
+    are more costly than attributes stored in the event.
+
+    Args:
+      path (str|list[str]): path of the values.
+
+    Returns:
+      int: estimated relative cost of expanding the values of the path.
+    """
+    if isinstance(path, py2to3.STRING_TYPES):
+      path = path.split(self.FIELD_SEPARATOR)
+
+    cost = super(PlasoValueExpander, self).GetExpandCost(path)
+
+    attr_name = self._GetAttributeName(path)
+    return cost + self._FORMATTED_ATTRIBUTES_COST.get(attr_name, 0)
+
 
 class PlasoExpression(objectfilter.BasicExpression):
   """A Plaso specific expression."""
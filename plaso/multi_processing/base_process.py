@@ -59,6 +59,7 @@ class MultiProcessBaseProcess(multiprocessing.Process):
     self._status_is_running = False
     self._storage_profiler = None
     self._tasks_profiler = None
+    self._yara_rules_profiler = None
 
     if self._processing_configuration:
       self._debug_output = self._processing_configuration.debug_output
@@ -209,6 +210,11 @@ class MultiProcessBaseProcess(multiprocessing.Process):
       self._tasks_profiler = profilers.TasksProfiler(self._name, configuration)
       self._tasks_profiler.Start()
 
+    if configuration.HaveProfileYaraRules():
+      self._yara_rules_profiler = profilers.YaraRulesProfiler(
+          self._name, configuration)
+      self._yara_rules_profiler.Start()
+
   def _StopProcessStatusRPCServer(self):
     """Stops the process status RPC server."""
     if not self._rpc_server:
@@ -252,6 +258,10 @@ class MultiProcessBaseProcess(multiprocessing.Process):
       self._tasks_profiler.Stop()
       self._tasks_profiler = None
 
+    if self._yara_rules_profiler:
+      self._yara_rules_profiler.Stop()
+      self._yara_rules_profiler = None
+
   def _WaitForStatusNotRunning(self):
     """Waits for the status is running to change to false."""
     # We wait slightly longer than the status check sleep time.
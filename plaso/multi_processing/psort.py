@@ -4,7 +4,9 @@
 from __future__ import unicode_literals
 
 import collections
+import hashlib
 import heapq
+import multiprocessing
 import os
 import time
 
@@ -19,11 +21,133 @@ from plaso.multi_processing import engine as multi_process_engine
 from plaso.multi_processing import logger
 from plaso.multi_processing import multi_process_queue
 from plaso.storage import event_tag_index
+from plaso.storage import factory as storage_factory
 from plaso.storage import time_range as storage_time_range
 
 
+# The export worker of the current export worker process.
+_export_worker = None
+
+
+def _ExportTimeRange(start_timestamp, end_timestamp):
+  """Exports the events in a time range in an export worker process.
+
+  Args:
+    start_timestamp (int): timestamp of the first event in the time range.
+    end_timestamp (int): timestamp of the last event in the time range.
+
+  Returns:
+    tuple: contains:
+
+      str: formatted events.
+      dict[str, int]: number of events exported from storage.
+  """
+  time_range = storage_time_range.TimeRange(start_timestamp, end_timestamp)
+  return _export_worker.ExportTimeRange(time_range)
+
+
+def _InitializeExportWorker(export_worker):
+  """Initializes an export worker process.
+
+  Args:
+    export_worker (PsortExportWorker): export worker.
+  """
+  global _export_worker  # pylint: disable=global-statement
+  _export_worker = export_worker
+
+
+class PsortExportOutputWriter(object):
+  """Output writer that buffers the output of an export worker."""
+
+  def __init__(self):
+    """Initializes an output writer."""
+    super(PsortExportOutputWriter, self).__init__()
+    self._output = []
+
+  def GetOutput(self):
+    """Retrieves and clears the buffered output.
+
+    Returns:
+      str: buffered output.
+    """
+    output = ''.join(self._output)
+    self._output = []
+    return output
+
+  def Write(self, string):
+    """Writes a string to the output.
+
+    Args:
+      string (str): output.
+    """
+    self._output.append(string)
+
+
+class PsortExportWorker(object):
+  """Psort export worker.
+
+  The export worker formats the events in a time range, in a separate process,
+  with its own storage reader and copy of the output module.
+  """
+
+  def __init__(
+      self, engine, storage_file_path, output_module, deduplicate_events=True,
+      event_filter=None):
+    """Initializes an export worker.
+
+    Args:
+      engine (PsortMultiProcessEngine): psort engine.
+      storage_file_path (str): path of the storage file.
+      output_module (OutputModule): output module.
+      deduplicate_events (Optional[bool]): True if events should be
+          deduplicated.
+      event_filter (Optional[FilterObject]): event filter.
+    """
+    super(PsortExportWorker, self).__init__()
+    self._deduplicate_events = deduplicate_events
+    self._engine = engine
+    self._event_filter = event_filter
+    self._output_module = output_module
+    self._output_writer = PsortExportOutputWriter()
+    self._storage_file_path = storage_file_path
+    self._storage_reader = None
+
+  def ExportTimeRange(self, time_range):
+    """Exports the events in a time range.
+
+    Args:
+      time_range (TimeRange): time range of the events to export.
+
+    Returns:
+      tuple: contains:
+
+        str: formatted events.
+        dict[str, int]: number of events exported from storage.
+    """
+    if not self._storage_reader:
+      # The storage reader is opened in the export worker process since
+      # SQLite connections cannot be shared between processes.
+      self._storage_reader = (
+          storage_factory.StorageFactory.CreateStorageReaderForFile(
+              self._storage_file_path))
+      self._output_module.SetOutputWriter(self._output_writer)
+
+    events_counter = self._engine.ExportTimeRange(
+        self._storage_reader, self._output_module, time_range,
+        deduplicate_events=self._deduplicate_events,
+        event_filter=self._event_filter)
+
+    return self._output_writer.GetOutput(), dict(events_counter)
+
+
 class PsortEventHeap(object):
-  """Psort event heap."""
+  """Psort event heap.
+
+  The event heap is used to sort and deduplicate events that share the same
+  timestamp. The events are ordered by fingerprints of their attribute values,
+  such that duplicate events, and events that can be MACB grouped, are
+  adjacent.
+  """
 
   _IDENTIFIER_EXCLUDED_ATTRIBUTES = frozenset([
       'data_type',
@@ -35,23 +159,42 @@ class PsortEventHeap(object):
       'timestamp',
       'timestamp_desc'])
 
+  # The 'atime', 'ctime', 'crtime', 'mtime' are included for backwards
+  # compatibility with the filestat parser.
+  _MACB_GROUP_TIMESTAMP_DESCRIPTIONS = frozenset([
+      'atime', 'ctime', 'crtime', 'mtime',
+      definitions.TIME_DESCRIPTION_LAST_ACCESS,
+      definitions.TIME_DESCRIPTION_CHANGE,
+      definitions.TIME_DESCRIPTION_CREATION,
+      definitions.TIME_DESCRIPTION_MODIFICATION])
+
+  # Identifier of an event that was pushed onto an otherwise empty heap and
+  # for which no fingerprint was calculated.
+  _UNIQUE_EVENT_IDENTIFIER = b''
+
   def __init__(self):
     """Initializes a psort events heap."""
     super(PsortEventHeap, self).__init__()
     self._heap = []
+    # The first event is not fingerprinted until a second event is pushed,
+    # since an event without other events at its timestamp is unique.
+    self._unique_event = None
 
   @property
   def number_of_events(self):
     """int: number of events on the heap."""
-    return len(self._heap)
+    number_of_events = len(self._heap)
+    if self._unique_event is not None:
+      number_of_events += 1
+    return number_of_events
 
   def _GetEventIdentifiers(self, event):
     """Retrieves different identifiers of the event.
 
     Every event contains event data, which consists of attributes and values.
-    These attributes and values can be represented as a string and used for
-    sorting and uniquely identifying events. This function determines multiple
-    identifiers:
+    The attribute values are fingerprinted with a 128-bit MD5 digest, which
+    is used for sorting and uniquely identifying events. This function
+    determines multiple identifiers:
     * an identifier of the attributes and values without the timestamp
       description (or usage). This is referred to as the MACB group
       identifier.
@@ -70,14 +213,12 @@ class PsortEventHeap(object):
     Returns:
       tuple: contains:
 
-        str: identifier of the event MACB group or None if the event cannot
+        bytes: identifier of the event MACB group or None if the event cannot
             be grouped.
-        str: identifier of the event content.
+        bytes: identifier of the event content.
     """
-    attributes = []
-
-    attribute_string = 'data_type: {0:s}'.format(event.data_type)
-    attributes.append(attribute_string)
+    fingerprint = hashlib.md5()
+    fingerprint.update(event.data_type.encode('utf-8'))
 
     for attribute_name, attribute_value in sorted(event.GetAttributes()):
       if attribute_name in self._IDENTIFIER_EXCLUDED_ATTRIBUTES:
@@ -95,51 +236,82 @@ class PsortEventHeap(object):
       elif isinstance(attribute_value, set):
         attribute_value = sorted(list(attribute_value))
 
-      elif isinstance(attribute_value, py2to3.BYTES_TYPE):
-        attribute_value = repr(attribute_value)
-
-      try:
-        attribute_string = '{0:s}: {1!s}'.format(
-            attribute_name, attribute_value)
-      except UnicodeDecodeError:
-        logger.error('Failed to decode attribute {0:s}'.format(
-            attribute_name))
-      attributes.append(attribute_string)
-
-    # The 'atime', 'ctime', 'crtime', 'mtime' are included for backwards
-    # compatibility with the filestat parser.
-    if event.timestamp_desc in (
-        'atime', 'ctime', 'crtime', 'mtime',
-        definitions.TIME_DESCRIPTION_LAST_ACCESS,
-        definitions.TIME_DESCRIPTION_CHANGE,
-        definitions.TIME_DESCRIPTION_CREATION,
-        definitions.TIME_DESCRIPTION_MODIFICATION):
-      macb_group_identifier = ', '.join(attributes)
+      if not isinstance(attribute_value, py2to3.BYTES_TYPE):
+        try:
+          attribute_value = '{0!s}'.format(attribute_value).encode('utf-8')
+        except UnicodeDecodeError:
+          logger.error('Failed to decode attribute {0:s}'.format(
+              attribute_name))
+          continue
+
+      # The attribute name and value are delimited by a byte that does not
+      # occur in UTF-8 encoded strings, to keep the fingerprint unambiguous.
+      fingerprint.update(b'\xff')
+      fingerprint.update(attribute_name.encode('utf-8'))
+      fingerprint.update(b'\xff')
+      fingerprint.update(attribute_value)
+
+    if event.timestamp_desc in self._MACB_GROUP_TIMESTAMP_DESCRIPTIONS:
+      macb_group_identifier = fingerprint.digest()
     else:
       macb_group_identifier = None
 
-    attributes.insert(0, event.timestamp_desc)
-    content_identifier = ', '.join(attributes)
+    fingerprint.update(b'\xfe')
+    if event.timestamp_desc:
+      fingerprint.update(event.timestamp_desc.encode('utf-8'))
+    content_identifier = fingerprint.digest()
 
     return macb_group_identifier, content_identifier
 
+  def _PushEventWithIdentifiers(self, event):
+    """Pushes an event onto the heap with its identifiers.
+
+    Args:
+      event (EventObject): event.
+    """
+    macb_group_identifier, content_identifier = self._GetEventIdentifiers(event)
+
+    # We can ignore the timestamp here because the psort engine only stores
+    # events with the same timestamp in the event heap. Events that cannot be
+    # grouped are sorted before the MACB groups, since None cannot be compared
+    # with the MACB group identifiers.
+    heap_values = (
+        macb_group_identifier or b'', content_identifier,
+        macb_group_identifier, event)
+    heapq.heappush(self._heap, heap_values)
+
   def PopEvent(self):
     """Pops an event from the heap.
 
     Returns:
       tuple: contains:
 
-        str: identifier of the event MACB group or None if the event cannot
+        bytes: identifier of the event MACB group or None if the event cannot
             be grouped.
-        str: identifier of the event content.
+        bytes: identifier of the event content.
         EventObject: event.
     """
+    if self._unique_event is not None:
+      event = self._unique_event
+      self._unique_event = None
+
+      # The identifiers of a unique event do not need to be distinct, only
+      # whether the event can be grouped is relevant.
+      macb_group_identifier = None
+      if event.timestamp_desc in self._MACB_GROUP_TIMESTAMP_DESCRIPTIONS:
+        macb_group_identifier = self._UNIQUE_EVENT_IDENTIFIER
+
+      return macb_group_identifier, self._UNIQUE_EVENT_IDENTIFIER, event
+
     try:
-      return heapq.heappop(self._heap)
+      _, content_identifier, macb_group_identifier, event = heapq.heappop(
+          self._heap)
 
     except IndexError:
       return None
 
+    return macb_group_identifier, content_identifier, event
+
   def PopEvents(self):
     """Pops events from the heap.
 
@@ -157,17 +329,23 @@ class PsortEventHeap(object):
     Args:
       event (EventObject): event.
     """
-    macb_group_identifier, content_identifier = self._GetEventIdentifiers(event)
+    if not self._heap and self._unique_event is None:
+      self._unique_event = event
+      return
 
-    # We can ignore the timestamp here because the psort engine only stores
-    # events with the same timestamp in the event heap.
-    heap_values = (macb_group_identifier, content_identifier, event)
-    heapq.heappush(self._heap, heap_values)
+    if self._unique_event is not None:
+      self._PushEventWithIdentifiers(self._unique_event)
+      self._unique_event = None
+
+    self._PushEventWithIdentifiers(event)
 
 
 class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
   """Psort multi-processing engine."""
 
+  # The number of events per time range formatted by an export worker.
+  _NUMBER_OF_EVENTS_PER_EXPORT_TIME_RANGE = 10000
+
   _PROCESS_JOIN_TIMEOUT = 5.0
   _PROCESS_WORKER_TIMEOUT = 15.0 * 60.0
 
@@ -241,17 +419,14 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
 
     logger.debug('Processing events.')
 
+    filter_conditions = None
     filter_limit = getattr(event_filter, 'limit', None)
 
-    for event in storage_writer.GetSortedEvents():
-      event_data_identifier = event.GetEventDataIdentifier()
-      if event_data_identifier:
-        event_data = storage_writer.GetEventDataByIdentifier(
-            event_data_identifier)
-        if event_data:
-          for attribute_name, attribute_value in event_data.GetAttributes():
-            setattr(event, attribute_name, attribute_value)
+    if event_filter:
+      filter_conditions = event_filter.GetFilterConditions()
 
+    for event in storage_writer.GetSortedEventsWithEventData(
+        filter_conditions=filter_conditions):
       event_identifier = event.GetIdentifier()
       event.tag = self._event_tag_index.GetEventTagByIdentifier(
           storage_writer, event_identifier)
@@ -431,7 +606,8 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
 
   def _ExportEvents(
       self, storage_reader, output_module, deduplicate_events=True,
-      event_filter=None, time_slice=None, use_time_slicer=False):
+      event_filter=None, time_range=None, time_slice=None,
+      use_time_slicer=False):
     """Exports events using an output module.
 
     Args:
@@ -440,6 +616,8 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
       deduplicate_events (Optional[bool]): True if events should be
           deduplicated.
       event_filter (Optional[FilterObject]): event filter.
+      time_range (Optional[TimeRange]): time range of the events to export,
+          where None represents all events.
       time_slice (Optional[TimeRange]): time range that defines a time slice
           to filter events.
       use_time_slicer (Optional[bool]): True if the 'time slicer' should be
@@ -452,6 +630,10 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
     """
     self._status = definitions.PROCESSING_STATUS_EXPORTING
 
+    # The cache statistics are determined per call since the output mediator
+    # of an export worker process is used to export multiple time ranges.
+    cache_statistics = self._GetCacheStatistics(output_module)
+
     time_slice_buffer = None
     time_slice_range = None
 
@@ -463,21 +645,22 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
       if use_time_slicer:
         time_slice_buffer = bufferlib.CircularBuffer(time_slice.duration)
 
+    filter_conditions = None
     filter_limit = getattr(event_filter, 'limit', None)
     forward_entries = 0
 
+    # The time slicer also exports events that do not match the filter,
+    # hence the filter conditions can only be evaluated by the storage
+    # when the time slicer is not used.
+    if event_filter and not time_slice_buffer:
+      filter_conditions = event_filter.GetFilterConditions()
+
     number_of_filtered_events = 0
     number_of_events_from_time_slice = 0
 
-    for event in storage_reader.GetSortedEvents(time_range=time_slice_range):
-      event_data_identifier = event.GetEventDataIdentifier()
-      if event_data_identifier:
-        event_data = storage_reader.GetEventDataByIdentifier(
-            event_data_identifier)
-        if event_data:
-          for attribute_name, attribute_value in event_data.GetAttributes():
-            setattr(event, attribute_name, attribute_value)
-
+    for event in storage_reader.GetSortedEventsWithEventData(
+        filter_conditions=filter_conditions,
+        time_range=time_slice_range or time_range):
       event_identifier = event.GetIdentifier()
       event.tag = self._event_tag_index.GetEventTagByIdentifier(
           storage_reader, event_identifier)
@@ -553,6 +736,56 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
     if filter_limit:
       events_counter['Limited By'] = filter_limit
 
+    events_counter.update(
+        self._GetCacheStatistics(output_module) - cache_statistics)
+
+    return events_counter
+
+  def _ExportEventsWithWorkers(
+      self, storage_reader, output_module, export_pool,
+      number_of_worker_processes):
+    """Exports events using export worker processes.
+
+    The events are divided in consecutive time ranges, which are formatted by
+    the export worker processes. The formatted events are written to the
+    output module in the order of the time ranges, so that the output is
+    the same as that of a single process export.
+
+    Args:
+      storage_reader (StorageReader): storage reader.
+      output_module (OutputModule): output module.
+      export_pool (multiprocessing.Pool): pool of export worker processes.
+      number_of_worker_processes (int): number of export worker processes.
+
+    Returns:
+      collections.Counter: counter that tracks the number of unique events
+          read from storage.
+    """
+    self._status = definitions.PROCESSING_STATUS_EXPORTING
+
+    time_ranges = storage_reader.GetEventTimeRanges(
+        self._NUMBER_OF_EVENTS_PER_EXPORT_TIME_RANGE)
+
+    events_counter = collections.Counter()
+
+    # The number of time ranges being exported is bounded to limit the amount
+    # of formatted output that is buffered in memory.
+    maximum_number_of_pending_results = number_of_worker_processes * 2
+    pending_results = collections.deque()
+
+    for time_range in time_ranges:
+      pending_results.append(export_pool.apply_async(
+          _ExportTimeRange,
+          (time_range.start_timestamp, time_range.end_timestamp)))
+
+      while len(pending_results) >= maximum_number_of_pending_results:
+        self._WriteExportResult(
+            output_module, pending_results.popleft(), events_counter)
+
+    while pending_results:
+      self._WriteExportResult(
+          output_module, pending_results.popleft(), events_counter)
+
     return events_counter
 
   def _FlushExportBuffer(self, output_module, deduplicate_events=True):
@@ -598,6 +831,30 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
     if macb_group:
       output_module.WriteEventMACBGroup(macb_group)
 
+  def _GetCacheStatistics(self, output_module):
+    """Retrieves the cache statistics of the formatting of events.
+
+    Args:
+      output_module (OutputModule): output module.
+
+    Returns:
+      collections.Counter: counter that tracks the number of cache hits and
+          misses of the formatted values and Windows Event Log message strings.
+    """
+    cache_statistics = collections.Counter()
+
+    cache_hits, cache_misses = (
+        output_module.GetFormattedValuesCacheStatistics())
+    cache_statistics['Formatted values cache hits'] = cache_hits
+    cache_statistics['Formatted values cache misses'] = cache_misses
+
+    cache_hits, cache_misses = (
+        output_module.GetWindowsEventMessageCacheStatistics())
+    cache_statistics['Windows Event Log message cache hits'] = cache_hits
+    cache_statistics['Windows Event Log message cache misses'] = cache_misses
+
+    return cache_statistics
+
   def _MergeEventTag(self, storage_writer, attribute_container):
     """Merges an event tag with the last stored event tag.
 
@@ -786,6 +1043,22 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
         number_of_consumed_errors, number_of_produced_errors,
         number_of_consumed_reports, number_of_produced_reports)
 
+  def _WriteExportResult(self, output_module, result, events_counter):
+    """Writes the result of an export worker to the output module.
+
+    Args:
+      output_module (OutputModule): output module.
+      result (multiprocessing.pool.AsyncResult): result of an export worker.
+      events_counter (collections.Counter): counter that tracks the number
+          of unique events read from storage.
+    """
+    output, time_range_events_counter = result.get()
+
+    output_module.WriteFormattedEvents(output)
+
+    events_counter.update(time_range_events_counter)
+    self._number_of_consumed_events = events_counter['Events processed']
+
   def _StartWorkerProcess(self, process_name, storage_writer):
     """Creates, starts, monitors and registers a worker process.
 
@@ -970,9 +1243,15 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
   def ExportEvents(
       self, knowledge_base_object, storage_reader, output_module,
       processing_configuration, deduplicate_events=True, event_filter=None,
-      status_update_callback=None, time_slice=None, use_time_slicer=False):
+      number_of_worker_processes=0, status_update_callback=None,
+      storage_file_path=None, time_slice=None, use_time_slicer=False):
     """Exports events using an output module.
 
+    Events are formatted by multiple export worker processes when more than
+    one worker process is requested, the output module supports it and
+    neither a time slice nor a filter limit is used. Otherwise the events
+    are formatted by the current process.
+
     Args:
       knowledge_base_object (KnowledgeBase): contains information from
           the source data needed for processing.
@@ -983,8 +1262,12 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
       deduplicate_events (Optional[bool]): True if events should be
           deduplicated.
       event_filter (Optional[FilterObject]): event filter.
+      number_of_worker_processes (Optional[int]): number of export worker
+          processes, where 0 or 1 represents export in the current process.
       status_update_callback (Optional[function]): callback function for status
           updates.
+      storage_file_path (Optional[str]): path of the storage file, which is
+          required to export events with worker processes.
       time_slice (Optional[TimeSlice]): slice of time to output.
       use_time_slicer (Optional[bool]): True if the 'time slicer' should be
           used. The 'time slicer' will provide a context of events around
@@ -1002,17 +1285,49 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
     output_module.Open()
     output_module.WriteHeader()
 
+    use_export_workers = (
+        number_of_worker_processes > 1 and storage_file_path and
+        output_module.SUPPORTS_PARALLEL_EXPORT and hasattr(os, 'fork') and
+        not time_slice and not use_time_slicer and
+        not getattr(event_filter, 'limit', None))
+
+    export_pool = None
+    if use_export_workers:
+      export_worker = PsortExportWorker(
+          self, storage_file_path, output_module,
+          deduplicate_events=deduplicate_events, event_filter=event_filter)
+
+      # The export worker processes are forked before the status update
+      # thread is started and inherit the configured output module.
+      if hasattr(multiprocessing, 'get_context'):
+        context = multiprocessing.get_context('fork')
+      else:
+        context = multiprocessing
+
+      export_pool = context.Pool(
+          processes=number_of_worker_processes,
+          initializer=_InitializeExportWorker, initargs=(export_worker, ))
+
     self._StartStatusUpdateThread()
 
     self._StartProfiling(self._processing_configuration.profiling)
 
     try:
-      events_counter = self._ExportEvents(
-          storage_reader, output_module, deduplicate_events=deduplicate_events,
-          event_filter=event_filter, time_slice=time_slice,
-          use_time_slicer=use_time_slicer)
+      if export_pool:
+        events_counter = self._ExportEventsWithWorkers(
+            storage_reader, output_module, export_pool,
+            number_of_worker_processes)
+      else:
+        events_counter = self._ExportEvents(
+            storage_reader, output_module,
+            deduplicate_events=deduplicate_events, event_filter=event_filter,
+            time_slice=time_slice, use_time_slicer=use_time_slicer)
 
     finally:
+      if export_pool:
+        export_pool.terminate()
+        export_pool.join()
+
       # Stop the status update thread after close of the storage writer
       # so we include the storage sync to disk in the status updates.
       self._StopStatusUpdateThread()
@@ -1027,3 +1342,33 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
     self._processing_configuration = None
 
     return events_counter
+
+  def ExportTimeRange(
+      self, storage_reader, output_module, time_range, deduplicate_events=True,
+      event_filter=None):
+    """Exports the events in a time range using an output module.
+
+    This is used by the export worker processes, which export consecutive
+    time ranges, each with its own export event heap and counters.
+
+    Args:
+      storage_reader (StorageReader): storage reader.
+      output_module (OutputModule): output module.
+      time_range (TimeRange): time range of the events to export.
+      deduplicate_events (Optional[bool]): True if events should be
+          deduplicated.
+      event_filter (Optional[FilterObject]): event filter.
+
+    Returns:
+      collections.Counter: counter that tracks the number of unique events
+          read from storage.
+    """
+    self._export_event_heap = PsortEventHeap()
+    self._export_event_timestamp = 0
+    self._number_of_consumed_events = 0
+    self._number_of_duplicate_events = 0
+    self._number_of_macb_grouped_events = 0
+
+    return self._ExportEvents(
+        storage_reader, output_module, deduplicate_events=deduplicate_events,
+        event_filter=event_filter, time_range=time_range)
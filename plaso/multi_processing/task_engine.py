@@ -28,7 +28,17 @@ from plaso.multi_processing import worker_process
 
 
 class _EventSourceHeap(object):
-  """Class that defines an event source heap."""
+  """Class that defines an event source heap.
+
+  Directories are popped first, since they produce additional event sources.
+  Other event sources are popped in order of decreasing expected processing
+  cost (longest processing time first), such that large files are not left
+  to be processed by a single worker after the other workers became idle.
+  """
+
+  # Expected processing cost of event sources of which the cost is not known,
+  # which corresponds to a 1 MiB file.
+  _DEFAULT_EXPECTED_PROCESSING_COST = 1024 * 1024
 
   def __init__(self, maximum_number_of_items=50000):
     """Initializes an event source heap.
@@ -48,7 +58,7 @@ class _EventSourceHeap(object):
       EventSource: event source or None on error.
     """
     try:
-      _, event_source = heapq.heappop(self._heap)
+      _, _, event_source = heapq.heappop(self._heap)
 
     except IndexError:
       return None
@@ -68,10 +78,17 @@ class _EventSourceHeap(object):
     if event_source.file_entry_type == (
         dfvfs_definitions.FILE_ENTRY_TYPE_DIRECTORY):
       weight = 1
+      expected_processing_cost = 0
     else:
       weight = 100
-
-    heap_values = (weight, event_source)
+      expected_processing_cost = getattr(
+          event_source, 'expected_processing_cost', None)
+      if expected_processing_cost is None:
+        expected_processing_cost = self._DEFAULT_EXPECTED_PROCESSING_COST
+
+    # The expected processing cost is negated since the heap pops the event
+    # source with the lowest values first.
+    heap_values = (weight, -expected_processing_cost, event_source)
     heapq.heappush(self._heap, heap_values)
 
     if len(self._heap) >= self._maximum_number_of_items:
@@ -86,12 +103,22 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
   * merge results returned by extraction workers.
   """
 
+  # Interval, in seconds, in which session checkpoints are written.
+  _CHECKPOINT_INTERVAL = 5.0 * 60.0
+
   # Maximum number of attribute containers to merge per loop.
   _MAXIMUM_NUMBER_OF_CONTAINERS = 50
 
   # Maximum number of concurrent tasks.
   _MAXIMUM_NUMBER_OF_TASKS = 10000
 
+  # Maximum number of event sources combined into a single task.
+  _MAXIMUM_NUMBER_OF_EVENT_SOURCES_PER_TASK = 64
+
+  # Maximum combined file size, in bytes, of the event sources combined into
+  # a single task.
+  _MAXIMUM_TASK_DATA_SIZE = 4 * 1024 * 1024
+
   # Consider a worker inactive after 15 minutes of no activity.
   _PROCESS_WORKER_TIMEOUT = 15.0 * 60.0
 
@@ -103,20 +130,33 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
   _ZEROMQ_NO_WORKER_REQUEST_TIME_SECONDS = 10 * 60
 
   def __init__(
-      self, maximum_number_of_tasks=_MAXIMUM_NUMBER_OF_TASKS, use_zeromq=True):
+      self, maximum_number_of_tasks=_MAXIMUM_NUMBER_OF_TASKS,
+      maximum_number_of_event_sources_per_task=(
+          _MAXIMUM_NUMBER_OF_EVENT_SOURCES_PER_TASK),
+      maximum_task_data_size=_MAXIMUM_TASK_DATA_SIZE, use_zeromq=True):
     """Initializes an engine.
 
     Args:
       maximum_number_of_tasks (Optional[int]): maximum number of concurrent
           tasks, where 0 represents no limit.
+      maximum_number_of_event_sources_per_task (Optional[int]): maximum number
+          of event sources of small files that are combined into a single
+          task, where 1 represents a task per event source.
+      maximum_task_data_size (Optional[int]): maximum combined file size, in
+          bytes, of the event sources that are combined into a single task.
       use_zeromq (Optional[bool]): True if ZeroMQ should be used for queuing
           instead of Python's multiprocessing queue.
     """
     super(TaskMultiProcessEngine, self).__init__()
+    self._completed_path_specs = []
     self._enable_sigsegv_handler = False
     self._filter_find_specs = None
+    self._last_checkpoint_time = 0.0
     self._last_worker_number = 0
+    self._maximum_number_of_event_sources_per_task = (
+        maximum_number_of_event_sources_per_task)
     self._maximum_number_of_tasks = maximum_number_of_tasks
+    self._maximum_task_data_size = maximum_task_data_size
     self._merge_task = None
     self._merge_task_on_hold = None
     self._number_of_consumed_errors = 0
@@ -131,6 +171,7 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
     self._number_of_produced_sources = 0
     self._number_of_worker_processes = 0
     self._path_spec_extractor = extractors.PathSpecExtractor()
+    self._processed_path_spec_comparables = set()
     self._processing_configuration = None
     self._resolver_context = context.Context()
     self._session_identifier = None
@@ -142,6 +183,79 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
     self._task_manager = task_manager.TaskManager()
     self._use_zeromq = use_zeromq
 
+  def _CreateTask(self, event_source, event_source_heap):
+    """Creates a task to process an event source.
+
+    Event sources of small files are combined into a single task, up to
+    the maximum number of event sources and combined file size per task,
+    to reduce the overhead of creating and merging a task storage per file.
+
+    Args:
+      event_source (EventSource): event source.
+      event_source_heap (_EventSourceHeap): event source heap, from which
+          additional event sources are popped to combine into the task.
+
+    Returns:
+      tuple: contains:
+
+        Task: task.
+        EventSource: event source that was popped from the event source heap
+            but could not be combined into the task or None if not available.
+    """
+    task = self._task_manager.CreateTask(self._session_identifier)
+    task.file_entry_type = event_source.file_entry_type
+
+    self._number_of_consumed_sources += 1
+
+    task_data_size = self._GetTaskDataSize(event_source)
+    if (task_data_size is None or
+        self._maximum_number_of_event_sources_per_task <= 1):
+      task.path_spec = event_source.path_spec
+      return task, None
+
+    path_specs = [event_source.path_spec]
+
+    next_event_source = event_source_heap.PopEventSource()
+    while (next_event_source and
+           len(path_specs) < self._maximum_number_of_event_sources_per_task):
+      data_size = self._GetTaskDataSize(next_event_source)
+      if (data_size is None or
+          task_data_size + data_size > self._maximum_task_data_size):
+        break
+
+      path_specs.append(next_event_source.path_spec)
+      task_data_size += data_size
+
+      self._number_of_consumed_sources += 1
+
+      next_event_source = event_source_heap.PopEventSource()
+
+    if len(path_specs) == 1:
+      task.path_spec = path_specs[0]
+    else:
+      task.path_specs = path_specs
+
+    return task, next_event_source
+
+  def _GetTaskDataSize(self, event_source):
+    """Retrieves the data size of an event source that can be combined.
+
+    Args:
+      event_source (EventSource): event source.
+
+    Returns:
+      int: file size of the event source in bytes or None if the event source
+          cannot be combined with other event sources into a single task.
+    """
+    if event_source.file_entry_type != dfvfs_definitions.FILE_ENTRY_TYPE_FILE:
+      return None
+
+    file_size = getattr(event_source, 'file_size', None)
+    if file_size is None or file_size > self._maximum_task_data_size:
+      return None
+
+    return file_size
+
   def _FillEventSourceHeap(
       self, storage_writer, event_source_heap, start_with_first=False):
     """Fills the event source heap with the available written event sources.
@@ -167,10 +281,18 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
       self._processing_profiler.StopTiming('get_event_source')
 
     while event_source:
-      try:
-        event_source_heap.PushEventSource(event_source)
-      except errors.HeapFull:
-        break
+      # Event sources that were processed by an interrupted session that is
+      # resumed are not processed again.
+      is_processed = bool(
+          self._processed_path_spec_comparables and
+          event_source.path_spec.comparable in (
+              self._processed_path_spec_comparables))
+
+      if not is_processed:
+        try:
+          event_source_heap.PushEventSource(event_source)
+        except errors.HeapFull:
+          break
 
       if self._processing_profiler:
         self._processing_profiler.StartTiming('get_event_source')
@@ -256,26 +378,67 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
               'with error: {1!s}').format(task.identifier, exception))
           self._storage_merge_reader = None
 
+      merge_failed = False
+      partially_merged = False
       if self._storage_merge_reader:
-        fully_merged = self._storage_merge_reader.MergeAttributeContainers(
-            maximum_number_of_containers=self._MAXIMUM_NUMBER_OF_CONTAINERS)
+        # The merge reader reads the task storage ahead of the merge in
+        # a separate thread, hence reading the task storage does not hold up
+        # the task scheduling loop.
+        try:
+          fully_merged = self._storage_merge_reader.MergeAttributeContainers(
+              maximum_number_of_containers=self._MAXIMUM_NUMBER_OF_CONTAINERS)
+
+        except IOError as exception:
+          logger.error((
+              'Unable to merge results of task: {0:s} '
+              'with error: {1!s}').format(
+                  self._merge_task.identifier, exception))
+          fully_merged = True
+          merge_failed = True
+          partially_merged = bool(
+              self._storage_merge_reader.number_of_merged_containers)
+
       else:
-        # TODO: Do something more sensible when this happens, perhaps
-        # retrying the task once that is implemented. For now, we mark the task
-        # as fully merged because we can't continue with it.
         fully_merged = True
+        merge_failed = True
 
       if self._processing_profiler:
         self._processing_profiler.StopTiming('merge')
 
       if fully_merged:
-        try:
-          self._task_manager.CompleteTask(self._merge_task)
+        if merge_failed and not partially_merged:
+          # A task of which none of the results were merged is abandoned,
+          # such that its path specifications are processed again by a retry
+          # task.
+          try:
+            self._task_manager.AbandonMergingTask(self._merge_task)
+
+          except KeyError as exception:
+            logger.error(
+                'Unable to abandon task: {0:s} with error: {1!s}'.format(
+                    self._merge_task.identifier, exception))
 
-        except KeyError as exception:
-          logger.error(
-              'Unable to complete task: {0:s} with error: {1!s}'.format(
-                  self._merge_task.identifier, exception))
+        else:
+          # A task of which part of the results were merged is completed with
+          # an error, since processing its path specifications again would
+          # store the merged results twice.
+          if partially_merged:
+            for path_spec in self._merge_task.GetPathSpecs():
+              error = error_containers.ExtractionError(
+                  message='Unable to merge all results of path specification',
+                  path_spec=path_spec)
+              storage_writer.AddError(error)
+              self._processing_status.error_path_specs.append(path_spec)
+
+          try:
+            self._task_manager.CompleteTask(self._merge_task)
+
+          except KeyError as exception:
+            logger.error(
+                'Unable to complete task: {0:s} with error: {1!s}'.format(
+                    self._merge_task.identifier, exception))
+
+          self._completed_path_specs.extend(self._merge_task.GetPathSpecs())
 
         if not self._storage_merge_reader_on_hold:
           self._merge_task = None
@@ -296,16 +459,21 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
       self._number_of_produced_sources = storage_writer.number_of_event_sources
 
   def _ProcessSources(
-      self, source_path_specs, storage_writer, filter_find_specs=None):
+      self, source_path_specs, storage_writer, append=False,
+      filter_find_specs=None, resume=False):
     """Processes the sources.
 
     Args:
       source_path_specs (list[dfvfs.PathSpec]): path specifications of
           the sources to process.
       storage_writer (StorageWriter): storage writer for a session storage.
+      append (Optional[bool]): True if a session is appended, which processes
+          the path specifications stored by the previous sessions.
       filter_find_specs (Optional[list[dfvfs.FindSpec]]): find specifications
           used in path specification extraction. If set, path specifications
           that match the find specification will be processed.
+      resume (Optional[bool]): True if an interrupted session is resumed,
+          of which the path specifications were already extracted.
     """
     if self._processing_profiler:
       self._processing_profiler.StartTiming('process_sources')
@@ -322,9 +490,15 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
     self._number_of_produced_reports = 0
     self._number_of_produced_sources = 0
 
-    path_spec_generator = self._path_spec_extractor.ExtractPathSpecs(
-        source_path_specs, find_specs=filter_find_specs,
-        recurse_file_system=False, resolver_context=self._resolver_context)
+    self._completed_path_specs = []
+    self._last_checkpoint_time = time.time()
+
+    if append or resume:
+      path_spec_generator = []
+    else:
+      path_spec_generator = self._path_spec_extractor.ExtractPathSpecs(
+          source_path_specs, find_specs=filter_find_specs,
+          recurse_file_system=False, resolver_context=self._resolver_context)
 
     for path_spec in path_spec_generator:
       if self._abort:
@@ -343,6 +517,12 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
       if self._status_update_callback:
         self._status_update_callback(self._processing_status)
 
+    # The event sources are part of the first session checkpoint, such that
+    # the session can be resumed without extracting the path specifications
+    # again.
+    if not resume and not self._abort:
+      self._WriteSessionCheckpoint(storage_writer)
+
     self._ScheduleTasks(storage_writer)
 
     if self._abort:
@@ -370,6 +550,58 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
     if self._status_update_callback:
       self._status_update_callback(self._processing_status)
 
+  def _ResumeSession(self, storage_writer):
+    """Resumes an interrupted session from its last session checkpoint.
+
+    The task storage files of the tasks that were pending merge are restored
+    and the path specifications that were processed, including those of
+    the restored tasks, are not processed again.
+
+    Args:
+      storage_writer (StorageWriter): storage writer for a session storage.
+
+    Raises:
+      IOError: if the session storage contains no checkpoint of the session.
+    """
+    session_checkpoint = None
+    for checkpoint in storage_writer.GetSessionCheckpoints():
+      if checkpoint.identifier != self._session_identifier:
+        continue
+
+      for path_spec in checkpoint.completed_path_specs or []:
+        self._processed_path_spec_comparables.add(path_spec.comparable)
+
+      session_checkpoint = checkpoint
+
+    if not session_checkpoint:
+      raise IOError('Missing checkpoint of session: {0:s}.'.format(
+          self._session_identifier))
+
+    storage_writer.ResumeSession(session_checkpoint)
+
+    number_of_restored_tasks = 0
+    for task in session_checkpoint.pending_merge_tasks or []:
+      if not session_checkpoint.task_storage_path:
+        break
+
+      if not storage_writer.RestoreProcessedTaskStorage(
+          task, session_checkpoint.task_storage_path):
+        logger.debug('Unable to restore task: {0:s}.'.format(task.identifier))
+        continue
+
+      self._task_manager.RestoreProcessedTask(task)
+      number_of_restored_tasks += 1
+
+      for path_spec in task.GetPathSpecs():
+        self._processed_path_spec_comparables.add(path_spec.comparable)
+
+    logger.debug((
+        'Resumed session: {0:s} with {1:d} processed path specifications and '
+        '{2:d} restored tasks.').format(
+            self._session_identifier,
+            len(self._processed_path_spec_comparables),
+            number_of_restored_tasks))
+
   def _ScheduleTask(self, task):
     """Schedules a task.
 
@@ -404,8 +636,6 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
 
     self._status = definitions.PROCESSING_STATUS_RUNNING
 
-    # TODO: make tasks persistent.
-
     # TODO: protect task scheduler loop by catch all and
     # handle abort path.
 
@@ -426,21 +656,22 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
           task = self._task_manager.CreateRetryTask()
 
         if not task and event_source:
-          task = self._task_manager.CreateTask(self._session_identifier)
-          task.file_entry_type = event_source.file_entry_type
-          task.path_spec = event_source.path_spec
-          event_source = None
-
-          self._number_of_consumed_sources += 1
+          task, event_source = self._CreateTask(
+              event_source, event_source_heap)
 
           if self._guppy_memory_profiler:
             self._guppy_memory_profiler.Sample()
 
         if task:
           if self._ScheduleTask(task):
-            logger.debug(
-                'Scheduled task {0:s} for path specification {1:s}'.format(
-                    task.identifier, task.path_spec.comparable))
+            if task.path_specs:
+              logger.debug(
+                  'Scheduled task {0:s} for {1:d} path specifications'.format(
+                      task.identifier, len(task.path_specs)))
+            else:
+              logger.debug(
+                  'Scheduled task {0:s} for path specification {1:s}'.format(
+                      task.identifier, task.path_spec.comparable))
 
             self._task_manager.SampleTaskStatus(task, 'scheduled')
 
@@ -451,6 +682,14 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
 
         self._MergeTaskStorage(storage_writer)
 
+        # Session checkpoints are only written in between task storage merges,
+        # since the checkpoint commits the merged results to the session
+        # storage.
+        if (not self._storage_merge_reader and
+            time.time() - self._last_checkpoint_time >= (
+                self._CHECKPOINT_INTERVAL)):
+          self._WriteSessionCheckpoint(storage_writer)
+
         self._FillEventSourceHeap(storage_writer, event_source_heap)
 
         if not task and not event_source:
@@ -464,11 +703,12 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
           self._status_update_callback(self._processing_status)
 
     for task in self._task_manager.GetFailedTasks():
-      error = error_containers.ExtractionError(
-          message='Worker failed to process path specification',
-          path_spec=task.path_spec)
-      self._storage_writer.AddError(error)
-      self._processing_status.error_path_specs.append(task.path_spec)
+      for path_spec in task.GetPathSpecs():
+        error = error_containers.ExtractionError(
+            message='Worker failed to process path specification',
+            path_spec=path_spec)
+        self._storage_writer.AddError(error)
+        self._processing_status.error_path_specs.append(path_spec)
 
     self._status = definitions.PROCESSING_STATUS_IDLE
 
@@ -600,6 +840,39 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
     # Kill any lingering processes.
     self._AbortKill()
 
+  def _WriteSessionCheckpoint(self, storage_writer):
+    """Writes a session checkpoint.
+
+    Args:
+      storage_writer (StorageWriter): storage writer for a session storage.
+    """
+    if self._processing_profiler:
+      self._processing_profiler.StartTiming('write_session_checkpoint')
+
+    pending_merge_tasks = self._task_manager.GetTasksPendingMerge()
+
+    append_session = bool(
+        self._processing_configuration and
+        self._processing_configuration.extraction.append_session)
+
+    try:
+      storage_writer.WriteSessionCheckpoint(
+          completed_path_specs=self._completed_path_specs,
+          pending_merge_tasks=pending_merge_tasks,
+          append_session=append_session)
+
+      self._completed_path_specs = []
+
+    except IOError as exception:
+      logger.error(
+          'Unable to write session checkpoint with error: {0!s}'.format(
+              exception))
+
+    self._last_checkpoint_time = time.time()
+
+    if self._processing_profiler:
+      self._processing_profiler.StopTiming('write_session_checkpoint')
+
   def _UpdateForemanProcessStatus(self):
     """Update the foreman process status."""
     used_memory = self._process_information.GetUsedMemory() or 0
@@ -667,6 +940,11 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
     number_of_produced_sources = process_status.get(
         'number_of_produced_sources', None)
 
+    number_of_block_cache_hits = process_status.get(
+        'number_of_block_cache_hits', None)
+    number_of_block_cache_misses = process_status.get(
+        'number_of_block_cache_misses', None)
+
     if processing_status != definitions.PROCESSING_STATUS_IDLE:
       last_activity_timestamp = process_status.get(
           'last_activity_timestamp', 0.0)
@@ -687,7 +965,9 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
         number_of_consumed_events, number_of_produced_events,
         number_of_consumed_event_tags, number_of_produced_event_tags,
         number_of_consumed_errors, number_of_produced_errors,
-        number_of_consumed_reports, number_of_produced_reports)
+        number_of_consumed_reports, number_of_produced_reports,
+        number_of_block_cache_hits=number_of_block_cache_hits,
+        number_of_block_cache_misses=number_of_block_cache_misses)
 
     task_identifier = process_status.get('task_identifier', '')
     if not task_identifier:
@@ -705,9 +985,13 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
       self, session_identifier, source_path_specs, storage_writer,
       processing_configuration, enable_sigsegv_handler=False,
       filter_find_specs=None, number_of_worker_processes=0,
-      status_update_callback=None, worker_memory_limit=None):
+      resume=False, status_update_callback=None, worker_memory_limit=None):
     """Processes the sources and extract events.
 
+    When the extraction configuration is set to append a session, the event
+    sources stored by the previous sessions are processed again, instead of
+    the event sources extracted from the sources.
+
     Args:
       session_identifier (str): identifier of the session.
       source_path_specs (list[dfvfs.PathSpec]): path specifications of
@@ -720,6 +1004,9 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
       filter_find_specs (Optional[list[dfvfs.FindSpec]]): find specifications
           used in path specification extraction.
       number_of_worker_processes (Optional[int]): number of worker processes.
+      resume (Optional[bool]): True if the interrupted session with
+          the session identifier should be resumed from its last session
+          checkpoint in the session storage.
       status_update_callback (Optional[function]): callback function for status
           updates.
       worker_memory_limit (Optional[int]): maximum amount of memory a worker is
@@ -728,6 +1015,9 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
 
     Returns:
       ProcessingStatus: processing status.
+
+    Raises:
+      IOError: if the session cannot be resumed.
     """
     if number_of_worker_processes < 1:
       # One worker for each "available" CPU (minus other processes).
@@ -817,14 +1107,26 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
       # the ZIP storage file will remain locked as long as the worker processes
       # are alive.
       storage_writer.Open()
-      storage_writer.WriteSessionStart()
+
+      append = processing_configuration.extraction.append_session
+
+      if resume:
+        self._ResumeSession(storage_writer)
+      else:
+        storage_writer.WriteSessionStart()
+
+        if append:
+          storage_writer.RewindWrittenEventSources()
 
       try:
-        storage_writer.WritePreprocessingInformation(self.knowledge_base)
+        # An appended session uses the preprocessing information stored by
+        # the previous sessions.
+        if not append and not resume:
+          storage_writer.WritePreprocessingInformation(self.knowledge_base)
 
         self._ProcessSources(
-            source_path_specs, storage_writer,
-            filter_find_specs=filter_find_specs)
+            source_path_specs, storage_writer, append=append,
+            filter_find_specs=filter_find_specs, resume=resume)
 
       finally:
         storage_writer.WriteSessionCompletion(aborted=self._abort)
@@ -884,7 +1186,9 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
 
     self._processing_configuration = None
 
+    self._completed_path_specs = []
     self._filter_find_specs = None
+    self._processed_path_spec_comparables = set()
     self._session_identifier = None
     self._status_update_callback = None
     self._storage_writer = None
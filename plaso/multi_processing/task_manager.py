@@ -18,13 +18,19 @@ from plaso.multi_processing import logger
 
 
 class _PendingMergeTaskHeap(object):
-  """Heap to manage pending merge tasks."""
+  """Heap to manage pending merge tasks.
+
+  Attributes:
+    storage_file_size (int): total size of the task storage files of the tasks
+        on the heap.
+  """
 
   def __init__(self):
     """Initializes a pending merge task heap."""
     super(_PendingMergeTaskHeap, self).__init__()
     self._heap = []
     self._task_identifiers = set()
+    self.storage_file_size = 0
 
   def __contains__(self, task_identifier):
     """Checks for an task identifier being present in the heap.
@@ -45,6 +51,14 @@ class _PendingMergeTaskHeap(object):
     """
     return len(self._heap)
 
+  def GetTasks(self):
+    """Retrieves the tasks on the heap.
+
+    Returns:
+      list[Task]: tasks on the heap, in no particular order.
+    """
+    return [task for _, task in self._heap]
+
   def PeekTask(self):
     """Retrieves the first task from the heap without removing it.
 
@@ -71,6 +85,7 @@ class _PendingMergeTaskHeap(object):
     except IndexError:
       return None
     self._task_identifiers.remove(task.identifier)
+    self.storage_file_size -= task.storage_file_size
     return task
 
   def PushTask(self, task):
@@ -96,6 +111,7 @@ class _PendingMergeTaskHeap(object):
     heap_values = (weight, task)
     heapq.heappush(self._heap, heap_values)
     self._task_identifiers.add(task.identifier)
+    self.storage_file_size += storage_file_size
 
 
 class TaskManager(object):
@@ -166,6 +182,10 @@ class TaskManager(object):
 
     self._tasks_profiler = None
 
+    # Retry tasks of an abandoned task with multiple path specifications
+    # that are queued but were not yet returned by CreateRetryTask.
+    self._retry_tasks_pending_schedule = collections.deque()
+
     # TODO: implement a limit on the number of tasks.
     self._total_number_of_tasks = 0
 
@@ -256,6 +276,29 @@ class TaskManager(object):
     self._latest_task_processing_time = max(
         self._latest_task_processing_time, task.last_processing_time)
 
+  def AbandonMergingTask(self, task):
+    """Marks a task that could not be merged as abandoned.
+
+    The abandoned task is retried, such that the path specifications of
+    the task are processed again.
+
+    Args:
+      task (Task): task.
+
+    Raises:
+      KeyError: if the task was not merging.
+    """
+    with self._lock:
+      if task.identifier not in self._tasks_merging:
+        raise KeyError('Task {0:s} was not merging.'.format(task.identifier))
+
+      self.SampleTaskStatus(task, 'abandoned_merging')
+
+      del self._tasks_merging[task.identifier]
+      self._tasks_abandoned[task.identifier] = task
+
+      logger.debug('Abandoned merging task {0:s}.'.format(task.identifier))
+
   def CheckTaskToMerge(self, task):
     """Checks if the task should be merged.
 
@@ -287,6 +330,11 @@ class TaskManager(object):
           no abandoned tasks that should be retried.
     """
     with self._lock:
+      while self._retry_tasks_pending_schedule:
+        retry_task = self._retry_tasks_pending_schedule.popleft()
+        if retry_task.identifier in self._tasks_queued:
+          return retry_task
+
       abandoned_task = self._GetTaskPendingRetry()
       if not abandoned_task:
         return None
@@ -294,16 +342,22 @@ class TaskManager(object):
       # The abandoned task is kept in _tasks_abandoned so it can be still
       # identified in CheckTaskToMerge and UpdateTaskAsPendingMerge.
 
-      retry_task = abandoned_task.CreateRetryTask()
-      logger.debug('Retrying task {0:s} as {1:s}.'.format(
-          abandoned_task.identifier, retry_task.identifier))
+      # An abandoned task with multiple path specifications is retried per
+      # path specification, of which all retry tasks are queued at once to
+      # prevent the abandoned task from being merged or retried again.
+      retry_tasks = abandoned_task.CreateRetryTasks()
+      for retry_task in retry_tasks:
+        logger.debug('Retrying task {0:s} as {1:s}.'.format(
+            abandoned_task.identifier, retry_task.identifier))
 
-      self._tasks_queued[retry_task.identifier] = retry_task
-      self._total_number_of_tasks += 1
+        self._tasks_queued[retry_task.identifier] = retry_task
+        self._total_number_of_tasks += 1
+
+        self.SampleTaskStatus(retry_task, 'created_retry')
 
-      self.SampleTaskStatus(retry_task, 'created_retry')
+      self._retry_tasks_pending_schedule.extend(retry_tasks[1:])
 
-      return retry_task
+      return retry_tasks[0]
 
   # TODO: add support for task types.
   def CreateTask(self, session_identifier):
@@ -401,6 +455,9 @@ class TaskManager(object):
       status.number_of_tasks_pending_merge = (
           len(self._tasks_pending_merge) + len(self._tasks_merging))
       status.number_of_tasks_processing = len(self._tasks_processing)
+      status.size_of_tasks_pending_merge = (
+          self._tasks_pending_merge.storage_file_size + sum(
+              task.storage_file_size for task in self._tasks_merging.values()))
       status.total_number_of_tasks = self._total_number_of_tasks
 
     return status
@@ -432,6 +489,15 @@ class TaskManager(object):
     self._tasks_merging[next_task.identifier] = next_task
     return next_task
 
+  def GetTasksPendingMerge(self):
+    """Retrieves the tasks that are pending merge.
+
+    Returns:
+      list[Task]: tasks that are pending merge.
+    """
+    with self._lock:
+      return self._tasks_pending_merge.GetTasks()
+
   def HasPendingTasks(self):
     """Determines if there are tasks running or in need of retrying.
 
@@ -503,6 +569,37 @@ class TaskManager(object):
 
       logger.debug('Removed task {0:s}.'.format(task.identifier))
 
+  def RestoreProcessedTask(self, task):
+    """Restores a task that was processed in an interrupted session.
+
+    The restored task is tracked as processing, such that the task storage of
+    the task, once in the processed directory, is merged as that of any other
+    processed task.
+
+    Args:
+      task (Task): task.
+
+    Raises:
+      KeyError: if the task is already known to the task manager.
+    """
+    with self._lock:
+      if (task.identifier in self._tasks_abandoned or
+          task.identifier in self._tasks_merging or
+          task.identifier in self._tasks_pending_merge or
+          task.identifier in self._tasks_processing or
+          task.identifier in self._tasks_queued):
+        raise KeyError('Task {0:s} is already known.'.format(task.identifier))
+
+      logger.debug('Restored processed task {0:s}.'.format(task.identifier))
+
+      self._tasks_processing[task.identifier] = task
+      self._total_number_of_tasks += 1
+
+      self.SampleTaskStatus(task, 'restored')
+
+      task.UpdateProcessingTime()
+      self._UpdateLatestProcessingTime(task)
+
   def SampleTaskStatus(self, task, status):
     """Takes a sample of the status of the task for profiling.
 
@@ -74,9 +74,15 @@ class WorkerProcess(base_process.MultiProcessBaseProcess):
       last_activity_timestamp = max(
           self._extraction_worker.last_activity_timestamp,
           self._parser_mediator.last_activity_timestamp)
+      number_of_block_cache_hits = (
+          self._extraction_worker.number_of_block_cache_hits)
+      number_of_block_cache_misses = (
+          self._extraction_worker.number_of_block_cache_misses)
       processing_status = self._extraction_worker.processing_status
     else:
       last_activity_timestamp = 0.0
+      number_of_block_cache_hits = None
+      number_of_block_cache_misses = None
       processing_status = self._status
 
     task_identifier = getattr(self._task, 'identifier', '')
@@ -96,6 +102,8 @@ class WorkerProcess(base_process.MultiProcessBaseProcess):
     status = {
         'display_name': self._current_display_name,
         'identifier': self._name,
+        'number_of_block_cache_hits': number_of_block_cache_hits,
+        'number_of_block_cache_misses': number_of_block_cache_misses,
         'number_of_consumed_errors': None,
         'number_of_consumed_event_tags': None,
         'number_of_consumed_events': self._number_of_consumed_events,
@@ -153,10 +161,14 @@ class WorkerProcess(base_process.MultiProcessBaseProcess):
     if self._processing_profiler:
       self._extraction_worker.SetProcessingProfiler(self._processing_profiler)
 
+    if self._yara_rules_profiler:
+      self._extraction_worker.SetYaraRulesProfiler(self._yara_rules_profiler)
+
     if self._serializers_profiler:
       self._storage_writer.SetSerializersProfiler(self._serializers_profiler)
 
     if self._storage_profiler:
+      self._parser_mediator.SetStorageProfiler(self._storage_profiler)
       self._storage_writer.SetStorageProfiler(self._storage_profiler)
 
     logger.debug('Worker: {0!s} (PID: {1:d}) started.'.format(
@@ -198,10 +210,14 @@ class WorkerProcess(base_process.MultiProcessBaseProcess):
     if self._processing_profiler:
       self._extraction_worker.SetProcessingProfiler(None)
 
+    if self._yara_rules_profiler:
+      self._extraction_worker.SetYaraRulesProfiler(None)
+
     if self._serializers_profiler:
       self._storage_writer.SetSerializersProfiler(None)
 
     if self._storage_profiler:
+      self._parser_mediator.SetStorageProfiler(None)
       self._storage_writer.SetStorageProfiler(None)
 
     self._StopProfiling()
@@ -282,14 +298,23 @@ class WorkerProcess(base_process.MultiProcessBaseProcess):
 
     try:
       # TODO: add support for more task types.
-      self._ProcessPathSpec(
-          self._extraction_worker, self._parser_mediator, task.path_spec)
-      self._number_of_consumed_sources += 1
+      for path_spec in task.GetPathSpecs():
+        if self._abort:
+          break
 
-      if self._guppy_memory_profiler:
-        self._guppy_memory_profiler.Sample()
+        self._ProcessPathSpec(
+            self._extraction_worker, self._parser_mediator, path_spec)
+        self._number_of_consumed_sources += 1
+
+        if self._guppy_memory_profiler:
+          self._guppy_memory_profiler.Sample()
 
     finally:
+      for parser_statistics in self._parser_mediator.GetParserStatistics():
+        storage_writer.AddParserStatistics(parser_statistics)
+
+      self._parser_mediator.ResetParserStatistics()
+
       storage_writer.WriteTaskCompletion(aborted=self._abort)
 
       self._parser_mediator.SetStorageWriter(None)
@@ -331,6 +331,8 @@ class DynamicOutputModule(interface.LinearOutputModule):
   DESCRIPTION = (
       'Dynamic selection of fields for a separated value output format.')
 
+  SUPPORTS_PARALLEL_EXPORT = True
+
   _DEFAULT_FIELD_DELIMITER = ','
 
   _DEFAULT_FIELDS = [
@@ -15,6 +15,11 @@ class OutputModule(object):
   NAME = ''
   DESCRIPTION = ''
 
+  # True if the output of an event does not depend on the events written
+  # before it, such that consecutive ranges of events can be formatted by
+  # separate processes and their output concatenated in order.
+  SUPPORTS_PARALLEL_EXPORT = False
+
   def __init__(self, output_mediator):
     """Initializes an output module.
 
@@ -48,6 +53,20 @@ class OutputModule(object):
     """Closes the output."""
     pass
 
+  def GetFormattedValuesCacheStatistics(self):
+    """Retrieves the formatted values cache statistics of the output mediator.
+
+    Returns:
+      tuple[int, int]: number of formatted values that were in the cache and
+          number of formatted values that were not in the cache.
+    """
+    if not self._output_mediator:
+      return 0, 0
+
+    return (
+        self._output_mediator.number_of_formatted_values_cache_hits,
+        self._output_mediator.number_of_formatted_values_cache_misses)
+
   def GetMissingArguments(self):
     """Retrieves arguments required by the module that have not been specified.
 
@@ -57,6 +76,18 @@ class OutputModule(object):
     """
     return []
 
+  def GetWindowsEventMessageCacheStatistics(self):
+    """Retrieves the Windows Event Log message string cache statistics.
+
+    Returns:
+      tuple[int, int]: number of message strings that were in the cache and
+          number of message strings that were not in the cache.
+    """
+    if not self._output_mediator:
+      return 0, 0
+
+    return self._output_mediator.GetWindowsEventMessageCacheStatistics()
+
   def Open(self):
     """Opens the output."""
     pass
@@ -174,3 +205,12 @@ class LinearOutputModule(OutputModule):
   def Close(self):
     """Closes the output."""
     self._output_writer = None
+
+  def WriteFormattedEvents(self, output):
+    """Writes events that were formatted by another output module.
+
+    Args:
+      output (str): formatted events, such as those of another process
+          using the same output module and configuration.
+    """
+    self._output_writer.Write(output)
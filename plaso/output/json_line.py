@@ -23,6 +23,8 @@ class JSONLineOutputModule(interface.LinearOutputModule):
   NAME = 'json_line'
   DESCRIPTION = 'Saves the events into a JSON line format.'
 
+  SUPPORTS_PARALLEL_EXPORT = True
+
   _JSON_SERIALIZER = json_serializer.JSONAttributeContainerSerializer
 
   def WriteEventBody(self, event):
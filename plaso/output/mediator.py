@@ -3,6 +3,8 @@
 
 from __future__ import unicode_literals
 
+import collections
+
 from plaso.formatters import manager as formatters_manager
 from plaso.lib import definitions
 
@@ -12,11 +14,23 @@ import pytz  # pylint: disable=wrong-import-order
 class OutputMediator(object):
   """Output mediator.
 
+  The formatted messages and sources are cached per event data, since
+  multiple events, such as those with different timestamps, can share
+  the same event data and output modules can request the same formatted
+  values multiple times per event.
+
   Attributes:
     fields_filter (FilterObject): filter object that indicates
         which fields to output.
+    number_of_formatted_values_cache_hits (int): number of formatted values
+        that were in the cache.
+    number_of_formatted_values_cache_misses (int): number of formatted values
+        that were not in the cache.
   """
 
+  # Maximum number of formatted values in the cache.
+  _MAXIMUM_NUMBER_OF_CACHED_FORMATTED_VALUES = 16 * 1024
+
   def __init__(
       self, knowledge_base, formatter_mediator, fields_filter=None,
       preferred_encoding='utf-8'):
@@ -30,12 +44,15 @@ class OutputMediator(object):
       preferred_encoding (Optional[str]): preferred encoding to output.
     """
     super(OutputMediator, self).__init__()
+    self._formatted_values_cache = collections.OrderedDict()
     self._formatter_mediator = formatter_mediator
     self._knowledge_base = knowledge_base
     self._preferred_encoding = preferred_encoding
     self._timezone = pytz.UTC
 
     self.fields_filter = fields_filter
+    self.number_of_formatted_values_cache_hits = 0
+    self.number_of_formatted_values_cache_misses = 0
 
   @property
   def encoding(self):
@@ -55,6 +72,41 @@ class OutputMediator(object):
     """The timezone."""
     return self._timezone
 
+  def _CacheFormattedValues(self, lookup_key, formatted_values):
+    """Caches formatted values.
+
+    The least recently used formatted values are removed when the cache
+    is full.
+
+    Args:
+      lookup_key (tuple): lookup key of the formatted values.
+      formatted_values (tuple[str, str]): formatted values.
+    """
+    if len(self._formatted_values_cache) >= (
+        self._MAXIMUM_NUMBER_OF_CACHED_FORMATTED_VALUES):
+      self._formatted_values_cache.popitem(last=False)
+
+    self._formatted_values_cache[lookup_key] = formatted_values
+
+  def _GetCachedFormattedValues(self, lookup_key):
+    """Retrieves formatted values from the cache.
+
+    Args:
+      lookup_key (tuple): lookup key of the formatted values.
+
+    Returns:
+      tuple[str, str]: formatted values or None if not cached.
+    """
+    formatted_values = self._formatted_values_cache.pop(lookup_key, None)
+    if formatted_values is None:
+      self.number_of_formatted_values_cache_misses += 1
+      return None
+
+    # Reinserting the formatted values marks them as most recently used.
+    self._formatted_values_cache[lookup_key] = formatted_values
+    self.number_of_formatted_values_cache_hits += 1
+    return formatted_values
+
   def GetEventFormatter(self, event):
     """Retrieves the event formatter for a specific event type.
 
@@ -86,7 +138,17 @@ class OutputMediator(object):
     if not event_formatter:
       return None, None
 
-    return event_formatter.GetMessages(self._formatter_mediator, event)
+    event_data_identifier = event.GetEventDataIdentifier()
+    if not event_data_identifier:
+      return event_formatter.GetMessages(self._formatter_mediator, event)
+
+    lookup_key = ('messages', event_data_identifier.CopyToString())
+    messages = self._GetCachedFormattedValues(lookup_key)
+    if messages is None:
+      messages = event_formatter.GetMessages(self._formatter_mediator, event)
+      self._CacheFormattedValues(lookup_key, messages)
+
+    return messages
 
   def GetFormattedSources(self, event):
     """Retrieves the formatted sources related to the event.
@@ -103,7 +165,21 @@ class OutputMediator(object):
     if not event_formatter:
       return None, None
 
-    return event_formatter.GetSources(event)
+    event_data_identifier = event.GetEventDataIdentifier()
+    if not event_data_identifier:
+      return event_formatter.GetSources(event)
+
+    # The sources can contain the timestamp description, for example those
+    # of the file system stat formatter, which is not part of the event data.
+    lookup_key = (
+        'sources', event_data_identifier.CopyToString(),
+        getattr(event, 'timestamp_desc', None))
+    sources = self._GetCachedFormattedValues(lookup_key)
+    if sources is None:
+      sources = event_formatter.GetSources(event)
+      self._CacheFormattedValues(lookup_key, sources)
+
+    return sources
 
   def GetFormatStringAttributeNames(self, event):
     """Retrieves the attribute names in the format string.
@@ -291,6 +367,18 @@ class OutputMediator(object):
         user_sid, session_identifier=session_identifier)
     return username or default_username
 
+  def GetWindowsEventMessageCacheStatistics(self):
+    """Retrieves the Windows Event Log message string cache statistics.
+
+    Returns:
+      tuple[int, int]: number of message strings that were in the cache and
+          number of message strings that were not in the cache.
+    """
+    if not self._formatter_mediator:
+      return 0, 0
+
+    return self._formatter_mediator.GetWindowsEventMessageCacheStatistics()
+
   def SetTimezone(self, timezone):
     """Sets the timezone.
 
@@ -62,6 +62,8 @@ class NativePythonOutputModule(interface.LinearOutputModule):
   NAME = 'rawpy'
   DESCRIPTION = '"raw" (or native) Python output.'
 
+  SUPPORTS_PARALLEL_EXPORT = True
+
   def WriteEventBody(self, event):
     """Writes the body of an event to the output.
 
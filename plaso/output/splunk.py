@@ -23,6 +23,8 @@ class SplunkOutputModule(interface.LinearOutputModule):
   NAME = 'splunk'
   DESCRIPTION = 'Saves the events into a JSON line format with Splunk corrections.'
 
+  SUPPORTS_PARALLEL_EXPORT = True
+
   _JSON_SERIALIZER = json_serializer.JSONAttributeContainerSerializer
 
   def MicrosecToSec(self, ts):
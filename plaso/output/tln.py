@@ -20,6 +20,8 @@ class TLNBaseOutputModule(interface.LinearOutputModule):
   # Stop pylint from complaining about missing WriteEventBody.
   # pylint: disable=abstract-method
 
+  SUPPORTS_PARALLEL_EXPORT = True
+
   _FIELD_DELIMITER = '|'
   _DESCRIPTION_FIELD_DELIMITER = ';'
 
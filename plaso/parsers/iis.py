@@ -7,6 +7,8 @@ https://msdn.microsoft.com/en-us/library/ms525807(v=vs.90).aspx
 
 from __future__ import unicode_literals
 
+import re
+
 import pyparsing
 
 from dfdatetime import time_elements as dfdatetime_time_elements
@@ -133,6 +135,10 @@ class WinIISParser(text_parser.PyparsingSingleLineTextParser):
       ('comment', COMMENT),
       ('logline', LOG_LINE_6_0)]
 
+  LINE_STRUCTURE_PREFILTERS = {
+      'comment': '#',
+      'logline': re.compile(r'[^#]')}
+
   # Define a signature value for the log file.
   _SIGNATURE = '#Software: Microsoft Internet Information Services'
 
@@ -3,6 +3,7 @@
 
 from __future__ import unicode_literals
 
+import collections
 import copy
 import os
 import time
@@ -10,6 +11,7 @@ import time
 from dfvfs.lib import definitions as dfvfs_definitions
 
 from plaso.containers import errors
+from plaso.containers import parser_statistics
 from plaso.engine import path_helper
 from plaso.engine import profilers
 from plaso.lib import errors as errors_lib
@@ -18,6 +20,11 @@ from plaso.lib import timelib
 from plaso.parsers import logger
 
 
+# time.clock() is deprecated as of Python 3.3 and has been removed from later
+# versions, in favor of time.process_time().
+_GetCPUTime = getattr(time, 'process_time', None) or time.clock
+
+
 class ParserMediator(object):
   """Parser mediator.
 
@@ -31,6 +38,10 @@ class ParserMediator(object):
         not responding (stalled).
   """
 
+  # The maximum number of event data identifiers that are cached to
+  # deduplicate the event data produced for the active file entry.
+  _MAXIMUM_NUMBER_OF_CACHED_EVENT_DATA = 256
+
   def __init__(
       self, storage_writer, knowledge_base, preferred_year=None,
       resolver_context=None, temporary_directory=None):
@@ -48,20 +59,26 @@ class ParserMediator(object):
     super(ParserMediator, self).__init__()
     self._abort = False
     self._cpu_time_profiler = None
+    self._event_data_identifiers = collections.OrderedDict()
     self._extra_event_attributes = {}
     self._file_entry = None
+    self._file_entry_values = None
     self._knowledge_base = knowledge_base
-    self._last_event_data_hash = None
-    self._last_event_data_identifier = None
+    self._last_recorded_event_data_hash = None
+    self._maximum_number_of_recorded_events = 0
     self._memory_profiler = None
     self._mount_path = None
     self._number_of_errors = 0
     self._number_of_event_sources = 0
     self._number_of_events = 0
     self._parser_chain_components = []
+    self._parser_measurements = []
+    self._parser_statistics = {}
     self._preferred_year = preferred_year
     self._process_information = None
+    self._recorded_events = None
     self._resolver_context = resolver_context
+    self._storage_profiler = None
     self._storage_writer = storage_writer
     self._temporary_directory = temporary_directory
     self._text_prepend = None
@@ -128,6 +145,36 @@ class ParserMediator(object):
     """int: year."""
     return self._knowledge_base.year
 
+  def _GetDisplayName(self, file_entry=None):
+    """Retrieves the display name for a file entry.
+
+    Unlike GetDisplayName this does not stop the recording of events.
+
+    Args:
+      file_entry (Optional[dfvfs.FileEntry]): file entry object, where None
+          will return the display name of self._file_entry.
+
+    Returns:
+      str: human readable string that describes the path to the file entry.
+
+    Raises:
+      ValueError: if the file entry is missing.
+    """
+    if file_entry is None:
+      file_entry = self._file_entry
+
+    if file_entry is None:
+      raise ValueError('Missing file entry')
+
+    path_spec = getattr(file_entry, 'path_spec', None)
+
+    relative_path = path_helper.PathHelper.GetRelativePathForPathSpec(
+        path_spec, mount_path=self._mount_path)
+    if not relative_path:
+      return file_entry.name
+
+    return self.GetDisplayNameForPathSpec(path_spec)
+
   def _GetEarliestYearFromFileEntry(self):
     """Retrieves the year from the file entry date and time values.
 
@@ -167,6 +214,41 @@ class ParserMediator(object):
           'error: {0:s}').format(exception))
       return None
 
+  def _GetFileEntryValues(self, file_entry):
+    """Retrieves the values of a file entry that are added to event data.
+
+    The values are determined once per file entry, since they are the same
+    for all the event data produced for the file entry.
+
+    Args:
+      file_entry (dfvfs.FileEntry): file entry.
+
+    Returns:
+      tuple[str, str, str, int]: relative path, display name and hostname of
+          the file entry and inode, where the inode is None if not available.
+    """
+    if self._file_entry_values and self._file_entry_values[0] is file_entry:
+      return self._file_entry_values[1:]
+
+    path_spec = getattr(file_entry, 'path_spec', None)
+    relative_path = path_helper.PathHelper.GetRelativePathForPathSpec(
+        path_spec, mount_path=self._mount_path)
+
+    # TODO: dfVFS refactor: move display name to output since the path
+    # specification contains the full information.
+    display_name = self._GetDisplayName(file_entry=file_entry)
+
+    stat_object = file_entry.GetStat()
+    inode_value = getattr(stat_object, 'ino', None)
+
+    inode = None
+    if inode_value is not None:
+      inode = self._GetInode(inode_value)
+
+    self._file_entry_values = (
+        file_entry, relative_path, display_name, self.hostname, inode)
+    return self._file_entry_values[1:]
+
   def _GetInode(self, inode_value):
     """Retrieves the inode from the inode value.
 
@@ -227,6 +309,46 @@ class ParserMediator(object):
           'information with error: {0!s}').format(exception))
       return None
 
+  def _GetParserStatistics(self, parser_name):
+    """Retrieves the statistics of a parser or parser plugin.
+
+    Args:
+      parser_name (str): name of the parser or parser plugin.
+
+    Returns:
+      ParserStatistics: parser statistics.
+    """
+    statistics = self._parser_statistics.get(parser_name, None)
+    if not statistics:
+      statistics = parser_statistics.ParserStatistics(name=parser_name)
+      self._parser_statistics[parser_name] = statistics
+
+    return statistics
+
+  def _RecordEvent(self, event, event_data, event_data_hash):
+    """Records an event and its event data, as produced by a parser.
+
+    Args:
+      event (EventObject): event.
+      event_data (EventData): event data.
+      event_data_hash (str): hash of the attribute values of the event data.
+    """
+    if len(self._recorded_events) >= self._maximum_number_of_recorded_events:
+      self._recorded_events = None
+      return
+
+    if (self._recorded_events and
+        event_data_hash == self._last_recorded_event_data_hash):
+      recorded_event_data = self._recorded_events[-1][2]
+    else:
+      # Parsers can reuse the event data for subsequent events so a copy is
+      # recorded before the mediator adds additional values to it.
+      recorded_event_data = copy.deepcopy(event_data)
+
+    self._recorded_events.append((
+        self.GetParserChain(), copy.deepcopy(event), recorded_event_data))
+    self._last_recorded_event_data_hash = event_data_hash
+
   def AddEventAttribute(self, attribute_name, attribute_value):
     """Adds an attribute that will be set on all events produced.
 
@@ -246,6 +368,7 @@ class ParserMediator(object):
           attribute_name))
 
     self._extra_event_attributes[attribute_name] = attribute_value
+    self._event_data_identifiers = collections.OrderedDict()
 
   def AppendToParserChain(self, plugin_or_parser):
     """Adds a parser or parser plugin to the parser chain.
@@ -258,6 +381,7 @@ class ParserMediator(object):
   def ClearEventAttributes(self):
     """Clears the extra event attributes."""
     self._extra_event_attributes = {}
+    self._event_data_identifiers = collections.OrderedDict()
 
   def ClearParserChain(self):
     """Clears the parser chain."""
@@ -276,20 +400,12 @@ class ParserMediator(object):
     Raises:
       ValueError: if the file entry is missing.
     """
-    if file_entry is None:
-      file_entry = self._file_entry
-
-    if file_entry is None:
-      raise ValueError('Missing file entry')
-
-    path_spec = getattr(file_entry, 'path_spec', None)
+    # Events that contain the display name, for example as the origin of
+    # the distributed link tracking data of a Windows Shortcut, cannot be
+    # reproduced for another file entry with the same content.
+    self._recorded_events = None
 
-    relative_path = path_helper.PathHelper.GetRelativePathForPathSpec(
-        path_spec, mount_path=self._mount_path)
-    if not relative_path:
-      return file_entry.name
-
-    return self.GetDisplayNameForPathSpec(path_spec)
+    return self._GetDisplayName(file_entry=file_entry)
 
   def GetDisplayNameForPathSpec(self, path_spec):
     """Retrieves the display name for a path specification.
@@ -339,6 +455,11 @@ class ParserMediator(object):
     Returns:
       dfvfs.FileEntry: file entry.
     """
+    # Events that depend on the file entry, for example on its timestamps or
+    # on other files in the same directory, cannot be reproduced for another
+    # file entry with the same content.
+    self._recorded_events = None
+
     return self._file_entry
 
   def GetFilename(self):
@@ -379,6 +500,16 @@ class ParserMediator(object):
     """
     return '/'.join(self._parser_chain_components)
 
+  def GetParserStatistics(self):
+    """Retrieves the statistics of the parsers and parser plugins.
+
+    Returns:
+      list[ParserStatistics]: parser statistics, sorted by name.
+    """
+    return [
+        self._parser_statistics[parser_name]
+        for parser_name in sorted(self._parser_statistics.keys())]
+
   def PopFromParserChain(self):
     """Removes the last added parser or parser plugin from the parser chain."""
     self._parser_chain_components.pop()
@@ -407,31 +538,28 @@ class ParserMediator(object):
 
     display_name = None
     if file_entry:
+      relative_path, display_name, hostname, inode = (
+          self._GetFileEntryValues(file_entry))
+
       event.pathspec = file_entry.path_spec
 
       if not getattr(event, 'filename', None):
-        path_spec = getattr(file_entry, 'path_spec', None)
-        event.filename = path_helper.PathHelper.GetRelativePathForPathSpec(
-            path_spec, mount_path=self._mount_path)
+        event.filename = relative_path
 
-      if not display_name:
-        # TODO: dfVFS refactor: move display name to output since the path
-        # specification contains the full information.
-        display_name = self.GetDisplayName(file_entry)
-
-      stat_object = file_entry.GetStat()
-      inode_value = getattr(stat_object, 'ino', None)
       # TODO: refactor to ProcessEventData.
       # Note that we use getattr here since event can be either EventObject
       # or EventData.
-      if getattr(event, 'inode', None) is None and inode_value is not None:
-        event.inode = self._GetInode(inode_value)
+      if getattr(event, 'inode', None) is None and inode is not None:
+        event.inode = inode
+
+    else:
+      hostname = self.hostname
 
     if not getattr(event, 'display_name', None) and display_name:
       event.display_name = display_name
 
-    if not getattr(event, 'hostname', None) and self.hostname:
-      event.hostname = self.hostname
+    if not getattr(event, 'hostname', None) and hostname:
+      event.hostname = hostname
 
     if not getattr(event, 'username', None):
       user_sid = getattr(event, 'user_sid', None)
@@ -460,6 +588,9 @@ class ParserMediator(object):
     if not self._storage_writer:
       raise RuntimeError('Storage writer not set.')
 
+    # Event sources are not recorded, hence events cannot be reproduced.
+    self._recorded_events = None
+
     self._storage_writer.AddEventSource(event_source)
     self._number_of_event_sources += 1
 
@@ -479,30 +610,53 @@ class ParserMediator(object):
       raise errors_lib.InvalidEvent('Event must have a timestamp set.')
 
     event_data_hash = event_data.GetAttributeValuesHash()
-    if event_data_hash != self._last_event_data_hash:
-      # Make a copy of the event data before adding additional values.
-      event_data = copy.deepcopy(event_data)
+
+    if self._recorded_events is not None:
+      self._RecordEvent(event, event_data, event_data_hash)
+
+    parser_chain = self.GetParserChain()
+
+    # Parsers can interleave the production of event data, hence the
+    # identifiers of recently produced event data are cached, per parser
+    # chain, to prevent storing duplicate event data.
+    lookup_key = (parser_chain, event_data_hash)
+    event_data_identifier = self._event_data_identifiers.pop(lookup_key, None)
+    if not event_data_identifier:
+      # Make a copy of the event data before adding additional values. A
+      # shallow copy suffices since values are only added and the event data
+      # is serialized when it is added to the storage.
+      event_data = copy.copy(event_data)
 
       # TODO: refactor to ProcessEventData.
       self.ProcessEvent(
-          event_data, parser_chain=self.GetParserChain(),
-          file_entry=self._file_entry)
+          event_data, parser_chain=parser_chain, file_entry=self._file_entry)
 
       self._storage_writer.AddEventData(event_data)
 
-      self._last_event_data_hash = event_data_hash
-      self._last_event_data_identifier = event_data.GetIdentifier()
+      event_data_identifier = event_data.GetIdentifier()
 
-    if self._last_event_data_identifier:
-      event.SetEventDataIdentifier(self._last_event_data_identifier)
+      if len(self._event_data_identifiers) >= (
+          self._MAXIMUM_NUMBER_OF_CACHED_EVENT_DATA):
+        self._event_data_identifiers.popitem(last=False)
+
+    # Reinserting the identifier marks it as most recently used.
+    self._event_data_identifiers[lookup_key] = event_data_identifier
+
+    if event_data_identifier:
+      event.SetEventDataIdentifier(event_data_identifier)
 
     # TODO: remove this after structural fix is in place
     # https://github.com/log2timeline/plaso/issues/1691
-    event.parser = self.GetParserChain()
+    event.parser = parser_chain
 
     self._storage_writer.AddEvent(event)
     self._number_of_events += 1
 
+    # The events are accounted to the parser and the plugins in the parser
+    # chain, similar to the CPU time that includes that of the plugins.
+    for parser_name in set(self._parser_chain_components):
+      self._GetParserStatistics(parser_name).number_of_produced_events += 1
+
     self.last_activity_timestamp = time.time()
 
   def ProduceExtractionError(self, message, path_spec=None):
@@ -523,6 +677,9 @@ class ParserMediator(object):
     if not path_spec and self._file_entry:
       path_spec = self._file_entry.path_spec
 
+    # Extraction errors are not recorded, hence events cannot be reproduced.
+    self._recorded_events = None
+
     parser_chain = self.GetParserChain()
     extraction_error = errors.ExtractionError(
         message=message, parser_chain=parser_chain, path_spec=path_spec)
@@ -531,6 +688,31 @@ class ParserMediator(object):
 
     self.last_activity_timestamp = time.time()
 
+  def ProduceRecordedEvents(self, recorded_events):
+    """Produces events that were recorded for another file entry.
+
+    The events are produced as if they were produced by the parsers for
+    the active file entry.
+
+    Args:
+      recorded_events (list[tuple[str, EventObject, EventData]]): parser
+          chain, event and event data of the events.
+    """
+    parser_chain_components = self._parser_chain_components
+
+    # The event data cannot be that of previously produced events since
+    # their file entry differs.
+    self._event_data_identifiers = collections.OrderedDict()
+
+    try:
+      for parser_chain, event, event_data in recorded_events:
+        self._parser_chain_components = parser_chain.split('/')
+
+        self.ProduceEventWithEventData(copy.deepcopy(event), event_data)
+
+    finally:
+      self._parser_chain_components = parser_chain_components
+
   def RemoveEventAttribute(self, attribute_name):
     """Removes an attribute from being set on all events produced.
 
@@ -544,10 +726,28 @@ class ParserMediator(object):
       raise KeyError('Event attribute: {0:s} not set'.format(attribute_name))
 
     del self._extra_event_attributes[attribute_name]
+    self._event_data_identifiers = collections.OrderedDict()
 
   def ResetFileEntry(self):
     """Resets the active file entry."""
+    self._event_data_identifiers = collections.OrderedDict()
     self._file_entry = None
+    self._file_entry_values = None
+
+  def ResetParserStatistics(self):
+    """Resets the statistics of the parsers and parser plugins."""
+    self._parser_measurements = []
+    self._parser_statistics = {}
+
+  def SampleCopiedDataSize(self, description, data_size):
+    """Takes a sample of data copied into temporary files for profiling.
+
+    Args:
+      description (str): description of the data copied.
+      data_size (int): size of the data copied in bytes.
+    """
+    if self._storage_profiler:
+      self._storage_profiler.Sample('copy', description, data_size, data_size)
 
   def SampleMemoryUsage(self, parser_name):
     """Takes a sample of the memory usage for profiling.
@@ -607,7 +807,19 @@ class ParserMediator(object):
     Args:
       file_entry (dfvfs.FileEntry): file entry.
     """
+    # The event data produced for another file entry differs in the values
+    # that are added for the file entry.
+    self._event_data_identifiers = collections.OrderedDict()
     self._file_entry = file_entry
+    self._file_entry_values = None
+
+  def SetStorageProfiler(self, storage_profiler):
+    """Sets the storage profiler.
+
+    Args:
+      storage_profiler (StorageProfiler): storage profiler.
+    """
+    self._storage_profiler = storage_profiler
 
   def SetStorageWriter(self, storage_writer):
     """Sets the storage writer.
@@ -617,15 +829,76 @@ class ParserMediator(object):
     """
     self._storage_writer = storage_writer
 
-    # Reset the last event data information. Each storage file should
+    # Reset the cached event data identifiers. Each storage file should
     # contain event data for their events.
-    self._last_event_data_hash = None
-    self._last_event_data_identifier = None
+    self._event_data_identifiers = collections.OrderedDict()
 
   def SignalAbort(self):
     """Signals the parsers to abort."""
     self._abort = True
 
+  def StartParserMeasurement(self, parser_name):
+    """Starts measuring a parser or parser plugin being applied to a file.
+
+    Args:
+      parser_name (str): name of the parser or parser plugin.
+    """
+    self._parser_measurements.append((parser_name, _GetCPUTime()))
+
+  def StopParserMeasurement(
+      self, parser_name, matched, number_of_read_bytes=0):
+    """Stops measuring a parser or parser plugin being applied to a file.
+
+    The CPU time of a parser includes that of its plugins.
+
+    Args:
+      parser_name (str): name of the parser or parser plugin.
+      matched (bool): True if the parser or parser plugin was able to parse
+          the file.
+      number_of_read_bytes (Optional[int]): number of bytes read by the parser
+          or parser plugin.
+    """
+    if (not self._parser_measurements or
+        self._parser_measurements[-1][0] != parser_name):
+      return
+
+    _, start_cpu_time = self._parser_measurements.pop()
+    cpu_time = _GetCPUTime() - start_cpu_time
+
+    statistics = self._GetParserStatistics(parser_name)
+    statistics.AddFile(
+        cpu_time, matched, number_of_read_bytes=number_of_read_bytes)
+
+    # The display name is only determined for the slowest files.
+    if self._file_entry and statistics.IsSlowestFile(cpu_time):
+      statistics.AddSlowestFile(cpu_time, self._GetDisplayName())
+
+  def StartRecordingEvents(self, maximum_number_of_events):
+    """Starts recording the events produced by the parsers.
+
+    Args:
+      maximum_number_of_events (int): maximum number of events to record,
+          where recording stops if more events are produced.
+    """
+    self._last_recorded_event_data_hash = None
+    self._maximum_number_of_recorded_events = maximum_number_of_events
+    self._recorded_events = []
+
+  def StopRecordingEvents(self):
+    """Stops recording the events produced by the parsers.
+
+    Returns:
+      list[tuple[str, EventObject, EventData]]: parser chain, event and event
+          data of the recorded events or None if the events could not be
+          recorded, for example because they depend on the file entry.
+    """
+    recorded_events = self._recorded_events
+
+    self._last_recorded_event_data_hash = None
+    self._recorded_events = None
+
+    return recorded_events
+
   def StartProfiling(self, configuration, identifier, process_information):
     """Starts profiling.
 
@@ -4,6 +4,7 @@
 from __future__ import unicode_literals
 
 import binascii
+import collections
 import operator
 import socket
 
@@ -66,10 +67,10 @@ def ParseDNS(dns_packet_data):
       dns_data.append(str(dns.rcode))
 
   except dpkt.UnpackError as exception:
-    dns_data.append('DNS Unpack Error: {0:s}. First 20 of data {1:s}'.format(
+    dns_data.append('DNS Unpack Error: {0!s}. First 20 of data {1!s}'.format(
         exception, repr(dns_packet_data[:20])))
   except IndexError as exception:
-    dns_data.append('DNS Index Error: {0:s}'.format(exception))
+    dns_data.append('DNS Index Error: {0!s}'.format(exception))
 
   return ' '.join(dns_data)
 
@@ -271,7 +272,32 @@ def ICMPTypes(packet):
 
 
 class Stream(object):
-  """Used to store packet details on network streams parsed from a pcap file."""
+  """Used to store packet details on network streams parsed from a pcap file.
+
+  A stream only maintains aggregates of its packets, such as the number of
+  packets and the first and last timestamp, and a limited amount of stream
+  data, so that its memory usage does not depend on the number of packets.
+
+  Attributes:
+    dest_ip (str): destination IP address.
+    dest_port (int): destination TCP or UDP port number.
+    end_time (int): timestamp of the last packet.
+    first_packet_id (int): identifier of the first packet.
+    last_packet_id (int): identifier of the last packet.
+    packet_count (int): number of packets.
+    protocol (str): protocol.
+    protocol_data (str): human readable representation of the protocol data.
+    size (int): size of the packets in bytes.
+    source_ip (str): source IP address.
+    source_port (int): source TCP or UDP port number.
+    start_time (int): timestamp of the first packet.
+    stream_data (bytes): data of the TCP or UDP packets, which is limited
+        to MAXIMUM_STREAM_DATA_SIZE bytes.
+  """
+
+  # The maximum size of the stream data that is kept to determine the stream
+  # type, such as a HTTP request or DNS query.
+  MAXIMUM_STREAM_DATA_SIZE = 16 * 1024
 
   def __init__(self, packet, prot_data, source_ip, dest_ip, prot):
     """Initialize new stream.
@@ -285,16 +311,20 @@ class Stream(object):
       prot: Protocol (TCP, UDP, ICMP, ARP).
     """
     super(Stream, self).__init__()
-    self.all_data = [prot_data]
+    self._first_protocol_data = None
+    self._has_truncated_packets = False
+    self._is_stream_data_truncated = False
     self.dest_ip = dest_ip
-    self.packet_id = [packet[1]]
+    self.end_time = packet[0]
+    self.first_packet_id = packet[1]
+    self.last_packet_id = packet[1]
+    self.packet_count = 0
     self.protocol = prot
     self.protocol_data = ''
-    self.size = packet[3]
+    self.size = 0
     self.source_ip = source_ip
     self.start_time = packet[0]
     self.stream_data = b''
-    self.timestamps = [packet[0]]
 
     if prot in ('TCP', 'UDP'):
       self.dest_port = prot_data.dport
@@ -303,6 +333,33 @@ class Stream(object):
       self.dest_port = ''
       self.source_port = ''
 
+    # ICMP packets are described by the first packet of the stream.
+    if prot == 'ICMP':
+      self._first_protocol_data = prot_data
+
+    self.AddPacket(packet, prot_data)
+
+  def _UnpackHTTPMessage(self, http_message):
+    """Unpacks a HTTP message from the stream data.
+
+    If the stream data was truncated only the start line and headers of
+    the HTTP message are unpacked, since the body can be incomplete.
+
+    Args:
+      http_message (dpkt.http.Message): HTTP request or response.
+
+    Raises:
+      dpkt.UnpackError: if the HTTP message cannot be unpacked.
+    """
+    try:
+      http_message.unpack(self.stream_data)
+
+    except dpkt.NeedData:
+      # The start line and headers are unpacked before the body.
+      if (not self._is_stream_data_truncated or
+          b'\r\n\r\n' not in self.stream_data):
+        raise
+
   def AddPacket(self, packet, prot_data):
     """Add another packet to an existing stream.
 
@@ -311,10 +368,25 @@ class Stream(object):
       prot_data: Protocol level data for ARP, UDP, RCP, ICMP.
           other types of ether packets, this is just the ether.data
     """
-    self.packet_id.append(packet[1])
-    self.timestamps.append(packet[0])
-    self.all_data.append(prot_data)
+    self.end_time = max(self.end_time, packet[0])
+    self.first_packet_id = min(self.first_packet_id, packet[1])
+    self.last_packet_id = max(self.last_packet_id, packet[1])
+    self.packet_count += 1
     self.size += packet[3]
+    self.start_time = min(self.start_time, packet[0])
+
+    if self.protocol == 'UDP' and prot_data.ulen != len(prot_data):
+      self._has_truncated_packets = True
+
+    if self.protocol in ('TCP', 'UDP'):
+      packet_data = getattr(prot_data, 'data', b'')
+      if isinstance(packet_data, bytes):
+        maximum_size = self.MAXIMUM_STREAM_DATA_SIZE - len(self.stream_data)
+        if len(packet_data) > maximum_size:
+          self._is_stream_data_truncated = True
+
+        if maximum_size > 0:
+          self.stream_data += packet_data[:maximum_size]
 
   def SpecialTypes(self):
     """Checks for some special types of packets.
@@ -329,7 +401,8 @@ class Stream(object):
     packet_details = []
     if self.stream_data[:4] == b'HTTP':
       try:
-        http = dpkt.http.Response(self.stream_data)
+        http = dpkt.http.Response()
+        self._UnpackHTTPMessage(http)
         packet_details.append('HTTP Response: status: ')
         packet_details.append(http.status)
         packet_details.append(' reason: ')
@@ -340,27 +413,28 @@ class Stream(object):
 
       except dpkt.UnpackError as exception:
         packet_details = (
-            'HTTP Response Unpack Error: {0:s}. '
-            'First 20 of data {1:s}').format(
+            'HTTP Response Unpack Error: {0!s}. '
+            'First 20 of data {1!s}').format(
                 exception, repr(self.stream_data[:20]))
         return 'HTTP Response', packet_details
 
       except IndexError as exception:
         packet_details = (
-            'HTTP Response Index Error: {0:s}. First 20 of data {1:s}').format(
+            'HTTP Response Index Error: {0!s}. First 20 of data {1!s}').format(
                 exception, repr(self.stream_data[:20]))
         return 'HTTP Response', packet_details
 
       except ValueError as exception:
         packet_details = (
-            'HTTP Response parsing error: {0:s}. '
-            'First 20 of data {1:s}').format(
+            'HTTP Response parsing error: {0!s}. '
+            'First 20 of data {1!s}').format(
                 exception, repr(self.stream_data[:20]))
         return 'HTTP Response', packet_details
 
     elif self.stream_data[:3] == b'GET' or self.stream_data[:4] == b'POST':
       try:
-        http = dpkt.http.Request(self.stream_data)
+        http = dpkt.http.Request()
+        self._UnpackHTTPMessage(http)
         packet_details.append('HTTP Request: method: ')
         packet_details.append(http.method)
         packet_details.append(' uri: ')
@@ -373,14 +447,14 @@ class Stream(object):
 
       except dpkt.UnpackError as exception:
         packet_details = (
-            'HTTP Request unpack error: {0:s}. First 20 of data {1:s}').format(
+            'HTTP Request unpack error: {0!s}. First 20 of data {1!s}').format(
                 exception, repr(self.stream_data[:20]))
         return 'HTTP Request', packet_details
 
       except ValueError as exception:
         packet_details = (
-            'HTTP Request parsing error: {0:s}. '
-            'First 20 of data {1:s}').format(
+            'HTTP Request parsing error: {0!s}. '
+            'First 20 of data {1!s}').format(
                 exception, repr(self.stream_data[:20]))
         return 'HTTP Request', packet_details
 
@@ -388,11 +462,10 @@ class Stream(object):
         self.source_port == 53 or self.dest_port == 53):
       # DNS request/replies.
       # Check to see if the lengths are valid.
-      for packet in self.all_data:
-        if not packet.ulen == len(packet):
-          packet_details.append('Truncated DNS packets - unable to parse: ')
-          packet_details.append(repr(self.stream_data[15:40]))
-          return 'DNS', ' '.join(packet_details)
+      if self._has_truncated_packets:
+        packet_details.append('Truncated DNS packets - unable to parse: ')
+        packet_details.append(repr(self.stream_data[15:40]))
+        return 'DNS', ' '.join(packet_details)
 
       return 'DNS', ParseDNS(self.stream_data)
 
@@ -403,7 +476,7 @@ class Stream(object):
     elif self.protocol == 'ICMP':
       # ICMP packets all end up as 1 stream, so they need to be
       #  processed 1 by 1.
-      return 'ICMP', ICMPTypes(self.all_data[0])
+      return 'ICMP', ICMPTypes(self._first_protocol_data)
 
     elif b'\x03\x01' in self.stream_data[1:3]:
       # Some form of ssl3 data.
@@ -414,7 +487,7 @@ class Stream(object):
         return 'SSL', ' '.join(packet_details)
       except dpkt.UnpackError as exception:
         packet_details = (
-            'SSL unpack error: {0:s}. First 20 of data {1:s}').format(
+            'SSL unpack error: {0!s}. First 20 of data {1!s}').format(
                 exception, repr(self.stream_data[:20]))
         return 'SSL', packet_details
 
@@ -428,23 +501,12 @@ class Stream(object):
 
       except dpkt.UnpackError as exception:
         packet_details = (
-            'SSL unpack error: {0:s}. First 20 of data {1:s}').format(
+            'SSL unpack error: {0!s}. First 20 of data {1!s}').format(
                 exception, repr(self.stream_data[:20]))
         return 'SSL', packet_details
 
     return 'other', self.protocol_data
 
-  def Clean(self):
-    """Clean up stream data."""
-    clean_data = []
-    for packet in self.all_data:
-      try:
-        clean_data.append(packet.data)
-      except AttributeError:
-        pass
-
-      self.stream_data = b''.join(clean_data)
-
 
 class PcapEventData(events.EventData):
   """PCAP event data.
@@ -485,24 +547,87 @@ class PcapEventData(events.EventData):
 
 
 class PcapParser(interface.FileObjectParser):
-  """Parses PCAP files."""
+  """Parses PCAP files.
+
+  The packets are read in large blocks and are aggregated into the streams
+  that are active. A stream expires, and its events are produced, when it
+  has had no packets for the idle timeout or when it is the least recently
+  active stream and the maximum number of active streams is exceeded.
+  """
 
   NAME = 'pcap'
   DESCRIPTION = 'Parser for PCAP files.'
 
+  # The maximum number of active streams.
+  _MAXIMUM_NUMBER_OF_STREAMS = 16384
+
+  # The size of the blocks in which the packets are read.
+  _READ_BUFFER_SIZE = 4 * 1024 * 1024
+
+  # The time, in microseconds, after which a stream without packets expires.
+  _STREAM_IDLE_TIMEOUT = 15 * 60 * 1000000
+
+  def _AddPacketToStream(
+      self, streams, stream_key, packet_values, protocol_data,
+      source_ip_address, destination_ip_address, protocol):
+    """Adds a packet to an active stream or to a new stream.
+
+    Args:
+      streams (collections.OrderedDict[str, Stream]): active streams, from
+          least to most recently active.
+      stream_key (str): key of the stream.
+      packet_values (list[object]): packet values.
+      protocol_data (dpkt.Packet): protocol level data.
+      source_ip_address (str): source IP address.
+      destination_ip_address (str): destination IP address.
+      protocol (str): protocol, such as TCP, UDP or ICMP.
+    """
+    stream_object = streams.pop(stream_key, None)
+    if stream_object:
+      stream_object.AddPacket(packet_values, protocol_data)
+    else:
+      stream_object = Stream(
+          packet_values, protocol_data, source_ip_address,
+          destination_ip_address, protocol)
+
+    # Reinserting the stream marks it as most recently active.
+    streams[stream_key] = stream_object
+
+  def _ExpireStreams(self, parser_mediator, streams, timestamp):
+    """Expires the streams that are idle or exceed the maximum.
+
+    Args:
+      parser_mediator (ParserMediator): mediates interactions between parsers
+          and other components, such as storage and dfvfs.
+      streams (collections.OrderedDict[str, Stream]): active streams, from
+          least to most recently active.
+      timestamp (int): timestamp of the current packet.
+    """
+    while streams:
+      stream_key = next(iter(streams))
+      stream_object = streams[stream_key]
+
+      if (len(streams) <= self._MAXIMUM_NUMBER_OF_STREAMS and
+          timestamp - stream_object.end_time <= self._STREAM_IDLE_TIMEOUT):
+        break
+
+      del streams[stream_key]
+      self._ProduceStreamEvents(parser_mediator, stream_object)
+
   def _ParseIPPacket(
-      self, connections, trunc_list, packet_number, timestamp,
+      self, parser_mediator, streams, packet_number, timestamp,
       packet_data_size, ip_packet):
     """Parses an IP packet.
 
     Args:
-      connections: A dictionary object to track the IP connections.
-      trunc_list: A list of packets that truncated strangely and could
-                  not be turned into a stream.
-      packet_number: The PCAP packet number, where 1 is the first packet.
-      timestamp: The PCAP packet timestamp.
-      packet_data_size: The packet data size.
-      ip_packet: The IP packet (instance of dpkt.ip.IP).
+      parser_mediator (ParserMediator): mediates interactions between parsers
+          and other components, such as storage and dfvfs.
+      streams (collections.OrderedDict[str, Stream]): active streams, from
+          least to most recently active.
+      packet_number (int): PCAP packet number, where 1 is the first packet.
+      timestamp (int): PCAP packet timestamp.
+      packet_data_size (int): packet data size.
+      ip_packet (dpkt.ip.IP): IP packet.
     """
     packet_values = [timestamp, packet_number, ip_packet, packet_data_size]
 
@@ -511,11 +636,11 @@ class PcapParser(interface.FileObjectParser):
 
     if ip_packet.p == dpkt.ip.IP_PROTO_TCP:
       # Later versions of dpkt seem to return a string instead of a TCP object.
-      if isinstance(ip_packet.data, str):
+      if isinstance(ip_packet.data, bytes):
         try:
           tcp = dpkt.tcp.TCP(ip_packet.data)
         except (dpkt.NeedData, dpkt.UnpackError):
-          trunc_list.append(packet_values)
+          self._ParseTruncatedIPPacket(parser_mediator, packet_values)
           return
 
       else:
@@ -524,20 +649,17 @@ class PcapParser(interface.FileObjectParser):
       stream_key = 'tcp: {0:s}:{1:d} > {2:s}:{3:d}'.format(
           source_ip_address, tcp.sport, destination_ip_address, tcp.dport)
 
-      if stream_key in connections:
-        connections[stream_key].AddPacket(packet_values, tcp)
-      else:
-        connections[stream_key] = Stream(
-            packet_values, tcp, source_ip_address, destination_ip_address,
-            'TCP')
+      self._AddPacketToStream(
+          streams, stream_key, packet_values, tcp, source_ip_address,
+          destination_ip_address, 'TCP')
 
     elif ip_packet.p == dpkt.ip.IP_PROTO_UDP:
       # Later versions of dpkt seem to return a string instead of an UDP object.
-      if isinstance(ip_packet.data, str):
+      if isinstance(ip_packet.data, bytes):
         try:
           udp = dpkt.udp.UDP(ip_packet.data)
         except (dpkt.NeedData, dpkt.UnpackError):
-          trunc_list.append(packet_values)
+          self._ParseTruncatedIPPacket(parser_mediator, packet_values)
           return
 
       else:
@@ -546,30 +668,29 @@ class PcapParser(interface.FileObjectParser):
       stream_key = 'udp: {0:s}:{1:d} > {2:s}:{3:d}'.format(
           source_ip_address, udp.sport, destination_ip_address, udp.dport)
 
-      if stream_key in connections:
-        connections[stream_key].AddPacket(packet_values, udp)
-      else:
-        connections[stream_key] = Stream(
-            packet_values, udp, source_ip_address, destination_ip_address,
-            'UDP')
+      self._AddPacketToStream(
+          streams, stream_key, packet_values, udp, source_ip_address,
+          destination_ip_address, 'UDP')
 
     elif ip_packet.p == dpkt.ip.IP_PROTO_ICMP:
       # Later versions of dpkt seem to return a string instead of
       # an ICMP object.
-      if isinstance(ip_packet.data, str):
-        icmp = dpkt.icmp.ICMP(ip_packet.data)
+      if isinstance(ip_packet.data, bytes):
+        try:
+          icmp = dpkt.icmp.ICMP(ip_packet.data)
+        except (dpkt.NeedData, dpkt.UnpackError):
+          self._ParseTruncatedIPPacket(parser_mediator, packet_values)
+          return
+
       else:
         icmp = ip_packet.data
 
       stream_key = 'icmp: {0:d} {1:s} > {2:s}'.format(
           timestamp, source_ip_address, destination_ip_address)
 
-      if stream_key in connections:
-        connections[stream_key].AddPacket(packet_values, icmp)
-      else:
-        connections[stream_key] = Stream(
-            packet_values, icmp, source_ip_address, destination_ip_address,
-            'ICMP')
+      self._AddPacketToStream(
+          streams, stream_key, packet_values, icmp, source_ip_address,
+          destination_ip_address, 'ICMP')
 
   def _ParseOtherPacket(self, packet_values):
     """Parses a non-IP packet.
@@ -690,39 +811,100 @@ class PcapParser(interface.FileObjectParser):
 
     return stream_object
 
-  def _ParseOtherStreams(self, other_list, trunc_list):
-    """Process PCAP packets that are not IP packets.
+  def _ParseTruncatedIPPacket(self, parser_mediator, packet_values):
+    """Parses an IP packet that truncated strangely.
 
-    For all packets that were not IP packets, create stream containers
-    depending on the type of packet.
+    Args:
+      parser_mediator (ParserMediator): mediates interactions between parsers
+          and other components, such as storage and dfvfs.
+      packet_values (list[object]): packet values.
+    """
+    ip_packet = packet_values[2]
+
+    source_ip_address = socket.inet_ntoa(ip_packet.src)
+    destination_ip_address = socket.inet_ntoa(ip_packet.dst)
+    stream_object = Stream(
+        packet_values, ip_packet.data, source_ip_address,
+        destination_ip_address, 'BAD')
+    stream_object.protocol_data = 'Bad truncated IP packet'
+
+    self._ProduceStreamEvents(parser_mediator, stream_object)
+
+  def _ProduceStreamEvents(self, parser_mediator, stream_object):
+    """Produces the start and end events of a stream.
 
     Args:
-      other_list: List of non-ip packets.
-      trunc_list: A list of packets that truncated strangely and could
-                  not be turned into a stream.
+      parser_mediator (ParserMediator): mediates interactions between parsers
+          and other components, such as storage and dfvfs.
+      stream_object (Stream): stream.
+    """
+    event_data = PcapEventData()
+    event_data.dest_ip = stream_object.dest_ip
+    event_data.dest_port = stream_object.dest_port
+    event_data.first_packet_id = stream_object.first_packet_id
+    event_data.last_packet_id = stream_object.last_packet_id
+    event_data.packet_count = stream_object.packet_count
+    event_data.protocol = stream_object.protocol
+    event_data.size = stream_object.size
+    event_data.source_ip = stream_object.source_ip
+    event_data.source_port = stream_object.source_port
+    event_data.stream_data = repr(stream_object.stream_data[:50])
+    event_data.stream_type, event_data.protocol_data = (
+        stream_object.SpecialTypes())
+
+    date_time = dfdatetime_posix_time.PosixTime(
+        timestamp=stream_object.start_time)
+    event = time_events.DateTimeValuesEvent(
+        date_time, definitions.TIME_DESCRIPTION_START)
+    parser_mediator.ProduceEventWithEventData(event, event_data)
+
+    date_time = dfdatetime_posix_time.PosixTime(
+        timestamp=stream_object.end_time)
+    event = time_events.DateTimeValuesEvent(
+        date_time, definitions.TIME_DESCRIPTION_END)
+    parser_mediator.ProduceEventWithEventData(event, event_data)
+
+  def _ReadPackets(self, file_object, packet_header_class):
+    """Reads the packets.
+
+    The packets are read from the file-like object in large blocks instead
+    of with a read per packet header and packet data.
 
-    Returns:
-      A list of stream objects (instances of Stream).
+    Args:
+      file_object (dfvfs.FileIO): file-like object.
+      packet_header_class (type): dpkt packet header class.
+
+    Yields:
+      tuple[dpkt.pcap.PktHdr, bytes]: packet header and packet data.
     """
-    other_streams = []
+    packet_header_size = packet_header_class.__hdr_len__
 
-    for packet_values in other_list:
-      stream_object = self._ParseOtherPacket(packet_values)
-      if stream_object:
-        other_streams.append(stream_object)
+    data = b''
+    data_offset = 0
 
-    for packet_values in trunc_list:
-      ip_packet = packet_values[2]
+    while True:
+      if len(data) - data_offset < packet_header_size:
+        data = data[data_offset:] + file_object.read(self._READ_BUFFER_SIZE)
+        data_offset = 0
 
-      source_ip_address = socket.inet_ntoa(ip_packet.src)
-      destination_ip_address = socket.inet_ntoa(ip_packet.dst)
-      stream_object = Stream(
-          packet_values, ip_packet.data, source_ip_address,
-          destination_ip_address, 'BAD')
-      stream_object.protocol_data = 'Bad truncated IP packet'
-      other_streams.append(stream_object)
+        if len(data) < packet_header_size:
+          break
+
+      packet_header = packet_header_class(
+          data[data_offset:data_offset + packet_header_size])
+      data_offset += packet_header_size
 
-    return other_streams
+      if len(data) - data_offset < packet_header.caplen:
+        read_size = max(
+            packet_header.caplen - (len(data) - data_offset),
+            self._READ_BUFFER_SIZE)
+        data = data[data_offset:] + file_object.read(read_size)
+        data_offset = 0
+
+      packet_data = data[data_offset:data_offset + packet_header.caplen]
+      data_offset += len(packet_data)
+
+      yield packet_header, packet_data
 
   def ParseFileObject(self, parser_mediator, file_object, **kwargs):
     """Parses a PCAP file-like object.
@@ -759,91 +941,33 @@ class PcapParser(interface.FileObjectParser):
       raise errors.UnableToParseFile('Unsupported file signature')
 
     packet_number = 1
-    connections = {}
-    other_list = []
-    trunc_list = []
+    streams = collections.OrderedDict()
 
-    data = file_object.read(dpkt.pcap.PktHdr.__hdr_len__)
-    while data:
-      packet_header = packet_header_class(data)
+    for packet_header, packet_data in self._ReadPackets(
+        file_object, packet_header_class):
       timestamp = (packet_header.tv_sec * 1000000) + packet_header.tv_usec
-      packet_data = file_object.read(packet_header.caplen)
+
+      self._ExpireStreams(parser_mediator, streams, timestamp)
 
       ethernet_frame = dpkt.ethernet.Ethernet(packet_data)
 
       if ethernet_frame.type == dpkt.ethernet.ETH_TYPE_IP:
         self._ParseIPPacket(
-            connections, trunc_list, packet_number, timestamp,
+            parser_mediator, streams, packet_number, timestamp,
             len(ethernet_frame), ethernet_frame.data)
 
       else:
         packet_values = [
             timestamp, packet_number, ethernet_frame, len(ethernet_frame)]
-        other_list.append(packet_values)
+        stream_object = self._ParseOtherPacket(packet_values)
+        if stream_object:
+          self._ProduceStreamEvents(parser_mediator, stream_object)
 
       packet_number += 1
-      data = file_object.read(dpkt.pcap.PktHdr.__hdr_len__)
-
-    other_streams = self._ParseOtherStreams(other_list, trunc_list)
 
     for stream_object in sorted(
-        connections.values(), key=operator.attrgetter('start_time')):
-
-      if not stream_object.protocol == 'ICMP':
-        stream_object.Clean()
-
-      event_data = PcapEventData()
-      event_data.dest_ip = stream_object.dest_ip
-      event_data.dest_port = stream_object.dest_port
-      event_data.first_packet_id = min(stream_object.packet_id)
-      event_data.last_packet_id = max(stream_object.packet_id)
-      event_data.packet_count = len(stream_object.packet_id)
-      event_data.protocol = stream_object.protocol
-      event_data.size = stream_object.size
-      event_data.source_ip = stream_object.source_ip
-      event_data.source_port = stream_object.source_port
-      event_data.stream_data = repr(stream_object.stream_data[:50])
-      event_data.stream_type, event_data.protocol_data = (
-          stream_object.SpecialTypes())
-
-      date_time = dfdatetime_posix_time.PosixTime(
-          timestamp=min(stream_object.timestamps))
-      event = time_events.DateTimeValuesEvent(
-          date_time, definitions.TIME_DESCRIPTION_START)
-      parser_mediator.ProduceEventWithEventData(event, event_data)
-
-      date_time = dfdatetime_posix_time.PosixTime(
-          timestamp=max(stream_object.timestamps))
-      event = time_events.DateTimeValuesEvent(
-          date_time, definitions.TIME_DESCRIPTION_END)
-      parser_mediator.ProduceEventWithEventData(event, event_data)
-
-    for stream_object in other_streams:
-      event_data = PcapEventData()
-      event_data.dest_ip = stream_object.dest_ip
-      event_data.dest_port = stream_object.dest_port
-      event_data.first_packet_id = min(stream_object.packet_id)
-      event_data.last_packet_id = max(stream_object.packet_id)
-      event_data.packet_count = len(stream_object.packet_id)
-      event_data.protocol = stream_object.protocol
-      event_data.size = stream_object.size
-      event_data.source_ip = stream_object.source_ip
-      event_data.source_port = stream_object.source_port
-      event_data.stream_data = repr(stream_object.stream_data[:50])
-      event_data.stream_type, event_data.protocol_data = (
-          stream_object.SpecialTypes())
-
-      date_time = dfdatetime_posix_time.PosixTime(
-          timestamp=min(stream_object.timestamps))
-      event = time_events.DateTimeValuesEvent(
-          date_time, definitions.TIME_DESCRIPTION_START)
-      parser_mediator.ProduceEventWithEventData(event, event_data)
-
-      date_time = dfdatetime_posix_time.PosixTime(
-          timestamp=max(stream_object.timestamps))
-      event = time_events.DateTimeValuesEvent(
-          date_time, definitions.TIME_DESCRIPTION_END)
-      parser_mediator.ProduceEventWithEventData(event, event_data)
+        streams.values(), key=operator.attrgetter('start_time')):
+      self._ProduceStreamEvents(parser_mediator, stream_object)
 
 
 manager.ParsersManager.RegisterParser(PcapParser)
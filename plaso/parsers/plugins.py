@@ -86,9 +86,14 @@ class BasePlugin(object):
       parser_mediator: A parser mediator object (instance of ParserMediator).
     """
     parser_mediator.AppendToParserChain(self)
+    parser_mediator.StartParserMeasurement(self.NAME)
+
+    matched = False
     try:
       self.Process(parser_mediator, **kwargs)
+      matched = True
     finally:
+      parser_mediator.StopParserMeasurement(self.NAME, matched)
       parser_mediator.PopFromParserChain()
 
 
@@ -123,6 +123,12 @@ class SCCMParser(text_parser.PyparsingMultiLineTextParser):
        LINE_GRAMMAR_OFFSET + _PARSING_COMPONENTS['lastline_remainder'] +
        pyparsing.lineEnd)]
 
+  LINE_STRUCTURE_PREFILTERS = {
+      'log_entry': '<![LOG[',
+      'log_entry_at_end': '<![LOG[',
+      'log_entry_offset': '<![LOG[',
+      'log_entry_offset_at_end': '<![LOG['}
+
   def _GetISO8601String(self, structure):
     """Retrieves an ISO8601 date time string from the structure.
 
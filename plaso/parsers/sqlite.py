@@ -115,6 +115,8 @@ class SQLiteDatabase(object):
   """SQLite database.
 
   Attributes:
+    copied_data_size (int): size of the data copied into the temporary copies
+        of the database and Write-Ahead Log (WAL), in bytes.
     schema (dict[str, str]): schema as an SQL query per table name, for
         example {'Users': 'CREATE TABLE Users ("id" INTEGER PRIMARY KEY, ...)'}.
   """
@@ -142,6 +144,7 @@ class SQLiteDatabase(object):
     self._temporary_directory = temporary_directory
     self._temp_wal_file_path = ''
 
+    self.copied_data_size = 0
     self.schema = {}
 
   @property
@@ -152,6 +155,14 @@ class SQLiteDatabase(object):
 
     return []
 
+  @property
+  def temporary_file_path(self):
+    """str: path of the temporary copy of the database or None if not open."""
+    if self._is_open:
+      return self._temp_db_file_path
+
+    return None
+
   def _CopyFileObjectToTemporaryFile(self, file_object, temporary_file):
     """Copies the contents of the file-like object to a temporary file.
 
@@ -163,6 +174,7 @@ class SQLiteDatabase(object):
     data = file_object.read(self._READ_BUFFER_SIZE)
     while data:
       temporary_file.write(data)
+      self.copied_data_size += len(data)
       data = file_object.read(self._READ_BUFFER_SIZE)
 
   def Close(self):
@@ -206,7 +218,7 @@ class SQLiteDatabase(object):
     of the tables.
 
     Args:
-      file_object (dfvfs.FileIO): file-like object.
+      file_object (dfvfs.FileIO|file): file-like object.
       wal_file_object (Optional[dfvfs.FileIO]): file-like object for the
           Write-Ahead Log (WAL) file.
 
@@ -218,13 +230,6 @@ class SQLiteDatabase(object):
     if not file_object:
       raise ValueError('Missing file object.')
 
-    # TODO: Current design copies the entire file into a buffer
-    # that is parsed by each SQLite parser. This is not very efficient,
-    # especially when many SQLite parsers are ran against a relatively
-    # large SQLite database. This temporary file that is created should
-    # be usable by all SQLite parsers so the file should only be read
-    # once in memory and then deleted when all SQLite parsers have completed.
-
     # TODO: Change this into a proper implementation using APSW
     # and virtual filesystems when that will be available.
     # Info: http://apidoc.apsw.googlecode.com/hg/vfs.html#vfs and
@@ -315,14 +320,17 @@ class SQLiteParser(interface.FileEntryParser):
   _plugin_classes = {}
 
   def _OpenDatabaseWithWAL(
-      self, parser_mediator, database_file_entry, database_file_object,
-      filename):
+      self, parser_mediator, database_file_entry, database, filename):
     """Opens a database with its Write-Ahead Log (WAL) committed.
 
+    The database with WAL is copied from the temporary copy of the database,
+    which prevents the data of the database from being read, and decoded,
+    from the source again.
+
     Args:
       parser_mediator (ParserMediator): parser mediator.
       database_file_entry (dfvfs.FileEntry): file entry of the database.
-      database_file_object (dfvfs.FileIO): file-like object of the database.
+      database (SQLiteDatabase): database without WAL.
       filename (str): name of the database file entry.
 
     Returns:
@@ -354,7 +362,9 @@ class SQLiteParser(interface.FileEntryParser):
         filename, temporary_directory=parser_mediator.temporary_directory)
 
     try:
-      database_wal.Open(database_file_object, wal_file_object=wal_file_object)
+      with open(database.temporary_file_path, 'rb') as database_file_object:
+        database_wal.Open(
+            database_file_object, wal_file_object=wal_file_object)
 
     except (IOError, ValueError, sqlite3.DatabaseError) as exception:
       parser_mediator.ProduceExtractionError((
@@ -366,6 +376,9 @@ class SQLiteParser(interface.FileEntryParser):
     finally:
       wal_file_object.close()
 
+      parser_mediator.SampleCopiedDataSize(
+          'sqlite_wal', database_wal.copied_data_size)
+
     return database_wal, wal_file_entry
 
   @classmethod
@@ -396,13 +409,18 @@ class SQLiteParser(interface.FileEntryParser):
     except (IOError, ValueError, sqlite3.DatabaseError) as exception:
       parser_mediator.ProduceExtractionError(
           'unable to open SQLite database with error: {0!s}'.format(exception))
-      file_object.close()
       return
 
-    database_wal, wal_file_entry = self._OpenDatabaseWithWAL(
-        parser_mediator, file_entry, file_object, filename)
+    finally:
+      file_object.close()
 
-    file_object.close()
+      parser_mediator.SampleCopiedDataSize(
+          'sqlite', database.copied_data_size)
+
+    # The temporary copy of the database is shared by all the plugins and
+    # the WAL pass.
+    database_wal, wal_file_entry = self._OpenDatabaseWithWAL(
+        parser_mediator, file_entry, database, filename)
 
     # Create a cache in which the resulting tables are cached.
     cache = SQLiteCache()
@@ -456,6 +474,10 @@ class SQLiteParser(interface.FileEntryParser):
           parser_mediator.RemoveEventAttribute('schema_match')
 
     finally:
+      # The temporary copies are removed when the file has been parsed.
+      if database_wal:
+        database_wal.Close()
+
       database.Close()
 
 
@@ -201,6 +201,11 @@ class SyslogParser(text_parser.PyparsingMultiLineTextParser):
       ('syslog_comment', _SYSLOG_COMMENT),
       ('chromeos_syslog_line', _CHROMEOS_SYSLOG_LINE)]
 
+  LINE_STRUCTURE_PREFILTERS = {
+      'chromeos_syslog_line': re.compile(r'\d{4}-\d{2}-\d{2}T'),
+      'syslog_comment': re.compile(r'[A-Z][a-z]{2}\s*\d{1,2}\s+\d{2}\s*:'),
+      'syslog_line': re.compile(r'[A-Z][a-z]{2}\s*\d{1,2}\s+\d{2}\s*:')}
+
   _SUPPORTED_KEYS = frozenset([key for key, _ in LINE_STRUCTURES])
 
   def __init__(self):
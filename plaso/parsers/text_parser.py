@@ -9,6 +9,8 @@ parser.
 from __future__ import unicode_literals
 
 import abc
+import os
+import re
 
 import pyparsing
 
@@ -228,6 +230,14 @@ class PyparsingSingleLineTextParser(interface.FileObjectParser):
   # The value is the actual pyparsing structure.
   LINE_STRUCTURES = []
 
+  # Optional pre-filters of the line structures, which is a dictionary
+  # that contains a key of a line structure and a compiled regular expression
+  # or a literal prefix. A line is only parsed with the pyparsing structures
+  # of a key if the start of the line matches the pre-filter of the key. This
+  # prevents the relatively slow pyparsing from being applied to lines that
+  # cannot match the structure.
+  LINE_STRUCTURE_PREFILTERS = {}
+
   # In order for the tool to not read too much data into a buffer to evaluate
   # whether or not the parser is the right one for this file or not we
   # specifically define a maximum amount of bytes a single line can occupy. This
@@ -242,6 +252,9 @@ class PyparsingSingleLineTextParser(interface.FileObjectParser):
   # Allow for a maximum of 40 empty lines before we bail out.
   _MAXIMUM_DEPTH = 40
 
+  # The size of the batches in which the lines are read.
+  _READ_BUFFER_SIZE = 64 * 1024
+
   def __init__(self):
     """Initializes a parser."""
     super(PyparsingSingleLineTextParser, self).__init__()
@@ -249,6 +262,23 @@ class PyparsingSingleLineTextParser(interface.FileObjectParser):
     # TODO: self._line_structures is a work-around and this needs
     # a structural fix.
     self._line_structures = self.LINE_STRUCTURES
+    self._line_structure_prefilters = self._GetLineStructurePrefilters()
+
+  def _GetLineStructurePrefilters(self):
+    """Retrieves the line structure pre-filters.
+
+    Returns:
+      dict[str, function]: match functions of the compiled regular expressions
+          of the pre-filters per line structure key.
+    """
+    line_structure_prefilters = {}
+    for key, prefilter in iter(self.LINE_STRUCTURE_PREFILTERS.items()):
+      if isinstance(prefilter, py2to3.STRING_TYPES):
+        prefilter = re.compile(re.escape(prefilter))
+
+      line_structure_prefilters[key] = prefilter.match
+
+    return line_structure_prefilters
 
   def _IsText(self, bytes_in, encoding=None):
     """Examine the bytes in and determine if they are indicative of text.
@@ -338,6 +368,75 @@ class PyparsingSingleLineTextParser(interface.FileObjectParser):
 
     return line.strip()
 
+  def _ReadLines(self, file_object, offset, encoding):
+    """Reads lines from a file-like object in batches.
+
+    Reading and decoding the data in batches is considerably faster than
+    reading the lines one by one with dfvfs.TextFile.
+
+    Args:
+      file_object (dfvfs.FileIO): file-like object.
+      offset (int): offset of the first line in the file-like object.
+      encoding (str): encoding of the text.
+
+    Yields:
+      tuple[int, str]: offset of the end of the line and the line.
+
+    Raises:
+      UnicodeDecodeError: if the text cannot be decoded using the specified
+          encoding.
+    """
+    file_object.seek(offset, os.SEEK_SET)
+
+    text_reader = EncodedTextReader(
+        buffer_size=self._READ_BUFFER_SIZE, encoding=encoding)
+
+    encoded_lines = text_reader.ReadEncodedLines(
+        file_object, maximum_line_length=self.MAX_LINE_LENGTH)
+    while encoded_lines:
+      for line_size, encoded_line in encoded_lines:
+        offset += line_size
+        if line_size == len(encoded_line):
+          line = encoded_line.decode(encoding)
+
+        else:
+          # A truncated line can end with a partial multi-byte character.
+          line = encoded_line.decode(encoding, 'ignore')
+          logger.debug((
+              'Truncated line at offset: {0:d} to the maximum allowed length '
+              'of {1:d}. The last few characters of the truncated line are: '
+              '{2:s} [parser {3:s}]').format(
+                  offset - line_size, self.MAX_LINE_LENGTH, repr(line[-10:]),
+                  self.NAME))
+
+        yield offset, line
+
+      encoded_lines = text_reader.ReadEncodedLines(
+          file_object, maximum_line_length=self.MAX_LINE_LENGTH)
+
+  def _ReadNextLine(self, lines, offset):
+    """Reads the next line that is not empty.
+
+    Args:
+      lines (generator): generator of the lines, as returned by _ReadLines.
+      offset (int): offset of the end of the previous line.
+
+    Returns:
+      tuple[int, str]: offset of the end of the line and the line, stripped of
+          leading and trailing white space, or an empty string if there are
+          no more lines or if the maximum number of empty lines was reached.
+
+    Raises:
+      UnicodeDecodeError: if the text cannot be decoded using the specified
+          encoding.
+    """
+    for _ in range(self._MAXIMUM_DEPTH + 1):
+      offset, line = next(lines, (offset, ''))
+      if line not in self._EMPTY_LINES:
+        return offset, line.strip()
+
+    return offset, ''
+
   def ParseFileObject(self, parser_mediator, file_object, **kwargs):
     """Parses a text file-like object using a pyparsing definition.
 
@@ -383,6 +482,11 @@ class PyparsingSingleLineTextParser(interface.FileObjectParser):
 
     # Set the offset to the beginning of the file.
     self._current_offset = 0
+
+    # The remaining lines are read in batches after the first line.
+    line_end_offset = text_file_object.get_offset()
+    lines = self._ReadLines(file_object, line_end_offset, encoding)
+
     # Read every line in the text file.
     while line:
       if parser_mediator.abort:
@@ -391,6 +495,10 @@ class PyparsingSingleLineTextParser(interface.FileObjectParser):
       use_key = None
       # Try to parse the line using all the line structures.
       for key, structure in self.LINE_STRUCTURES:
+        prefilter = self._line_structure_prefilters.get(key, None)
+        if prefilter and not prefilter(line):
+          continue
+
         try:
           parsed_structure = structure.parseString(line)
         except pyparsing.ParseException:
@@ -408,10 +516,10 @@ class PyparsingSingleLineTextParser(interface.FileObjectParser):
             'unable to parse log line: {0:s} at offset: {1:d}'.format(
                 repr(line), self._current_offset))
 
-      self._current_offset = text_file_object.get_offset()
+      self._current_offset = line_end_offset
 
       try:
-        line = self._ReadLine(text_file_object)
+        line_end_offset, line = self._ReadNextLine(lines, line_end_offset)
       except UnicodeDecodeError:
         parser_mediator.ProduceExtractionError(
             'unable to read and decode log line at offset {0:d}'.format(
@@ -464,6 +572,7 @@ class EncodedTextReader(object):
     self._buffer_size = buffer_size
     self._current_offset = 0
     self._encoding = encoding
+    self._skipped_size = 0
 
     if self._encoding:
       self._new_line = '\n'.encode(self._encoding)
@@ -517,6 +626,70 @@ class EncodedTextReader(object):
 
     return line
 
+  def ReadEncodedLines(self, file_object, maximum_line_length=None):
+    """Reads a batch of encoded lines.
+
+    The data is read in chunks of the buffer size and split into lines
+    without decoding it. A partial line at the end of a chunk is kept in
+    the buffer until the next chunk is read.
+
+    A line that exceeds the maximum line length is truncated to the maximum
+    line length, without the end-of-line characters, and the remainder of
+    the line is skipped. The buffer never holds more than the maximum line
+    length of a partial line.
+
+    Args:
+      file_object (dfvfs.FileIO): file-like object.
+      maximum_line_length (Optional[int]): maximum length of a line in
+          characters, where None represents no maximum. The encoded line is
+          truncated on a multiple of the size of the end-of-line character,
+          which can cut a multi-byte character.
+
+    Returns:
+      list[tuple[int, bytes]]: size of the line in the file-like object and
+          the encoded line, including the end-of-line characters unless
+          the line was truncated, or an empty list if there are no more
+          lines.
+    """
+    maximum_line_size = None
+    if maximum_line_length:
+      maximum_line_size = maximum_line_length * self._new_line_length
+
+    lines = []
+    while not lines:
+      data = file_object.read(self._buffer_size)
+      if not data:
+        if self._buffer or self._skipped_size:
+          lines.append((
+              len(self._buffer) + self._skipped_size, self._buffer))
+          self._buffer = b''
+          self._skipped_size = 0
+        break
+
+      encoded_lines = b''.join([self._buffer, data]).split(self._new_line)
+      self._buffer = encoded_lines.pop()
+
+      for encoded_line in encoded_lines:
+        line_size = (
+            len(encoded_line) + self._new_line_length + self._skipped_size)
+        self._skipped_size = 0
+
+        if maximum_line_size and len(encoded_line) > maximum_line_size:
+          encoded_line = encoded_line[:maximum_line_size]
+        else:
+          encoded_line = b''.join([encoded_line, self._new_line])
+
+        lines.append((line_size, encoded_line))
+
+      if maximum_line_size and len(self._buffer) > maximum_line_size:
+        self._skipped_size += len(self._buffer) - maximum_line_size
+        self._buffer = self._buffer[:maximum_line_size]
+
+    for line_size, _ in lines:
+      self._current_offset += line_size
+
+    return lines
+
   def ReadLine(self, file_object):
     """Reads a line.
 
@@ -554,6 +727,7 @@ class EncodedTextReader(object):
     """Resets the encoded text reader."""
     self._buffer = b''
     self._current_offset = 0
+    self._skipped_size = 0
 
     self.lines = ''
 
@@ -636,6 +810,10 @@ class PyparsingMultiLineTextParser(PyparsingSingleLineTextParser):
 
       # Try to parse the line using all the line structures.
       for key, structure in self.LINE_STRUCTURES:
+        prefilter = self._line_structure_prefilters.get(key, None)
+        if prefilter and not prefilter(self._text_reader.lines):
+          continue
+
         try:
           structure_generator = structure.scanString(
               self._text_reader.lines, maxMatches=1)
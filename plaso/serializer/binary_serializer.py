@@ -0,0 +1,600 @@
+# -*- coding: utf-8 -*-
+"""The binary serializer object implementation.
+
+The binary serialization format is a compact tag-length-value encoding,
+similar to MessagePack, in which every value starts with a 1-byte tag:
+
+* 0x00, 0x01 and 0x02: None, False and True;
+* 0x03: 64-bit signed little-endian integer;
+* 0x04: integer that does not fit in 64-bit, stored as a decimal string;
+* 0x05: 64-bit little-endian floating-point;
+* 0x06: UTF-8 string with a 32-bit little-endian size;
+* 0x07: byte string with a 32-bit little-endian size;
+* 0x08 and 0x09: list and tuple with a 32-bit little-endian number of values,
+  followed by the values;
+* 0x0a and 0x0b: dict and collections.Counter with a 32-bit little-endian
+  number of items, followed by the keys and values;
+* 0x0c: attribute container, followed by the container type and a dict
+  of the attribute values without the dict tag;
+* 0x0d: path specification with a 32-bit little-endian size, followed by
+  the type indicator and a dict of the properties without the dict tag;
+* 0x0e: string from the table of known strings, followed by an 8-bit index;
+* 0x20 - 0x3f: UTF-8 string of 0 - 31 bytes;
+* 0x80 - 0xff: integer of 0 - 127.
+
+The table of known strings contains frequently used container types,
+attribute names and values, which are therefore stored in 2 bytes. Strings
+can only be appended to the table since its indexes are stored.
+"""
+
+from __future__ import unicode_literals
+
+import collections
+import struct
+
+from dfvfs.path import path_spec as dfvfs_path_spec
+from dfvfs.path import factory as dfvfs_path_spec_factory
+
+from plaso.containers import interface as containers_interface
+from plaso.containers import manager as containers_manager
+from plaso.lib import py2to3
+from plaso.serializer import interface
+from plaso.serializer import logger
+
+
+class BinaryAttributeContainerSerializer(
+    interface.AttributeContainerSerializer):
+  """Class that implements the binary attribute container serializer."""
+
+  _TAG_NONE = 0x00
+  _TAG_FALSE = 0x01
+  _TAG_TRUE = 0x02
+  _TAG_INTEGER = 0x03
+  _TAG_LONG_INTEGER = 0x04
+  _TAG_FLOAT = 0x05
+  _TAG_STRING = 0x06
+  _TAG_BYTES = 0x07
+  _TAG_LIST = 0x08
+  _TAG_TUPLE = 0x09
+  _TAG_DICT = 0x0a
+  _TAG_COUNTER = 0x0b
+  _TAG_ATTRIBUTE_CONTAINER = 0x0c
+  _TAG_PATH_SPEC = 0x0d
+  _TAG_KNOWN_STRING = 0x0e
+
+  _TAG_SHORT_STRING = 0x20
+  _TAG_SMALL_INTEGER = 0x80
+
+  _MAXIMUM_SHORT_STRING_SIZE = 31
+  _MAXIMUM_SMALL_INTEGER = 127
+
+  _MINIMUM_INTEGER = -(2 ** 63)
+  _MAXIMUM_INTEGER = (2 ** 63) - 1
+
+  # Python 2 encodes and decodes surrogates in UTF-8 without error handler.
+  if py2to3.PY_2:
+    _UNICODE_ERRORS = 'strict'
+  else:
+    _UNICODE_ERRORS = 'surrogatepass'
+
+  _TAGS = [struct.pack('B', tag) for tag in range(256)]
+
+  _DOUBLE = struct.Struct('<d')
+  _INT64 = struct.Struct('<q')
+  _UINT32 = struct.Struct('<I')
+
+  # Note that strings can only be appended to this table.
+  _KNOWN_STRINGS = (
+      # Container types.
+      'analysis_report',
+      'event',
+      'event_data',
+      'event_source',
+      'event_tag',
+      'extraction_error',
+      'session_completion',
+      'session_start',
+      'system_configuration',
+      'task_completion',
+      'task_start',
+      # Attribute names.
+      'data_type',
+      'display_name',
+      'event_data_row_identifier',
+      'event_row_identifier',
+      'file_entry_type',
+      'file_reference',
+      'file_size',
+      'file_system_type',
+      'filename',
+      'hostname',
+      'inode',
+      'is_allocated',
+      'labels',
+      'message',
+      'offset',
+      'parser',
+      'parser_chain',
+      'path_spec',
+      'pathspec',
+      'query',
+      'timestamp',
+      'timestamp_desc',
+      'username',
+      # Path specification property names.
+      'column_name',
+      'compression_method',
+      'data_stream',
+      'encoding_method',
+      'encryption_method',
+      'identifier',
+      'location',
+      'mft_attribute',
+      'mft_entry',
+      'part_index',
+      'range_offset',
+      'range_size',
+      'row_condition',
+      'row_index',
+      'start_offset',
+      'store_index',
+      'table_name',
+      'volume_index',
+      # Path specification type indicators.
+      'APFS',
+      'APFS_CONTAINER',
+      'BDE',
+      'BZIP2',
+      'COMPRESSED_STREAM',
+      'CPIO',
+      'DATA_RANGE',
+      'ENCODED_STREAM',
+      'ENCRYPTED_STREAM',
+      'EWF',
+      'FAKE',
+      'FVDE',
+      'GZIP',
+      'LVM',
+      'MOUNT',
+      'NTFS',
+      'OS',
+      'QCOW',
+      'RAW',
+      'SQLITE_BLOB',
+      'TAR',
+      'TSK',
+      'TSK_PARTITION',
+      'VHDI',
+      'VMDK',
+      'VSHADOW',
+      'XZ',
+      'ZIP',
+      # Timestamp descriptions.
+      'Content Modification Time',
+      'Creation Time',
+      'Expiration Time',
+      'Last Access Time',
+      'Last Connected Time',
+      'Last Login Time',
+      'Last Printed Time',
+      'Last Run Time',
+      'Last Time Executed',
+      'Last Visited Time',
+      'Metadata Modification Time',
+      'Not a time',
+      'Start Time',
+      'Written Time',
+      # Path specification node container type and attribute names.
+      'parent_row_identifier',
+      'path_spec_row_identifier',
+      'properties',
+      'type_indicator')
+
+  _KNOWN_STRINGS_INDEXES = {
+      string: index for index, string in enumerate(_KNOWN_STRINGS)}
+
+  # The maximum number of deserialized path specifications to cache. Path
+  # specifications that are serialized identically are deserialized into
+  # the same object, since many attribute containers, such as the event data
+  # of the same file, contain the same path specification.
+  _MAXIMUM_CACHED_PATH_SPECS = 1024
+
+  _path_spec_cache = {}
+
+  @classmethod
+  def _ReadAttributeContainer(cls, data, offset):
+    """Reads an attribute container.
+
+    Args:
+      data (bytes|bytearray): serialized data.
+      offset (int): offset of the container type.
+
+    Returns:
+      tuple[AttributeContainer, int]: attribute container and offset of
+          the data following the attribute container.
+
+    Raises:
+      ValueError: if the container type is not supported.
+    """
+    container_type, offset = cls._ReadValue(data, offset)
+
+    container_class = (
+        containers_manager.AttributeContainersManager.GetAttributeContainer(
+            container_type))
+    if not container_class:
+      raise ValueError('Unsupported container type: {0!s}'.format(
+          container_type))
+
+    attribute_values, offset = cls._ReadDict(data, offset)
+
+    container_object = container_class()
+
+    if container_type in ('event', 'event_data'):
+      for attribute_name, attribute_value in iter(attribute_values.items()):
+        setattr(container_object, attribute_name, attribute_value)
+
+    else:
+      # Be strict about which attributes to set in non event values.
+      supported_attribute_names = container_object.GetAttributeNames()
+      for attribute_name, attribute_value in iter(attribute_values.items()):
+        if attribute_name not in supported_attribute_names:
+          logger.debug((
+              '[ReadAttributeContainer] unsupported attribute name: '
+              '{0:s}.{1:s}').format(container_type, attribute_name))
+          continue
+
+        setattr(container_object, attribute_name, attribute_value)
+
+    return container_object, offset
+
+  @classmethod
+  def _ReadDict(cls, data, offset):
+    """Reads a dict.
+
+    Args:
+      data (bytes|bytearray): serialized data.
+      offset (int): offset of the number of items.
+
+    Returns:
+      tuple[dict[object, object], int]: dict and offset of the data following
+          the dict.
+    """
+    number_of_items = cls._UINT32.unpack_from(data, offset)[0]
+    offset += 4
+
+    dict_value = {}
+    for _ in range(number_of_items):
+      key, offset = cls._ReadValue(data, offset)
+      dict_value[key], offset = cls._ReadValue(data, offset)
+
+    return dict_value, offset
+
+  @classmethod
+  def _ReadPathSpec(cls, data, offset):
+    """Reads a path specification.
+
+    Args:
+      data (bytes|bytearray): serialized data.
+      offset (int): offset of the size of the path specification.
+
+    Returns:
+      tuple[dfvfs.PathSpec, int]: path specification and offset of the data
+          following the path specification.
+    """
+    data_size = cls._UINT32.unpack_from(data, offset)[0]
+    offset += 4
+
+    end_offset = offset + data_size
+    lookup_key = bytes(data[offset:end_offset])
+
+    path_spec = cls._path_spec_cache.get(lookup_key, None)
+    if not path_spec:
+      type_indicator, offset = cls._ReadValue(data, offset)
+      properties, offset = cls._ReadDict(data, offset)
+
+      path_spec = dfvfs_path_spec_factory.Factory.NewPathSpec(
+          type_indicator, **properties)
+
+      if len(cls._path_spec_cache) >= cls._MAXIMUM_CACHED_PATH_SPECS:
+        cls._path_spec_cache = {}
+      cls._path_spec_cache[lookup_key] = path_spec
+
+    return path_spec, end_offset
+
+  @classmethod
+  def _ReadValue(cls, data, offset):
+    """Reads a value.
+
+    Args:
+      data (bytes|bytearray): serialized data.
+      offset (int): offset of the tag of the value.
+
+    Returns:
+      tuple[object, int]: value and offset of the data following the value.
+
+    Raises:
+      ValueError: if the tag is not supported.
+    """
+    tag = data[offset]
+    offset += 1
+
+    if tag >= cls._TAG_SMALL_INTEGER:
+      return tag - cls._TAG_SMALL_INTEGER, offset
+
+    if cls._TAG_SHORT_STRING <= tag <= (
+        cls._TAG_SHORT_STRING + cls._MAXIMUM_SHORT_STRING_SIZE):
+      end_offset = offset + tag - cls._TAG_SHORT_STRING
+      value = data[offset:end_offset].decode('utf-8', cls._UNICODE_ERRORS)
+      return value, end_offset
+
+    if tag == cls._TAG_KNOWN_STRING:
+      return cls._KNOWN_STRINGS[data[offset]], offset + 1
+
+    if tag == cls._TAG_NONE:
+      return None, offset
+
+    if tag == cls._TAG_FALSE:
+      return False, offset
+
+    if tag == cls._TAG_TRUE:
+      return True, offset
+
+    if tag == cls._TAG_INTEGER:
+      return cls._INT64.unpack_from(data, offset)[0], offset + 8
+
+    if tag == cls._TAG_FLOAT:
+      return cls._DOUBLE.unpack_from(data, offset)[0], offset + 8
+
+    if tag in (cls._TAG_STRING, cls._TAG_BYTES, cls._TAG_LONG_INTEGER):
+      data_size = cls._UINT32.unpack_from(data, offset)[0]
+      offset += 4
+
+      end_offset = offset + data_size
+      if tag == cls._TAG_BYTES:
+        return bytes(data[offset:end_offset]), end_offset
+
+      value = data[offset:end_offset].decode('utf-8', cls._UNICODE_ERRORS)
+      if tag == cls._TAG_LONG_INTEGER:
+        value = py2to3.LONG_TYPE(value, 10)
+      return value, end_offset
+
+    if tag in (cls._TAG_LIST, cls._TAG_TUPLE):
+      number_of_values = cls._UINT32.unpack_from(data, offset)[0]
+      offset += 4
+
+      list_value = []
+      for _ in range(number_of_values):
+        value, offset = cls._ReadValue(data, offset)
+        list_value.append(value)
+
+      if tag == cls._TAG_TUPLE:
+        return tuple(list_value), offset
+      return list_value, offset
+
+    if tag == cls._TAG_DICT:
+      return cls._ReadDict(data, offset)
+
+    if tag == cls._TAG_COUNTER:
+      dict_value, offset = cls._ReadDict(data, offset)
+      return collections.Counter(dict_value), offset
+
+    if tag == cls._TAG_ATTRIBUTE_CONTAINER:
+      return cls._ReadAttributeContainer(data, offset)
+
+    if tag == cls._TAG_PATH_SPEC:
+      return cls._ReadPathSpec(data, offset)
+
+    raise ValueError('Unsupported tag: 0x{0:02x}'.format(tag))
+
+  @classmethod
+  def _WriteAttributeContainer(cls, attribute_container, data_chunks):
+    """Writes an attribute container.
+
+    Args:
+      attribute_container (AttributeContainer): attribute container.
+      data_chunks (list[bytes]): chunks of the serialized data.
+
+    Raises:
+      ValueError: if the attribute container type is not supported.
+    """
+    container_type = getattr(attribute_container, 'CONTAINER_TYPE', None)
+    if not container_type:
+      raise ValueError('Unsupported attribute container type: {0!s}.'.format(
+          type(attribute_container)))
+
+    attribute_values = list(attribute_container.GetAttributes())
+
+    data_chunks.append(cls._TAGS[cls._TAG_ATTRIBUTE_CONTAINER])
+    cls._WriteValue(container_type, data_chunks)
+    data_chunks.append(cls._UINT32.pack(len(attribute_values)))
+
+    for attribute_name, attribute_value in attribute_values:
+      cls._WriteValue(attribute_name, data_chunks)
+      cls._WriteValue(attribute_value, data_chunks)
+
+  @classmethod
+  def _WriteDict(cls, tag, dict_value, data_chunks):
+    """Writes a dict.
+
+    Args:
+      tag (int): tag of the dict or None if the tag should not be written.
+      dict_value (dict[object, object]): dict.
+      data_chunks (list[bytes]): chunks of the serialized data.
+    """
+    if tag is not None:
+      data_chunks.append(cls._TAGS[tag])
+    data_chunks.append(cls._UINT32.pack(len(dict_value)))
+
+    for key, value in iter(dict_value.items()):
+      cls._WriteValue(key, data_chunks)
+      cls._WriteValue(value, data_chunks)
+
+  @classmethod
+  def _WritePathSpec(cls, path_spec, data_chunks):
+    """Writes a path specification.
+
+    Args:
+      path_spec (dfvfs.PathSpec): path specification.
+      data_chunks (list[bytes]): chunks of the serialized data.
+    """
+    properties = {}
+    for property_name in dfvfs_path_spec_factory.Factory.PROPERTY_NAMES:
+      property_value = getattr(path_spec, property_name, None)
+      if property_value is not None:
+        properties[property_name] = property_value
+
+    if path_spec.HasParent():
+      properties['parent'] = path_spec.parent
+
+    path_spec_data_chunks = []
+    cls._WriteValue(path_spec.type_indicator, path_spec_data_chunks)
+    cls._WriteDict(None, properties, path_spec_data_chunks)
+    path_spec_data = b''.join(path_spec_data_chunks)
+
+    data_chunks.append(cls._TAGS[cls._TAG_PATH_SPEC])
+    data_chunks.append(cls._UINT32.pack(len(path_spec_data)))
+    data_chunks.append(path_spec_data)
+
+  @classmethod
+  def _WriteValue(cls, value, data_chunks):
+    """Writes a value.
+
+    Args:
+      value (object): value.
+      data_chunks (list[bytes]): chunks of the serialized data.
+
+    Raises:
+      TypeError: if the type of the value is not supported.
+    """
+    if isinstance(value, py2to3.UNICODE_TYPE):
+      index = cls._KNOWN_STRINGS_INDEXES.get(value, None)
+      if index is not None:
+        data_chunks.append(cls._TAGS[cls._TAG_KNOWN_STRING])
+        data_chunks.append(cls._TAGS[index])
+        return
+
+      encoded_value = value.encode('utf-8', cls._UNICODE_ERRORS)
+      data_size = len(encoded_value)
+      if data_size <= cls._MAXIMUM_SHORT_STRING_SIZE:
+        data_chunks.append(cls._TAGS[cls._TAG_SHORT_STRING + data_size])
+      else:
+        data_chunks.append(cls._TAGS[cls._TAG_STRING])
+        data_chunks.append(cls._UINT32.pack(data_size))
+      data_chunks.append(encoded_value)
+
+    elif value is None:
+      data_chunks.append(cls._TAGS[cls._TAG_NONE])
+
+    # Note that bool is a subclass of int and must be checked first.
+    elif isinstance(value, bool):
+      if value:
+        data_chunks.append(cls._TAGS[cls._TAG_TRUE])
+      else:
+        data_chunks.append(cls._TAGS[cls._TAG_FALSE])
+
+    elif isinstance(value, py2to3.INTEGER_TYPES):
+      if 0 <= value <= cls._MAXIMUM_SMALL_INTEGER:
+        data_chunks.append(cls._TAGS[cls._TAG_SMALL_INTEGER + value])
+
+      elif cls._MINIMUM_INTEGER <= value <= cls._MAXIMUM_INTEGER:
+        data_chunks.append(cls._TAGS[cls._TAG_INTEGER])
+        data_chunks.append(cls._INT64.pack(value))
+
+      else:
+        encoded_value = '{0:d}'.format(value).encode('ascii')
+        data_chunks.append(cls._TAGS[cls._TAG_LONG_INTEGER])
+        data_chunks.append(cls._UINT32.pack(len(encoded_value)))
+        data_chunks.append(encoded_value)
+
+    elif isinstance(value, py2to3.BYTES_TYPE):
+      data_chunks.append(cls._TAGS[cls._TAG_BYTES])
+      data_chunks.append(cls._UINT32.pack(len(value)))
+      data_chunks.append(value)
+
+    elif isinstance(value, float):
+      data_chunks.append(cls._TAGS[cls._TAG_FLOAT])
+      data_chunks.append(cls._DOUBLE.pack(value))
+
+    elif isinstance(value, (list, tuple)):
+      if isinstance(value, list):
+        data_chunks.append(cls._TAGS[cls._TAG_LIST])
+      else:
+        data_chunks.append(cls._TAGS[cls._TAG_TUPLE])
+      data_chunks.append(cls._UINT32.pack(len(value)))
+
+      for list_element in value:
+        cls._WriteValue(list_element, data_chunks)
+
+    # Note that collections.Counter is a subclass of dict and must be checked
+    # first.
+    elif isinstance(value, collections.Counter):
+      cls._WriteDict(cls._TAG_COUNTER, value, data_chunks)
+
+    elif isinstance(value, dict):
+      cls._WriteDict(cls._TAG_DICT, value, data_chunks)
+
+    elif isinstance(value, dfvfs_path_spec.PathSpec):
+      cls._WritePathSpec(value, data_chunks)
+
+    elif isinstance(value, containers_interface.AttributeContainer):
+      cls._WriteAttributeContainer(value, data_chunks)
+
+    else:
+      raise TypeError('Unsupported value type: {0!s}.'.format(type(value)))
+
+  @classmethod
+  def ReadSerialized(cls, serialized):
+    """Reads an attribute container from serialized form.
+
+    Args:
+      serialized (bytes): serialized form.
+
+    Returns:
+      AttributeContainer: attribute container or None.
+
+    Raises:
+      TypeError: if the serialized data does not contain an attribute
+          container.
+      ValueError: if the serialized data cannot be read.
+    """
+    if not serialized:
+      return None
+
+    if py2to3.PY_2:
+      # Indexing a bytearray returns an integer in Python 2 and 3.
+      serialized = bytearray(serialized)
+
+    try:
+      attribute_container, _ = cls._ReadValue(serialized, 0)
+    except (IndexError, UnicodeDecodeError, struct.error) as exception:
+      raise ValueError(
+          'Unable to read serialized data with error: {0!s}'.format(exception))
+
+    if not isinstance(
+        attribute_container, containers_interface.AttributeContainer):
+      raise TypeError('{0!s} is not an attribute container type.'.format(
+          type(attribute_container)))
+
+    return attribute_container
+
+  @classmethod
+  def WriteSerialized(cls, attribute_container):
+    """Writes an attribute container to serialized form.
+
+    Args:
+      attribute_container (AttributeContainer): attribute container.
+
+    Returns:
+      bytes: serialized form.
+
+    Raises:
+      TypeError: if not an instance of AttributeContainer.
+    """
+    if not isinstance(
+        attribute_container, containers_interface.AttributeContainer):
+      raise TypeError('{0!s} is not an attribute container type.'.format(
+          type(attribute_container)))
+
+    data_chunks = []
+    cls._WriteAttributeContainer(attribute_container, data_chunks)
+    return b''.join(data_chunks)
@@ -0,0 +1,473 @@
+# -*- coding: utf-8 -*-
+"""Compression codecs of the serialized attribute container data."""
+
+from __future__ import unicode_literals
+
+import abc
+import zlib
+
+try:
+  import lz4.block
+except ImportError:
+  lz4 = None
+
+try:
+  import lzma
+except ImportError:
+  try:
+    from backports import lzma
+  except ImportError:
+    lzma = None
+
+try:
+  import zstandard
+except ImportError:
+  zstandard = None
+
+from plaso.lib import definitions
+from plaso.lib import py2to3
+
+
+class CompressionCodec(object):
+  """Compression codec interface.
+
+  Attributes:
+    dictionary (bytes): shared compression dictionary or None if not set.
+  """
+
+  COMPRESSION_FORMAT = None
+
+  # True if the codec supports shared compression dictionaries.
+  SUPPORTS_DICTIONARY = False
+
+  # The maximum size of a shared compression dictionary.
+  _MAXIMUM_DICTIONARY_SIZE = 0
+
+  def __init__(self, dictionary=None):
+    """Initializes a compression codec.
+
+    Args:
+      dictionary (Optional[bytes]): shared compression dictionary.
+
+    Raises:
+      ValueError: if a dictionary is provided and the codec does not
+          support dictionaries.
+    """
+    if dictionary and not self.SUPPORTS_DICTIONARY:
+      raise ValueError(
+          'Compression format: {0:s} does not support dictionaries.'.format(
+              self.COMPRESSION_FORMAT))
+
+    super(CompressionCodec, self).__init__()
+    self.dictionary = dictionary or None
+
+  @abc.abstractmethod
+  def Compress(self, data):
+    """Compresses data.
+
+    Args:
+      data (bytes): uncompressed data.
+
+    Returns:
+      bytes: compressed data.
+    """
+
+  @abc.abstractmethod
+  def Decompress(self, data):
+    """Decompresses data.
+
+    Args:
+      data (bytes): compressed data.
+
+    Returns:
+      bytes: uncompressed data.
+
+    Raises:
+      IOError: if the data cannot be decompressed.
+    """
+
+  @classmethod
+  def TrainDictionary(cls, samples):
+    """Trains a shared compression dictionary.
+
+    The default implementation uses the trailing part of the samples as
+    dictionary. A preset dictionary is used as if it was the data preceding
+    the data being compressed, where the data at its end is referenced most
+    efficiently.
+
+    Args:
+      samples (list[bytes]): samples of the data to compress.
+
+    Returns:
+      bytes: shared compression dictionary or None if the codec does not
+          support dictionaries or no dictionary could be trained.
+    """
+    if not cls.SUPPORTS_DICTIONARY:
+      return None
+
+    data = b''.join(samples)
+    return data[-cls._MAXIMUM_DICTIONARY_SIZE:] or None
+
+
+class LZ4Codec(CompressionCodec):
+  """LZ4 block compression codec, which favors speed over size."""
+
+  COMPRESSION_FORMAT = definitions.COMPRESSION_FORMAT_LZ4
+
+  SUPPORTS_DICTIONARY = True
+
+  # LZ4 only references data within the preceding 64 KiB.
+  _MAXIMUM_DICTIONARY_SIZE = 64 * 1024
+
+  def Compress(self, data):
+    """Compresses data.
+
+    Args:
+      data (bytes): uncompressed data.
+
+    Returns:
+      bytes: compressed data.
+    """
+    if self.dictionary:
+      return lz4.block.compress(data, store_size=True, dict=self.dictionary)
+
+    return lz4.block.compress(data, store_size=True)
+
+  def Decompress(self, data):
+    """Decompresses data.
+
+    Args:
+      data (bytes): compressed data.
+
+    Returns:
+      bytes: uncompressed data.
+
+    Raises:
+      IOError: if the data cannot be decompressed.
+    """
+    try:
+      if self.dictionary:
+        return lz4.block.decompress(data, dict=self.dictionary)
+
+      return lz4.block.decompress(data)
+
+    except lz4.block.LZ4BlockError as exception:
+      raise IOError('Unable to decompress LZ4 data with error: {0!s}'.format(
+          exception))
+
+
+class LZMACodec(CompressionCodec):
+  """LZMA compression codec, which favors size over speed."""
+
+  COMPRESSION_FORMAT = definitions.COMPRESSION_FORMAT_LZMA
+
+  def Compress(self, data):
+    """Compresses data.
+
+    Args:
+      data (bytes): uncompressed data.
+
+    Returns:
+      bytes: compressed data.
+    """
+    return lzma.compress(data)
+
+  def Decompress(self, data):
+    """Decompresses data.
+
+    Args:
+      data (bytes): compressed data.
+
+    Returns:
+      bytes: uncompressed data.
+
+    Raises:
+      IOError: if the data cannot be decompressed.
+    """
+    try:
+      return lzma.decompress(data)
+
+    except (EOFError, lzma.LZMAError) as exception:
+      raise IOError('Unable to decompress LZMA data with error: {0!s}'.format(
+          exception))
+
+
+class NoneCodec(CompressionCodec):
+  """Codec that stores data without compression."""
+
+  COMPRESSION_FORMAT = definitions.COMPRESSION_FORMAT_NONE
+
+  def Compress(self, data):
+    """Compresses data.
+
+    Args:
+      data (bytes): uncompressed data.
+
+    Returns:
+      bytes: the uncompressed data.
+    """
+    return data
+
+  def Decompress(self, data):
+    """Decompresses data.
+
+    Args:
+      data (bytes): compressed data.
+
+    Returns:
+      bytes: the data.
+    """
+    return data
+
+
+class ZlibCodec(CompressionCodec):
+  """Zlib compression codec."""
+
+  COMPRESSION_FORMAT = definitions.COMPRESSION_FORMAT_ZLIB
+
+  # Preset dictionaries are only supported by the zlib module of Python 3.
+  SUPPORTS_DICTIONARY = py2to3.PY_3
+
+  # Deflate only references data within the preceding 32 KiB.
+  _MAXIMUM_DICTIONARY_SIZE = 32 * 1024
+
+  def Compress(self, data):
+    """Compresses data.
+
+    Args:
+      data (bytes): uncompressed data.
+
+    Returns:
+      bytes: compressed data.
+    """
+    if not self.dictionary:
+      return zlib.compress(data)
+
+    compressor = zlib.compressobj(
+        zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, zlib.MAX_WBITS,
+        zlib.DEF_MEM_LEVEL, zlib.Z_DEFAULT_STRATEGY, self.dictionary)
+    return compressor.compress(data) + compressor.flush()
+
+  def Decompress(self, data):
+    """Decompresses data.
+
+    Args:
+      data (bytes): compressed data.
+
+    Returns:
+      bytes: uncompressed data.
+
+    Raises:
+      IOError: if the data cannot be decompressed.
+    """
+    if self.dictionary and not self.SUPPORTS_DICTIONARY:
+      raise IOError(
+          'Unable to decompress zlib data with dictionary, since dictionaries '
+          'are not supported by the zlib module.')
+
+    try:
+      if not self.dictionary:
+        return zlib.decompress(data)
+
+      decompressor = zlib.decompressobj(zlib.MAX_WBITS, self.dictionary)
+      return decompressor.decompress(data) + decompressor.flush()
+
+    except zlib.error as exception:
+      raise IOError('Unable to decompress zlib data with error: {0!s}'.format(
+          exception))
+
+
+class ZstdCodec(CompressionCodec):
+  """Zstandard compression codec."""
+
+  COMPRESSION_FORMAT = definitions.COMPRESSION_FORMAT_ZSTD
+
+  SUPPORTS_DICTIONARY = True
+
+  _MAXIMUM_DICTIONARY_SIZE = 112 * 1024
+
+  def __init__(self, dictionary=None):
+    """Initializes a compression codec.
+
+    Args:
+      dictionary (Optional[bytes]): shared compression dictionary.
+    """
+    super(ZstdCodec, self).__init__(dictionary=dictionary)
+
+    dictionary_data = None
+    if self.dictionary:
+      dictionary_data = zstandard.ZstdCompressionDict(self.dictionary)
+
+    # Note that the compression contexts are reused for every call, which
+    # prevents having to load the dictionary for every attribute container.
+    self._compressor = zstandard.ZstdCompressor(dict_data=dictionary_data)
+    self._decompressor = zstandard.ZstdDecompressor(dict_data=dictionary_data)
+
+  def Compress(self, data):
+    """Compresses data.
+
+    Args:
+      data (bytes): uncompressed data.
+
+    Returns:
+      bytes: compressed data.
+    """
+    return self._compressor.compress(data)
+
+  def Decompress(self, data):
+    """Decompresses data.
+
+    Args:
+      data (bytes): compressed data.
+
+    Returns:
+      bytes: uncompressed data.
+
+    Raises:
+      IOError: if the data cannot be decompressed.
+    """
+    try:
+      return self._decompressor.decompress(data)
+
+    except zstandard.ZstdError as exception:
+      raise IOError((
+          'Unable to decompress Zstandard data with error: {0!s}').format(
+              exception))
+
+  @classmethod
+  def TrainDictionary(cls, samples):
+    """Trains a shared compression dictionary.
+
+    Args:
+      samples (list[bytes]): samples of the data to compress.
+
+    Returns:
+      bytes: shared compression dictionary or None if no dictionary could
+          be trained, for example when there are too few samples.
+    """
+    try:
+      dictionary = zstandard.train_dictionary(
+          cls._MAXIMUM_DICTIONARY_SIZE, samples)
+    except zstandard.ZstdError:
+      return None
+
+    return dictionary.as_bytes()
+
+
+class CompressionCodecsManager(object):
+  """Compression codecs manager."""
+
+  _codec_classes = {}
+
+  @classmethod
+  def DeregisterCodec(cls, codec_class):
+    """Deregisters a compression codec class.
+
+    Args:
+      codec_class (type): compression codec class.
+
+    Raises:
+      KeyError: if codec class is not set for the corresponding compression
+          format.
+    """
+    compression_format = codec_class.COMPRESSION_FORMAT
+    if compression_format not in cls._codec_classes:
+      raise KeyError(
+          'Codec class not set for compression format: {0:s}.'.format(
+              compression_format))
+
+    del cls._codec_classes[compression_format]
+
+  @classmethod
+  def GetCodec(cls, compression_format, dictionary=None):
+    """Retrieves a compression codec.
+
+    Args:
+      compression_format (str): compression format.
+      dictionary (Optional[bytes]): shared compression dictionary.
+
+    Returns:
+      CompressionCodec: compression codec.
+
+    Raises:
+      ValueError: if the compression format is not supported or a dictionary
+          is provided and the codec does not support dictionaries.
+    """
+    codec_class = cls._codec_classes.get(compression_format, None)
+    if not codec_class:
+      raise ValueError('Unsupported compression format: {0!s}'.format(
+          compression_format))
+
+    return codec_class(dictionary=dictionary)
+
+  @classmethod
+  def GetCompressionFormats(cls):
+    """Retrieves the compression formats of the available codecs.
+
+    Returns:
+      list[str]: compression formats.
+    """
+    return sorted(cls._codec_classes.keys())
+
+  @classmethod
+  def SupportsDictionary(cls, compression_format):
+    """Determines if a compression format supports shared dictionaries.
+
+    Args:
+      compression_format (str): compression format.
+
+    Returns:
+      bool: True if the codec of the compression format is available and
+          supports shared compression dictionaries.
+    """
+    codec_class = cls._codec_classes.get(compression_format, None)
+    return bool(codec_class and codec_class.SUPPORTS_DICTIONARY)
+
+  @classmethod
+  def TrainDictionary(cls, compression_format, samples):
+    """Trains a shared compression dictionary.
+
+    Args:
+      compression_format (str): compression format.
+      samples (list[bytes]): samples of the data to compress.
+
+    Returns:
+      bytes: shared compression dictionary or None if not supported.
+    """
+    codec_class = cls._codec_classes.get(compression_format, None)
+    if not codec_class:
+      return None
+
+    return codec_class.TrainDictionary(samples)
+
+  @classmethod
+  def RegisterCodec(cls, codec_class):
+    """Registers a compression codec class.
+
+    Args:
+      codec_class (type): compression codec class.
+
+    Raises:
+      KeyError: if codec class is already set for the corresponding
+          compression format.
+    """
+    compression_format = codec_class.COMPRESSION_FORMAT
+    if compression_format in cls._codec_classes:
+      raise KeyError(
+          'Codec class already set for compression format: {0:s}.'.format(
+              compression_format))
+
+    cls._codec_classes[compression_format] = codec_class
+
+
+CompressionCodecsManager.RegisterCodec(NoneCodec)
+CompressionCodecsManager.RegisterCodec(ZlibCodec)
+
+if lz4:
+  CompressionCodecsManager.RegisterCodec(LZ4Codec)
+
+if lzma:
+  CompressionCodecsManager.RegisterCodec(LZMACodec)
+
+if zstandard:
+  CompressionCodecsManager.RegisterCodec(ZstdCodec)
@@ -115,24 +115,28 @@ class SerializedEventHeap(object):
 
         int: event timestamp or None if the heap is empty
         bytes: serialized event or None if the heap is empty
+        tuple: values of the event attributes that are stored separately
+            from the serialized event or None if not available.
     """
     try:
-      timestamp, serialized_event = heapq.heappop(self._heap)
+      timestamp, serialized_event, attribute_values = heapq.heappop(self._heap)
 
       self.data_size -= len(serialized_event)
-      return timestamp, serialized_event
+      return timestamp, serialized_event, attribute_values
 
     except IndexError:
-      return None, None
+      return None, None, None
 
-  def PushEvent(self, timestamp, event_data):
+  def PushEvent(self, timestamp, event_data, attribute_values=None):
     """Pushes a serialized event onto the heap.
 
     Args:
       timestamp (int): event timestamp, which contains the number of
           micro seconds since January 1, 1970, 00:00:00 UTC.
       event_data (bytes): serialized event.
+      attribute_values (Optional[tuple]): values of the event attributes
+          that are stored separately from the serialized event.
     """
-    heap_values = (timestamp, event_data)
+    heap_values = (timestamp, event_data, attribute_values)
     heapq.heappush(self._heap, heap_values)
     self.data_size += len(event_data)
@@ -61,20 +61,37 @@ class StorageFactory(object):
     return None
 
   @classmethod
-  def CreateStorageWriter(cls, storage_format, session, path):
+  def CreateStorageWriter(
+      cls, storage_format, session, path,
+      serialization_format=definitions.SERIALIZER_FORMAT_JSON,
+      compression_format=None, compression_formats=None,
+      compression_dictionaries=False):
     """Creates a storage writer.
 
     Args:
       session (Session): session the storage changes are part of.
       path (str): path to the storage file.
       storage_format (str): storage format.
+      serialization_format (Optional[str]): serialization format of a newly
+          created storage file.
+      compression_format (Optional[str]): compression format of a newly
+          created storage file, where None represents the default
+          compression format.
+      compression_formats (Optional[dict[str, str]]): compression formats
+          per container type of a newly created storage file.
+      compression_dictionaries (Optional[bool]): True if shared compression
+          dictionaries should be trained per container type.
 
     Returns:
       StorageWriter: a storage writer or None if the storage file cannot be
           opened or the storage format is not supported.
     """
     if storage_format == definitions.STORAGE_FORMAT_SQLITE:
-      return sqlite_writer.SQLiteStorageFileWriter(session, path)
+      return sqlite_writer.SQLiteStorageFileWriter(
+          session, path, serialization_format=serialization_format,
+          compression_format=compression_format,
+          compression_formats=compression_formats,
+          compression_dictionaries=compression_dictionaries)
 
     return None
 
@@ -16,6 +16,7 @@ class FakeStorageWriter(interface.StorageWriter):
 
   Attributes:
     analysis_reports (list[AnalysisReport]): analysis reports.
+    parser_statistics (list[ParserStatistics]): parser statistics.
     session_completion (SessionCompletion): session completion attribute
         container.
     session_start (SessionStart): session start attribute container.
@@ -42,6 +43,7 @@ class FakeStorageWriter(interface.StorageWriter):
     self._is_open = False
     self._task_storage_writers = {}
     self.analysis_reports = []
+    self.parser_statistics = []
     self.session_completion = None
     self.session_start = None
     self.task_completion = None
@@ -202,6 +204,21 @@ class FakeStorageWriter(interface.StorageWriter):
     self._event_tags.append(event_tag)
     self.number_of_event_tags += 1
 
+  def AddParserStatistics(self, parser_statistics):
+    """Adds parser statistics.
+
+    Args:
+      parser_statistics (ParserStatistics): parser statistics.
+
+    Raises:
+      IOError: when the storage writer is closed.
+    """
+    self._RaiseIfNotWritable()
+
+    parser_statistics = self._PrepareAttributeContainer(parser_statistics)
+
+    self.parser_statistics.append(parser_statistics)
+
   def CreateTaskStorage(self, task):
     """Creates a task storage.
 
@@ -330,10 +347,14 @@ class FakeStorageWriter(interface.StorageWriter):
     self._written_event_source_index += 1
     return event_source
 
-  def GetSortedEvents(self, time_range=None):
+  def GetSortedEvents(self, filter_conditions=None, time_range=None):
     """Retrieves the events in increasing chronological order.
 
     Args:
+      filter_conditions (Optional[list[tuple[str, str, object]]]): filter
+          conditions, each containing an attribute name, a comparison operator
+          and a value, that the events must meet. The storage can use these
+          to skip events, but can also return events that do not meet them.
       time_range (Optional[TimeRange]): time range used to filter events
           that fall in a specific period.
 
@@ -363,6 +384,32 @@ class FakeStorageWriter(interface.StorageWriter):
 
     return iter(event_heap.PopEvents())
 
+  def GetSortedEventsWithEventData(
+      self, filter_conditions=None, time_range=None):
+    """Retrieves the events, combined with their event data, in order.
+
+    The events are retrieved in increasing chronological order and
+    the attributes of the event data they reference are set on the events.
+
+    Args:
+      filter_conditions (Optional[list[tuple[str, str, object]]]): filter
+          conditions, each containing an attribute name, a comparison operator
+          and a value, that the events must meet. The storage can use these
+          to skip events, but can also return events that do not meet them.
+      time_range (Optional[TimeRange]): time range used to filter events
+          that fall in a specific period.
+
+    Returns:
+      generator(EventObject): event generator.
+
+    Raises:
+      IOError: when the storage writer is closed.
+    """
+    # Note that GetSortedEvents already combines the events with their
+    # event data.
+    return self.GetSortedEvents(
+        filter_conditions=filter_conditions, time_range=time_range)
+
   def FinalizeTaskStorage(self, task):
     """Finalizes a processed task storage.
 
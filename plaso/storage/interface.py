@@ -4,11 +4,16 @@
 from __future__ import unicode_literals
 
 import abc
+import copy
 import os
 import shutil
 import tempfile
 
+from plaso.containers import errors
+from plaso.containers import event_sources
+from plaso.containers import events
 from plaso.lib import definitions
+from plaso.serializer import binary_serializer
 from plaso.serializer import json_serializer
 
 
@@ -90,6 +95,67 @@ class SerializedAttributeContainerList(object):
     self.next_sequence_number += 1
 
 
+class AttributeContainerSerializationMixIn(object):
+  """Mix-in that serializes attribute containers in a serialization format.
+
+  The class using the mix-in must initialize the _serializer,
+  _serializers_profiler and serialization_format attributes.
+  """
+
+  _SERIALIZERS = {
+      definitions.SERIALIZER_FORMAT_BINARY: (
+          binary_serializer.BinaryAttributeContainerSerializer),
+      definitions.SERIALIZER_FORMAT_JSON: (
+          json_serializer.JSONAttributeContainerSerializer)}
+
+  def _DeserializeAttributeContainer(self, container_type, serialized_data):
+    """Deserializes an attribute container.
+
+    Args:
+      container_type (str): attribute container type.
+      serialized_data (bytes): serialized attribute container data.
+
+    Returns:
+      AttributeContainer: attribute container or None.
+    """
+    if not serialized_data:
+      return None
+
+    if self._serializers_profiler:
+      self._serializers_profiler.StartTiming(container_type)
+
+    if self.serialization_format == definitions.SERIALIZER_FORMAT_JSON:
+      try:
+        serialized_data = serialized_data.decode('utf-8')
+      except UnicodeDecodeError as exception:
+        raise IOError('Unable to decode serialized data: {0!s}'.format(
+            exception))
+
+    attribute_container = self._serializer.ReadSerialized(serialized_data)
+
+    if self._serializers_profiler:
+      self._serializers_profiler.StopTiming(container_type)
+
+    return attribute_container
+
+  def _SetSerializationFormat(self, serialization_format):
+    """Sets the serialization format.
+
+    Args:
+      serialization_format (str): serialization format.
+
+    Raises:
+      IOError: if the serialization format is not supported.
+    """
+    serializer = self._SERIALIZERS.get(serialization_format, None)
+    if not serializer:
+      raise IOError('Unsupported serialization format: {0!s}'.format(
+          serialization_format))
+
+    self._serializer = serializer
+    self.serialization_format = serialization_format
+
+
 class BaseStore(object):
   """Storage interface."""
 
@@ -139,6 +205,14 @@ class BaseStore(object):
       event_tag (EventTag): event tag.
     """
 
+  @abc.abstractmethod
+  def AddParserStatistics(self, parser_statistics):
+    """Adds parser statistics.
+
+    Args:
+      parser_statistics (ParserStatistics): parser statistics.
+    """
+
   @abc.abstractmethod
   def Close(self):
     """Closes the storage."""
@@ -222,13 +296,51 @@ class BaseStore(object):
     """
 
   @abc.abstractmethod
-  def GetSortedEvents(self, time_range=None):
+  def GetParserStatistics(self):
+    """Retrieves the parser statistics.
+
+    Yields:
+      ParserStatistics: parser statistics.
+    """
+
+  @abc.abstractmethod
+  def GetSessionCheckpoints(self):
+    """Retrieves the session checkpoints.
+
+    Yields:
+      SessionCheckpoint: session checkpoint.
+    """
+
+  @abc.abstractmethod
+  def GetEventTimeRanges(self, number_of_events):
+    """Divides the events in time ranges with about the same number of events.
+
+    The time ranges are consecutive and do not overlap, and a time range only
+    ends before a different timestamp, hence events with the same timestamp
+    are always part of the same time range.
+
+    Args:
+      number_of_events (int): number of events per time range, where a time
+          range contains more events if its last timestamp is shared by more
+          events.
+
+    Returns:
+      list[TimeRange]: time ranges in chronological order, which contain all
+          stored events.
+    """
+
+  @abc.abstractmethod
+  def GetSortedEvents(self, filter_conditions=None, time_range=None):
     """Retrieves the events in increasing chronological order.
 
     This includes all events written to the storage including those pending
     being flushed (written) to the storage.
 
     Args:
+      filter_conditions (Optional[list[tuple[str, str, object]]]): filter
+          conditions, each containing an attribute name, a comparison operator
+          and a value, that the events must meet. The storage can use these
+          to skip events, but can also return events that do not meet them.
       time_range (Optional[TimeRange]): time range used to filter events
           that fall in a specific period.
 
@@ -236,6 +348,26 @@ class BaseStore(object):
       EventObject: event.
     """
 
+  @abc.abstractmethod
+  def GetSortedEventsWithEventData(
+      self, filter_conditions=None, time_range=None):
+    """Retrieves the events, combined with their event data, in order.
+
+    The events are retrieved in increasing chronological order and
+    the attributes of the event data they reference are set on the events.
+
+    Args:
+      filter_conditions (Optional[list[tuple[str, str, object]]]): filter
+          conditions, each containing an attribute name, a comparison operator
+          and a value, that the events must meet. The storage can use these
+          to skip events, but can also return events that do not meet them.
+      time_range (Optional[TimeRange]): time range used to filter events
+          that fall in a specific period.
+
+    Yields:
+      EventObject: event, with the attributes of its event data.
+    """
+
   @abc.abstractmethod
   def HasAnalysisReports(self):
     """Determines if a store contains analysis reports.
@@ -301,6 +433,14 @@ class BaseStore(object):
       knowledge_base (KnowledgeBase): contains the preprocessing information.
     """
 
+  @abc.abstractmethod
+  def WriteSessionCheckpoint(self, session_checkpoint):
+    """Writes a session checkpoint.
+
+    Args:
+      session_checkpoint (SessionCheckpoint): session checkpoint.
+    """
+
   @abc.abstractmethod
   def WriteSessionCompletion(self, session_completion):
     """Writes session completion information.
@@ -334,8 +474,12 @@ class BaseStore(object):
     """
 
 
-class BaseStorageFile(BaseStore):
-  """Interface for file-based stores."""
+class BaseStorageFile(AttributeContainerSerializationMixIn, BaseStore):
+  """Interface for file-based stores.
+
+  Attributes:
+    serialization_format (str): serialization format.
+  """
 
   # pylint: disable=abstract-method
 
@@ -346,34 +490,7 @@ class BaseStorageFile(BaseStore):
     self._read_only = True
     self._serialized_attribute_containers = {}
     self._serializer = json_serializer.JSONAttributeContainerSerializer
-
-  def _DeserializeAttributeContainer(self, container_type, serialized_data):
-    """Deserializes an attribute container.
-
-    Args:
-      container_type (str): attribute container type.
-      serialized_data (bytes): serialized attribute container data.
-
-    Returns:
-      AttributeContainer: attribute container or None.
-    """
-    if not serialized_data:
-      return None
-
-    if self._serializers_profiler:
-      self._serializers_profiler.StartTiming(container_type)
-
-    try:
-      serialized_string = serialized_data.decode('utf-8')
-    except UnicodeDecodeError as exception:
-      raise IOError('Unable to decode serialized data: {0!s}'.format(
-          exception))
-    attribute_container = self._serializer.ReadSerialized(serialized_string)
-
-    if self._serializers_profiler:
-      self._serializers_profiler.StopTiming(container_type)
-
-    return attribute_container
+    self.serialization_format = definitions.SERIALIZER_FORMAT_JSON
 
   def _GetNumberOfSerializedAttributeContainers(self, container_type):
     """Retrieves the number of serialized attribute containers.
@@ -441,7 +558,8 @@ class BaseStorageFile(BaseStore):
             'Unable to serialize attribute container: {0:s}.'.format(
                 attribute_container.CONTAINER_TYPE))
 
-      attribute_container_data = attribute_container_data.encode('utf-8')
+      if self.serialization_format == definitions.SERIALIZER_FORMAT_JSON:
+        attribute_container_data = attribute_container_data.encode('utf-8')
 
     finally:
       if self._serializers_profiler:
@@ -464,7 +582,12 @@ class BaseStorageFile(BaseStore):
 
 
 class StorageMergeReader(object):
-  """Storage reader interface for merging."""
+  """Storage reader interface for merging.
+
+  Attributes:
+    number_of_merged_containers (int): number of attribute containers that
+        have been merged into the storage writer.
+  """
 
   def __init__(self, storage_writer):
     """Initializes a storage merge reader.
@@ -474,6 +597,7 @@ class StorageMergeReader(object):
     """
     super(StorageMergeReader, self).__init__()
     self._storage_writer = storage_writer
+    self.number_of_merged_containers = 0
 
   @abc.abstractmethod
   def MergeAttributeContainers(
@@ -491,8 +615,13 @@ class StorageMergeReader(object):
     """
 
 
-class StorageFileMergeReader(StorageMergeReader):
-  """Storage reader interface for merging file-based stores."""
+class StorageFileMergeReader(
+    AttributeContainerSerializationMixIn, StorageMergeReader):
+  """Storage reader interface for merging file-based stores.
+
+  Attributes:
+    serialization_format (str): serialization format.
+  """
 
   # pylint: disable=abstract-method
 
@@ -505,34 +634,7 @@ class StorageFileMergeReader(StorageMergeReader):
     super(StorageFileMergeReader, self).__init__(storage_writer)
     self._serializer = json_serializer.JSONAttributeContainerSerializer
     self._serializers_profiler = None
-
-  def _DeserializeAttributeContainer(self, container_type, serialized_data):
-    """Deserializes an attribute container.
-
-    Args:
-      container_type (str): attribute container type.
-      serialized_data (bytes): serialized attribute container data.
-
-    Returns:
-      AttributeContainer: attribute container or None.
-    """
-    if not serialized_data:
-      return None
-
-    if self._serializers_profiler:
-      self._serializers_profiler.StartTiming(container_type)
-
-    try:
-      serialized_string = serialized_data.decode('utf-8')
-    except UnicodeDecodeError as exception:
-      raise IOError('Unable to decode serialized data: {0!s}'.format(
-          exception))
-    attribute_container = self._serializer.ReadSerialized(serialized_string)
-
-    if self._serializers_profiler:
-      self._serializers_profiler.StopTiming(container_type)
-
-    return attribute_container
+    self.serialization_format = definitions.SERIALIZER_FORMAT_JSON
 
 
 class StorageReader(object):
@@ -629,13 +731,51 @@ class StorageReader(object):
     """
 
   @abc.abstractmethod
-  def GetSortedEvents(self, time_range=None):
+  def GetParserStatistics(self):
+    """Retrieves the parser statistics.
+
+    Yields:
+      ParserStatistics: parser statistics.
+    """
+
+  @abc.abstractmethod
+  def GetSessionCheckpoints(self):
+    """Retrieves the session checkpoints.
+
+    Yields:
+      SessionCheckpoint: session checkpoint.
+    """
+
+  @abc.abstractmethod
+  def GetEventTimeRanges(self, number_of_events):
+    """Divides the events in time ranges with about the same number of events.
+
+    The time ranges are consecutive and do not overlap, and a time range only
+    ends before a different timestamp, hence events with the same timestamp
+    are always part of the same time range.
+
+    Args:
+      number_of_events (int): number of events per time range, where a time
+          range contains more events if its last timestamp is shared by more
+          events.
+
+    Returns:
+      list[TimeRange]: time ranges in chronological order, which contain all
+          stored events.
+    """
+
+  @abc.abstractmethod
+  def GetSortedEvents(self, filter_conditions=None, time_range=None):
     """Retrieves the events in increasing chronological order.
 
     This includes all events written to the storage including those pending
     being flushed (written) to the storage.
 
     Args:
+      filter_conditions (Optional[list[tuple[str, str, object]]]): filter
+          conditions, each containing an attribute name, a comparison operator
+          and a value, that the events must meet. The storage can use these
+          to skip events, but can also return events that do not meet them.
       time_range (Optional[TimeRange]): time range used to filter events
           that fall in a specific period.
 
@@ -643,6 +783,26 @@ class StorageReader(object):
       EventObject: event.
     """
 
+  @abc.abstractmethod
+  def GetSortedEventsWithEventData(
+      self, filter_conditions=None, time_range=None):
+    """Retrieves the events, combined with their event data, in order.
+
+    The events are retrieved in increasing chronological order and
+    the attributes of the event data they reference are set on the events.
+
+    Args:
+      filter_conditions (Optional[list[tuple[str, str, object]]]): filter
+          conditions, each containing an attribute name, a comparison operator
+          and a value, that the events must meet. The storage can use these
+          to skip events, but can also return events that do not meet them.
+      time_range (Optional[TimeRange]): time range used to filter events
+          that fall in a specific period.
+
+    Yields:
+      EventObject: event, with the attributes of its event data.
+    """
+
   @abc.abstractmethod
   def ReadPreprocessingInformation(self, knowledge_base):
     """Reads preprocessing information.
@@ -770,20 +930,80 @@ class StorageFileReader(StorageReader):
     """
     return self._storage_file.GetNumberOfAnalysisReports()
 
-  def GetSortedEvents(self, time_range=None):
+  def GetParserStatistics(self):
+    """Retrieves the parser statistics.
+
+    Returns:
+      generator(ParserStatistics): parser statistics generator.
+    """
+    return self._storage_file.GetParserStatistics()
+
+  def GetSessionCheckpoints(self):
+    """Retrieves the session checkpoints.
+
+    Returns:
+      generator(SessionCheckpoint): session checkpoint generator.
+    """
+    return self._storage_file.GetSessionCheckpoints()
+
+  def GetEventTimeRanges(self, number_of_events):
+    """Divides the events in time ranges with about the same number of events.
+
+    The time ranges are consecutive and do not overlap, and a time range only
+    ends before a different timestamp, hence events with the same timestamp
+    are always part of the same time range.
+
+    Args:
+      number_of_events (int): number of events per time range, where a time
+          range contains more events if its last timestamp is shared by more
+          events.
+
+    Returns:
+      list[TimeRange]: time ranges in chronological order, which contain all
+          stored events.
+    """
+    return self._storage_file.GetEventTimeRanges(number_of_events)
+
+  def GetSortedEvents(self, filter_conditions=None, time_range=None):
     """Retrieves the events in increasing chronological order.
 
     This includes all events written to the storage including those pending
     being flushed (written) to the storage.
 
     Args:
+      filter_conditions (Optional[list[tuple[str, str, object]]]): filter
+          conditions, each containing an attribute name, a comparison operator
+          and a value, that the events must meet. The storage can use these
+          to skip events, but can also return events that do not meet them.
+      time_range (Optional[TimeRange]): time range used to filter events
+          that fall in a specific period.
+
+    Returns:
+      generator(EventObject): event generator.
+    """
+    return self._storage_file.GetSortedEvents(
+        filter_conditions=filter_conditions, time_range=time_range)
+
+  def GetSortedEventsWithEventData(
+      self, filter_conditions=None, time_range=None):
+    """Retrieves the events, combined with their event data, in order.
+
+    The events are retrieved in increasing chronological order and
+    the attributes of the event data they reference are set on the events.
+
+    Args:
+      filter_conditions (Optional[list[tuple[str, str, object]]]): filter
+          conditions, each containing an attribute name, a comparison operator
+          and a value, that the events must meet. The storage can use these
+          to skip events, but can also return events that do not meet them.
       time_range (Optional[TimeRange]): time range used to filter events
           that fall in a specific period.
 
     Returns:
       generator(EventObject): event generator.
     """
-    return self._storage_file.GetSortedEvents(time_range=time_range)
+    return self._storage_file.GetSortedEventsWithEventData(
+        filter_conditions=filter_conditions, time_range=time_range)
 
   def ReadPreprocessingInformation(self, knowledge_base):
     """Reads preprocessing information.
@@ -889,6 +1109,14 @@ class StorageWriter(object):
       event_tag (EventTag): an event tag.
     """
 
+  @abc.abstractmethod
+  def AddParserStatistics(self, parser_statistics):
+    """Adds parser statistics.
+
+    Args:
+      parser_statistics (ParserStatistics): parser statistics.
+    """
+
   @abc.abstractmethod
   def Close(self):
     """Closes the storage writer."""
@@ -945,14 +1173,29 @@ class StorageWriter(object):
       EventSource: event source or None if there are no newly written ones.
     """
 
+  def GetSessionCheckpoints(self):
+    """Retrieves the session checkpoints.
+
+    Returns:
+      generator(SessionCheckpoint): session checkpoint generator.
+
+    Raises:
+      NotImplementedError: since there is no implementation.
+    """
+    raise NotImplementedError()
+
   @abc.abstractmethod
-  def GetSortedEvents(self, time_range=None):
+  def GetSortedEvents(self, filter_conditions=None, time_range=None):
     """Retrieves the events in increasing chronological order.
 
     This includes all events written to the storage including those pending
     being flushed (written) to the storage.
 
     Args:
+      filter_conditions (Optional[list[tuple[str, str, object]]]): filter
+          conditions, each containing an attribute name, a comparison operator
+          and a value, that the events must meet. The storage can use these
+          to skip events, but can also return events that do not meet them.
       time_range (Optional[TimeRange]): time range used to filter events
           that fall in a specific period.
 
@@ -960,6 +1203,26 @@ class StorageWriter(object):
       EventObject: event.
     """
 
+  @abc.abstractmethod
+  def GetSortedEventsWithEventData(
+      self, filter_conditions=None, time_range=None):
+    """Retrieves the events, combined with their event data, in order.
+
+    The events are retrieved in increasing chronological order and
+    the attributes of the event data they reference are set on the events.
+
+    Args:
+      filter_conditions (Optional[list[tuple[str, str, object]]]): filter
+          conditions, each containing an attribute name, a comparison operator
+          and a value, that the events must meet. The storage can use these
+          to skip events, but can also return events that do not meet them.
+      time_range (Optional[TimeRange]): time range used to filter events
+          that fall in a specific period.
+
+    Yields:
+      EventObject: event, with the attributes of its event data.
+    """
+
   def FinalizeTaskStorage(self, unused_task):
     """Finalizes a processed task storage.
 
@@ -1010,6 +1273,41 @@ class StorageWriter(object):
     """
     raise NotImplementedError()
 
+  def RestoreProcessedTaskStorage(self, unused_task, unused_task_storage_path):
+    """Restores a processed task storage of an interrupted session.
+
+    Args:
+      task (Task): task.
+      task_storage_path (str): path of the task storage of the interrupted
+          session.
+
+    Returns:
+      bool: True if the task storage was restored.
+
+    Raises:
+      NotImplementedError: since there is no implementation.
+    """
+    raise NotImplementedError()
+
+  def ResumeSession(self, unused_session_checkpoint):
+    """Resumes an interrupted session from a session checkpoint.
+
+    Args:
+      session_checkpoint (SessionCheckpoint): session checkpoint.
+
+    Raises:
+      NotImplementedError: since there is no implementation.
+    """
+    raise NotImplementedError()
+
+  def RewindWrittenEventSources(self):
+    """Rewinds the written event sources to the first stored event source.
+
+    Raises:
+      NotImplementedError: since there is no implementation.
+    """
+    raise NotImplementedError()
+
   @abc.abstractmethod
   def SetSerializersProfiler(self, serializers_profiler):
     """Sets the serializers profiler.
@@ -1034,6 +1332,25 @@ class StorageWriter(object):
       knowledge_base (KnowledgeBase): contains the preprocessing information.
     """
 
+  def WriteSessionCheckpoint(
+      self, unused_completed_path_specs=None, unused_pending_merge_tasks=None,
+      unused_append_session=False):
+    """Writes a session checkpoint.
+
+    Args:
+      completed_path_specs (Optional[list[dfvfs.PathSpec]]): path
+          specifications of the event sources of which the results were merged
+          since the previous checkpoint.
+      pending_merge_tasks (Optional[list[Task]]): tasks of which the results
+          were processed but not yet merged.
+      append_session (Optional[bool]): True if the session was appended to
+          the event sources of the previous sessions.
+
+    Raises:
+      NotImplementedError: since there is no implementation.
+    """
+    raise NotImplementedError()
+
   @abc.abstractmethod
   def WriteSessionCompletion(self, aborted=False):
     """Writes session completion information.
@@ -1060,24 +1377,49 @@ class StorageWriter(object):
 
 
 class StorageFileWriter(StorageWriter):
-  """Defines an interface for a file-backed storage writer."""
+  """Defines an interface for a file-backed storage writer.
+
+  Attributes:
+    serialization_format (str): serialization format.
+  """
+
+  _CONTAINER_TYPE_EVENT = events.EventObject.CONTAINER_TYPE
+  _CONTAINER_TYPE_EVENT_SOURCE = event_sources.EventSource.CONTAINER_TYPE
+  _CONTAINER_TYPE_EXTRACTION_ERROR = errors.ExtractionError.CONTAINER_TYPE
 
   def __init__(
       self, session, output_file,
-      storage_type=definitions.STORAGE_TYPE_SESSION, task=None):
+      serialization_format=definitions.SERIALIZER_FORMAT_JSON,
+      storage_type=definitions.STORAGE_TYPE_SESSION, task=None,
+      compression_format=None, compression_formats=None,
+      compression_dictionaries=False):
     """Initializes a storage writer.
 
     Args:
       session (Session): session the storage changes are part of.
       output_file (str): path to the output file.
+      serialization_format (Optional[str]): serialization format of a newly
+          created storage file.
       storage_type (Optional[str]): storage type.
       task(Optional[Task]): task.
+      compression_format (Optional[str]): compression format of a newly
+          created storage file, where None represents the default
+          compression format of the storage type.
+      compression_formats (Optional[dict[str, str]]): compression formats
+          per container type of a newly created storage file.
+      compression_dictionaries (Optional[bool]): True if shared compression
+          dictionaries should be trained per container type.
     """
     super(StorageFileWriter, self).__init__(
         session, storage_type=storage_type, task=task)
+    self._compression_dictionaries = compression_dictionaries
+    self._compression_format = compression_format
+    self._compression_formats = compression_formats
     self._merge_task_storage_path = ''
     self._output_file = output_file
+    self._parser_statistics = {}
     self._processed_task_storage_path = ''
+    self.serialization_format = serialization_format
     self._storage_file = None
     self._task_storage_path = None
 
@@ -1154,11 +1496,19 @@ class StorageFileWriter(StorageWriter):
     Args:
       event: an event (instance of EventObject).
     """
+    parser_chain = getattr(event, 'parser', '')
+    self._UpdateParsersCounter(parser_chain)
+
+  def _UpdateParsersCounter(self, parser_chain):
+    """Updates the parsers counter.
+
+    Args:
+      parser_chain (str): parser chain of an event.
+    """
     self._session.parsers_counter['total'] += 1
 
     # Here we want the name of the parser or plugin not the parser chain.
-    parser_name = getattr(event, 'parser', '')
-    _, _, parser_name = parser_name.rpartition('/')
+    _, _, parser_name = parser_chain.rpartition('/')
     if not parser_name:
       parser_name = 'N/A'
     self._session.parsers_counter[parser_name] += 1
@@ -1265,6 +1615,79 @@ class StorageFileWriter(StorageWriter):
       self._session.event_labels_counter[label] += 1
     self.number_of_event_tags += 1
 
+  def AddParserStatistics(self, parser_statistics):
+    """Adds parser statistics.
+
+    The parser statistics of a session are aggregated per parser and written
+    on session completion, while those of a task are written directly.
+
+    Args:
+      parser_statistics (ParserStatistics): parser statistics.
+
+    Raises:
+      IOError: when the storage writer is closed.
+    """
+    self._RaiseIfNotWritable()
+
+    if self._storage_type != definitions.STORAGE_TYPE_SESSION:
+      self._storage_file.AddParserStatistics(parser_statistics)
+      return
+
+    aggregated_parser_statistics = self._parser_statistics.get(
+        parser_statistics.name, None)
+    if aggregated_parser_statistics:
+      aggregated_parser_statistics.Merge(parser_statistics)
+    else:
+      # A copy is stored since the parser statistics are merged into it.
+      self._parser_statistics[parser_statistics.name] = copy.deepcopy(
+          parser_statistics)
+
+  def AddSerializedAttributeContainer(
+      self, container_type, serialized_data, attribute_values=None,
+      parser_chain=None, timestamp=None):
+    """Adds a serialized attribute container.
+
+    This method is used to merge attribute containers from a task storage
+    without deserializing them. Only event, event data, event source,
+    extraction error and path specification node containers are supported.
+
+    Args:
+      container_type (str): attribute container type.
+      serialized_data (bytes): serialized attribute container data.
+      attribute_values (Optional[dict[str, object]]): values of the event
+          attributes, including those of the event data, that the storage
+          file stores separately from the serialized event, such as data_type
+          and parser. Only used when the container type is event.
+      parser_chain (Optional[str]): parser chain of the event, used to update
+          the parsers counter. Only used when the container type is event.
+      timestamp (Optional[int]): timestamp of the event, which contains
+          the number of micro seconds since January 1, 1970, 00:00:00 UTC.
+          Only used when the container type is event.
+
+    Returns:
+      AttributeContainerIdentifier: identifier of the attribute container.
+
+    Raises:
+      IOError: when the storage writer is closed.
+    """
+    self._RaiseIfNotWritable()
+
+    identifier = self._storage_file.AddSerializedAttributeContainer(
+        container_type, serialized_data, attribute_values=attribute_values,
+        timestamp=timestamp)
+
+    if container_type == self._CONTAINER_TYPE_EVENT:
+      self.number_of_events += 1
+      self._UpdateParsersCounter(parser_chain or '')
+
+    elif container_type == self._CONTAINER_TYPE_EVENT_SOURCE:
+      self.number_of_event_sources += 1
+
+    elif container_type == self._CONTAINER_TYPE_EXTRACTION_ERROR:
+      self.number_of_errors += 1
+
+    return identifier
+
   def CheckTaskReadyForMerge(self, task):
     """Checks if a task is ready for merging with this session storage.
 
@@ -1430,13 +1853,31 @@ class StorageFileWriter(StorageWriter):
         path.replace('.plaso', '')
         for path in os.listdir(self._processed_task_storage_path)]
 
-  def GetSortedEvents(self, time_range=None):
+  def GetSessionCheckpoints(self):
+    """Retrieves the session checkpoints.
+
+    Returns:
+      generator(SessionCheckpoint): session checkpoint generator.
+
+    Raises:
+      IOError: when the storage writer is closed.
+    """
+    if not self._storage_file:
+      raise IOError('Unable to read from closed storage writer.')
+
+    return self._storage_file.GetSessionCheckpoints()
+
+  def GetSortedEvents(self, filter_conditions=None, time_range=None):
     """Retrieves the events in increasing chronological order.
 
     This includes all events written to the storage including those pending
     being flushed (written) to the storage.
 
     Args:
+      filter_conditions (Optional[list[tuple[str, str, object]]]): filter
+          conditions, each containing an attribute name, a comparison operator
+          and a value, that the events must meet. The storage can use these
+          to skip events, but can also return events that do not meet them.
       time_range (Optional[TimeRange]): time range used to filter events
           that fall in a specific period.
 
@@ -1449,7 +1890,35 @@ class StorageFileWriter(StorageWriter):
     if not self._storage_file:
       raise IOError('Unable to read from closed storage writer.')
 
-    return self._storage_file.GetSortedEvents(time_range=time_range)
+    return self._storage_file.GetSortedEvents(
+        filter_conditions=filter_conditions, time_range=time_range)
+
+  def GetSortedEventsWithEventData(
+      self, filter_conditions=None, time_range=None):
+    """Retrieves the events, combined with their event data, in order.
+
+    The events are retrieved in increasing chronological order and
+    the attributes of the event data they reference are set on the events.
+
+    Args:
+      filter_conditions (Optional[list[tuple[str, str, object]]]): filter
+          conditions, each containing an attribute name, a comparison operator
+          and a value, that the events must meet. The storage can use these
+          to skip events, but can also return events that do not meet them.
+      time_range (Optional[TimeRange]): time range used to filter events
+          that fall in a specific period.
+
+    Returns:
+      generator(EventObject): event generator.
+
+    Raises:
+      IOError: when the storage writer is closed.
+    """
+    if not self._storage_file:
+      raise IOError('Unable to read from closed storage writer.')
+
+    return self._storage_file.GetSortedEventsWithEventData(
+        filter_conditions=filter_conditions, time_range=time_range)
 
   def FinalizeTaskStorage(self, task):
     """Finalizes a processed task storage.
@@ -1496,6 +1965,9 @@ class StorageFileWriter(StorageWriter):
 
     self._storage_file.Open(path=self._output_file, read_only=False)
 
+    # An existing storage file keeps its serialization format.
+    self.serialization_format = self._storage_file.serialization_format
+
     self._first_written_event_source_index = (
         self._storage_file.GetNumberOfEventSources())
     self._written_event_source_index = self._first_written_event_source_index
@@ -1569,6 +2041,98 @@ class StorageFileWriter(StorageWriter):
           'Unable to remove task storage file: {0:s} with error: '
           '{1!s}').format(processed_storage_file_path, exception))
 
+  def RestoreProcessedTaskStorage(self, task, task_storage_path):
+    """Restores a processed task storage of an interrupted session.
+
+    Moves the task storage file from the merge directory of the task storage
+    of the interrupted session to the processed directory.
+
+    Args:
+      task (Task): task.
+      task_storage_path (str): path of the task storage of the interrupted
+          session.
+
+    Returns:
+      bool: True if the task storage was restored or False if the task storage
+          file no longer exists.
+
+    Raises:
+      IOError: if the storage type is not supported or
+          if the temporary path for the task storage does not exist or
+          if the storage file cannot be renamed.
+    """
+    if self._storage_type != definitions.STORAGE_TYPE_SESSION:
+      raise IOError('Unsupported storage type.')
+
+    if not self._processed_task_storage_path:
+      raise IOError('Missing processed task storage path.')
+
+    filename = '{0:s}.plaso'.format(task.identifier)
+    merge_storage_file_path = os.path.join(
+        task_storage_path, 'merge', filename)
+    if not os.path.isfile(merge_storage_file_path):
+      return False
+
+    processed_storage_file_path = self._GetProcessedStorageFilePath(task)
+
+    try:
+      os.rename(merge_storage_file_path, processed_storage_file_path)
+    except OSError as exception:
+      raise IOError((
+          'Unable to rename task storage file: {0:s} with error: '
+          '{1!s}').format(merge_storage_file_path, exception))
+
+    return True
+
+  def ResumeSession(self, session_checkpoint):
+    """Resumes an interrupted session from a session checkpoint.
+
+    The session takes over the identifier, counters and parser statistics
+    of the interrupted session, and the event sources written by
+    the interrupted session are retrieved again as written event sources.
+
+    Args:
+      session_checkpoint (SessionCheckpoint): last session checkpoint of
+          the interrupted session.
+
+    Raises:
+      IOError: if the storage type is not supported or
+          when the storage writer is closed.
+    """
+    self._RaiseIfNotWritable()
+
+    if self._storage_type != definitions.STORAGE_TYPE_SESSION:
+      raise IOError('Unsupported storage type.')
+
+    self._session.CopyAttributesFromSessionCheckpoint(session_checkpoint)
+
+    self._parser_statistics = {
+        parser_statistics.name: parser_statistics
+        for parser_statistics in session_checkpoint.parser_statistics or []}
+
+    self._first_written_event_source_index = (
+        session_checkpoint.first_event_source_index or 0)
+    self._written_event_source_index = self._first_written_event_source_index
+
+  def RewindWrittenEventSources(self):
+    """Rewinds the written event sources to the first stored event source.
+
+    The event sources stored by previous sessions are retrieved again as
+    written event sources, such that a session appended to the storage can
+    process them, for example with additional parsers.
+
+    Raises:
+      IOError: if the storage type is not supported or
+          when the storage writer is closed.
+    """
+    self._RaiseIfNotWritable()
+
+    if self._storage_type != definitions.STORAGE_TYPE_SESSION:
+      raise IOError('Unsupported storage type.')
+
+    self._first_written_event_source_index = 0
+    self._written_event_source_index = 0
+
   def SetSerializersProfiler(self, serializers_profiler):
     """Sets the serializers profiler.
 
@@ -1630,6 +2194,16 @@ class StorageFileWriter(StorageWriter):
     if self._task_storage_path:
       raise IOError('Task storage path already exists.')
 
+    # The task storage files are created by worker processes that are
+    # started before the storage writer is opened, hence the serialization
+    # format of an existing storage file, such as one that is appended to
+    # or resumed, is determined before that.
+    if os.path.isfile(self._output_file):
+      storage_file = self._CreateStorageFile()
+      storage_file.Open(path=self._output_file, read_only=True)
+      self.serialization_format = storage_file.serialization_format
+      storage_file.Close()
+
     output_directory = os.path.dirname(self._output_file)
     self._task_storage_path = tempfile.mkdtemp(dir=output_directory)
 
@@ -1694,6 +2268,42 @@ class StorageFileWriter(StorageWriter):
 
     self._storage_file.WritePreprocessingInformation(knowledge_base)
 
+  def WriteSessionCheckpoint(
+      self, completed_path_specs=None, pending_merge_tasks=None,
+      append_session=False):
+    """Writes a session checkpoint.
+
+    Args:
+      completed_path_specs (Optional[list[dfvfs.PathSpec]]): path
+          specifications of the event sources of which the results were merged
+          since the previous checkpoint.
+      pending_merge_tasks (Optional[list[Task]]): tasks of which the results
+          were processed but not yet merged.
+      append_session (Optional[bool]): True if the session was appended to
+          the event sources of the previous sessions.
+
+    Raises:
+      IOError: if the storage type is not supported or
+          when the storage writer is closed.
+    """
+    self._RaiseIfNotWritable()
+
+    if self._storage_type != definitions.STORAGE_TYPE_SESSION:
+      raise IOError('Unsupported storage type.')
+
+    session_checkpoint = self._session.CreateSessionCheckpoint()
+    session_checkpoint.append_session = append_session
+    session_checkpoint.completed_path_specs = completed_path_specs or []
+    session_checkpoint.first_event_source_index = (
+        self._first_written_event_source_index)
+    session_checkpoint.parser_statistics = [
+        self._parser_statistics[parser_name]
+        for parser_name in sorted(self._parser_statistics.keys())]
+    session_checkpoint.pending_merge_tasks = pending_merge_tasks or []
+    session_checkpoint.task_storage_path = self._task_storage_path
+
+    self._storage_file.WriteSessionCheckpoint(session_checkpoint)
+
   def WriteSessionCompletion(self, aborted=False):
     """Writes session completion information.
 
@@ -1709,6 +2319,12 @@ class StorageFileWriter(StorageWriter):
     if self._storage_type != definitions.STORAGE_TYPE_SESSION:
       raise IOError('Unsupported storage type.')
 
+    for parser_name in sorted(self._parser_statistics.keys()):
+      self._storage_file.AddParserStatistics(
+          self._parser_statistics[parser_name])
+
+    self._parser_statistics = {}
+
     self._session.aborted = aborted
     session_completion = self._session.CreateSessionCompletion()
     self._storage_file.WriteSessionCompletion(session_completion)
@@ -4,19 +4,155 @@
 from __future__ import unicode_literals
 
 import os
+import re
 import sqlite3
-import zlib
+import threading
+
+# The 'Queue' module was renamed to 'queue' in Python 3
+try:
+  import Queue  # pylint: disable=import-error
+except ImportError:
+  import queue as Queue  # pylint: disable=import-error
 
 from plaso.containers import errors
 from plaso.containers import event_sources
 from plaso.containers import events
+from plaso.containers import parser_statistics as parser_statistics_containers
+from plaso.containers import path_specs
 from plaso.containers import reports
 from plaso.containers import tasks
 from plaso.lib import definitions
+from plaso.storage import compression
 from plaso.storage import identifiers
 from plaso.storage import interface
 
 
+class _ReadAheadThread(threading.Thread):
+  """Thread that reads the rows of a task storage ahead of the merge.
+
+  The rows are read, and decompressed if needed, in batches that are queued
+  for the merge reader. This allows the task storage to be read while
+  the foreman is scheduling tasks or writing to the session storage.
+  """
+
+  _CONTAINER_TYPE_EVENT = events.EventObject.CONTAINER_TYPE
+
+  # Maximum number of batches of rows in the queue.
+  _MAXIMUM_NUMBER_OF_QUEUED_BATCHES = 4
+
+  # Number of rows per batch.
+  _NUMBER_OF_ROWS_PER_BATCH = 500
+
+  # Number of seconds to wait for the queue before checking for an abort.
+  _QUEUE_TIMEOUT = 1.0
+
+  def __init__(
+      self, path, container_types, codecs, event_attribute_names=None):
+    """Initializes a read ahead thread.
+
+    Args:
+      path (str): path to the task storage file.
+      container_types (list[str]): names of the container types to read,
+          in the order they should be merged.
+      codecs (dict[str, CompressionCodec]): compression codecs per container
+          type, of the container types that are compressed.
+      event_attribute_names (Optional[list[str]]): names of the event
+          attributes that are stored in separate columns of the event table
+          and should be read in addition to the serialized event.
+    """
+    super(_ReadAheadThread, self).__init__(name='Merge read ahead')
+    self._abort = False
+    self._codecs = codecs
+    self._container_types = container_types
+    self._event_attribute_names = event_attribute_names or []
+    self._path = path
+    self._queue = Queue.Queue(maxsize=self._MAXIMUM_NUMBER_OF_QUEUED_BATCHES)
+
+    self.daemon = True
+
+  def _PushBatch(self, container_type, rows):
+    """Pushes a batch of rows onto the queue.
+
+    Args:
+      container_type (str): attribute container type or None to signal
+          the end of the task storage.
+      rows (list[tuple]|Exception): rows of the attribute container type or
+          the exception that caused reading to stop.
+
+    Returns:
+      bool: True if the batch was pushed, False if reading was aborted.
+    """
+    while not self._abort:
+      try:
+        self._queue.put((container_type, rows), True, self._QUEUE_TIMEOUT)
+        return True
+      except Queue.Full:
+        pass
+
+    return False
+
+  def GetBatch(self):
+    """Retrieves the next batch of rows.
+
+    This method blocks until a batch of rows is available.
+
+    Returns:
+      tuple: contains:
+
+        str: attribute container type or None if there are no more rows.
+        list[tuple]|Exception: rows of the attribute container type or,
+            if no more rows, the exception that caused reading to stop.
+    """
+    return self._queue.get()
+
+  # This method is part of the threading.Thread interface, hence its name does
+  # not follow the style guide.
+  def run(self):
+    """Reads the rows of the task storage."""
+    connection = sqlite3.connect(
+        self._path, detect_types=sqlite3.PARSE_DECLTYPES|sqlite3.PARSE_COLNAMES)
+    cursor = connection.cursor()
+
+    error = None
+    try:
+      for container_type in self._container_types:
+        if container_type == self._CONTAINER_TYPE_EVENT:
+          column_names = ['_identifier', '_data', '_timestamp']
+          column_names.extend([
+              '_{0:s}'.format(attribute_name)
+              for attribute_name in self._event_attribute_names])
+          query = 'SELECT {0:s} FROM event'.format(', '.join(column_names))
+        else:
+          query = 'SELECT _identifier, _data FROM {0:s}'.format(container_type)
+        cursor.execute(query)
+
+        codec = self._codecs.get(container_type, None)
+
+        rows = cursor.fetchmany(size=self._NUMBER_OF_ROWS_PER_BATCH)
+        while rows:
+          if codec:
+            rows = [
+                (row[0], codec.Decompress(row[1])) + row[2:] for row in rows]
+
+          if not self._PushBatch(container_type, rows):
+            return
+
+          rows = cursor.fetchmany(size=self._NUMBER_OF_ROWS_PER_BATCH)
+
+    except (IOError, sqlite3.Error) as exception:
+      error = exception
+
+    finally:
+      connection.close()
+
+    self._PushBatch(None, error)
+
+  def Stop(self):
+    """Stops reading and waits for the thread to exit."""
+    self._abort = True
+    self.join()
+
+
 class SQLiteStorageMergeReader(interface.StorageFileMergeReader):
   """SQLite-based storage file reader for merging."""
 
@@ -26,6 +162,9 @@ class SQLiteStorageMergeReader(interface.StorageFileMergeReader):
   _CONTAINER_TYPE_EVENT_SOURCE = event_sources.EventSource.CONTAINER_TYPE
   _CONTAINER_TYPE_EVENT_TAG = events.EventTag.CONTAINER_TYPE
   _CONTAINER_TYPE_EXTRACTION_ERROR = errors.ExtractionError.CONTAINER_TYPE
+  _CONTAINER_TYPE_PARSER_STATISTICS = (
+      parser_statistics_containers.ParserStatistics.CONTAINER_TYPE)
+  _CONTAINER_TYPE_PATH_SPEC = path_specs.PathSpecNode.CONTAINER_TYPE
   _CONTAINER_TYPE_TASK_COMPLETION = tasks.TaskCompletion.CONTAINER_TYPE
   _CONTAINER_TYPE_TASK_START = tasks.TaskStart.CONTAINER_TYPE
 
@@ -33,12 +172,14 @@ class SQLiteStorageMergeReader(interface.StorageFileMergeReader):
   # referencing event_data. Container types in this tuple must be ordered after
   # all the container types they reference.
   _CONTAINER_TYPES = (
+      _CONTAINER_TYPE_PATH_SPEC,
       _CONTAINER_TYPE_EVENT_SOURCE,
       _CONTAINER_TYPE_EVENT_DATA,
       _CONTAINER_TYPE_EVENT,
       _CONTAINER_TYPE_EVENT_TAG,
       _CONTAINER_TYPE_EXTRACTION_ERROR,
-      _CONTAINER_TYPE_ANALYSIS_REPORT)
+      _CONTAINER_TYPE_ANALYSIS_REPORT,
+      _CONTAINER_TYPE_PARSER_STATISTICS)
 
   _ADD_CONTAINER_TYPE_METHODS = {
       _CONTAINER_TYPE_ANALYSIS_REPORT: '_AddAnalysisReport',
@@ -47,8 +188,52 @@ class SQLiteStorageMergeReader(interface.StorageFileMergeReader):
       _CONTAINER_TYPE_EVENT_SOURCE: '_AddEventSource',
       _CONTAINER_TYPE_EVENT_TAG: '_AddEventTag',
       _CONTAINER_TYPE_EXTRACTION_ERROR: '_AddError',
+      _CONTAINER_TYPE_PARSER_STATISTICS: '_AddParserStatistics',
+      _CONTAINER_TYPE_PATH_SPEC: '_AddPathSpecNode',
   }
 
+  # Container types that can be merged without deserializing them.
+  _SERIALIZED_CONTAINER_TYPES = frozenset([
+      _CONTAINER_TYPE_EVENT,
+      _CONTAINER_TYPE_EVENT_DATA,
+      _CONTAINER_TYPE_EVENT_SOURCE,
+      _CONTAINER_TYPE_EXTRACTION_ERROR,
+      _CONTAINER_TYPE_PATH_SPEC])
+
+  # Container types that reference other container types, of which
+  # the references can only be updated in JSON serialized data.
+  _REFERENCING_CONTAINER_TYPES = frozenset([
+      _CONTAINER_TYPE_EVENT,
+      _CONTAINER_TYPE_EVENT_DATA,
+      _CONTAINER_TYPE_EVENT_SOURCE,
+      _CONTAINER_TYPE_PATH_SPEC])
+
+  # Names of the path specification attributes of the container types that
+  # reference a path specification node.
+  _PATH_SPEC_ATTRIBUTE_NAMES = {
+      _CONTAINER_TYPE_EVENT_DATA: 'pathspec',
+      _CONTAINER_TYPE_EVENT_SOURCE: 'path_spec'}
+
+  # Note that the JSON serializer escapes a double quote in a string value,
+  # hence these expressions only match attribute names.
+  _EVENT_DATA_ROW_IDENTIFIER_RE = re.compile(
+      br'"event_data_row_identifier": ([0-9]+)')
+
+  _PARENT_ROW_IDENTIFIER_RE = re.compile(
+      br'"parent_row_identifier": ([0-9]+)')
+
+  _PARSER_CHAIN_RE = re.compile(br'"parser": "([^"\\]*)"')
+
+  _PATH_SPEC_ROW_IDENTIFIER_RE = re.compile(
+      br'"path_spec_row_identifier": ([0-9]+)')
+
+  # Names of the event attributes that are stored in separate columns of
+  # the event table by storage format version 20180630 and later.
+  _EVENT_ATTRIBUTE_NAMES = (
+      'data_type', 'filename', 'hostname', 'parser', 'username')
+
+  _EVENT_TABLE_COLUMNS_QUERY = 'PRAGMA table_info(event)'
+
   _TABLE_NAMES_QUERY = (
       'SELECT name FROM sqlite_master WHERE type = "table"')
 
@@ -65,15 +250,19 @@ class SQLiteStorageMergeReader(interface.StorageFileMergeReader):
     """
     super(SQLiteStorageMergeReader, self).__init__(storage_writer)
     self._active_container_type = None
-    self._active_cursor = None
+    self._active_rows = []
     self._add_active_container_method = None
     self._add_container_type_methods = {}
-    self._compression_format = definitions.COMPRESSION_FORMAT_NONE
+    self._codecs = {}
     self._connection = None
     self._container_types = None
     self._cursor = None
+    self._event_attribute_names = []
     self._event_data_identifier_mappings = {}
     self._path = path
+    self._path_spec_identifier_mappings = {}
+    self._path_specs = {}
+    self._read_ahead_thread = None
 
     # Create a runtime lookup table for the add container type method. This
     # prevents having to create a series of if-else checks for container types.
@@ -111,10 +300,7 @@ class SQLiteStorageMergeReader(interface.StorageFileMergeReader):
       event (EventObject): event.
     """
     if hasattr(event, 'event_data_row_identifier'):
-      event_data_identifier = identifiers.SQLTableIdentifier(
-          self._CONTAINER_TYPE_EVENT_DATA,
-          event.event_data_row_identifier)
-      lookup_key = event_data_identifier.CopyToString()
+      lookup_key = event.event_data_row_identifier
 
       event_data_identifier = self._event_data_identifier_mappings[lookup_key]
       event.SetEventDataIdentifier(event_data_identifier)
@@ -130,7 +316,7 @@ class SQLiteStorageMergeReader(interface.StorageFileMergeReader):
       event_data (EventData): event data.
     """
     identifier = event_data.GetIdentifier()
-    lookup_key = identifier.CopyToString()
+    lookup_key = identifier.row_identifier
 
     self._storage_writer.AddEventData(event_data)
 
@@ -153,11 +339,123 @@ class SQLiteStorageMergeReader(interface.StorageFileMergeReader):
     """
     self._storage_writer.AddEventTag(event_tag)
 
+  def _AddParserStatistics(self, parser_statistics):
+    """Adds parser statistics.
+
+    Args:
+      parser_statistics (ParserStatistics): parser statistics.
+    """
+    self._storage_writer.AddParserStatistics(parser_statistics)
+
+  def _AddPathSpecNode(self, path_spec_node):
+    """Adds a path specification node.
+
+    The path specification node is not added to the storage writer, but
+    resolved into the path specification that is stored with the attribute
+    containers that reference it.
+
+    Args:
+      path_spec_node (PathSpecNode): path specification node.
+    """
+    parent_path_spec = None
+    if path_spec_node.parent_row_identifier is not None:
+      parent_path_spec = self._path_specs[path_spec_node.parent_row_identifier]
+
+    identifier = path_spec_node.GetIdentifier()
+    self._path_specs[identifier.row_identifier] = path_spec_node.GetPathSpec(
+        parent=parent_path_spec)
+
+  def _AddSerializedAttributeContainer(self, row):
+    """Adds a serialized attribute container without deserializing it.
+
+    Only the references to other attribute containers, such as the event data
+    row identifier of an event, are updated in the serialized data.
+
+    Args:
+      row (tuple): table row of the active container type.
+    """
+    serialized_data = row[1]
+
+    if self._active_container_type == self._CONTAINER_TYPE_EVENT:
+      serialized_data = self._EVENT_DATA_ROW_IDENTIFIER_RE.sub(
+          self._ReplaceEventDataRowIdentifier, serialized_data)
+
+      attribute_values = None
+      if self._event_attribute_names:
+        attribute_values = dict(zip(self._event_attribute_names, row[3:]))
+        parser_chain = attribute_values.get('parser', None)
+
+      else:
+        parser_chain = None
+        match = self._PARSER_CHAIN_RE.search(serialized_data)
+        if match:
+          parser_chain = match.group(1).decode('utf-8')
+
+      self._storage_writer.AddSerializedAttributeContainer(
+          self._active_container_type, serialized_data,
+          attribute_values=attribute_values, parser_chain=parser_chain,
+          timestamp=row[2])
+
+    elif self._active_container_type == self._CONTAINER_TYPE_PATH_SPEC:
+      serialized_data = self._PARENT_ROW_IDENTIFIER_RE.sub(
+          self._ReplacePathSpecRowIdentifier, serialized_data)
+
+      identifier = self._storage_writer.AddSerializedAttributeContainer(
+          self._active_container_type, serialized_data)
+
+      self._path_spec_identifier_mappings[row[0]] = identifier
+
+    else:
+      if self._active_container_type in self._PATH_SPEC_ATTRIBUTE_NAMES:
+        serialized_data = self._PATH_SPEC_ROW_IDENTIFIER_RE.sub(
+            self._ReplacePathSpecRowIdentifier, serialized_data)
+
+      identifier = self._storage_writer.AddSerializedAttributeContainer(
+          self._active_container_type, serialized_data)
+
+      if self._active_container_type == self._CONTAINER_TYPE_EVENT_DATA:
+        self._event_data_identifier_mappings[row[0]] = identifier
+
+  def _CanMergeSerialized(self, callback):
+    """Determines if the active container type can be merged serialized.
+
+    Serialized attribute containers can only be merged when the task storage
+    and the session storage use the same serialization format. Attribute
+    containers that reference other attribute containers can only be merged
+    serialized when using JSON, since the references, such as the event data
+    row identifier, are updated in the serialized data.
+
+    Args:
+      callback (function[StorageWriter, AttributeContainer]): function to call
+          after each attribute container is deserialized.
+
+    Returns:
+      bool: True if the attribute containers of the active container type
+          can be merged without deserializing them.
+    """
+    if (callback or
+        self._active_container_type not in self._SERIALIZED_CONTAINER_TYPES):
+      return False
+
+    serialization_format = getattr(
+        self._storage_writer, 'serialization_format', None)
+    if serialization_format != self.serialization_format:
+      return False
+
+    return (
+        self._active_container_type not in self._REFERENCING_CONTAINER_TYPES or
+        self.serialization_format == definitions.SERIALIZER_FORMAT_JSON)
+
   def _Close(self):
     """Closes the task storage after reading."""
-    self._connection.close()
-    self._connection = None
-    self._cursor = None
+    if self._read_ahead_thread:
+      self._read_ahead_thread.Stop()
+      self._read_ahead_thread = None
+
+    if self._connection:
+      self._connection.close()
+      self._connection = None
+      self._cursor = None
 
   def _GetContainerTypes(self):
     """Retrieves the container types to merge.
@@ -178,88 +476,74 @@ class SQLiteStorageMergeReader(interface.StorageFileMergeReader):
         table_name for table_name in self._CONTAINER_TYPES
         if table_name in table_names]
 
-  def _Open(self):
-    """Opens the task storage for reading."""
-    self._connection = sqlite3.connect(
-        self._path, detect_types=sqlite3.PARSE_DECLTYPES|sqlite3.PARSE_COLNAMES)
-    self._cursor = self._connection.cursor()
-
-  def _ReadStorageMetadata(self):
-    """Reads the task storage metadata."""
-    query = 'SELECT key, value FROM metadata'
-    self._cursor.execute(query)
-
-    metadata_values = {row[0]: row[1] for row in self._cursor.fetchall()}
-
-    self._compression_format = metadata_values['compression_format']
-
-  def _PrepareForNextContainerType(self):
-    """Prepares for the next container type.
+  def _GetEventAttributeNames(self):
+    """Retrieves the names of the event attributes stored in separate columns.
 
-    This method prepares the task storage for merging the next container type.
-    It set the active container type, its add method and active cursor
-    accordingly.
+    Returns:
+      list[str]: names of the event attributes that are stored in separate
+          columns of the event table of the task storage.
     """
-    self._active_container_type = self._container_types.pop(0)
-
-    self._add_active_container_method = self._add_container_type_methods.get(
-        self._active_container_type)
-
-    query = 'SELECT _identifier, _data FROM {0:s}'.format(
-        self._active_container_type)
-    self._cursor.execute(query)
+    self._cursor.execute(self._EVENT_TABLE_COLUMNS_QUERY)
+    column_names = [row[1] for row in self._cursor.fetchall()]
 
-    self._active_cursor = self._cursor
+    return [
+        attribute_name for attribute_name in self._EVENT_ATTRIBUTE_NAMES
+        if '_{0:s}'.format(attribute_name) in column_names]
 
-  def MergeAttributeContainers(
-      self, callback=None, maximum_number_of_containers=0):
-    """Reads attribute containers from a task storage file into the writer.
+  def _MergeAttributeContainers(self, callback, maximum_number_of_containers):
+    """Reads attribute containers from the task storage file into the writer.
 
     Args:
       callback (function[StorageWriter, AttributeContainer]): function to call
           after each attribute container is deserialized.
-      maximum_number_of_containers (Optional[int]): maximum number of
-          containers to merge, where 0 represent no limit.
+      maximum_number_of_containers (int): maximum number of containers to
+          merge, where 0 represent no limit.
 
     Returns:
       bool: True if the entire task storage file has been merged.
 
     Raises:
+      IOError: if the task storage file cannot be read.
       RuntimeError: if the add method for the active attribute container
           type is missing.
-      OSError: if the task storage file cannot be deleted.
     """
-    if not self._cursor:
-      self._Open()
-      self._ReadStorageMetadata()
-      self._container_types = self._GetContainerTypes()
-
     number_of_containers = 0
-    while self._active_cursor or self._container_types:
-      if not self._active_cursor:
-        self._PrepareForNextContainerType()
+    while True:
+      if not self._active_rows:
+        container_type, rows = self._read_ahead_thread.GetBatch()
+        if not container_type:
+          if rows:
+            raise IOError(
+                'Unable to read task storage with error: {0!s}'.format(rows))
+          break
+
+        if container_type != self._active_container_type:
+          self._PrepareForNextContainerType(container_type)
+
+        self._active_rows = rows
 
       if maximum_number_of_containers > 0:
         number_of_rows = maximum_number_of_containers - number_of_containers
-        rows = self._active_cursor.fetchmany(size=number_of_rows)
+        rows = self._active_rows[:number_of_rows]
+        self._active_rows = self._active_rows[number_of_rows:]
       else:
-        rows = self._active_cursor.fetchall()
+        rows = self._active_rows
+        self._active_rows = []
 
-      if not rows:
-        self._active_cursor = None
-        continue
+      merge_serialized = self._CanMergeSerialized(callback)
 
       for row in rows:
+        if merge_serialized:
+          self._AddSerializedAttributeContainer(row)
+          self.number_of_merged_containers += 1
+          number_of_containers += 1
+          continue
+
         identifier = identifiers.SQLTableIdentifier(
             self._active_container_type, row[0])
 
-        if self._compression_format == definitions.COMPRESSION_FORMAT_ZLIB:
-          serialized_data = zlib.decompress(row[1])
-        else:
-          serialized_data = row[1]
-
         attribute_container = self._DeserializeAttributeContainer(
-            self._active_container_type, serialized_data)
+            self._active_container_type, row[1])
         attribute_container.SetIdentifier(identifier)
 
         if self._active_container_type == self._CONTAINER_TYPE_EVENT_TAG:
@@ -270,10 +554,14 @@ class SQLiteStorageMergeReader(interface.StorageFileMergeReader):
 
           del attribute_container.event_row_identifier
 
+        elif self._active_container_type in self._PATH_SPEC_ATTRIBUTE_NAMES:
+          self._ResolvePathSpec(attribute_container)
+
         if callback:
           callback(self._storage_writer, attribute_container)
 
         self._add_active_container_method(attribute_container)
+        self.number_of_merged_containers += 1
 
         number_of_containers += 1
 
@@ -281,8 +569,170 @@ class SQLiteStorageMergeReader(interface.StorageFileMergeReader):
           number_of_containers >= maximum_number_of_containers):
         return False
 
-    self._Close()
+    return True
 
-    os.remove(self._path)
 
-    return True
+  def _Open(self):
+    """Opens the task storage for reading."""
+    self._connection = sqlite3.connect(
+        self._path, detect_types=sqlite3.PARSE_DECLTYPES|sqlite3.PARSE_COLNAMES)
+    self._cursor = self._connection.cursor()
+
+  def _ReadStorageMetadata(self):
+    """Reads the task storage metadata.
+
+    Raises:
+      IOError: if the compression format is not supported.
+    """
+    query = 'SELECT key, value FROM metadata'
+    self._cursor.execute(query)
+
+    metadata_values = {row[0]: row[1] for row in self._cursor.fetchall()}
+
+    self._cursor.execute(self._TABLE_NAMES_QUERY)
+    table_names = [row[0] for row in self._cursor.fetchall()]
+
+    compression_dictionaries = {}
+    if 'compression_dictionary' in table_names:
+      query = 'SELECT container_type, data FROM compression_dictionary'
+      self._cursor.execute(query)
+
+      for row in self._cursor.fetchall():
+        compression_dictionaries[row[0]] = bytes(row[1])
+
+    self._codecs = {}
+    for container_type in self._CONTAINER_TYPES:
+      compression_format = metadata_values.get(
+          'compression_format_{0:s}'.format(container_type),
+          metadata_values['compression_format'])
+      if compression_format == definitions.COMPRESSION_FORMAT_NONE:
+        continue
+
+      try:
+        self._codecs[container_type] = (
+            compression.CompressionCodecsManager.GetCodec(
+                compression_format,
+                dictionary=compression_dictionaries.get(container_type, None)))
+      except ValueError as exception:
+        raise IOError((
+            'Unable to create codec of container type: {0:s} with '
+            'error: {1!s}').format(container_type, exception))
+
+    # Task storage files created before the serialization format was
+    # configurable are serialized in JSON.
+    self._SetSerializationFormat(metadata_values.get(
+        'serialization_format', definitions.SERIALIZER_FORMAT_JSON))
+
+  def _ReplaceEventDataRowIdentifier(self, match):
+    """Replaces an event data row identifier in a serialized event.
+
+    Args:
+      match (re.Match): match of the event data row identifier.
+
+    Returns:
+      bytes: serialized event data row identifier in the session storage.
+    """
+    lookup_key = int(match.group(1), 10)
+    event_data_identifier = self._event_data_identifier_mappings[lookup_key]
+
+    return '"event_data_row_identifier": {0:d}'.format(
+        event_data_identifier.row_identifier).encode('utf-8')
+
+  def _ReplacePathSpecRowIdentifier(self, match):
+    """Replaces a path specification node row identifier in serialized data.
+
+    Args:
+      match (re.Match): match of the path specification node row identifier.
+
+    Returns:
+      bytes: serialized path specification node row identifier in the session
+          storage.
+    """
+    lookup_key = int(match.group(1), 10)
+    path_spec_identifier = self._path_spec_identifier_mappings[lookup_key]
+
+    return match.group(0).replace(
+        match.group(1), '{0:d}'.format(
+            path_spec_identifier.row_identifier).encode('utf-8'))
+
+  def _ResolvePathSpec(self, attribute_container):
+    """Resolves the path specification of an attribute container.
+
+    Args:
+      attribute_container (AttributeContainer): attribute container that
+          references a path specification node.
+    """
+    row_identifier = getattr(
+        attribute_container, 'path_spec_row_identifier', None)
+    if row_identifier is not None:
+      path_spec_attribute_name = self._PATH_SPEC_ATTRIBUTE_NAMES[
+          attribute_container.CONTAINER_TYPE]
+      setattr(
+          attribute_container, path_spec_attribute_name,
+          self._path_specs[row_identifier])
+      attribute_container.path_spec_row_identifier = None
+
+  def _PrepareForNextContainerType(self, container_type):
+    """Prepares for the next container type.
+
+    This method prepares the task storage for merging the next container type.
+    It set the active container type and its add method accordingly.
+
+    Args:
+      container_type (str): attribute container type.
+    """
+    self._active_container_type = container_type
+
+    self._add_active_container_method = self._add_container_type_methods.get(
+        self._active_container_type)
+
+  def MergeAttributeContainers(
+      self, callback=None, maximum_number_of_containers=0):
+    """Reads attribute containers from a task storage file into the writer.
+
+    If no callback is provided, event, event data, event source and extraction
+    error attribute containers are merged in their serialized form, without
+    deserializing them.
+
+    Args:
+      callback (function[StorageWriter, AttributeContainer]): function to call
+          after each attribute container is deserialized.
+      maximum_number_of_containers (Optional[int]): maximum number of
+          containers to merge, where 0 represent no limit.
+
+    Returns:
+      bool: True if the entire task storage file has been merged.
+
+    Raises:
+      IOError: if the task storage file cannot be read.
+      RuntimeError: if the add method for the active attribute container
+          type is missing.
+      OSError: if the task storage file cannot be deleted.
+    """
+    try:
+      if not self._cursor:
+        self._Open()
+        self._ReadStorageMetadata()
+        self._container_types = self._GetContainerTypes()
+        self._event_attribute_names = self._GetEventAttributeNames()
+
+        self._read_ahead_thread = _ReadAheadThread(
+            self._path, self._container_types, self._codecs,
+            event_attribute_names=self._event_attribute_names)
+        self._read_ahead_thread.start()
+
+      fully_merged = self._MergeAttributeContainers(
+          callback, maximum_number_of_containers)
+
+    except IOError:
+      # The task storage file cannot be merged, hence it is removed to
+      # prevent it from being left behind in the merge directory.
+      self._Close()
+      os.remove(self._path)
+      raise
+
+    if fully_merged:
+      self._Close()
+      os.remove(self._path)
+
+    return fully_merged
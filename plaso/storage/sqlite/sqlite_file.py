@@ -3,45 +3,73 @@
 
 from __future__ import unicode_literals
 
+import collections
+import heapq
+import itertools
 import os
 import sqlite3
-import zlib
 
 from plaso.containers import artifacts
 from plaso.containers import errors
 from plaso.containers import event_sources
 from plaso.containers import events
+from plaso.containers import parser_statistics as parser_statistics_containers
+from plaso.containers import path_specs
 from plaso.containers import reports
 from plaso.containers import sessions
 from plaso.containers import tasks
 from plaso.lib import definitions
+from plaso.lib import py2to3
+from plaso.storage import compression
 from plaso.storage import event_heaps
 from plaso.storage import identifiers
 from plaso.storage import interface
 from plaso.storage import logger
+from plaso.storage import time_range as storage_time_range
 
 
 class SQLiteStorageFile(interface.BaseStorageFile):
   """SQLite-based storage file.
 
   Attributes:
+    compression_format (str): compression format of the container types
+        without a specific compression format.
     format_version (int): storage format version.
     serialization_format (str): serialization format.
     storage_type (str): storage type.
   """
 
-  _FORMAT_VERSION = 20180101
+  _FORMAT_VERSION = 20180714
 
   # The earliest format version, stored in-file, that this class
   # is able to read.
   _COMPATIBLE_FORMAT_VERSION = 20170707
 
+  # The earliest format version, stored in-file, that stores the event
+  # attributes used by filters in separate columns of the event table.
+  _EVENT_ATTRIBUTE_COLUMNS_FORMAT_VERSION = 20180630
+
+  # The earliest format version, stored in-file, that stores the path
+  # specifications of event data and event sources in a separate table.
+  _PATH_SPEC_TABLE_FORMAT_VERSION = 20180707
+
+  # Names of the event attributes that are frequently used by filters and
+  # are stored in separate columns of the event table, in addition to
+  # the serialized event. This allows SQLite to evaluate filters on these
+  # attributes without deserializing the events.
+  _EVENT_ATTRIBUTE_NAMES = (
+      'data_type', 'filename', 'hostname', 'parser', 'username')
+
   _CONTAINER_TYPE_ANALYSIS_REPORT = reports.AnalysisReport.CONTAINER_TYPE
   _CONTAINER_TYPE_EVENT = events.EventObject.CONTAINER_TYPE
   _CONTAINER_TYPE_EVENT_DATA = events.EventData.CONTAINER_TYPE
   _CONTAINER_TYPE_EVENT_SOURCE = event_sources.EventSource.CONTAINER_TYPE
   _CONTAINER_TYPE_EVENT_TAG = events.EventTag.CONTAINER_TYPE
   _CONTAINER_TYPE_EXTRACTION_ERROR = errors.ExtractionError.CONTAINER_TYPE
+  _CONTAINER_TYPE_PARSER_STATISTICS = (
+      parser_statistics_containers.ParserStatistics.CONTAINER_TYPE)
+  _CONTAINER_TYPE_PATH_SPEC = path_specs.PathSpecNode.CONTAINER_TYPE
+  _CONTAINER_TYPE_SESSION_CHECKPOINT = sessions.SessionCheckpoint.CONTAINER_TYPE
   _CONTAINER_TYPE_SESSION_COMPLETION = sessions.SessionCompletion.CONTAINER_TYPE
   _CONTAINER_TYPE_SESSION_START = sessions.SessionStart.CONTAINER_TYPE
   _CONTAINER_TYPE_SYSTEM_CONFIGURATION = (
@@ -56,6 +84,9 @@ class SQLiteStorageFile(interface.BaseStorageFile):
       _CONTAINER_TYPE_EVENT_DATA,
       _CONTAINER_TYPE_EVENT_SOURCE,
       _CONTAINER_TYPE_EVENT_TAG,
+      _CONTAINER_TYPE_PARSER_STATISTICS,
+      _CONTAINER_TYPE_PATH_SPEC,
+      _CONTAINER_TYPE_SESSION_CHECKPOINT,
       _CONTAINER_TYPE_SESSION_COMPLETION,
       _CONTAINER_TYPE_SESSION_START,
       _CONTAINER_TYPE_SYSTEM_CONFIGURATION,
@@ -66,11 +97,28 @@ class SQLiteStorageFile(interface.BaseStorageFile):
   _REFERENCED_CONTAINER_TYPES = (
       _CONTAINER_TYPE_EVENT,
       _CONTAINER_TYPE_EVENT_DATA,
-      _CONTAINER_TYPE_EVENT_SOURCE)
+      _CONTAINER_TYPE_EVENT_SOURCE,
+      _CONTAINER_TYPE_PATH_SPEC)
+
+  # Names of the path specification attributes of the container types that
+  # reference a path specification node instead of storing the path
+  # specification. The same path specification, and especially the same
+  # parent chain, is shared by many attribute containers.
+  _PATH_SPEC_ATTRIBUTE_NAMES = {
+      _CONTAINER_TYPE_EVENT_DATA: 'pathspec',
+      _CONTAINER_TYPE_EVENT_SOURCE: 'path_spec'}
 
   _CREATE_METADATA_TABLE_QUERY = (
       'CREATE TABLE metadata (key TEXT, value TEXT);')
 
+  _CREATE_COMPRESSION_DICTIONARY_TABLE_QUERY = (
+      'CREATE TABLE compression_dictionary ('
+      'container_type TEXT PRIMARY KEY, data BLOB);')
+
+  # Prefix of the metadata keys of the compression format of a specific
+  # container type, such as "compression_format_event".
+  _COMPRESSION_FORMAT_KEY_PREFIX = 'compression_format_'
+
   _CREATE_TABLE_QUERY = (
       'CREATE TABLE {0:s} ('
       '_identifier INTEGER PRIMARY KEY AUTOINCREMENT,'
@@ -80,8 +128,57 @@ class SQLiteStorageFile(interface.BaseStorageFile):
       'CREATE TABLE {0:s} ('
       '_identifier INTEGER PRIMARY KEY AUTOINCREMENT,'
       '_timestamp BIGINT,'
+      '_data_type TEXT,'
+      '_filename TEXT,'
+      '_hostname TEXT,'
+      '_parser TEXT,'
+      '_username TEXT,'
       '_data {1:s});')
 
+  # The data type index contains the timestamp so that events of a specific
+  # data type can be read in chronological order without an additional sort.
+  _CREATE_EVENT_INDEX_QUERIES = (
+      'CREATE INDEX event_timestamp ON event (_timestamp)',
+      'CREATE INDEX event_data_type ON event (_data_type, _timestamp)')
+
+  # Every flush of the serialized event heap writes the events in
+  # chronological order to consecutive rows, which makes each flush a sorted
+  # run of events. The row identifiers of the sorted runs are stored so that
+  # the events can be read in chronological order by merging the runs.
+  _CREATE_EVENT_RUN_TABLE_QUERY = (
+      'CREATE TABLE event_run ('
+      '_identifier INTEGER PRIMARY KEY AUTOINCREMENT,'
+      'first_row_identifier INTEGER,'
+      'last_row_identifier INTEGER);')
+
+  # When more sorted runs are stored than are merged at once, groups of runs
+  # are merged into new sorted runs in a temporary database, with this table,
+  # until few enough runs remain.
+  _CREATE_MERGED_EVENT_RUN_TABLE_QUERY = (
+      'CREATE TABLE merged_event_run ('
+      '_identifier INTEGER PRIMARY KEY,'
+      '_timestamp BIGINT,'
+      '_event_identifier INTEGER,'
+      '_data BLOB);')
+
+  _INSERT_EVENT_QUERY = 'INSERT INTO event (_timestamp, _data) VALUES (?, ?)'
+
+  _INSERT_EVENT_WITH_ATTRIBUTES_QUERY = (
+      'INSERT INTO event (_timestamp, _data_type, _filename, _hostname, '
+      '_parser, _username, _data) VALUES (?, ?, ?, ?, ?, ?, ?)')
+
+  _INSERT_MERGED_EVENT_RUN_ROW_QUERY = (
+      'INSERT INTO merged_event_run (_identifier, _timestamp, '
+      '_event_identifier, _data) VALUES (?, ?, ?, ?)')
+
+  # Comparison operators of filter conditions that can be evaluated by SQLite.
+  _FILTER_CONDITION_OPERATORS = {
+      '==': '=',
+      '<': '<',
+      '<=': '<=',
+      '>': '>',
+      '>=': '>='}
+
   _HAS_TABLE_QUERY = (
       'SELECT name FROM sqlite_master '
       'WHERE type = "table" AND name = "{0:s}"')
@@ -90,43 +187,126 @@ class SQLiteStorageFile(interface.BaseStorageFile):
   # a flush to disk (64 MiB).
   _MAXIMUM_BUFFER_SIZE = 64 * 1024 * 1024
 
+  # The maximum number of event data attribute values to cache, used to
+  # determine the attribute values of the events that reference them.
+  _MAXIMUM_CACHED_EVENT_DATA = 1024
+
+  # The maximum number of deserialized event data to cache, used when reading
+  # events together with their event data.
+  _MAXIMUM_CACHED_EVENT_DATA_CONTAINERS = 16 * 1024
+
+  # The number of events to read, or to add of which the event data attribute
+  # values are not cached, before reading the event data they reference in
+  # bulk.
+  _NUMBER_OF_EVENTS_PER_BATCH = 1024
+
+  # The maximum number of sorted runs of events to merge at once, since every
+  # run requires a separate query. The runs of a store with more sorted runs
+  # are merged in multiple passes.
+  _MAXIMUM_NUMBER_OF_EVENT_RUNS = 512
+
+  # The number of rows to read at once per sorted run of events, which
+  # bounds the memory used to merge the runs.
+  _NUMBER_OF_ROWS_PER_EVENT_RUN_READ = 32
+
+  # The maximum number of path specifications and path specification node
+  # row identifiers to cache. Path specifications that are no longer cached
+  # are stored again when written, which only affects the storage size.
+  _MAXIMUM_CACHED_PATH_SPECS = 16 * 1024
+
+  # The maximum number of serialized attribute containers used to train
+  # a shared compression dictionary.
+  _MAXIMUM_NUMBER_OF_DICTIONARY_SAMPLES = 4096
+
   def __init__(
       self, maximum_buffer_size=0,
-      storage_type=definitions.STORAGE_TYPE_SESSION):
+      serialization_format=definitions.SERIALIZER_FORMAT_JSON,
+      storage_type=definitions.STORAGE_TYPE_SESSION, compression_format=None,
+      compression_formats=None, compression_dictionaries=False):
     """Initializes a store.
 
     Args:
       maximum_buffer_size (Optional[int]):
           maximum size of a single storage stream. A value of 0 indicates
           the limit is _MAXIMUM_BUFFER_SIZE.
+      serialization_format (Optional[str]): serialization format of a newly
+          created store. The serialization format of an existing store is
+          read from its metadata.
       storage_type (Optional[str]): storage type.
+      compression_format (Optional[str]): compression format of a newly
+          created store, where None represents zlib for a session store
+          and no compression for a task store. The compression formats of
+          an existing store are read from its metadata.
+      compression_formats (Optional[dict[str, str]]): compression formats
+          per container type of a newly created store, which override
+          the compression format for specific container types.
+      compression_dictionaries (Optional[bool]): True if shared compression
+          dictionaries should be trained per container type, for compression
+          formats that support them. A dictionary is trained on the first
+          attribute containers written of a container type and stored in
+          the store.
 
     Raises:
-      ValueError: if the maximum buffer size value is out of bounds.
+      ValueError: if the maximum buffer size value is out of bounds or
+          the serialization or compression format is not supported.
     """
     if (maximum_buffer_size < 0 or
         maximum_buffer_size > self._MAXIMUM_BUFFER_SIZE):
       raise ValueError('Maximum buffer size value out of bounds.')
 
+    if serialization_format not in definitions.SERIALIZER_FORMATS:
+      raise ValueError('Unsupported serialization format: {0!s}'.format(
+          serialization_format))
+
+    if not compression_format:
+      if storage_type == definitions.STORAGE_TYPE_SESSION:
+        compression_format = definitions.COMPRESSION_FORMAT_ZLIB
+      else:
+        compression_format = definitions.COMPRESSION_FORMAT_NONE
+
+    compression_formats = dict(compression_formats or {})
+
+    supported_compression_formats = (
+        compression.CompressionCodecsManager.GetCompressionFormats())
+    for container_type, container_compression_format in itertools.chain(
+        [(None, compression_format)], compression_formats.items()):
+      if container_type and container_type not in self._CONTAINER_TYPES:
+        raise ValueError('Unsupported container type: {0!s}'.format(
+            container_type))
+
+      if container_compression_format not in supported_compression_formats:
+        raise ValueError('Unsupported compression format: {0!s}'.format(
+            container_compression_format))
+
     if not maximum_buffer_size:
       maximum_buffer_size = self._MAXIMUM_BUFFER_SIZE
 
     super(SQLiteStorageFile, self).__init__()
+    self._codecs = {}
+    self._compression_dictionaries = {}
+    self._compression_formats = compression_formats
     self._connection = None
     self._cursor = None
+    self._event_data_attribute_values = collections.OrderedDict()
+    self._event_data_cache = collections.OrderedDict()
+    self._events_with_uncached_event_data = []
+    self._has_event_attribute_columns = True
+    self._has_event_run_table = False
+    self._has_path_spec_table = True
     self._last_session = 0
     self._maximum_buffer_size = maximum_buffer_size
+    self._path_spec_cache = collections.OrderedDict()
+    self._path_spec_row_identifiers = collections.OrderedDict()
     self._serialized_event_heap = event_heaps.SerializedEventHeap()
+    self._serialized_path_spec_row_identifiers = collections.OrderedDict()
+    self._train_compression_dictionaries = compression_dictionaries
 
-    if storage_type == definitions.STORAGE_TYPE_SESSION:
-      self.compression_format = definitions.COMPRESSION_FORMAT_ZLIB
-    else:
-      self.compression_format = definitions.COMPRESSION_FORMAT_NONE
-
+    self.compression_format = compression_format
     self.format_version = self._FORMAT_VERSION
-    self.serialization_format = definitions.SERIALIZER_FORMAT_JSON
     self.storage_type = storage_type
 
+    self._SetSerializationFormat(serialization_format)
+
   def _AddAttributeContainer(self, container_type, attribute_container):
     """Adds an attribute container.
 
@@ -143,7 +323,27 @@ class SQLiteStorageFile(interface.BaseStorageFile):
         container_type, container_list.next_sequence_number + 1)
     attribute_container.SetIdentifier(identifier)
 
-    serialized_data = self._SerializeAttributeContainer(attribute_container)
+    path_spec = None
+    path_spec_attribute_name = None
+    if self._has_path_spec_table:
+      path_spec_attribute_name = self._PATH_SPEC_ATTRIBUTE_NAMES.get(
+          container_type, None)
+      if path_spec_attribute_name:
+        path_spec = getattr(
+            attribute_container, path_spec_attribute_name, None)
+
+    if path_spec:
+      attribute_container.path_spec_row_identifier = (
+          self._GetPathSpecRowIdentifier(path_spec))
+      setattr(attribute_container, path_spec_attribute_name, None)
+
+    try:
+      serialized_data = self._SerializeAttributeContainer(attribute_container)
+
+    finally:
+      if path_spec:
+        setattr(attribute_container, path_spec_attribute_name, path_spec)
+        attribute_container.path_spec_row_identifier = None
 
     container_list.PushAttributeContainer(serialized_data)
 
@@ -159,18 +359,68 @@ class SQLiteStorageFile(interface.BaseStorageFile):
     Raises:
       IOError: if the event cannot be serialized.
     """
+    number_of_events = self._serialized_event_heap.number_of_events + len(
+        self._events_with_uncached_event_data)
     identifier = identifiers.SQLTableIdentifier(
-        self._CONTAINER_TYPE_EVENT,
-        self._serialized_event_heap.number_of_events + 1)
+        self._CONTAINER_TYPE_EVENT, number_of_events + 1)
     event.SetIdentifier(identifier)
 
     serialized_data = self._SerializeAttributeContainer(event)
 
-    self._serialized_event_heap.PushEvent(event.timestamp, serialized_data)
+    attribute_values = None
+    has_uncached_event_data = False
+    if self._has_event_attribute_columns:
+      attribute_values = self._GetEventAttributeValues(event)
+      has_uncached_event_data = attribute_values is None
+
+    if not has_uncached_event_data:
+      self._serialized_event_heap.PushEvent(
+          event.timestamp, serialized_data, attribute_values=attribute_values)
+
+    else:
+      # The event data of events of which the event data attribute values
+      # are not cached is read in bulk.
+      self._events_with_uncached_event_data.append((event, serialized_data))
+      if len(self._events_with_uncached_event_data) < (
+          self._NUMBER_OF_EVENTS_PER_BATCH):
+        return
+
+      self._PushEventsWithUncachedEventData()
 
     if self._serialized_event_heap.data_size > self._maximum_buffer_size:
       self._WriteSerializedAttributeContainerList(self._CONTAINER_TYPE_EVENT)
 
+  def _AddSerializedPathSpecNode(self, serialized_data):
+    """Adds a serialized path specification node if not already stored.
+
+    Args:
+      serialized_data (bytes): serialized path specification node data.
+
+    Returns:
+      int: row identifier of the path specification node.
+    """
+    row_identifier = self._serialized_path_spec_row_identifiers.pop(
+        serialized_data, None)
+    if row_identifier is None:
+      container_list = self._GetSerializedAttributeContainerList(
+          self._CONTAINER_TYPE_PATH_SPEC)
+
+      row_identifier = container_list.next_sequence_number + 1
+      container_list.PushAttributeContainer(serialized_data)
+
+      if container_list.data_size > self._maximum_buffer_size:
+        self._WriteSerializedAttributeContainerList(
+            self._CONTAINER_TYPE_PATH_SPEC)
+
+      if len(self._serialized_path_spec_row_identifiers) >= (
+          self._MAXIMUM_CACHED_PATH_SPECS):
+        self._serialized_path_spec_row_identifiers.popitem(last=False)
+
+    self._serialized_path_spec_row_identifiers[serialized_data] = (
+        row_identifier)
+
+    return row_identifier
+
   @classmethod
   def _CheckStorageMetadata(cls, metadata_values):
     """Checks the storage metadata.
@@ -179,7 +429,8 @@ class SQLiteStorageFile(interface.BaseStorageFile):
       metadata_values (dict[str, str]): metadata values per key.
 
     Raises:
-      IOError: if the format version or the serializer format is not supported.
+      IOError: if the format version, the compression format or
+          the serializer format is not supported.
     """
     format_version = metadata_values.get('format_version', None)
 
@@ -205,11 +456,16 @@ class SQLiteStorageFile(interface.BaseStorageFile):
 
     compression_format = metadata_values.get('compression_format', None)
     if compression_format not in definitions.COMPRESSION_FORMATS:
-      raise IOError('Unsupported compression format: {0:s}'.format(
+      raise IOError('Unsupported compression format: {0!s}'.format(
           compression_format))
 
+    for key, value in metadata_values.items():
+      if (key.startswith(cls._COMPRESSION_FORMAT_KEY_PREFIX) and
+          value not in definitions.COMPRESSION_FORMATS):
+        raise IOError('Unsupported compression format: {0!s}'.format(value))
+
     serialization_format = metadata_values.get('serialization_format', None)
-    if serialization_format != definitions.SERIALIZER_FORMAT_JSON:
+    if serialization_format not in definitions.SERIALIZER_FORMATS:
       raise IOError('Unsupported serialization format: {0:s}'.format(
           serialization_format))
 
@@ -218,6 +474,62 @@ class SQLiteStorageFile(interface.BaseStorageFile):
       raise IOError('Unsupported storage type: {0:s}'.format(
           storage_type))
 
+  def _CompressSerializedData(self, container_type, codec, serialized_data):
+    """Compresses serialized attribute container data.
+
+    Args:
+      container_type (str): attribute container type.
+      codec (CompressionCodec): compression codec of the container type.
+      serialized_data (bytes|str): serialized attribute container data.
+
+    Returns:
+      bytes|str: data to store, which is the serialized data if not
+          compressed.
+    """
+    if codec.COMPRESSION_FORMAT == definitions.COMPRESSION_FORMAT_NONE:
+      if self._storage_profiler:
+        self._storage_profiler.Sample(
+            'write', container_type, len(serialized_data), 0)
+      return serialized_data
+
+    compressed_data = codec.Compress(serialized_data)
+
+    if self._storage_profiler:
+      self._storage_profiler.Sample(
+          'write', container_type, len(serialized_data),
+          len(compressed_data))
+
+    return sqlite3.Binary(compressed_data)
+
+  def _DeserializeAttributeContainer(self, container_type, serialized_data):
+    """Deserializes an attribute container.
+
+    The path specification of an attribute container that references
+    a path specification node is resolved.
+
+    Args:
+      container_type (str): attribute container type.
+      serialized_data (bytes): serialized attribute container data.
+
+    Returns:
+      AttributeContainer: attribute container or None.
+    """
+    attribute_container = super(
+        SQLiteStorageFile, self)._DeserializeAttributeContainer(
+            container_type, serialized_data)
+
+    path_spec_attribute_name = self._PATH_SPEC_ATTRIBUTE_NAMES.get(
+        container_type, None)
+    if attribute_container and path_spec_attribute_name:
+      row_identifier = getattr(
+          attribute_container, 'path_spec_row_identifier', None)
+      if row_identifier is not None:
+        path_spec = self._GetPathSpecByRowIdentifier(row_identifier)
+        setattr(attribute_container, path_spec_attribute_name, path_spec)
+        attribute_container.path_spec_row_identifier = None
+
+    return attribute_container
+
   def _GetAttributeContainerByIndex(self, container_type, index):
     """Retrieves a specific attribute container.
 
@@ -227,6 +539,9 @@ class SQLiteStorageFile(interface.BaseStorageFile):
 
     Returns:
       AttributeContainer: attribute container or None if not available.
+
+    Raises:
+      IOError: if the attribute container data cannot be decompressed.
     """
     sequence_number = index + 1
     query = 'SELECT _data FROM {0:s} WHERE rowid = {1:d}'.format(
@@ -238,10 +553,8 @@ class SQLiteStorageFile(interface.BaseStorageFile):
       identifier = identifiers.SQLTableIdentifier(
           container_type, sequence_number)
 
-      if self.compression_format == definitions.COMPRESSION_FORMAT_ZLIB:
-        serialized_data = zlib.decompress(row[0])
-      else:
-        serialized_data = row[0]
+      codec = self._GetCodec(container_type)
+      serialized_data = codec.Decompress(row[0])
 
       if self._storage_profiler:
         self._storage_profiler.Sample(
@@ -267,16 +580,22 @@ class SQLiteStorageFile(interface.BaseStorageFile):
     return attribute_container
 
   def _GetAttributeContainers(
-      self, container_type, filter_expression=None, order_by=None):
+      self, container_type, filter_expression=None, filter_values=None,
+      order_by=None):
     """Retrieves attribute containers.
 
     Args:
       container_type (str): attribute container type.
       filter_expression (Optional[str]): expression to filter results by.
+      filter_values (Optional[list[object]]): values of the parameters of
+          the filter expression.
       order_by (Optional[str]): name of a column to order the results by.
 
     Yields:
       AttributeContainer: attribute container.
+
+    Raises:
+      IOError: if the attribute container data cannot be decompressed.
     """
     query = 'SELECT _identifier, _data FROM {0:s}'.format(container_type)
     if filter_expression:
@@ -287,16 +606,18 @@ class SQLiteStorageFile(interface.BaseStorageFile):
     # Use a local cursor to prevent another query interrupting the generator.
     cursor = self._connection.cursor()
 
-    cursor.execute(query)
+    cursor.execute(query, filter_values or [])
+
+    codec = None
 
     row = cursor.fetchone()
     while row:
       identifier = identifiers.SQLTableIdentifier(container_type, row[0])
 
-      if self.compression_format == definitions.COMPRESSION_FORMAT_ZLIB:
-        serialized_data = zlib.decompress(row[1])
-      else:
-        serialized_data = row[1]
+      if not codec:
+        codec = self._GetCodec(container_type)
+
+      serialized_data = codec.Decompress(row[1])
 
       if self._storage_profiler:
         self._storage_profiler.Sample(
@@ -309,6 +630,315 @@ class SQLiteStorageFile(interface.BaseStorageFile):
 
       row = cursor.fetchone()
 
+  def _GetAttributeValues(self, attribute_container):
+    """Retrieves the values of the event attributes stored in separate columns.
+
+    Args:
+      attribute_container (AttributeContainer): event or event data.
+
+    Returns:
+      tuple: values of the event attributes, in the order of
+          _EVENT_ATTRIBUTE_NAMES, where None represents an unset attribute.
+    """
+    return tuple(
+        getattr(attribute_container, attribute_name, None)
+        for attribute_name in self._EVENT_ATTRIBUTE_NAMES)
+
+  def _GetCodec(self, container_type):
+    """Retrieves the compression codec of a specific container type.
+
+    Args:
+      container_type (str): attribute container type.
+
+    Returns:
+      CompressionCodec: compression codec.
+
+    Raises:
+      IOError: if the compression format is not supported.
+    """
+    codec = self._codecs.get(container_type, None)
+    if not codec:
+      compression_format = self._GetCompressionFormat(container_type)
+      dictionary = self._compression_dictionaries.get(container_type, None)
+
+      try:
+        codec = compression.CompressionCodecsManager.GetCodec(
+            compression_format, dictionary=dictionary)
+      except ValueError as exception:
+        raise IOError((
+            'Unable to create codec of container type: {0:s} with '
+            'error: {1!s}').format(container_type, exception))
+
+      self._codecs[container_type] = codec
+
+    return codec
+
+  def _GetCompressionFormat(self, container_type):
+    """Retrieves the compression format of a specific container type.
+
+    Args:
+      container_type (str): attribute container type.
+
+    Returns:
+      str: compression format.
+    """
+    return self._compression_formats.get(
+        container_type, self.compression_format)
+
+  def _GetEventAttributeValues(self, event):
+    """Retrieves the values of the event attributes stored in separate columns.
+
+    The values of the event data take precedence over those of the event,
+    in the same way the event data attributes are combined with the event
+    when the event is read.
+
+    Args:
+      event (EventObject): event.
+
+    Returns:
+      tuple: values of the event attributes, in the order of
+          _EVENT_ATTRIBUTE_NAMES, where None represents an unset attribute,
+          or None if the attribute values of the event data referenced by
+          the event are not cached.
+    """
+    event_values = self._GetAttributeValues(event)
+
+    event_data_identifier = event.GetEventDataIdentifier()
+    if not event_data_identifier:
+      return event_values
+
+    event_data_values = self._event_data_attribute_values.get(
+        event_data_identifier.row_identifier, None)
+    if event_data_values is None:
+      return None
+
+    return self._MergeAttributeValues(event_values, event_data_values)
+
+  def _GetEventDataOfEvents(self, events):
+    """Retrieves the event data referenced by events.
+
+    Event data that is not cached is read in bulk, in order of row
+    identifier, and added to the cache.
+
+    Args:
+      events (list[EventObject]): events.
+
+    Returns:
+      dict[int, EventData]: event data per row identifier.
+    """
+    event_data_per_row = {}
+    row_identifiers = set()
+
+    for event in events:
+      event_data_identifier = event.GetEventDataIdentifier()
+      if not event_data_identifier:
+        continue
+
+      row_identifier = event_data_identifier.row_identifier
+      if row_identifier in event_data_per_row:
+        continue
+
+      # Move the cached event data to the end to mark it as recently used.
+      event_data = self._event_data_cache.pop(row_identifier, None)
+      if event_data:
+        self._event_data_cache[row_identifier] = event_data
+        event_data_per_row[row_identifier] = event_data
+      else:
+        row_identifiers.add(row_identifier)
+
+    if row_identifiers:
+      filter_expression = '_identifier IN ({0:s})'.format(', '.join([
+          '{0:d}'.format(row_identifier)
+          for row_identifier in sorted(row_identifiers)]))
+
+      event_data_generator = self._GetAttributeContainers(
+          self._CONTAINER_TYPE_EVENT_DATA, filter_expression=filter_expression,
+          order_by='_identifier')
+
+      for event_data in event_data_generator:
+        row_identifier = event_data.GetIdentifier().row_identifier
+        event_data_per_row[row_identifier] = event_data
+        row_identifiers.remove(row_identifier)
+
+      # Event data that has not been written yet is not returned by the query.
+      for row_identifier in row_identifiers:
+        event_data_identifier = identifiers.SQLTableIdentifier(
+            self._CONTAINER_TYPE_EVENT_DATA, row_identifier)
+        event_data = self.GetEventDataByIdentifier(event_data_identifier)
+        if event_data:
+          event_data_per_row[row_identifier] = event_data
+
+    for row_identifier, event_data in event_data_per_row.items():
+      if row_identifier not in self._event_data_cache:
+        self._event_data_cache[row_identifier] = event_data
+
+    while len(self._event_data_cache) > (
+        self._MAXIMUM_CACHED_EVENT_DATA_CONTAINERS):
+      self._event_data_cache.popitem(last=False)
+
+    return event_data_per_row
+
+  def _GetEventValuesTuple(self, timestamp, serialized_data, attribute_values):
+    """Retrieves the values tuple to insert an event.
+
+    Args:
+      timestamp (int): timestamp of the event.
+      serialized_data (bytes): serialized event data.
+      attribute_values (tuple): values of the event attributes stored in
+          separate columns or None if not available.
+
+    Returns:
+      tuple: values of the parameters of the insert event query.
+    """
+    if not self._has_event_attribute_columns:
+      return timestamp, serialized_data
+
+    if attribute_values is None:
+      attribute_values = (None, ) * len(self._EVENT_ATTRIBUTE_NAMES)
+
+    return (timestamp, ) + attribute_values + (serialized_data, )
+
+  def _GetEventRunRows(
+      self, first_row_identifier, last_row_identifier, merge_connection=None):
+    """Retrieves the rows of a sorted run of events.
+
+    Args:
+      first_row_identifier (int): row identifier of the first event of the run.
+      last_row_identifier (int): row identifier of the last event of the run.
+      merge_connection (Optional[sqlite3.Connection]): connection to
+          the temporary database that contains the merged runs, where None
+          represents a run of the event table.
+
+    Yields:
+      tuple[int, int, bytes]: timestamp, row identifier and data of an event,
+          in chronological order.
+    """
+    if merge_connection:
+      query = (
+          'SELECT _timestamp, _event_identifier, _data FROM merged_event_run '
+          'WHERE _identifier >= {0:d} AND _identifier <= {1:d} '
+          'ORDER BY _identifier').format(
+              first_row_identifier, last_row_identifier)
+
+      cursor = merge_connection.cursor()
+
+    else:
+      query = (
+          'SELECT _timestamp, _identifier, _data FROM event '
+          'WHERE _identifier >= {0:d} AND _identifier <= {1:d} '
+          'ORDER BY _identifier').format(
+              first_row_identifier, last_row_identifier)
+
+      # Use a local cursor since the rows of the runs are read interleaved.
+      cursor = self._connection.cursor()
+
+    cursor.execute(query)
+
+    rows = cursor.fetchmany(size=self._NUMBER_OF_ROWS_PER_EVENT_RUN_READ)
+    while rows:
+      for row in rows:
+        yield row
+
+      rows = cursor.fetchmany(size=self._NUMBER_OF_ROWS_PER_EVENT_RUN_READ)
+
+  def _GetEventRuns(self):
+    """Retrieves the sorted runs of events.
+
+    Returns:
+      list[tuple[int, int]]: row identifiers of the first and last event
+          of every sorted run, or None if the events cannot be read by merging
+          sorted runs, because the store does not contain sorted runs for all
+          events.
+    """
+    if not self._has_event_run_table:
+      return None
+
+    query = (
+        'SELECT first_row_identifier, last_row_identifier FROM event_run '
+        'ORDER BY first_row_identifier')
+    self._cursor.execute(query)
+    event_runs = self._cursor.fetchall()
+
+    if not event_runs:
+      return None
+
+    number_of_events = sum(
+        last_row_identifier - first_row_identifier + 1
+        for first_row_identifier, last_row_identifier in event_runs)
+
+    if number_of_events != self._CountStoredAttributeContainers(
+        self._CONTAINER_TYPE_EVENT):
+      return None
+
+    return event_runs
+
+  def _GetEventsFromSortedRuns(self, event_runs):
+    """Retrieves the events in chronological order by merging sorted runs.
+
+    Only a limited number of rows of every sorted run is read at a time,
+    hence the memory used does not depend on the number of events. If there
+    are more sorted runs than are merged at once, the runs are first merged
+    into fewer runs by _MergeEventRuns.
+
+    Args:
+      event_runs (list[tuple[int, int]]): row identifiers of the first and
+          last event of every sorted run.
+
+    Yields:
+      EventObject: event.
+
+    Raises:
+      IOError: if the event data cannot be decompressed.
+    """
+    merge_connection = None
+    if len(event_runs) > self._MAXIMUM_NUMBER_OF_EVENT_RUNS:
+      # An empty path creates a temporary database that is removed when
+      # the connection is closed.
+      merge_connection = sqlite3.connect('')
+      event_runs = self._MergeEventRuns(merge_connection, event_runs)
+
+    try:
+      event_run_generators = [
+          self._GetEventRunRows(
+              first_row_identifier, last_row_identifier,
+              merge_connection=merge_connection)
+          for first_row_identifier, last_row_identifier in event_runs]
+
+      codec = self._GetCodec(self._CONTAINER_TYPE_EVENT)
+
+      # The rows are merged on timestamp and row identifier, which is
+      # the order of the timestamp index, since the row identifiers are
+      # unique.
+      for _, row_identifier, data in heapq.merge(*event_run_generators):
+        serialized_data = codec.Decompress(data)
+
+        if self._storage_profiler:
+          self._storage_profiler.Sample(
+              'read', self._CONTAINER_TYPE_EVENT, len(serialized_data),
+              len(data))
+
+        event = self._DeserializeAttributeContainer(
+            self._CONTAINER_TYPE_EVENT, serialized_data)
+        event.SetIdentifier(identifiers.SQLTableIdentifier(
+            self._CONTAINER_TYPE_EVENT, row_identifier))
+        yield event
+
+    finally:
+      if merge_connection:
+        merge_connection.close()
+
+  def _GetInsertEventQuery(self):
+    """Retrieves the query to insert an event.
+
+    Returns:
+      str: insert event query, with the parameters as returned by
+          _GetEventValuesTuple.
+    """
+    if self._has_event_attribute_columns:
+      return self._INSERT_EVENT_WITH_ATTRIBUTES_QUERY
+
+    return self._INSERT_EVENT_QUERY
+
   def _HasAttributeContainers(self, container_type):
     """Determines if a store contains a specific type of attribute containers.
 
@@ -322,6 +952,77 @@ class SQLiteStorageFile(interface.BaseStorageFile):
     count = self._CountStoredAttributeContainers(container_type)
     return count > 0
 
+  def _GetPathSpecByRowIdentifier(self, row_identifier):
+    """Retrieves a path specification by the row identifier of its node.
+
+    Args:
+      row_identifier (int): row identifier of the path specification node.
+
+    Returns:
+      dfvfs.PathSpec: path specification.
+
+    Raises:
+      IOError: if the path specification node cannot be read.
+    """
+    path_spec = self._path_spec_cache.pop(row_identifier, None)
+    if not path_spec:
+      path_spec_node = self._GetAttributeContainerByIndex(
+          self._CONTAINER_TYPE_PATH_SPEC, row_identifier - 1)
+      if not path_spec_node:
+        raise IOError('Missing path specification node: {0:d}'.format(
+            row_identifier))
+
+      parent_path_spec = None
+      if path_spec_node.parent_row_identifier is not None:
+        parent_path_spec = self._GetPathSpecByRowIdentifier(
+            path_spec_node.parent_row_identifier)
+
+      path_spec = path_spec_node.GetPathSpec(parent=parent_path_spec)
+
+      if len(self._path_spec_cache) >= self._MAXIMUM_CACHED_PATH_SPECS:
+        self._path_spec_cache.popitem(last=False)
+
+    self._path_spec_cache[row_identifier] = path_spec
+
+    return path_spec
+
+  def _GetPathSpecRowIdentifier(self, path_spec):
+    """Retrieves the row identifier of the node of a path specification.
+
+    The path specification node and the nodes of its parents are added when
+    not already stored.
+
+    Args:
+      path_spec (dfvfs.PathSpec): path specification.
+
+    Returns:
+      int: row identifier of the path specification node.
+
+    Raises:
+      IOError: if the path specification node cannot be serialized.
+    """
+    lookup_key = path_spec.comparable
+
+    row_identifier = self._path_spec_row_identifiers.pop(lookup_key, None)
+    if row_identifier is None:
+      parent_row_identifier = None
+      if path_spec.HasParent():
+        parent_row_identifier = self._GetPathSpecRowIdentifier(
+            path_spec.parent)
+
+      path_spec_node = path_specs.PathSpecNode(
+          parent_row_identifier=parent_row_identifier, path_spec=path_spec)
+      serialized_data = self._SerializeAttributeContainer(path_spec_node)
+      row_identifier = self._AddSerializedPathSpecNode(serialized_data)
+
+      if len(self._path_spec_row_identifiers) >= (
+          self._MAXIMUM_CACHED_PATH_SPECS):
+        self._path_spec_row_identifiers.popitem(last=False)
+
+    self._path_spec_row_identifiers[lookup_key] = row_identifier
+
+    return row_identifier
+
   def _HasTable(self, table_name):
     """Determines if a specific table exists.
 
@@ -336,11 +1037,115 @@ class SQLiteStorageFile(interface.BaseStorageFile):
     self._cursor.execute(query)
     return bool(self._cursor.fetchone())
 
+  def _MergeAttributeValues(self, event_values, event_data_values):
+    """Merges the values of the event attributes of an event and event data.
+
+    The values of the event data take precedence over those of the event.
+
+    Args:
+      event_values (tuple): values of the event attributes of the event.
+      event_data_values (tuple): values of the event attributes of the event
+          data.
+
+    Returns:
+      tuple: values of the event attributes, in the order of
+          _EVENT_ATTRIBUTE_NAMES, where None represents an unset attribute.
+    """
+    return tuple(
+        event_value if event_data_value is None else event_data_value
+        for event_value, event_data_value in zip(
+            event_values, event_data_values))
+
+  def _MergeEventRuns(self, merge_connection, event_runs):
+    """Merges sorted runs of events into fewer sorted runs.
+
+    Every group of at most _MAXIMUM_NUMBER_OF_EVENT_RUNS sorted runs is merged
+    into a new sorted run in a temporary database. This is repeated, with
+    the merged runs, until at most _MAXIMUM_NUMBER_OF_EVENT_RUNS runs remain.
+
+    Args:
+      merge_connection (sqlite3.Connection): connection to the temporary
+          database to store the merged runs in.
+      event_runs (list[tuple[int, int]]): row identifiers of the first and
+          last event of every sorted run in the event table.
+
+    Returns:
+      list[tuple[int, int]]: row identifiers of the first and last row of
+          every merged run in the temporary database.
+    """
+    # At least 2 runs need to be merged at once to reduce the number of runs.
+    maximum_number_of_event_runs = max(self._MAXIMUM_NUMBER_OF_EVENT_RUNS, 2)
+
+    cursor = merge_connection.cursor()
+    cursor.execute(self._CREATE_MERGED_EVENT_RUN_TABLE_QUERY)
+
+    row_identifier = 1
+    runs_connection = None
+    while len(event_runs) > maximum_number_of_event_runs:
+      merged_event_runs = []
+      for index in range(0, len(event_runs), maximum_number_of_event_runs):
+        event_run_generators = [
+            self._GetEventRunRows(
+                first_row_identifier, last_row_identifier,
+                merge_connection=runs_connection)
+            for first_row_identifier, last_row_identifier in event_runs[
+                index:index + maximum_number_of_event_runs]]
+
+        row_identifiers = itertools.count(start=row_identifier)
+        cursor.executemany(self._INSERT_MERGED_EVENT_RUN_ROW_QUERY, (
+            (next(row_identifiers), timestamp, event_identifier, data)
+            for timestamp, event_identifier, data in heapq.merge(
+                *event_run_generators)))
+
+        last_row_identifier = next(row_identifiers) - 1
+        merged_event_runs.append((row_identifier, last_row_identifier))
+        row_identifier = last_row_identifier + 1
+
+      if runs_connection:
+        # Remove the rows of the runs that were merged again.
+        cursor.execute(
+            'DELETE FROM merged_event_run WHERE _identifier < {0:d}'.format(
+                merged_event_runs[0][0]))
+
+      event_runs = merged_event_runs
+      runs_connection = merge_connection
+
+    merge_connection.commit()
+
+    return event_runs
+
+  def _PushEventsWithUncachedEventData(self):
+    """Pushes the events with uncached event data onto the event heap.
+
+    The event data referenced by the events is read in bulk to determine
+    the values of their event attributes.
+    """
+    if not self._events_with_uncached_event_data:
+      return
+
+    event_data_per_row = self._GetEventDataOfEvents([
+        event for event, _ in self._events_with_uncached_event_data])
+
+    for event, serialized_data in self._events_with_uncached_event_data:
+      attribute_values = self._GetAttributeValues(event)
+
+      event_data_identifier = event.GetEventDataIdentifier()
+      event_data = event_data_per_row.get(
+          event_data_identifier.row_identifier, None)
+      if event_data:
+        attribute_values = self._MergeAttributeValues(
+            attribute_values, self._GetAttributeValues(event_data))
+
+      self._serialized_event_heap.PushEvent(
+          event.timestamp, serialized_data, attribute_values=attribute_values)
+
+    self._events_with_uncached_event_data = []
+
   def _ReadStorageMetadata(self):
     """Reads the storage metadata.
 
-    Returns:
-      bool: True if the storage metadata was read.
+    Raises:
+      IOError: if the storage metadata is not supported.
     """
     query = 'SELECT key, value FROM metadata'
     self._cursor.execute(query)
@@ -350,10 +1155,71 @@ class SQLiteStorageFile(interface.BaseStorageFile):
     SQLiteStorageFile._CheckStorageMetadata(metadata_values)
 
     self.format_version = metadata_values['format_version']
+    self._has_event_attribute_columns = (
+        self.format_version >= self._EVENT_ATTRIBUTE_COLUMNS_FORMAT_VERSION)
+    self._has_path_spec_table = (
+        self.format_version >= self._PATH_SPEC_TABLE_FORMAT_VERSION)
     self.compression_format = metadata_values['compression_format']
-    self.serialization_format = metadata_values['serialization_format']
     self.storage_type = metadata_values['storage_type']
 
+    self._compression_formats = {
+        key[len(self._COMPRESSION_FORMAT_KEY_PREFIX):]: value
+        for key, value in metadata_values.items()
+        if key.startswith(self._COMPRESSION_FORMAT_KEY_PREFIX)}
+
+    supported_compression_formats = (
+        compression.CompressionCodecsManager.GetCompressionFormats())
+    for compression_format in itertools.chain(
+        [self.compression_format], self._compression_formats.values()):
+      if compression_format not in supported_compression_formats:
+        raise IOError('Compression format: {0:s} not available.'.format(
+            compression_format))
+
+    self._compression_dictionaries = {}
+    if self._HasTable('compression_dictionary'):
+      query = 'SELECT container_type, data FROM compression_dictionary'
+      self._cursor.execute(query)
+
+      for row in self._cursor.fetchall():
+        self._compression_dictionaries[row[0]] = bytes(row[1])
+
+    self._codecs = {}
+
+    self._SetSerializationFormat(metadata_values['serialization_format'])
+
+  def _TrainCompressionDictionary(self, container_type, samples):
+    """Trains and stores a shared compression dictionary if supported.
+
+    A dictionary is only trained for a container type that has no stored
+    attribute containers, since these are compressed without dictionary.
+
+    Args:
+      container_type (str): attribute container type.
+      samples (list[bytes]): serialized attribute container data to train
+          the dictionary on.
+    """
+    compression_format = self._GetCompressionFormat(container_type)
+    if (container_type in self._compression_dictionaries or
+        not compression.CompressionCodecsManager.SupportsDictionary(
+            compression_format) or
+        self._CountStoredAttributeContainers(container_type)):
+      return
+
+    dictionary = compression.CompressionCodecsManager.TrainDictionary(
+        compression_format, samples)
+    if not dictionary:
+      return
+
+    if not self._HasTable('compression_dictionary'):
+      self._cursor.execute(self._CREATE_COMPRESSION_DICTIONARY_TABLE_QUERY)
+
+    query = (
+        'INSERT INTO compression_dictionary (container_type, data) '
+        'VALUES (?, ?)')
+    self._cursor.execute(query, (container_type, sqlite3.Binary(dictionary)))
+
+    self._compression_dictionaries[container_type] = dictionary
+
   def _WriteAttributeContainer(self, attribute_container):
     """Writes an attribute container.
 
@@ -361,26 +1227,25 @@ class SQLiteStorageFile(interface.BaseStorageFile):
 
     Args:
       attribute_container (AttributeContainer): attribute container.
+
+    Raises:
+      IOError: if the compression format is not supported.
     """
     if attribute_container.CONTAINER_TYPE == self._CONTAINER_TYPE_EVENT:
-      timestamp, serialized_data = self._serialized_event_heap.PopEvent()
+      timestamp, serialized_data, attribute_values = (
+          self._serialized_event_heap.PopEvent())
     else:
       serialized_data = self._SerializeAttributeContainer(attribute_container)
 
-    if self.compression_format == definitions.COMPRESSION_FORMAT_ZLIB:
-      compressed_data = zlib.compress(serialized_data)
-      serialized_data = sqlite3.Binary(compressed_data)
-    else:
-      compressed_data = ''
-
-    if self._storage_profiler:
-      self._storage_profiler.Sample(
-          'write', attribute_container.CONTAINER_TYPE, len(serialized_data),
-          len(compressed_data))
+    codec = self._GetCodec(attribute_container.CONTAINER_TYPE)
+    serialized_data = self._CompressSerializedData(
+        attribute_container.CONTAINER_TYPE, codec, serialized_data)
 
     if attribute_container.CONTAINER_TYPE == self._CONTAINER_TYPE_EVENT:
-      query = 'INSERT INTO event (_timestamp, _data) VALUES (?, ?)'
-      self._cursor.execute(query, (timestamp, serialized_data))
+      query = self._GetInsertEventQuery()
+      values_tuple = self._GetEventValuesTuple(
+          timestamp, serialized_data, attribute_values)
+      self._cursor.execute(query, values_tuple)
     else:
       query = 'INSERT INTO {0:s} (_data) VALUES (?)'.format(
           attribute_container.CONTAINER_TYPE)
@@ -395,8 +1260,13 @@ class SQLiteStorageFile(interface.BaseStorageFile):
 
     Args:
       container_type (str): attribute container type.
+
+    Raises:
+      IOError: if the compression format is not supported.
     """
     if container_type == self._CONTAINER_TYPE_EVENT:
+      self._PushEventsWithUncachedEventData()
+
       if not self._serialized_event_heap.data_size:
         return
 
@@ -415,7 +1285,7 @@ class SQLiteStorageFile(interface.BaseStorageFile):
       self._serializers_profiler.StartTiming('write')
 
     if container_type == self._CONTAINER_TYPE_EVENT:
-      query = 'INSERT INTO event (_timestamp, _data) VALUES (?, ?)'
+      query = self._GetInsertEventQuery()
     else:
       query = 'INSERT INTO {0:s} (_data) VALUES (?)'.format(container_type)
 
@@ -423,27 +1293,52 @@ class SQLiteStorageFile(interface.BaseStorageFile):
     values_tuple_list = []
     for _ in range(number_of_attribute_containers):
       if container_type == self._CONTAINER_TYPE_EVENT:
-        timestamp, serialized_data = self._serialized_event_heap.PopEvent()
+        timestamp, serialized_data, attribute_values = (
+            self._serialized_event_heap.PopEvent())
+        values_tuple_list.append(
+            (timestamp, serialized_data, attribute_values))
       else:
         serialized_data = container_list.PopAttributeContainer()
+        values_tuple_list.append((serialized_data, ))
 
-      if self.compression_format == definitions.COMPRESSION_FORMAT_ZLIB:
-        compressed_data = zlib.compress(serialized_data)
-        serialized_data = sqlite3.Binary(compressed_data)
-      else:
-        compressed_data = ''
+    if (self._train_compression_dictionaries and
+        container_type not in self._codecs):
+      samples = [
+          values_tuple[1] if container_type == self._CONTAINER_TYPE_EVENT
+          else values_tuple[0]
+          for values_tuple in values_tuple_list[
+              :self._MAXIMUM_NUMBER_OF_DICTIONARY_SAMPLES]]
+      self._TrainCompressionDictionary(container_type, samples)
 
-      if self._storage_profiler:
-        self._storage_profiler.Sample(
-            'write', container_type, len(serialized_data), len(compressed_data))
+    codec = self._GetCodec(container_type)
+
+    if container_type == self._CONTAINER_TYPE_EVENT:
+      first_row_identifier = self._CountStoredAttributeContainers(
+          container_type) + 1
 
+    for index, values_tuple in enumerate(values_tuple_list):
       if container_type == self._CONTAINER_TYPE_EVENT:
-        values_tuple_list.append((timestamp, serialized_data))
+        timestamp, serialized_data, attribute_values = values_tuple
+        serialized_data = self._CompressSerializedData(
+            container_type, codec, serialized_data)
+        values_tuple_list[index] = self._GetEventValuesTuple(
+            timestamp, serialized_data, attribute_values)
       else:
-        values_tuple_list.append((serialized_data, ))
+        serialized_data = self._CompressSerializedData(
+            container_type, codec, values_tuple[0])
+        values_tuple_list[index] = (serialized_data, )
 
     self._cursor.executemany(query, values_tuple_list)
 
+    if (container_type == self._CONTAINER_TYPE_EVENT and
+        self._has_event_run_table):
+      query = (
+          'INSERT INTO event_run (first_row_identifier, last_row_identifier) '
+          'VALUES (?, ?)')
+      self._cursor.execute(query, (
+          first_row_identifier,
+          first_row_identifier + number_of_attribute_containers - 1))
+
     if self._serializers_profiler:
       self._serializers_profiler.StopTiming('write')
 
@@ -452,6 +1347,24 @@ class SQLiteStorageFile(interface.BaseStorageFile):
     else:
       container_list.Empty()
 
+  def _WriteSerializedAttributeContainerLists(self):
+    """Writes all serialized attribute container lists.
+
+    The path specifications are written first, since the other attribute
+    containers reference them.
+    """
+    self._WriteSerializedAttributeContainerList(
+        self._CONTAINER_TYPE_PATH_SPEC)
+    self._WriteSerializedAttributeContainerList(
+        self._CONTAINER_TYPE_EVENT_SOURCE)
+    self._WriteSerializedAttributeContainerList(
+        self._CONTAINER_TYPE_EVENT_DATA)
+    self._WriteSerializedAttributeContainerList(self._CONTAINER_TYPE_EVENT)
+    self._WriteSerializedAttributeContainerList(
+        self._CONTAINER_TYPE_EVENT_TAG)
+    self._WriteSerializedAttributeContainerList(
+        self._CONTAINER_TYPE_EXTRACTION_ERROR)
+
   def _WriteStorageMetadata(self):
     """Writes the storage metadata."""
     self._cursor.execute(self._CREATE_METADATA_TABLE_QUERY)
@@ -466,6 +1379,11 @@ class SQLiteStorageFile(interface.BaseStorageFile):
     value = self.compression_format
     self._cursor.execute(query, (key, value))
 
+    for container_type, value in sorted(self._compression_formats.items()):
+      key = '{0:s}{1:s}'.format(
+          self._COMPRESSION_FORMAT_KEY_PREFIX, container_type)
+      self._cursor.execute(query, (key, value))
+
     key = 'serialization_format'
     value = self.serialization_format
     self._cursor.execute(query, (key, value))
@@ -490,7 +1408,7 @@ class SQLiteStorageFile(interface.BaseStorageFile):
       raise ValueError('Attribute container type {0:s} is not supported'.format(
           container_type))
 
-    if not self._HasTable(self._CONTAINER_TYPE_ANALYSIS_REPORT):
+    if not self._HasTable(container_type):
       return 0
 
     # Note that this is SQLite specific, and will give inaccurate results if
@@ -567,6 +1485,15 @@ class SQLiteStorageFile(interface.BaseStorageFile):
 
     self._AddAttributeContainer(self._CONTAINER_TYPE_EVENT_DATA, event_data)
 
+    if self._has_event_attribute_columns:
+      identifier = event_data.GetIdentifier()
+      self._event_data_attribute_values[identifier.row_identifier] = (
+          self._GetAttributeValues(event_data))
+
+      if len(self._event_data_attribute_values) > (
+          self._MAXIMUM_CACHED_EVENT_DATA):
+        self._event_data_attribute_values.popitem(last=False)
+
   def AddEventSource(self, event_source):
     """Adds an event source.
 
@@ -602,6 +1529,84 @@ class SQLiteStorageFile(interface.BaseStorageFile):
 
     self._AddAttributeContainer(self._CONTAINER_TYPE_EVENT_TAG, event_tag)
 
+  def AddParserStatistics(self, parser_statistics):
+    """Adds parser statistics.
+
+    Args:
+      parser_statistics (ParserStatistics): parser statistics.
+
+    Raises:
+      IOError: when the storage file is closed or read-only.
+    """
+    self._RaiseIfNotWritable()
+
+    self._WriteAttributeContainer(parser_statistics)
+
+  def AddSerializedAttributeContainer(
+      self, container_type, serialized_data, attribute_values=None,
+      timestamp=None):
+    """Adds a serialized attribute container.
+
+    This method is used to merge attribute containers from a task storage
+    without deserializing and serializing them again. Note that
+    the serialized data must be in the serialization format of the storage
+    and that references to other attribute containers must already have been
+    updated. Path specification nodes that are already stored are not added
+    again, in which case the identifier of the stored node is returned.
+
+    Args:
+      container_type (str): attribute container type.
+      serialized_data (bytes): serialized attribute container data.
+      attribute_values (Optional[dict[str, object]]): values of the event
+          attributes that are stored in separate columns, such as data_type
+          and parser, which includes the attribute values of the event data
+          referenced by the event. Only used when the container type is event.
+      timestamp (Optional[int]): timestamp of the event, which contains
+          the number of micro seconds since January 1, 1970, 00:00:00 UTC.
+          Only used when the container type is event.
+
+    Returns:
+      SQLTableIdentifier: identifier of the attribute container.
+
+    Raises:
+      IOError: when the storage file is closed or read-only.
+    """
+    self._RaiseIfNotWritable()
+
+    if container_type == self._CONTAINER_TYPE_PATH_SPEC:
+      row_identifier = self._AddSerializedPathSpecNode(serialized_data)
+      identifier = identifiers.SQLTableIdentifier(
+          container_type, row_identifier)
+
+    elif container_type == self._CONTAINER_TYPE_EVENT:
+      identifier = identifiers.SQLTableIdentifier(
+          container_type, self._serialized_event_heap.number_of_events + 1)
+
+      if attribute_values is not None:
+        attribute_values = tuple(
+            attribute_values.get(attribute_name, None)
+            for attribute_name in self._EVENT_ATTRIBUTE_NAMES)
+
+      self._serialized_event_heap.PushEvent(
+          timestamp, serialized_data, attribute_values=attribute_values)
+
+      if self._serialized_event_heap.data_size > self._maximum_buffer_size:
+        self._WriteSerializedAttributeContainerList(container_type)
+
+    else:
+      container_list = self._GetSerializedAttributeContainerList(
+          container_type)
+
+      identifier = identifiers.SQLTableIdentifier(
+          container_type, container_list.next_sequence_number + 1)
+
+      container_list.PushAttributeContainer(serialized_data)
+
+      if container_list.data_size > self._maximum_buffer_size:
+        self._WriteSerializedAttributeContainerList(container_type)
+
+    return identifier
+
   def AddEventTags(self, event_tags):
     """Adds event tags.
 
@@ -658,15 +1663,7 @@ class SQLiteStorageFile(interface.BaseStorageFile):
       raise IOError('Storage file already closed.')
 
     if not self._read_only:
-      self._WriteSerializedAttributeContainerList(
-          self._CONTAINER_TYPE_EVENT_SOURCE)
-      self._WriteSerializedAttributeContainerList(
-          self._CONTAINER_TYPE_EVENT_DATA)
-      self._WriteSerializedAttributeContainerList(self._CONTAINER_TYPE_EVENT)
-      self._WriteSerializedAttributeContainerList(
-          self._CONTAINER_TYPE_EVENT_TAG)
-      self._WriteSerializedAttributeContainerList(
-          self._CONTAINER_TYPE_EXTRACTION_ERROR)
+      self._WriteSerializedAttributeContainerLists()
 
     if self._connection:
       # We need to run commit or not all data is stored in the database.
@@ -808,6 +1805,34 @@ class SQLiteStorageFile(interface.BaseStorageFile):
         self._CONTAINER_TYPE_EVENT_SOURCE)
     return number_of_event_sources
 
+  def GetParserStatistics(self):
+    """Retrieves the parser statistics.
+
+    Returns:
+      generator(ParserStatistics): parser statistics generator.
+    """
+    # Storage files created before parser statistics were stored do not
+    # contain the corresponding table.
+    if not self._HasTable(self._CONTAINER_TYPE_PARSER_STATISTICS):
+      return iter([])
+
+    return self._GetAttributeContainers(
+        self._CONTAINER_TYPE_PARSER_STATISTICS)
+
+  def GetSessionCheckpoints(self):
+    """Retrieves the session checkpoints.
+
+    Returns:
+      generator(SessionCheckpoint): session checkpoint generator.
+    """
+    # Storage files created before session checkpoints were stored do not
+    # contain the corresponding table.
+    if not self._HasTable(self._CONTAINER_TYPE_SESSION_CHECKPOINT):
+      return iter([])
+
+    return self._GetAttributeContainers(
+        self._CONTAINER_TYPE_SESSION_CHECKPOINT)
+
   def GetSessions(self):
     """Retrieves the sessions.
 
@@ -840,33 +1865,132 @@ class SQLiteStorageFile(interface.BaseStorageFile):
 
       yield session
 
-  def GetSortedEvents(self, time_range=None):
+  def GetEventTimeRanges(self, number_of_events):
+    """Divides the events in time ranges with about the same number of events.
+
+    The time ranges are consecutive and do not overlap, and a time range only
+    ends before a different timestamp, hence events with the same timestamp
+    are always part of the same time range.
+
+    Args:
+      number_of_events (int): number of events per time range, where a time
+          range contains more events if its last timestamp is shared by more
+          events.
+
+    Returns:
+      list[TimeRange]: time ranges in chronological order, which contain all
+          stored events.
+    """
+    # The timestamps are read from the timestamp index, without reading
+    # the events.
+    query = 'SELECT _timestamp FROM event ORDER BY _timestamp'
+
+    # Use a local cursor to prevent another query interrupting the read.
+    cursor = self._connection.cursor()
+    cursor.execute(query)
+
+    time_ranges = []
+    event_count = 0
+    previous_timestamp = None
+    start_timestamp = None
+
+    rows = cursor.fetchmany(size=self._NUMBER_OF_EVENTS_PER_BATCH)
+    while rows:
+      for row in rows:
+        timestamp = row[0]
+        if start_timestamp is None:
+          start_timestamp = timestamp
+
+        elif event_count >= number_of_events and (
+            timestamp != previous_timestamp):
+          time_ranges.append(storage_time_range.TimeRange(
+              start_timestamp, timestamp - 1))
+          event_count = 0
+          start_timestamp = timestamp
+
+        event_count += 1
+        previous_timestamp = timestamp
+
+      rows = cursor.fetchmany(size=self._NUMBER_OF_EVENTS_PER_BATCH)
+
+    if start_timestamp is not None:
+      time_ranges.append(storage_time_range.TimeRange(
+          start_timestamp, previous_timestamp))
+
+    return time_ranges
+
+  def GetSortedEvents(self, filter_conditions=None, time_range=None):
     """Retrieves the events in increasing chronological order.
 
+    Filter conditions on the timestamp and, if the storage format supports
+    it, on the attributes stored in separate columns are evaluated by SQLite.
+    Other filter conditions are ignored.
+
+    When all events are read, the sorted runs of events are merged if
+    the store contains them, which prevents SQLite from having to sort, or
+    randomly access, the entire event table.
+
     Args:
+      filter_conditions (Optional[list[tuple[str, str, object]]]): filter
+          conditions, each containing an attribute name, a comparison operator
+          and a value, that the events must meet. Events that do not meet
+          the conditions can still be returned, hence these conditions do not
+          replace the filter they were derived from.
       time_range (Optional[TimeRange]): time range used to filter events
           that fall in a specific period.
 
     Yield:
       EventObject: event.
     """
-    filter_expression = None
+    filter_expression = []
+    filter_values = []
+
+    # Note that a time range always has a start and an end timestamp, which
+    # can be 0.
     if time_range:
-      filter_expression = []
+      filter_expression.append(
+          '_timestamp >= {0:d}'.format(time_range.start_timestamp))
+      filter_expression.append(
+          '_timestamp <= {0:d}'.format(time_range.end_timestamp))
+
+    for attribute_name, operator, value in filter_conditions or []:
+      sql_operator = self._FILTER_CONDITION_OPERATORS.get(operator, None)
+      if not sql_operator:
+        continue
+
+      if attribute_name == 'timestamp':
+        if not isinstance(value, py2to3.INTEGER_TYPES):
+          continue
+
+      elif (self._has_event_attribute_columns and
+            attribute_name in self._EVENT_ATTRIBUTE_NAMES):
+        # Only test string values for equality, since the collation of SQLite
+        # does not necessarily match the string comparison of Python.
+        if operator != '==' or not isinstance(value, py2to3.STRING_TYPES):
+          continue
 
-      if time_range.start_timestamp:
-        filter_expression.append(
-            '_timestamp >= {0:d}'.format(time_range.start_timestamp))
+      else:
+        continue
+
+      filter_expression.append('_{0:s} {1:s} ?'.format(
+          attribute_name, sql_operator))
+      filter_values.append(value)
 
-      if time_range.end_timestamp:
-        filter_expression.append(
-            '_timestamp <= {0:d}'.format(time_range.end_timestamp))
+    filter_expression = ' AND '.join(filter_expression)
 
-      filter_expression = ' AND '.join(filter_expression)
+    # The sorted runs are only merged when all events are read, since
+    # the indexes allow SQLite to efficiently read a selection of the events
+    # in chronological order.
+    event_runs = None
+    if not filter_expression:
+      event_runs = self._GetEventRuns()
 
-    event_generator = self._GetAttributeContainers(
-        self._CONTAINER_TYPE_EVENT, filter_expression=filter_expression,
-        order_by='_timestamp')
+    if event_runs:
+      event_generator = self._GetEventsFromSortedRuns(event_runs)
+    else:
+      event_generator = self._GetAttributeContainers(
+          self._CONTAINER_TYPE_EVENT, filter_expression=filter_expression,
+          filter_values=filter_values, order_by='_timestamp')
 
     for event in event_generator:
       if hasattr(event, 'event_data_row_identifier'):
@@ -878,6 +2002,48 @@ class SQLiteStorageFile(interface.BaseStorageFile):
 
       yield event
 
+  def GetSortedEventsWithEventData(
+      self, filter_conditions=None, time_range=None):
+    """Retrieves the events, combined with their event data, in order.
+
+    The events are read in batches and the event data referenced by a batch
+    is read in bulk. Deserialized event data is cached, since many events
+    reference the same event data.
+
+    Args:
+      filter_conditions (Optional[list[tuple[str, str, object]]]): filter
+          conditions, each containing an attribute name, a comparison operator
+          and a value, that the events must meet. Events that do not meet
+          the conditions can still be returned, hence these conditions do not
+          replace the filter they were derived from.
+      time_range (Optional[TimeRange]): time range used to filter events
+          that fall in a specific period.
+
+    Yield:
+      EventObject: event, with the attributes of its event data.
+    """
+    event_generator = self.GetSortedEvents(
+        filter_conditions=filter_conditions, time_range=time_range)
+
+    events = list(itertools.islice(
+        event_generator, self._NUMBER_OF_EVENTS_PER_BATCH))
+    while events:
+      event_data_per_row = self._GetEventDataOfEvents(events)
+
+      for event in events:
+        event_data_identifier = event.GetEventDataIdentifier()
+        if event_data_identifier:
+          event_data = event_data_per_row.get(
+              event_data_identifier.row_identifier, None)
+          if event_data:
+            for attribute_name, attribute_value in event_data.GetAttributes():
+              setattr(event, attribute_name, attribute_value)
+
+        yield event
+
+      events = list(itertools.islice(
+          event_generator, self._NUMBER_OF_EVENTS_PER_BATCH))
+
   def HasAnalysisReports(self):
     """Determines if a store contains analysis reports.
 
@@ -941,31 +2107,48 @@ class SQLiteStorageFile(interface.BaseStorageFile):
     else:
       # self._cursor.execute('PRAGMA journal_mode=MEMORY')
 
-      # Turn off insert transaction integrity since we want to do bulk insert.
-      self._cursor.execute('PRAGMA synchronous=OFF')
+      # Turn off insert transaction integrity of task stores since we want to
+      # do bulk insert. A session store keeps the default, such that its
+      # session checkpoints remain intact when the system crashes.
+      if self.storage_type == definitions.STORAGE_TYPE_TASK:
+        self._cursor.execute('PRAGMA synchronous=OFF')
 
       if not self._HasTable('metadata'):
         self._WriteStorageMetadata()
-      else:
-        self._ReadStorageMetadata()
 
-      if self.compression_format == definitions.COMPRESSION_FORMAT_ZLIB:
-        data_column_type = 'BLOB'
+        # The sorted runs are only stored for newly created stores, since
+        # the events of an existing store are not necessarily part of a run.
+        self._cursor.execute(self._CREATE_EVENT_RUN_TABLE_QUERY)
       else:
-        data_column_type = 'TEXT'
+        self._ReadStorageMetadata()
 
       for container_type in self._CONTAINER_TYPES:
         if not self._HasTable(container_type):
+          compression_format = self._GetCompressionFormat(container_type)
+          if (compression_format != definitions.COMPRESSION_FORMAT_NONE or
+              self.serialization_format != (
+                  definitions.SERIALIZER_FORMAT_JSON)):
+            data_column_type = 'BLOB'
+          else:
+            data_column_type = 'TEXT'
+
           if container_type == self._CONTAINER_TYPE_EVENT:
             query = self._CREATE_EVENT_TABLE_QUERY.format(
                 container_type, data_column_type)
+            self._cursor.execute(query)
+
+            for query in self._CREATE_EVENT_INDEX_QUERIES:
+              self._cursor.execute(query)
+
           else:
             query = self._CREATE_TABLE_QUERY.format(
                 container_type, data_column_type)
-          self._cursor.execute(query)
+            self._cursor.execute(query)
 
       self._connection.commit()
 
+    self._has_event_run_table = self._HasTable('event_run')
+
     last_session_start = self._CountStoredAttributeContainers(
         self._CONTAINER_TYPE_SESSION_START)
 
@@ -1022,6 +2205,26 @@ class SQLiteStorageFile(interface.BaseStorageFile):
 
     self._WriteAttributeContainer(system_configuration)
 
+  def WriteSessionCheckpoint(self, session_checkpoint):
+    """Writes a session checkpoint.
+
+    The attribute containers pending to be written are written and committed
+    together with the session checkpoint, such that the content of the storage
+    file corresponds with the checkpoint if the session is interrupted.
+
+    Args:
+      session_checkpoint (SessionCheckpoint): session checkpoint.
+
+    Raises:
+      IOError: when the storage file is closed or read-only.
+    """
+    self._RaiseIfNotWritable()
+
+    self._WriteSerializedAttributeContainerLists()
+    self._WriteAttributeContainer(session_checkpoint)
+
+    self._connection.commit()
+
   def WriteSessionCompletion(self, session_completion):
     """Writes session completion information.
 
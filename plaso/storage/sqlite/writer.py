@@ -16,7 +16,12 @@ class SQLiteStorageFileWriter(interface.StorageFileWriter):
     Returns:
       SQLiteStorageFile: storage file.
     """
-    return sqlite_file.SQLiteStorageFile(storage_type=self._storage_type)
+    return sqlite_file.SQLiteStorageFile(
+        serialization_format=self.serialization_format,
+        storage_type=self._storage_type,
+        compression_format=self._compression_format,
+        compression_formats=self._compression_formats,
+        compression_dictionaries=self._compression_dictionaries)
 
   def _CreateTaskStorageMergeReader(self, path):
     """Creates a task storage merge reader.
@@ -40,5 +45,5 @@ class SQLiteStorageFileWriter(interface.StorageFileWriter):
       SQLiteStorageFileWriter: storage writer.
     """
     return SQLiteStorageFileWriter(
-        self._session, path,
+        self._session, path, serialization_format=self.serialization_format,
         storage_type=definitions.STORAGE_TYPE_TASK, task=task)
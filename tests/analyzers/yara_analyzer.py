@@ -4,8 +4,11 @@
 
 from __future__ import unicode_literals
 
+import io
 import unittest
 
+import yara
+
 from plaso.containers import analyzer_result
 from plaso.analyzers import yara_analyzer
 
@@ -20,6 +23,51 @@ class YaraAnalyzerTest(shared_test_lib.BaseTestCase):
 
   _RULE_FILE = ['yara.rules']
 
+  def _AnalyzeBlocks(self, analyzer, blocks):
+    """Analyzes blocks of data as the extraction worker does.
+
+    Args:
+      analyzer (YaraAnalyzer): Yara analyzer.
+      blocks (list[bytes]): blocks of data.
+
+    Returns:
+      str: names of the matched rules.
+    """
+    if analyzer.INCREMENTAL_ANALYZER:
+      for block in blocks:
+        analyzer.Analyze(block)
+    else:
+      analyzer.Analyze(b''.join(blocks))
+
+    results = analyzer.GetResults()
+    analyzer.Reset()
+    return results[0].attribute_value
+
+  def testCheckIncrementalMatching(self):
+    """Tests the _CheckIncrementalMatching function."""
+    analyzer = yara_analyzer.YaraAnalyzer()
+
+    analyzer._CheckIncrementalMatching((
+        'rule test { meta: author = "test@example.com" '
+        'strings: $a = "filesize" $b = /condition: \\$a }/ '
+        '$c = { 4D 5A } condition: $a or ($b or any of ($c*)) }'))
+    self.assertTrue(analyzer.INCREMENTAL_ANALYZER)
+
+    analyzer._CheckIncrementalMatching((
+        'rule test { strings: $a = "data" condition: any of them } '
+        'rule other { strings: $a = "data" condition: not $a }'))
+    self.assertFalse(analyzer.INCREMENTAL_ANALYZER)
+
+    analyzer._CheckIncrementalMatching((
+        'import "pe" '
+        'rule test { strings: $a = "data" condition: any of them }'))
+    self.assertFalse(analyzer.INCREMENTAL_ANALYZER)
+
+    analyzer._CheckIncrementalMatching((
+        'global rule test { strings: $a = "data" condition: $a } '
+        'rule other { strings: $a = "other" condition: $a }'))
+    self.assertFalse(analyzer.INCREMENTAL_ANALYZER)
+
   def testFileRuleParse(self):
     """Tests that the Yara analyzer can read rules."""
     analyzer = yara_analyzer.YaraAnalyzer()
@@ -57,5 +105,115 @@ class YaraAnalyzerTest(shared_test_lib.BaseTestCase):
     self.assertEqual(first_result.attribute_value, 'PEfileBasic,PEfile')
 
 
+  def testMatchBlocks(self):
+    """Tests that the Yara analyzer matches strings that span blocks."""
+    analyzer = yara_analyzer.YaraAnalyzer()
+    analyzer.SetRules(
+        'rule test { strings: $a = "boundary" condition: $a }')
+
+    analyzer.Analyze(b'data before the bound')
+    analyzer.Analyze(b'ary and data after it')
+
+    results = analyzer.GetResults()
+    self.assertEqual(results[0].attribute_value, 'test')
+    self.assertGreater(analyzer.match_time, 0.0)
+
+    analyzer.Reset()
+
+    analyzer.Analyze(b'ary and data after it')
+
+    results = analyzer.GetResults()
+    self.assertEqual(results[0].attribute_value, '')
+    self.assertEqual(analyzer._overlap_data, b'ary and data after it')
+
+  def testMatchBlocksWithFileSizeCondition(self):
+    """Tests matching rules that depend on the file size."""
+    analyzer = yara_analyzer.YaraAnalyzer()
+    self.assertFalse(analyzer.INCREMENTAL_ANALYZER)
+
+    analyzer.SetRules(
+        'rule test { strings: $a = "boundary" condition: $a }')
+    self.assertTrue(analyzer.INCREMENTAL_ANALYZER)
+
+    analyzer.SetRules('rule small { condition: filesize < 32 }')
+    self.assertFalse(analyzer.INCREMENTAL_ANALYZER)
+
+    analyzer.SetRules('rule mz { condition: uint16(0) == 0x5a4d }')
+    self.assertFalse(analyzer.INCREMENTAL_ANALYZER)
+
+    # The data is matched as a whole, without the end of a previous block.
+    analyzer.SetRules('rule small { condition: filesize < 32 }')
+    analyzer.Analyze(b'data of a file of less than 32 bytes')
+
+    results = analyzer.GetResults()
+    self.assertEqual(results[0].attribute_value, '')
+    self.assertEqual(analyzer._overlap_data, b'')
+
+    analyzer.Reset()
+
+    analyzer.Analyze(b'data of 15 bytes')
+
+    results = analyzer.GetResults()
+    self.assertEqual(results[0].attribute_value, 'small')
+
+    # Compiled rules without their definitions are not matched in blocks.
+    compiled_rules_file = io.BytesIO()
+    yara.compile(source=(
+        'rule test { strings: $a = "boundary" condition: $a }')).save(
+            file=compiled_rules_file)
+
+    analyzer.SetCompiledRules(compiled_rules_file.getvalue())
+    self.assertFalse(analyzer.INCREMENTAL_ANALYZER)
+
+  def testMatchBlocksWithStringConditions(self):
+    """Tests matching rules with conditions on strings in separate blocks."""
+    blocks = [
+        b'AAAA' + b'\x00' * 200 * 1024,
+        b'\x00' * 200 * 1024 + b'BBBB']
+
+    analyzer = yara_analyzer.YaraAnalyzer()
+    analyzer.SetRules((
+        'rule test { strings: $a = "AAAA" $b = "BBBB" '
+        'condition: any of them }'))
+    self.assertTrue(analyzer.INCREMENTAL_ANALYZER)
+    self.assertEqual(self._AnalyzeBlocks(analyzer, blocks), 'test')
+
+    analyzer.SetRules((
+        'rule test { strings: $a = "AAAA" $b = "BBBB" condition: $a and $b }'))
+    self.assertFalse(analyzer.INCREMENTAL_ANALYZER)
+    self.assertEqual(self._AnalyzeBlocks(analyzer, blocks), 'test')
+
+    analyzer.SetRules((
+        'rule test { strings: $a = "AAAA" $b = "BBBB" '
+        'condition: all of them }'))
+    self.assertFalse(analyzer.INCREMENTAL_ANALYZER)
+    self.assertEqual(self._AnalyzeBlocks(analyzer, blocks), 'test')
+
+    analyzer.SetRules((
+        'rule test { strings: $b = "BBBB" condition: not $b }'))
+    self.assertFalse(analyzer.INCREMENTAL_ANALYZER)
+    self.assertEqual(self._AnalyzeBlocks(analyzer, blocks), '')
+
+  @shared_test_lib.skipUnlessHasTestFile(['test_pe.exe'])
+  def testAnalyzeFilePath(self):
+    """Tests the AnalyzeFilePath function with compiled rules."""
+    rule_path = self._GetTestFilePath(self._RULE_FILE)
+
+    with open(rule_path, 'r') as rule_file:
+      rule_string = rule_file.read()
+
+    compiled_rules_file = io.BytesIO()
+    yara.compile(source=rule_string).save(file=compiled_rules_file)
+
+    analyzer = yara_analyzer.YaraAnalyzer()
+    analyzer.SetCompiledRules(compiled_rules_file.getvalue())
+
+    target_path = self._GetTestFilePath(['test_pe.exe'])
+    analyzer.AnalyzeFilePath(target_path)
+
+    results = analyzer.GetResults()
+    self.assertEqual(results[0].attribute_value, 'PEfileBasic,PEfile')
+
+
 if __name__ == '__main__':
   unittest.main()
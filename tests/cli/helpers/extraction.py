@@ -20,12 +20,19 @@ class ExtractionArgumentsHelperTest(cli_test_lib.CLIToolTestCase):
   # pylint: disable=no-member,protected-access
 
   _EXPECTED_OUTPUT = """\
-usage: cli_helper.py [--preferred_year YEAR] [--process_archives]
-                     [--skip_compressed_streams]
+usage: cli_helper.py [--deduplicate_content] [--preferred_year YEAR]
+                     [--process_archives] [--skip_compressed_streams]
 
 Test argument parser.
 
 optional arguments:
+  --deduplicate_content, --deduplicate-content
+                        Reproduce the events of file content that is identical
+                        to the content of a previously parsed file, such as
+                        the same Windows Registry file in multiple Volume
+                        Shadow Snapshots, instead of parsing it again. The
+                        content of files up to 256 MiB is hashed to detect
+                        identical content.
   --preferred_year YEAR, --preferred-year YEAR
                         When a format\'s timestamp does not include a year,
                         e.g. syslog, use this as the initial year instead of
@@ -58,6 +65,7 @@ optional arguments:
     test_tool = tools.CLITool()
     extraction.ExtractionArgumentsHelper.ParseOptions(options, test_tool)
 
+    self.assertFalse(test_tool._deduplicate_content)
     self.assertIsNone(test_tool._preferred_year)
     self.assertFalse(test_tool._process_archives)
     self.assertTrue(test_tool._process_compressed_streams)
@@ -52,6 +52,7 @@ optional arguments:
     yara_rules.YaraRulesArgumentsHelper.ParseOptions(options, test_tool)
 
     self.assertIsNotNone(test_tool._yara_rules_string)
+    self.assertIsNotNone(test_tool._compiled_yara_rules)
 
     with self.assertRaises(errors.BadConfigObject):
       yara_rules.YaraRulesArgumentsHelper.ParseOptions(options, None)
@@ -15,6 +15,7 @@ except ImportError:
   resource = None
 
 from plaso.cli import log2timeline_tool
+from plaso.containers import sessions
 from plaso.lib import definitions
 from plaso.lib import errors
 from plaso.storage.sqlite import sqlite_file
@@ -112,6 +113,20 @@ optional arguments:
   # TODO: add tests for _CheckStorageFile
   # TODO: add tests for _CreateProcessingConfiguration
 
+  def testGetAppendedSessionParserFilterExpression(self):
+    """Tests the _GetAppendedSessionParserFilterExpression function."""
+    test_tool = log2timeline_tool.Log2TimelineTool()
+    test_tool._storage_file_path = 'test.plaso'
+
+    parser_filter_expression = (
+        test_tool._GetAppendedSessionParserFilterExpression(
+            'filestat,syslog', set(['filestat', 'syslog', 'syslog/cron'])))
+    self.assertEqual(parser_filter_expression, 'syslog/ssh')
+
+    with self.assertRaises(errors.BadConfigOption):
+      test_tool._GetAppendedSessionParserFilterExpression(
+          'filestat', set(['filestat', 'syslog']))
+
   def testGetPluginData(self):
     """Tests the _GetPluginData function."""
     test_tool = log2timeline_tool.Log2TimelineTool()
@@ -129,6 +144,37 @@ optional arguments:
     self.assertIn('Parser Plugins', plugin_info)
     self.assertIsNotNone(plugin_info['Parser Plugins'])
 
+  def testGetResumableSessionCheckpoint(self):
+    """Tests the _GetResumableSessionCheckpoint function."""
+    session = sessions.Session()
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      test_tool = log2timeline_tool.Log2TimelineTool()
+      test_tool._storage_file_path = os.path.join(
+          temp_directory, 'storage.plaso')
+
+      session_checkpoint = session.CreateSessionCheckpoint()
+      session_checkpoint.first_event_source_index = 0
+
+      storage_file = sqlite_file.SQLiteStorageFile()
+      storage_file.Open(path=test_tool._storage_file_path, read_only=False)
+      storage_file.WriteSessionCheckpoint(session_checkpoint)
+      storage_file.Close()
+
+      session_checkpoint = test_tool._GetResumableSessionCheckpoint()
+      self.assertEqual(session_checkpoint.identifier, session.identifier)
+
+      # An appended session cannot be resumed.
+      session_checkpoint.append_session = True
+
+      storage_file = sqlite_file.SQLiteStorageFile()
+      storage_file.Open(path=test_tool._storage_file_path, read_only=False)
+      storage_file.WriteSessionCheckpoint(session_checkpoint)
+      storage_file.Close()
+
+      with self.assertRaises(errors.BadConfigOption):
+        test_tool._GetResumableSessionCheckpoint()
+
   def testParseProcessingOptions(self):
     """Tests the _ParseProcessingOptions function."""
     test_tool = log2timeline_tool.Log2TimelineTool()
@@ -191,6 +237,18 @@ optional arguments:
     options.artifact_definitions_path = self._GetTestFilePath(['artifacts'])
     options.source = self._GetTestFilePath(['testdir'])
 
+    with self.assertRaises(errors.BadConfigOption):
+      test_tool.ParseOptions(options)
+
+    # ParseOptions will raise if both append and resume are set.
+    options = test_lib.TestOptions()
+    options.append = True
+    options.artifact_definitions_path = self._GetTestFilePath(['artifacts'])
+    options.resume = True
+    options.source = self._GetTestFilePath(['testdir'])
+    options.storage_file = 'storage.plaso'
+    options.storage_format = definitions.STORAGE_FORMAT_SQLITE
+
     with self.assertRaises(errors.BadConfigOption):
       test_tool.ParseOptions(options)
 
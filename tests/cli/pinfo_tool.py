@@ -201,6 +201,8 @@ class PinfoToolTest(test_lib.CLIToolTestCase):
 
     expected_output = (
         '{0:s}'
+        'No parser statistics stored.\n'
+        '\n'
         'No errors stored.\n'
         '\n'
         'No analysis reports stored.\n'
@@ -118,7 +118,7 @@ class PsortToolTest(test_lib.CLIToolTestCase):
   if resource is None:
     _EXPECTED_PROCESSING_OPTIONS = """\
 usage: psort_test.py [--temporary_directory DIRECTORY] [--disable_zeromq]
-                     [--worker-memory-limit SIZE]
+                     [--worker-memory-limit SIZE] [--export-workers NUMBER]
 
 Test argument parser.
 
@@ -126,6 +126,13 @@ optional arguments:
   --disable_zeromq, --disable-zeromq
                         Disable queueing using ZeroMQ. A Multiprocessing queue
                         will be used instead.
+  --export-workers NUMBER, --export_workers NUMBER
+                        Number of worker processes to format the events with,
+                        where 0 represents formatting the events in the main
+                        process. Only output modules of which the output does
+                        not depend on previous events, such as l2tcsv and
+                        json_line, are supported and not in combination with a
+                        time slice or filter limit.
   --temporary_directory DIRECTORY, --temporary-directory DIRECTORY
                         Path to the directory that should be used to store
                         temporary files created during processing.
@@ -140,7 +147,7 @@ optional arguments:
     _EXPECTED_PROCESSING_OPTIONS = """\
 usage: psort_test.py [--process_memory_limit SIZE]
                      [--temporary_directory DIRECTORY] [--disable_zeromq]
-                     [--worker-memory-limit SIZE]
+                     [--worker-memory-limit SIZE] [--export-workers NUMBER]
 
 Test argument parser.
 
@@ -148,6 +155,13 @@ optional arguments:
   --disable_zeromq, --disable-zeromq
                         Disable queueing using ZeroMQ. A Multiprocessing queue
                         will be used instead.
+  --export-workers NUMBER, --export_workers NUMBER
+                        Number of worker processes to format the events with,
+                        where 0 represents formatting the events in the main
+                        process. Only output modules of which the output does
+                        not depend on previous events, such as l2tcsv and
+                        json_line, are supported and not in combination with a
+                        time slice or filter limit.
   --process_memory_limit SIZE, --process-memory-limit SIZE
                         Maximum amount of memory (data segment) a process is
                         allowed to allocate in bytes, where 0 represents no
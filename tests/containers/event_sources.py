@@ -19,7 +19,8 @@ class EventSourceTest(shared_test_lib.BaseTestCase):
     attribute_container = event_sources.EventSource()
 
     expected_attribute_names = [
-        'data_type', 'file_entry_type', 'path_spec']
+        'data_type', 'expected_processing_cost', 'file_entry_type',
+        'file_size', 'path_spec', 'path_spec_row_identifier']
 
     attribute_names = sorted(attribute_container.GetAttributeNames())
 
@@ -34,7 +35,8 @@ class FileEntryEventSourceTest(shared_test_lib.BaseTestCase):
     attribute_container = event_sources.FileEntryEventSource()
 
     expected_attribute_names = [
-        'data_type', 'file_entry_type', 'path_spec']
+        'data_type', 'expected_processing_cost', 'file_entry_type',
+        'file_size', 'path_spec', 'path_spec_row_identifier']
 
     attribute_names = sorted(attribute_container.GetAttributeNames())
 
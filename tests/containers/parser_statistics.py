@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the parser statistics attribute containers."""
+
+from __future__ import unicode_literals
+
+import unittest
+
+from plaso.containers import parser_statistics
+
+from tests import test_lib as shared_test_lib
+
+
+class ParserStatisticsTest(shared_test_lib.BaseTestCase):
+  """Tests for the parser statistics attribute container."""
+
+  def testGetAttributeNames(self):
+    """Tests the GetAttributeNames function."""
+    attribute_container = parser_statistics.ParserStatistics()
+
+    expected_attribute_names = [
+        'cpu_time', 'name', 'number_of_attempted_files',
+        'number_of_matched_files', 'number_of_produced_events',
+        'number_of_read_bytes', 'slowest_files']
+
+    attribute_names = sorted(attribute_container.GetAttributeNames())
+
+    self.assertEqual(attribute_names, expected_attribute_names)
+
+  def testAddFile(self):
+    """Tests the AddFile function."""
+    attribute_container = parser_statistics.ParserStatistics(name='test')
+
+    attribute_container.AddFile(0.5, True, number_of_read_bytes=1024)
+    attribute_container.AddFile(0.25, False)
+
+    self.assertEqual(attribute_container.cpu_time, 0.75)
+    self.assertEqual(attribute_container.number_of_attempted_files, 2)
+    self.assertEqual(attribute_container.number_of_matched_files, 1)
+    self.assertEqual(attribute_container.number_of_read_bytes, 1024)
+
+  def testAddSlowestFile(self):
+    """Tests the AddSlowestFile function."""
+    attribute_container = parser_statistics.ParserStatistics(name='test')
+
+    for index in range(0, 15):
+      attribute_container.AddSlowestFile(
+          float(index), 'file{0:d}'.format(index))
+
+    self.assertEqual(len(attribute_container.slowest_files), 10)
+    self.assertEqual(attribute_container.slowest_files[0], [14.0, 'file14'])
+    self.assertEqual(attribute_container.slowest_files[-1], [5.0, 'file5'])
+
+  def testIsSlowestFile(self):
+    """Tests the IsSlowestFile function."""
+    attribute_container = parser_statistics.ParserStatistics(name='test')
+
+    self.assertTrue(attribute_container.IsSlowestFile(0.0))
+
+    for index in range(1, 11):
+      attribute_container.AddSlowestFile(
+          float(index), 'file{0:d}'.format(index))
+
+    self.assertFalse(attribute_container.IsSlowestFile(1.0))
+    self.assertTrue(attribute_container.IsSlowestFile(1.5))
+
+  def testMerge(self):
+    """Tests the Merge function."""
+    attribute_container = parser_statistics.ParserStatistics(name='test')
+    attribute_container.AddFile(0.5, True, number_of_read_bytes=1024)
+    attribute_container.AddSlowestFile(0.5, 'file1')
+
+    other_attribute_container = parser_statistics.ParserStatistics(
+        name='test')
+    other_attribute_container.AddFile(1.0, True, number_of_read_bytes=2048)
+    other_attribute_container.AddSlowestFile(1.0, 'file2')
+    other_attribute_container.number_of_produced_events = 5
+
+    attribute_container.Merge(other_attribute_container)
+
+    self.assertEqual(attribute_container.cpu_time, 1.5)
+    self.assertEqual(attribute_container.number_of_attempted_files, 2)
+    self.assertEqual(attribute_container.number_of_matched_files, 2)
+    self.assertEqual(attribute_container.number_of_produced_events, 5)
+    self.assertEqual(attribute_container.number_of_read_bytes, 3072)
+    self.assertEqual(
+        attribute_container.slowest_files, [[1.0, 'file2'], [0.5, 'file1']])
+
+    other_attribute_container = parser_statistics.ParserStatistics(
+        name='other')
+
+    with self.assertRaises(ValueError):
+      attribute_container.Merge(other_attribute_container)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the path specification attribute containers."""
+
+from __future__ import unicode_literals
+
+import unittest
+
+from dfvfs.lib import definitions as dfvfs_definitions
+from dfvfs.path import factory as path_spec_factory
+
+from plaso.containers import path_specs
+
+from tests import test_lib as shared_test_lib
+
+
+class PathSpecNodeTest(shared_test_lib.BaseTestCase):
+  """Tests for the path specification node attribute container."""
+
+  def testGetAttributeNames(self):
+    """Tests the GetAttributeNames function."""
+    attribute_container = path_specs.PathSpecNode()
+
+    expected_attribute_names = [
+        'parent_row_identifier', 'properties', 'type_indicator']
+
+    attribute_names = sorted(attribute_container.GetAttributeNames())
+
+    self.assertEqual(attribute_names, expected_attribute_names)
+
+  def testGetPathSpec(self):
+    """Tests the GetPathSpec function."""
+    os_path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_OS, location='/tmp/image.raw')
+    tsk_path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_TSK, inode=15, location='/a_file',
+        parent=os_path_spec)
+
+    attribute_container = path_specs.PathSpecNode(
+        parent_row_identifier=1, path_spec=tsk_path_spec)
+
+    self.assertEqual(attribute_container.parent_row_identifier, 1)
+    self.assertEqual(
+        attribute_container.properties,
+        [['inode', 15], ['location', '/a_file']])
+    self.assertEqual(
+        attribute_container.type_indicator,
+        dfvfs_definitions.TYPE_INDICATOR_TSK)
+
+    path_spec = attribute_container.GetPathSpec(parent=os_path_spec)
+    self.assertEqual(path_spec.comparable, tsk_path_spec.comparable)
+
+
+if __name__ == '__main__':
+  unittest.main()
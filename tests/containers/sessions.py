@@ -43,12 +43,56 @@ class SessionTest(shared_test_lib.BaseTestCase):
 
     self.assertEqual(test_dict, expected_dict)
 
+  def testCreateSessionCheckpoint(self):
+    """Tests the CreateSessionCheckpoint function."""
+    session = sessions.Session()
+    session.parsers_counter['test'] += 1
+
+    session_checkpoint = session.CreateSessionCheckpoint()
+    self.assertEqual(session_checkpoint.identifier, session.identifier)
+    self.assertEqual(session_checkpoint.parsers_counter['test'], 1)
+    self.assertIsNotNone(session_checkpoint.timestamp)
+
+    # The counter of the session checkpoint is a copy.
+    session.parsers_counter['test'] += 1
+    self.assertEqual(session_checkpoint.parsers_counter['test'], 1)
+
+    resumed_session = sessions.Session()
+    resumed_session.CopyAttributesFromSessionCheckpoint(session_checkpoint)
+    self.assertEqual(resumed_session.identifier, session.identifier)
+    self.assertEqual(resumed_session.parsers_counter['test'], 1)
+
   # TODO: add tests for CopyAttributesFromSessionCompletion
   # TODO: add tests for CopyAttributesFromSessionStart
   # TODO: add tests for CreateSessionCompletion
   # TODO: add tests for CreateSessionStart
 
 
+class SessionCheckpointTest(shared_test_lib.BaseTestCase):
+  """Tests for the session checkpoint attribute container."""
+
+  # TODO: replace by GetAttributeNames test
+  def testCopyToDict(self):
+    """Tests the CopyToDict function."""
+    timestamp = int(time.time() * 1000000)
+    session_identifier = '{0:s}'.format(uuid.uuid4().hex)
+    session_checkpoint = sessions.SessionCheckpoint(
+        identifier=session_identifier)
+    session_checkpoint.first_event_source_index = 0
+    session_checkpoint.timestamp = timestamp
+
+    self.assertEqual(session_checkpoint.identifier, session_identifier)
+
+    expected_dict = {
+        'first_event_source_index': 0,
+        'identifier': session_checkpoint.identifier,
+        'timestamp': timestamp}
+
+    test_dict = session_checkpoint.CopyToDict()
+
+    self.assertEqual(test_dict, expected_dict)
+
+
 class SessionCompletionTest(shared_test_lib.BaseTestCase):
   """Tests for the session completion attribute container."""
 
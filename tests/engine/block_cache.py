@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests the block cache."""
+
+from __future__ import unicode_literals
+
+import os
+import unittest
+
+from plaso.engine import block_cache
+
+from tests import test_lib as shared_test_lib
+
+
+class BlockCacheTest(unittest.TestCase):
+  """Tests for the block cache."""
+
+  def testGetBlock(self):
+    """Tests the GetBlock function."""
+    cache = block_cache.BlockCache(block_size=4, maximum_size=8)
+
+    block_data = cache.GetBlock(0)
+    self.assertIsNone(block_data)
+    self.assertEqual(cache.number_of_hits, 0)
+    self.assertEqual(cache.number_of_misses, 1)
+
+    cache.SetBlock(0, b'abcd')
+
+    block_data = cache.GetBlock(0)
+    self.assertEqual(block_data, b'abcd')
+    self.assertEqual(cache.number_of_hits, 1)
+    self.assertEqual(cache.number_of_misses, 1)
+
+    cache.Empty()
+
+    block_data = cache.GetBlock(0)
+    self.assertIsNone(block_data)
+    self.assertEqual(cache.number_of_hits, 1)
+    self.assertEqual(cache.number_of_misses, 2)
+
+  def testInitialize(self):
+    """Tests the __init__ function."""
+    cache = block_cache.BlockCache()
+    self.assertIsNotNone(cache)
+
+    with self.assertRaises(ValueError):
+      block_cache.BlockCache(block_size=0)
+
+    with self.assertRaises(ValueError):
+      block_cache.BlockCache(block_size=4, maximum_size=2)
+
+  def testSetBlock(self):
+    """Tests the SetBlock function."""
+    cache = block_cache.BlockCache(block_size=4, maximum_size=8)
+
+    cache.SetBlock(0, b'abcd')
+    cache.SetBlock(1, b'efgh')
+
+    # Retrieving block 0 makes block 1 the least recently used block.
+    self.assertEqual(cache.GetBlock(0), b'abcd')
+
+    cache.SetBlock(2, b'ijkl')
+
+    self.assertEqual(cache.GetBlock(0), b'abcd')
+    self.assertIsNone(cache.GetBlock(1))
+    self.assertEqual(cache.GetBlock(2), b'ijkl')
+
+
+class BlockCacheFileObjectTest(shared_test_lib.BaseTestCase):
+  """Tests for the block cache file-like object."""
+
+  _TEST_PATH_SEGMENTS = ['SysEvent.Evt']
+
+  @shared_test_lib.skipUnlessHasTestFile(_TEST_PATH_SEGMENTS)
+  def testRead(self):
+    """Tests the read function."""
+    test_file_path = self._GetTestFilePath(self._TEST_PATH_SEGMENTS)
+    with open(test_file_path, 'rb') as file_object:
+      expected_data = file_object.read()
+
+    cache = block_cache.BlockCache(block_size=1024, maximum_size=4096)
+
+    file_entry = self._GetTestFileEntry(self._TEST_PATH_SEGMENTS)
+    file_object = block_cache.BlockCacheFileObject(
+        file_entry.GetFileObject(), cache)
+
+    try:
+      self.assertEqual(file_object.get_size(), len(expected_data))
+
+      file_object.seek(1000, os.SEEK_SET)
+      data = file_object.read(100)
+      self.assertEqual(data, expected_data[1000:1100])
+      self.assertEqual(file_object.get_offset(), 1100)
+      self.assertEqual(cache.number_of_hits, 0)
+      self.assertEqual(cache.number_of_misses, 2)
+
+      file_object.seek(-100, os.SEEK_CUR)
+      data = file_object.read(24)
+      self.assertEqual(data, expected_data[1000:1024])
+      self.assertEqual(cache.number_of_hits, 1)
+      self.assertEqual(cache.number_of_misses, 2)
+
+      file_object.seek(0, os.SEEK_SET)
+      data = file_object.read()
+      self.assertEqual(data, expected_data)
+      self.assertEqual(file_object.tell(), len(expected_data))
+
+      data = file_object.read(16)
+      self.assertEqual(data, b'')
+
+      file_object.seek(-16, os.SEEK_END)
+      data = file_object.read(32)
+      self.assertEqual(data, expected_data[-16:])
+
+      with self.assertRaises(IOError):
+        file_object.seek(-1, os.SEEK_SET)
+
+    finally:
+      file_object.close()
+
+    with self.assertRaises(IOError):
+      file_object.read(16)
+
+  @shared_test_lib.skipUnlessHasTestFile(_TEST_PATH_SEGMENTS)
+  def testReadWithSharedCache(self):
+    """Tests the read function with a cache shared by file-like objects."""
+    cache = block_cache.BlockCache(block_size=1024)
+
+    file_entry = self._GetTestFileEntry(self._TEST_PATH_SEGMENTS)
+    file_object = block_cache.BlockCacheFileObject(
+        file_entry.GetFileObject(), cache)
+
+    try:
+      expected_data = file_object.read()
+    finally:
+      file_object.close()
+
+    number_of_misses = cache.number_of_misses
+    self.assertEqual(cache.number_of_hits, 0)
+    self.assertGreater(number_of_misses, 0)
+
+    file_object = block_cache.BlockCacheFileObject(
+        file_entry.GetFileObject(), cache)
+
+    try:
+      data = file_object.read()
+    finally:
+      file_object.close()
+
+    self.assertEqual(data, expected_data)
+    self.assertEqual(cache.number_of_hits, number_of_misses)
+    self.assertEqual(cache.number_of_misses, number_of_misses)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -88,6 +88,11 @@ class ProfilingConfigurationTest(unittest.TestCase):
     configuration = configurations.ProfilingConfiguration()
     self.assertFalse(configuration.HaveProfileTasks())
 
+  def testHaveProfileYaraRules(self):
+    """Tests the HaveProfileYaraRules function."""
+    configuration = configurations.ProfilingConfiguration()
+    self.assertFalse(configuration.HaveProfileYaraRules())
+
 
 class ProcessingConfigurationTest(unittest.TestCase):
   """Tests the processing configuration settings."""
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests the content cache."""
+
+from __future__ import unicode_literals
+
+import unittest
+
+from plaso.containers import events
+from plaso.engine import content_cache
+
+
+class ContentCacheTest(unittest.TestCase):
+  """Tests for the content cache."""
+
+  def _CreateRecordedEvents(self, number_of_events):
+    """Creates recorded events.
+
+    Args:
+      number_of_events (int): number of events.
+
+    Returns:
+      list[tuple[str, EventObject, EventData]]: parser chain, event and event
+          data of the events.
+    """
+    event_data = events.EventData()
+
+    recorded_events = []
+    for timestamp in range(number_of_events):
+      event = events.EventObject()
+      event.timestamp = timestamp
+      recorded_events.append(('test', event, event_data))
+
+    return recorded_events
+
+  def testGetEvents(self):
+    """Tests the GetEvents function."""
+    cache = content_cache.ContentCache()
+
+    recorded_events = cache.GetEvents('identifier')
+    self.assertIsNone(recorded_events)
+    self.assertEqual(cache.number_of_hits, 0)
+    self.assertEqual(cache.number_of_misses, 1)
+
+    cache.SetEvents('identifier', self._CreateRecordedEvents(2))
+
+    recorded_events = cache.GetEvents('identifier')
+    self.assertEqual(len(recorded_events), 2)
+    self.assertEqual(cache.number_of_hits, 1)
+    self.assertEqual(cache.number_of_misses, 1)
+
+  def testSetEvents(self):
+    """Tests the SetEvents function."""
+    cache = content_cache.ContentCache(maximum_number_of_events=4)
+
+    cache.SetEvents('first', self._CreateRecordedEvents(2))
+    cache.SetEvents('second', [])
+
+    # Retrieving the first events makes the second the least recently used.
+    self.assertIsNotNone(cache.GetEvents('first'))
+
+    cache.SetEvents('third', self._CreateRecordedEvents(2))
+
+    self.assertIsNotNone(cache.GetEvents('first'))
+    self.assertIsNone(cache.GetEvents('second'))
+    self.assertIsNotNone(cache.GetEvents('third'))
+
+    # Events that exceed the maximum number of events are not stored.
+    cache.SetEvents('fourth', self._CreateRecordedEvents(5))
+    self.assertIsNone(cache.GetEvents('fourth'))
+    self.assertIsNotNone(cache.GetEvents('first'))
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -100,7 +100,7 @@ class BaseEngineTest(shared_test_lib.BaseTestCase):
       configuration.profiling.directory = temp_directory
       configuration.profiling.profilers = set([
           'memory', 'parsers', 'processing', 'serializers', 'storage',
-          'task_queue'])
+          'task_queue', 'yara_rules'])
 
       test_engine = engine.BaseEngine()
 
@@ -32,6 +32,29 @@ class EventExtractorTest(shared_test_lib.BaseTestCase):
   # TODO: add test for ParseFileEntryMetadata
   # TODO: add test for ParseMetadataFile
 
+  @shared_test_lib.skipUnlessHasTestFile(['syslog'])
+  def testCanParseFileEntryContent(self):
+    """Tests the CanParseFileEntryContent function."""
+    path_spec = self._GetTestFilePathSpec(['syslog'])
+    file_entry = path_spec_resolver.Resolver.OpenFileEntry(path_spec)
+
+    test_extractor = extractors.EventExtractor(
+        parser_filter_expression='syslog')
+    result = test_extractor.CanParseFileEntryContent(file_entry)
+    self.assertTrue(result)
+
+    # The filters of the rplog parser only match rp.log files.
+    test_extractor = extractors.EventExtractor(
+        parser_filter_expression='rplog')
+    result = test_extractor.CanParseFileEntryContent(file_entry)
+    self.assertFalse(result)
+
+    # Parsers with signatures require the content to be scanned.
+    test_extractor = extractors.EventExtractor(
+        parser_filter_expression='rplog,winevtx')
+    result = test_extractor.CanParseFileEntryContent(file_entry)
+    self.assertTrue(result)
+
 
 class PathSpecExtractorTest(shared_test_lib.BaseTestCase):
   """Tests for the path specification extractor."""
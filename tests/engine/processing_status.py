@@ -113,6 +113,15 @@ class ProcessingStatusTest(unittest.TestCase):
         'test', 'Idle', 12345, 2000000, 'test process',
         0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
 
+    status.UpdateWorkerStatus(
+        'test', 'Idle', 12345, 2000000, 'test process',
+        0, 0, 0, 0, 0, 0, 0, 0, 0, 0, number_of_block_cache_hits=5,
+        number_of_block_cache_misses=3)
+
+    process_status = status.workers_status[0]
+    self.assertEqual(process_status.number_of_block_cache_hits, 5)
+    self.assertEqual(process_status.number_of_block_cache_misses, 3)
+
 
 class TasksStatusTest(unittest.TestCase):
   """Tests the task status."""
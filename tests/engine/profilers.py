@@ -4,6 +4,7 @@
 
 from __future__ import unicode_literals
 
+import os
 import time
 import unittest
 
@@ -225,6 +226,26 @@ class TaskQueueProfilerTest(shared_test_lib.BaseTestCase):
 class TasksProfilerTest(shared_test_lib.BaseTestCase):
   """Tests for the tasks profiler."""
 
+  # pylint: disable=protected-access
+
+  def testGetLatencyStatistics(self):
+    """Tests the GetLatencyStatistics function."""
+    profiling_configuration = configurations.ProfilingConfiguration()
+
+    test_profiler = profilers.TasksProfiler('test', profiling_configuration)
+
+    statistics = test_profiler.GetLatencyStatistics()
+    self.assertEqual(statistics, [('number_of_tasks', 0.0)])
+
+    test_profiler._latencies = [float(value) for value in range(100, 0, -1)]
+
+    statistics = dict(test_profiler.GetLatencyStatistics())
+    self.assertEqual(statistics['number_of_tasks'], 100.0)
+    self.assertEqual(statistics['mean'], 50.5)
+    self.assertEqual(statistics['p50'], 50.0)
+    self.assertEqual(statistics['p99'], 99.0)
+    self.assertEqual(statistics['maximum'], 100.0)
+
   def testSample(self):
     """Tests the Sample function."""
     profiling_configuration = configurations.ProfilingConfiguration()
@@ -240,9 +261,46 @@ class TasksProfilerTest(shared_test_lib.BaseTestCase):
         task = tasks.Task()
         test_profiler.Sample(task, 'queued')
         time.sleep(0.01)
+        test_profiler.Sample(task, 'completed')
+
+      statistics = dict(test_profiler.GetLatencyStatistics())
+      self.assertEqual(statistics['number_of_tasks'], 5.0)
+      self.assertGreater(statistics['maximum'], 0.0)
+
+      test_profiler.Stop()
+
+      latency_file_path = os.path.join(
+          temp_directory, 'tasks_latency-test.csv.gz')
+      self.assertTrue(os.path.exists(latency_file_path))
+
+
+
+class YaraRulesProfilerTest(shared_test_lib.BaseTestCase):
+  """Tests for the Yara rules profiler."""
+
+  def testSample(self):
+    """Tests the Sample function."""
+    profiling_configuration = configurations.ProfilingConfiguration()
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      profiling_configuration.directory = temp_directory
+
+      test_profiler = profilers.YaraRulesProfiler(
+          'test', profiling_configuration)
+
+      test_profiler.Start()
+
+      for _ in range(5):
+        test_profiler.Sample('OS:/test', 0.01, 'PEfileBasic,PEfile')
+        time.sleep(0.01)
 
+      test_profiler.SetRulesCost({'default:PEfile': 10, 'default:test': 5})
       test_profiler.Stop()
 
+      rules_cost_path = os.path.join(
+          temp_directory, 'yara_rules_cost-test.csv.gz')
+      self.assertTrue(os.path.exists(rules_cost_path))
+
 
 if __name__ == '__main__':
   unittest.main()
@@ -4,6 +4,8 @@
 
 from __future__ import unicode_literals
 
+import os
+import shutil
 import unittest
 
 from dfvfs.lib import definitions as dfvfs_definitions
@@ -109,6 +111,26 @@ class EventExtractionWorkerTest(shared_test_lib.BaseTestCase):
     event_attribute = mediator._extra_event_attributes.get('test_result', None)
     self.assertEqual(event_attribute, 'is_vegetable')
 
+  def testGetExpectedProcessingCost(self):
+    """Tests the _GetExpectedProcessingCost function."""
+    extraction_worker = worker.EventExtractionWorker()
+
+    expected_processing_cost = extraction_worker._GetExpectedProcessingCost(
+        'syslog', 1024)
+    self.assertEqual(expected_processing_cost, 1024)
+
+    expected_processing_cost = extraction_worker._GetExpectedProcessingCost(
+        'System.evtx', 1024)
+    self.assertEqual(expected_processing_cost, 8 * 1024)
+
+    expected_processing_cost = extraction_worker._GetExpectedProcessingCost(
+        'NTUSER.DAT', 1024)
+    self.assertEqual(expected_processing_cost, 4 * 1024)
+
+    expected_processing_cost = extraction_worker._GetExpectedProcessingCost(
+        'syslog', None)
+    self.assertIsNone(expected_processing_cost)
+
   @shared_test_lib.skipUnlessHasTestFile(['syslog'])
   def testProcessPathSpecFile(self):
     """Tests the ProcessPathSpec function on a file."""
@@ -122,6 +144,42 @@ class EventExtractionWorkerTest(shared_test_lib.BaseTestCase):
 
     self.assertEqual(storage_writer.number_of_events, 19)
 
+  @shared_test_lib.skipUnlessHasTestFile(['syslog'])
+  def testProcessPathSpecAppendSession(self):
+    """Tests the ProcessPathSpec function when appending a session."""
+    knowledge_base_values = {'year': 2016}
+    session = sessions.Session()
+
+    configuration = configurations.ExtractionConfiguration()
+    configuration.append_session = True
+    configuration.hasher_names_string = 'sha256'
+
+    # The file entry metadata and hashes are not extracted again.
+    extraction_worker = worker.EventExtractionWorker(
+        parser_filter_expression='filestat,syslog')
+    extraction_worker.SetExtractionConfiguration(configuration)
+    self.assertEqual(extraction_worker.GetAnalyzerNames(), [])
+
+    path_spec = self._GetTestFilePathSpec(['syslog'])
+    storage_writer = fake_writer.FakeStorageWriter(session)
+    self._TestProcessPathSpec(
+        storage_writer, path_spec, extraction_worker=extraction_worker,
+        knowledge_base_values=knowledge_base_values)
+
+    self.assertEqual(storage_writer.number_of_events, 16)
+
+    # The file does not match the filters of the rplog parser.
+    extraction_worker = worker.EventExtractionWorker(
+        parser_filter_expression='rplog')
+    extraction_worker.SetExtractionConfiguration(configuration)
+
+    storage_writer = fake_writer.FakeStorageWriter(session)
+    self._TestProcessPathSpec(
+        storage_writer, path_spec, extraction_worker=extraction_worker,
+        knowledge_base_values=knowledge_base_values)
+
+    self.assertEqual(storage_writer.number_of_events, 0)
+
   @shared_test_lib.skipUnlessHasTestFile(['syslog.gz'])
   def testProcessPathSpecCompressedFileGZIP(self):
     """Tests the ProcessPathSpec function on a gzip compressed file."""
@@ -148,6 +206,54 @@ class EventExtractionWorkerTest(shared_test_lib.BaseTestCase):
 
     self.assertEqual(storage_writer.number_of_events, 15)
 
+  @shared_test_lib.skipUnlessHasTestFile(['example.lnk'])
+  def testProcessPathSpecDeduplicateContent(self):
+    """Tests the ProcessPathSpec function with content deduplication."""
+    configuration = configurations.ExtractionConfiguration()
+    configuration.deduplicate_content = True
+
+    extraction_worker = worker.EventExtractionWorker(
+        parser_filter_expression='lnk')
+    extraction_worker.SetExtractionConfiguration(configuration)
+
+    session = sessions.Session()
+    storage_writer = fake_writer.FakeStorageWriter(session)
+    storage_writer.Open()
+    storage_writer.WriteSessionStart()
+
+    mediator = parsers_mediator.ParserMediator(
+        storage_writer, knowledge_base.KnowledgeBase(),
+        resolver_context=context.Context())
+
+    test_file_path = self._GetTestFilePath(['example.lnk'])
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      # The same Windows Shortcut file is seen at two different paths.
+      for directory_name in ('first', 'second'):
+        directory_path = os.path.join(temp_directory, directory_name)
+        os.mkdir(directory_path)
+        file_path = os.path.join(directory_path, 'example.lnk')
+        shutil.copyfile(test_file_path, file_path)
+
+        path_spec = path_spec_factory.Factory.NewPathSpec(
+            dfvfs_definitions.TYPE_INDICATOR_OS, location=file_path)
+        extraction_worker.ProcessPathSpec(mediator, path_spec)
+
+    storage_writer.WriteSessionCompletion()
+    storage_writer.Close()
+
+    self.assertEqual(storage_writer.number_of_events, 10)
+
+    # The origin of the distributed link tracking event contains the path
+    # of the file, hence the events of the first file are not reproduced
+    # for the second file.
+    origins = sorted([
+        event.origin for event in storage_writer.GetEvents()
+        if getattr(event, 'origin', None)])
+    self.assertEqual(len(origins), 2)
+    self.assertIn('first', origins[0])
+    self.assertIn('second', origins[1])
+
   @shared_test_lib.skipUnlessHasTestFile(['syslog.tar'])
   def testProcessPathSpec(self):
     """Tests the ProcessPathSpec function on an archive file."""
@@ -38,6 +38,28 @@ class EventObjectFilterTest(test_lib.FilterTestCase):
       test_filter.CompileFilter(
           'some_stuff is "random" and other_stuff ')
 
+  def testGetFilterConditions(self):
+    """Tests the GetFilterConditions function."""
+    test_filter = event_filter.EventObjectFilter()
+
+    filter_conditions = test_filter.GetFilterConditions()
+    self.assertEqual(filter_conditions, [])
+
+    test_filter.CompileFilter(
+        'data_type is "fs:stat" and date > "2015-01-01 00:00:00" and '
+        'filename contains "evil" and hostname is not "host"')
+
+    filter_conditions = test_filter.GetFilterConditions()
+    self.assertEqual(filter_conditions, [
+        ('data_type', '==', 'fs:stat'),
+        ('timestamp', '>', 1420070400000000)])
+
+    test_filter.CompileFilter(
+        'data_type is "fs:stat" or parser is "filestat"')
+
+    filter_conditions = test_filter.GetFilterConditions()
+    self.assertEqual(filter_conditions, [])
+
 
 if __name__ == '__main__':
   unittest.main()
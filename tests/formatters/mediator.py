@@ -4,14 +4,93 @@
 
 from __future__ import unicode_literals
 
+import os
+import sqlite3
 import unittest
 
 from plaso.formatters import mediator
 
+from tests import test_lib as shared_test_lib
 
-class FormatterMediatorTest(unittest.TestCase):
+
+class FormatterMediatorTest(shared_test_lib.BaseTestCase):
   """Tests for the formatter mediator object."""
 
+  def _CreateTestDatabase(self, path):
+    """Creates a test Windows Event Log resource database.
+
+    Args:
+      path (str): path of the database.
+    """
+    connection = sqlite3.connect(path)
+    cursor = connection.cursor()
+
+    cursor.execute('CREATE TABLE metadata (name TEXT, value TEXT)')
+    cursor.executemany('INSERT INTO metadata VALUES (?, ?)', [
+        ('version', '20150315'), ('string_format', 'wrc')])
+
+    cursor.execute((
+        'CREATE TABLE event_log_providers (event_log_provider_key INTEGER, '
+        'log_source TEXT)'))
+    cursor.execute((
+        'INSERT INTO event_log_providers VALUES (1, '
+        '"Microsoft-Windows-Security-Auditing")'))
+
+    cursor.execute((
+        'CREATE TABLE message_file_per_event_log_provider ('
+        'message_file_key INTEGER, event_log_provider_key INTEGER)'))
+    cursor.execute(
+        'INSERT INTO message_file_per_event_log_provider VALUES (1, 1)')
+
+    cursor.execute((
+        'CREATE TABLE message_table_1_0x00000409 (message_identifier TEXT, '
+        'message_string TEXT)'))
+    cursor.executemany(
+        'INSERT INTO message_table_1_0x00000409 VALUES (?, ?)', [
+            ('0x00001210', 'An account was logged on: %1'),
+            ('0x00001250', 'A new process has been created: %1')])
+
+    connection.commit()
+    connection.close()
+
+  def testGetWindowsEventMessage(self):
+    """Tests the GetWindowsEventMessage function."""
+    with shared_test_lib.TempDirectory() as temp_directory:
+      database_path = os.path.join(temp_directory, 'winevt-rc.db')
+      self._CreateTestDatabase(database_path)
+
+      formatter_mediator = mediator.FormatterMediator(
+          data_location=temp_directory)
+
+      cache_statistics = (
+          formatter_mediator.GetWindowsEventMessageCacheStatistics())
+      self.assertEqual(cache_statistics, (0, 0))
+
+      # The message strings of the Security Auditing Event Log source are
+      # preloaded when the database is opened.
+      message_string = formatter_mediator.GetWindowsEventMessage(
+          'Microsoft-Windows-Security-Auditing', 0x00001210)
+      self.assertEqual(message_string, 'An account was logged on: {0:s}')
+
+      message_string = formatter_mediator.GetWindowsEventMessage(
+          'Microsoft-Windows-Security-Auditing', 0x00001250)
+      self.assertEqual(message_string, 'A new process has been created: {0:s}')
+
+      cache_statistics = (
+          formatter_mediator.GetWindowsEventMessageCacheStatistics())
+      self.assertEqual(cache_statistics, (2, 0))
+
+      message_string = formatter_mediator.GetWindowsEventMessage(
+          'Bogus-Provider', 0x00001210)
+      self.assertIsNone(message_string)
+
+      cache_statistics = (
+          formatter_mediator.GetWindowsEventMessageCacheStatistics())
+      self.assertEqual(cache_statistics, (2, 1))
+
+      # pylint: disable=protected-access
+      formatter_mediator._winevt_database_reader.Close()
+
   def testInitialization(self):
     """Tests the initialization."""
     formatter_mediator = mediator.FormatterMediator()
@@ -4,6 +4,8 @@
 
 from __future__ import unicode_literals
 
+import os
+import sqlite3
 import unittest
 
 from plaso.formatters import winevt_rc
@@ -14,6 +16,50 @@ from tests import test_lib as shared_test_lib
 class WinevtResourcesSqlite3DatabaseReaderTest(shared_test_lib.BaseTestCase):
   """Tests for the Event Log resources sqlite3 database reader."""
 
+  def _CreateTestDatabase(self, path):
+    """Creates a test Event Log resources database.
+
+    Args:
+      path (str): path of the database.
+    """
+    connection = sqlite3.connect(path)
+    cursor = connection.cursor()
+
+    cursor.execute('CREATE TABLE metadata (name TEXT, value TEXT)')
+    cursor.executemany('INSERT INTO metadata VALUES (?, ?)', [
+        ('version', '20150315'), ('string_format', 'wrc')])
+
+    cursor.execute((
+        'CREATE TABLE event_log_providers (event_log_provider_key INTEGER, '
+        'log_source TEXT)'))
+    cursor.execute(
+        'INSERT INTO event_log_providers VALUES (1, "Test-Provider")')
+
+    cursor.execute((
+        'CREATE TABLE message_file_per_event_log_provider ('
+        'message_file_key INTEGER, event_log_provider_key INTEGER)'))
+    cursor.executemany(
+        'INSERT INTO message_file_per_event_log_provider VALUES (?, ?)', [
+            (1, 1), (2, 1)])
+
+    cursor.execute((
+        'CREATE TABLE message_table_1_0x00000409 (message_identifier TEXT, '
+        'message_string TEXT)'))
+    cursor.execute(
+        'INSERT INTO message_table_1_0x00000409 VALUES (?, ?)',
+        ('0x00001210', 'An account was logged on: %1'))
+
+    cursor.execute((
+        'CREATE TABLE message_table_2_0x00000409 (message_identifier TEXT, '
+        'message_string TEXT)'))
+    cursor.executemany(
+        'INSERT INTO message_table_2_0x00000409 VALUES (?, ?)', [
+            ('0x00001210', 'Overridden: %1'),
+            ('0x00001250', 'A new process has been created: %1')])
+
+    connection.commit()
+    connection.close()
+
   @shared_test_lib.skipUnlessHasTestFile(['winevt-rc.db'])
   def testGetMessage(self):
     """Tests the GetMessage function."""
@@ -34,6 +80,73 @@ class WinevtResourcesSqlite3DatabaseReaderTest(shared_test_lib.BaseTestCase):
 
     database_reader.Close()
 
+  def testGetMessageCache(self):
+    """Tests the GetMessage function with cached message strings."""
+    with shared_test_lib.TempDirectory() as temp_directory:
+      database_path = os.path.join(temp_directory, 'winevt-rc.db')
+      self._CreateTestDatabase(database_path)
+
+      database_reader = winevt_rc.WinevtResourcesSqlite3DatabaseReader()
+      database_reader.Open(database_path)
+
+      message_string = database_reader.GetMessage(
+          'Test-Provider', 0x00000409, 0x00001210)
+      self.assertEqual(message_string, 'An account was logged on: {0:s}')
+      self.assertEqual(database_reader.number_of_message_cache_hits, 0)
+      self.assertEqual(database_reader.number_of_message_cache_misses, 1)
+
+      message_string = database_reader.GetMessage(
+          'Test-Provider', 0x00000409, 0x00001210)
+      self.assertEqual(message_string, 'An account was logged on: {0:s}')
+      self.assertEqual(database_reader.number_of_message_cache_hits, 1)
+
+      # Test that message strings that are not available are cached.
+      message_string = database_reader.GetMessage(
+          'Test-Provider', 0x00000409, 0x00009999)
+      self.assertIsNone(message_string)
+
+      message_string = database_reader.GetMessage(
+          'Test-Provider', 0x00000409, 0x00009999)
+      self.assertIsNone(message_string)
+      self.assertEqual(database_reader.number_of_message_cache_hits, 2)
+      self.assertEqual(database_reader.number_of_message_cache_misses, 2)
+
+      message_string = database_reader.GetMessage(
+          'Bogus-Provider', 0x00000409, 0x00001210)
+      self.assertIsNone(message_string)
+
+      database_reader.Close()
+
+  def testPreloadMessages(self):
+    """Tests the PreloadMessages function."""
+    with shared_test_lib.TempDirectory() as temp_directory:
+      database_path = os.path.join(temp_directory, 'winevt-rc.db')
+      self._CreateTestDatabase(database_path)
+
+      database_reader = winevt_rc.WinevtResourcesSqlite3DatabaseReader()
+      database_reader.Open(database_path)
+
+      number_of_messages = database_reader.PreloadMessages(
+          'Test-Provider', 0x00000409)
+      self.assertEqual(number_of_messages, 2)
+
+      number_of_messages = database_reader.PreloadMessages(
+          'Bogus-Provider', 0x00000409)
+      self.assertEqual(number_of_messages, 0)
+
+      message_string = database_reader.GetMessage(
+          'Test-Provider', 0x00000409, 0x00001210)
+      self.assertEqual(message_string, 'An account was logged on: {0:s}')
+
+      message_string = database_reader.GetMessage(
+          'Test-Provider', 0x00000409, 0x00001250)
+      self.assertEqual(message_string, 'A new process has been created: {0:s}')
+
+      self.assertEqual(database_reader.number_of_message_cache_hits, 2)
+      self.assertEqual(database_reader.number_of_message_cache_misses, 0)
+
+      database_reader.Close()
+
 
 if __name__ == '__main__':
   unittest.main()
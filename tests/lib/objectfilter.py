@@ -200,9 +200,15 @@ class ObjectFilterTest(unittest.TestCase):
         self.assertEqual(
             test_unit[0], ops.Matches(self.file),
             'test case {0!s} failed'.format(test_unit))
+        match_function = ops.CompileMatchFunction()
+        self.assertEqual(
+            test_unit[0], match_function(self.file),
+            'compiled test case {0!s} failed'.format(test_unit))
         if hasattr(ops, 'FlipBool'):
           ops.FlipBool()
           self.assertEqual(not test_unit[0], ops.Matches(self.file))
+          match_function = ops.CompileMatchFunction()
+          self.assertEqual(not test_unit[0], match_function(self.file))
 
   def testExpand(self):
     # Case insensitivity.
@@ -350,6 +356,9 @@ class ObjectFilterTest(unittest.TestCase):
     filter_ = filter_.Compile(self.filter_imp)
     self.assertEqual(True, filter_.Matches(self.file))
 
+    match_function = filter_.CompileMatchFunction()
+    self.assertEqual(True, match_function(self.file))
+
   def testRegexpRaises(self):
     with self.assertRaises(ValueError):
       objectfilter.Regexp(
@@ -518,6 +527,30 @@ class ObjectFilterTest(unittest.TestCase):
     filter_ = parser.Compile(self.filter_imp)
     self.assertEqual(filter_.Matches(obj), False)
 
+  def testCompileMatchFunction(self):
+    """Tests the CompileMatchFunction function."""
+    query = 'name regexp "boot" and size == 10'
+    parser = objectfilter.Parser(query).Parse()
+    filter_ = parser.Compile(self.filter_imp)
+
+    # The least costly child filter is evaluated first.
+    regexp_filter, equals_filter = filter_.args
+    self.assertEqual(regexp_filter.GetMatchCost(), 5)
+    self.assertEqual(equals_filter.GetMatchCost(), 2)
+
+    match_function = filter_.CompileMatchFunction()
+    self.assertTrue(match_function(self.file))
+
+    query = 'name contains "meh" or imported_dlls.name contains "b.dll"'
+    parser = objectfilter.Parser(query).Parse()
+    filter_ = parser.Compile(self.filter_imp)
+
+    match_function = filter_.CompileMatchFunction()
+    self.assertTrue(match_function(self.file))
+
+    match_function = objectfilter.OrFilter().CompileMatchFunction()
+    self.assertTrue(match_function(self.file))
+
 
 if __name__ == '__main__':
   unittest.main()
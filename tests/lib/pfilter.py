@@ -41,6 +41,24 @@ class PFilterTest(unittest.TestCase):
         result, matcher.Matches(event),
         'query {0:s} failed with event {1!s}'.format(query, event.CopyToDict()))
 
+    match_function = matcher.CompileMatchFunction()
+    self.assertEqual(
+        result, match_function(event),
+        'compiled query {0:s} failed with event {1!s}'.format(
+            query, event.CopyToDict()))
+
+  def testGetMatchCost(self):
+    """Tests the GetMatchCost function."""
+    query = 'message contains \'bad\' and filename contains \'GoodFella\''
+    my_parser = pfilter.BaseParser(query).Parse()
+    matcher = my_parser.Compile(
+        pfilter.PlasoAttributeFilterImplementation)
+
+    message_matcher, filename_matcher = matcher.args
+    self.assertEqual(message_matcher.GetMatchCost(), 103)
+    self.assertEqual(filename_matcher.GetMatchCost(), 3)
+    self.assertEqual(matcher.GetMatchCost(), 106)
+
   def testPlasoEvents(self):
     """Test plaso EventObjects, both Python and Protobuf version.
 
@@ -177,11 +177,41 @@ class PsortEventHeapTest(shared_test_lib.BaseTestCase):
     macb_group_identifier, content_identifier = (
         event_heap._GetEventIdentifiers(event))
 
-    expected_identifier = 'data_type: test:event'
-    self.assertEqual(macb_group_identifier, expected_identifier)
+    self.assertEqual(len(macb_group_identifier), 16)
+    self.assertEqual(len(content_identifier), 16)
+    self.assertNotEqual(macb_group_identifier, content_identifier)
 
-    expected_identifier = 'Metadata Modification Time, data_type: test:event'
-    self.assertEqual(content_identifier, expected_identifier)
+    # Events with the same attribute values have the same identifiers.
+    event = containers_test_lib.TestEvent(
+        2345871286, attributes=self._TEST_EVENT_ATTRIBUTES)
+    test_identifiers = event_heap._GetEventIdentifiers(event)
+    self.assertEqual(
+        test_identifiers, (macb_group_identifier, content_identifier))
+
+    # Events that only differ in their timestamp description are in the same
+    # MACB group.
+    event = containers_test_lib.TestEvent(5134324321, attributes={
+        'timestamp_desc': definitions.TIME_DESCRIPTION_CREATION})
+    test_identifiers = event_heap._GetEventIdentifiers(event)
+    self.assertEqual(test_identifiers[0], macb_group_identifier)
+    self.assertNotEqual(test_identifiers[1], content_identifier)
+
+    event = containers_test_lib.TestEvent(5134324321, attributes={
+        'text': 'Another text',
+        'timestamp_desc': definitions.TIME_DESCRIPTION_CHANGE})
+    test_identifiers = event_heap._GetEventIdentifiers(event)
+    self.assertNotEqual(test_identifiers[0], macb_group_identifier)
+    self.assertNotEqual(test_identifiers[1], content_identifier)
+
+    event = containers_test_lib.TestEvent(5134324321, attributes={
+        'timestamp_desc': definitions.TIME_DESCRIPTION_WRITTEN})
+    test_identifiers = event_heap._GetEventIdentifiers(event)
+    self.assertIsNotNone(test_identifiers[0])
+
+    event = containers_test_lib.TestEvent(5134324321, attributes={
+        'timestamp_desc': definitions.TIME_DESCRIPTION_UNKNOWN})
+    test_identifiers = event_heap._GetEventIdentifiers(event)
+    self.assertIsNone(test_identifiers[0])
 
   def testPopEvent(self):
     """Tests the PopEvent function."""
@@ -241,7 +271,30 @@ class PsortEventHeapTest(shared_test_lib.BaseTestCase):
         5134324321, attributes=self._TEST_EVENT_ATTRIBUTES)
     event_heap.PushEvent(event)
 
-    self.assertEqual(len(event_heap._heap), 1)
+    # The identifiers of the first event are determined when a second event
+    # is pushed.
+    self.assertEqual(len(event_heap._heap), 0)
+    self.assertEqual(event_heap.number_of_events, 1)
+
+    macb_group_identifier, content_identifier, test_event = (
+        event_heap.PopEvent())
+    self.assertEqual(macb_group_identifier, b'')
+    self.assertEqual(content_identifier, b'')
+    self.assertEqual(test_event, event)
+
+    event_heap.PushEvent(event)
+
+    event = containers_test_lib.TestEvent(5134324321, attributes={
+        'timestamp_desc': definitions.TIME_DESCRIPTION_UNKNOWN})
+    event_heap.PushEvent(event)
+
+    self.assertEqual(len(event_heap._heap), 2)
+    self.assertEqual(event_heap.number_of_events, 2)
+
+    # Events that cannot be grouped are popped before the MACB groups.
+    macb_group_identifier, _, test_event = event_heap.PopEvent()
+    self.assertIsNone(macb_group_identifier)
+    self.assertEqual(test_event, event)
 
 
 class PsortMultiProcessEngineTest(shared_test_lib.BaseTestCase):
@@ -533,6 +586,101 @@ class PsortMultiProcessEngineTest(shared_test_lib.BaseTestCase):
         'repeated')
     self.assertEqual(lines[14], expected_line)
 
+  @shared_test_lib.skipUnlessHasTestFile(['psort_test.plaso'])
+  def testExportEventsWithWorkers(self):
+    """Tests the ExportEvents function with export worker processes."""
+    storage_file_path = self._GetTestFilePath(['psort_test.plaso'])
+
+    knowledge_base_object = knowledge_base.KnowledgeBase()
+
+    formatter_mediator = formatters_mediator.FormatterMediator()
+    formatter_mediator.SetPreferredLanguageIdentifier('en-US')
+
+    output_mediator_object = output_mediator.OutputMediator(
+        knowledge_base_object, formatter_mediator)
+
+    configuration = configurations.ProcessingConfiguration()
+
+    counters = []
+    outputs = []
+    for number_of_worker_processes in (0, 2):
+      output_writer = cli_test_lib.TestBinaryOutputWriter()
+      output_module = dynamic.DynamicOutputModule(output_mediator_object)
+      output_module.SetOutputWriter(output_writer)
+
+      storage_reader = (
+          storage_factory.StorageFactory.CreateStorageReaderForFile(
+              storage_file_path))
+
+      test_engine = psort.PsortMultiProcessEngine()
+      # Use small time ranges so that the events are exported by multiple
+      # export workers.
+      test_engine._NUMBER_OF_EVENTS_PER_EXPORT_TIME_RANGE = 4
+
+      counter = test_engine.ExportEvents(
+          knowledge_base_object, storage_reader, output_module, configuration,
+          number_of_worker_processes=number_of_worker_processes,
+          storage_file_path=storage_file_path)
+
+      storage_reader.Close()
+
+      counters.append(counter)
+      outputs.append(output_writer.ReadOutput())
+
+    self.assertEqual(
+        counters[0]['Events processed'], counters[1]['Events processed'])
+
+    # The number of formatted values lookups does not depend on the number
+    # of export worker processes, while the number of cache hits does.
+    number_of_lookups = [
+        counter['Formatted values cache hits'] +
+        counter['Formatted values cache misses'] for counter in counters]
+    self.assertNotEqual(number_of_lookups[0], 0)
+    self.assertEqual(number_of_lookups[0], number_of_lookups[1])
+    self.assertEqual(outputs[0], outputs[1])
+
+
+  def testExportTimeRange(self):
+    """Tests the ExportTimeRange function."""
+    knowledge_base_object = knowledge_base.KnowledgeBase()
+    output_writer = cli_test_lib.TestBinaryOutputWriter()
+
+    formatter_mediator = formatters_mediator.FormatterMediator()
+
+    output_mediator_object = output_mediator.OutputMediator(
+        knowledge_base_object, formatter_mediator)
+
+    output_module = TestOutputModule(output_mediator_object)
+    output_module.SetOutputWriter(output_writer)
+
+    test_engine = psort.PsortMultiProcessEngine()
+
+    formatters_manager.FormattersManager.RegisterFormatter(TestEventFormatter)
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, 'storage.plaso')
+      self._CreateTestStorageFile(temp_file)
+
+      storage_reader = (
+          storage_factory.StorageFactory.CreateStorageReaderForFile(temp_file))
+      storage_reader.ReadPreprocessingInformation(knowledge_base_object)
+
+      time_ranges = list(storage_reader.GetEventTimeRanges(100))
+      self.assertEqual(len(time_ranges), 1)
+
+      # The counters are reset for every time range.
+      for _ in range(2):
+        events_counter = test_engine.ExportTimeRange(
+            storage_reader, output_module, time_ranges[0],
+            deduplicate_events=False)
+        self.assertEqual(events_counter['Events processed'], 17)
+
+      storage_reader.Close()
+
+    formatters_manager.FormattersManager.DeregisterFormatter(TestEventFormatter)
+
+    self.assertEqual(len(output_module.events), 34)
+
 
 if __name__ == '__main__':
   unittest.main()
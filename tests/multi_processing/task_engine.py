@@ -12,6 +12,7 @@ from artifacts import registry as artifacts_registry
 from dfvfs.lib import definitions as dfvfs_definitions
 from dfvfs.path import factory as path_spec_factory
 
+from plaso.containers import event_sources
 from plaso.containers import sessions
 from plaso.engine import configurations
 from plaso.multi_processing import task_engine
@@ -23,6 +24,93 @@ from tests import test_lib as shared_test_lib
 class TaskMultiProcessEngineTest(shared_test_lib.BaseTestCase):
   """Tests for the task multi-process engine."""
 
+  # pylint: disable=protected-access
+
+  def _CreateTestEventSource(
+      self, location, file_size, expected_processing_cost=None,
+      file_entry_type=dfvfs_definitions.FILE_ENTRY_TYPE_FILE):
+    """Creates an event source for testing.
+
+    Args:
+      location (str): location of the file entry.
+      file_size (int): size of the file entry data.
+      expected_processing_cost (Optional[int]): expected processing cost.
+      file_entry_type (Optional[str]): dfVFS file entry type.
+
+    Returns:
+      EventSource: event source.
+    """
+    path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_FAKE, location=location)
+
+    event_source = event_sources.FileEntryEventSource(path_spec=path_spec)
+    event_source.expected_processing_cost = expected_processing_cost
+    event_source.file_entry_type = file_entry_type
+    event_source.file_size = file_size
+    return event_source
+
+  def testEventSourceHeap(self):
+    """Tests the event source heap ordering."""
+    event_source_heap = task_engine._EventSourceHeap()
+
+    event_source_heap.PushEventSource(
+        self._CreateTestEventSource('/small', 10, expected_processing_cost=10))
+    event_source_heap.PushEventSource(
+        self._CreateTestEventSource('/unknown', None))
+    event_source_heap.PushEventSource(self._CreateTestEventSource(
+        '/large', 1024 * 1024 * 1024,
+        expected_processing_cost=1024 * 1024 * 1024))
+    event_source_heap.PushEventSource(self._CreateTestEventSource(
+        '/directory', None,
+        file_entry_type=dfvfs_definitions.FILE_ENTRY_TYPE_DIRECTORY))
+
+    locations = []
+    event_source = event_source_heap.PopEventSource()
+    while event_source:
+      locations.append(event_source.path_spec.location)
+      event_source = event_source_heap.PopEventSource()
+
+    self.assertEqual(locations, ['/directory', '/large', '/unknown', '/small'])
+
+  def testCreateTask(self):
+    """Tests the _CreateTask function."""
+    test_engine = task_engine.TaskMultiProcessEngine(
+        maximum_number_of_event_sources_per_task=3,
+        maximum_task_data_size=1024)
+
+    event_source_heap = task_engine._EventSourceHeap()
+    for index in range(5):
+      event_source_heap.PushEventSource(self._CreateTestEventSource(
+          '/file{0:d}'.format(index), 100))
+
+    event_source_heap.PushEventSource(
+        self._CreateTestEventSource('/large_file', 2048))
+
+    event_source = event_source_heap.PopEventSource()
+    task, event_source = test_engine._CreateTask(
+        event_source, event_source_heap)
+
+    self.assertIsNone(task.path_spec)
+    self.assertEqual(len(task.path_specs), 3)
+    self.assertIsNotNone(event_source)
+
+    task, event_source = test_engine._CreateTask(
+        event_source, event_source_heap)
+
+    self.assertIsNone(task.path_spec)
+    self.assertEqual(len(task.path_specs), 2)
+    self.assertEqual(event_source.path_spec.location, '/large_file')
+
+    # An event source that exceeds the maximum data size is not combined.
+    task, event_source = test_engine._CreateTask(
+        event_source, event_source_heap)
+
+    self.assertEqual(task.path_spec.location, '/large_file')
+    self.assertIsNone(task.path_specs)
+    self.assertIsNone(event_source)
+
+    self.assertEqual(test_engine._number_of_consumed_sources, 6)
+
   @shared_test_lib.skipUnlessHasTestFile(['ímynd.dd'])
   def testProcessSources(self):
     """Tests the PreprocessSources and ProcessSources function."""
@@ -40,6 +40,17 @@ class PendingMergeTaskHeapTest(shared_test_lib.BaseTestCase):
     heap.PushTask(task)
     self.assertEqual(len(heap), 1)
 
+  def testGetTasks(self):
+    """Tests the GetTasks function."""
+    task = tasks.Task()
+    task.storage_file_size = 10
+
+    heap = task_manager._PendingMergeTaskHeap()
+    self.assertEqual(heap.GetTasks(), [])
+
+    heap.PushTask(task)
+    self.assertEqual(heap.GetTasks(), [task])
+
   def testPeekTask(self):
     """Tests the PeekTask function."""
     task = tasks.Task()
@@ -72,6 +83,7 @@ class PendingMergeTaskHeapTest(shared_test_lib.BaseTestCase):
 
     result_task = heap.PopTask()
     self.assertEqual(len(heap), 0)
+    self.assertEqual(heap.storage_file_size, 0)
     self.assertEqual(result_task, task)
 
   def testPushTask(self):
@@ -90,6 +102,7 @@ class PendingMergeTaskHeapTest(shared_test_lib.BaseTestCase):
 
     heap.PushTask(task)
     self.assertEqual(len(heap), 2)
+    self.assertEqual(heap.storage_file_size, 110)
 
     task = tasks.Task()
     with self.assertRaises(ValueError):
@@ -209,6 +222,33 @@ class TaskManagerTest(shared_test_lib.BaseTestCase):
 
     manager._UpdateLatestProcessingTime(task)
 
+  def testAbandonMergingTask(self):
+    """Tests the AbandonMergingTask function."""
+    manager = task_manager.TaskManager()
+
+    task = manager.CreateTask(self._TEST_SESSION_IDENTIFIER)
+    task.storage_file_size = 10
+
+    with self.assertRaises(KeyError):
+      manager.AbandonMergingTask(task)
+
+    manager.UpdateTaskAsProcessingByIdentifier(task.identifier)
+    manager.UpdateTaskAsPendingMerge(task)
+
+    merging_task = manager.GetTaskPendingMerge(None)
+    self.assertEqual(merging_task, task)
+
+    manager.AbandonMergingTask(task)
+
+    self.assertEqual(len(manager._tasks_merging), 0)
+    self.assertEqual(len(manager._tasks_abandoned), 1)
+
+    # The abandoned task is retried.
+    retry_task = manager.CreateRetryTask()
+    self.assertIsNotNone(retry_task)
+    self.assertNotEqual(retry_task.identifier, task.identifier)
+    self.assertTrue(task.has_retry)
+
   def testCheckTaskToMerge(self):
     """Tests the CheckTaskToMerge function."""
     manager = task_manager.TaskManager()
@@ -305,6 +345,32 @@ class TaskManagerTest(shared_test_lib.BaseTestCase):
 
     self.assertEqual(manager._total_number_of_tasks, 2)
 
+  def testCreateRetryTaskWithMultiplePathSpecs(self):
+    """Tests the CreateRetryTask function with multiple path specs."""
+    manager = task_manager.TaskManager()
+    task = manager.CreateTask(self._TEST_SESSION_IDENTIFIER)
+    task.path_specs = ['test_path_spec1', 'test_path_spec2', 'test_path_spec3']
+
+    manager._AbandonQueuedTasks()
+
+    retry_task = manager.CreateRetryTask()
+    self.assertIsNotNone(retry_task)
+    self.assertEqual(retry_task.path_spec, 'test_path_spec1')
+
+    # The retry tasks of every path specification are queued at once.
+    self.assertTrue(task.has_retry)
+    self.assertEqual(len(manager._tasks_queued), 3)
+    self.assertEqual(manager._total_number_of_tasks, 4)
+
+    retry_task = manager.CreateRetryTask()
+    self.assertEqual(retry_task.path_spec, 'test_path_spec2')
+
+    retry_task = manager.CreateRetryTask()
+    self.assertEqual(retry_task.path_spec, 'test_path_spec3')
+
+    retry_task = manager.CreateRetryTask()
+    self.assertIsNone(retry_task)
+
   def testCreateTask(self):
     """Tests the CreateTask function."""
     manager = task_manager.TaskManager()
@@ -507,8 +573,17 @@ class TaskManagerTest(shared_test_lib.BaseTestCase):
     self.assertEqual(result_status.number_of_queued_tasks, 1)
     self.assertEqual(result_status.number_of_tasks_pending_merge, 0)
     self.assertEqual(result_status.number_of_tasks_processing, 0)
+    self.assertEqual(result_status.size_of_tasks_pending_merge, 0)
     self.assertEqual(result_status.total_number_of_tasks, 1)
 
+    task = manager.CreateTask(self._TEST_SESSION_IDENTIFIER)
+    task.storage_file_size = 10
+    manager.UpdateTaskAsPendingMerge(task)
+
+    result_status = manager.GetStatusInformation()
+    self.assertEqual(result_status.number_of_tasks_pending_merge, 1)
+    self.assertEqual(result_status.size_of_tasks_pending_merge, 10)
+
   def testGetTaskPendingMerge(self):
     """Tests the GetTaskPendingMerge function."""
     current_task = tasks.Task()
@@ -557,6 +632,18 @@ class TaskManagerTest(shared_test_lib.BaseTestCase):
     self.assertEqual(len(manager._tasks_pending_merge), 0)
     self.assertEqual(len(manager._tasks_merging), 1)
 
+  def testGetTasksPendingMerge(self):
+    """Tests the GetTasksPendingMerge function."""
+    manager = task_manager.TaskManager()
+    task = manager.CreateTask(self._TEST_SESSION_IDENTIFIER)
+    task.storage_file_size = 10
+
+    self.assertEqual(manager.GetTasksPendingMerge(), [])
+
+    manager.UpdateTaskAsPendingMerge(task)
+
+    self.assertEqual(manager.GetTasksPendingMerge(), [task])
+
   def testHasPendingTasks(self):
     """Tests the HasPendingTasks function."""
     manager = task_manager.TaskManager()
@@ -672,6 +759,32 @@ class TaskManagerTest(shared_test_lib.BaseTestCase):
     self.assertEqual(len(manager._tasks_pending_merge), 0)
     self.assertEqual(len(manager._tasks_abandoned), 0)
 
+  def testRestoreProcessedTask(self):
+    """Tests the RestoreProcessedTask function."""
+    manager = task_manager.TaskManager()
+
+    task = tasks.Task(session_identifier=self._TEST_SESSION_IDENTIFIER)
+    task.storage_file_size = 10
+
+    manager.RestoreProcessedTask(task)
+
+    self.assertEqual(len(manager._tasks_queued), 0)
+    self.assertEqual(len(manager._tasks_processing), 1)
+    self.assertEqual(len(manager._tasks_pending_merge), 0)
+    self.assertEqual(manager._total_number_of_tasks, 1)
+    self.assertIsNotNone(task.last_processing_time)
+
+    with self.assertRaises(KeyError):
+      manager.RestoreProcessedTask(task)
+
+    # The restored task is merged as any other processed task.
+    self.assertTrue(manager.CheckTaskToMerge(task))
+
+    manager.UpdateTaskAsPendingMerge(task)
+
+    self.assertEqual(len(manager._tasks_processing), 0)
+    self.assertEqual(len(manager._tasks_pending_merge), 1)
+
   # TODO: add tests for SampleTaskStatus
   # TODO: add tests for StartProfiling
   # TODO: add tests for StopProfiling
@@ -147,7 +147,7 @@ class WorkerProcessTest(test_lib.MultiProcessingTestCase):
       configuration.profiling.directory = temp_directory
       configuration.profiling.profilers = set([
           'memory', 'parsers', 'processing', 'serializers', 'storage',
-          'task_queue'])
+          'task_queue', 'yara_rules'])
 
       test_process = worker_process.WorkerProcess(
           None, None, None, None, configuration, name='TestWorker')
@@ -29,6 +29,28 @@ class TestEvent(object):
 class LinearOutputModuleTest(test_lib.OutputModuleTestCase):
   """Tests the linear output module."""
 
+  def testGetFormattedValuesCacheStatistics(self):
+    """Tests the GetFormattedValuesCacheStatistics function."""
+    output_mediator = self._CreateOutputMediator()
+    output_module = test_lib.TestOutputModule(output_mediator)
+
+    cache_statistics = output_module.GetFormattedValuesCacheStatistics()
+    self.assertEqual(cache_statistics, (0, 0))
+
+    output_mediator.number_of_formatted_values_cache_hits = 3
+    output_mediator.number_of_formatted_values_cache_misses = 2
+
+    cache_statistics = output_module.GetFormattedValuesCacheStatistics()
+    self.assertEqual(cache_statistics, (3, 2))
+
+  def testGetWindowsEventMessageCacheStatistics(self):
+    """Tests the GetWindowsEventMessageCacheStatistics function."""
+    output_mediator = self._CreateOutputMediator()
+    output_module = test_lib.TestOutputModule(output_mediator)
+
+    cache_statistics = output_module.GetWindowsEventMessageCacheStatistics()
+    self.assertEqual(cache_statistics, (0, 0))
+
   def testOutput(self):
     """Tests an implementation of output module."""
     events = [
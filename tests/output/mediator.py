@@ -13,6 +13,7 @@ from plaso.formatters import manager as formatters_manager
 from plaso.lib import definitions
 from plaso.lib import timelib
 from plaso.output import mediator
+from plaso.storage import identifiers
 
 
 class TestEvent(events.EventObject):
@@ -82,6 +83,50 @@ class OutputMediatorTest(unittest.TestCase):
     formatters_manager.FormattersManager.DeregisterFormatter(
         TestEventFormatter)
 
+  def testGetFormattedMessagesWithEventData(self):
+    """Tests the GetFormattedMessages function with event data."""
+    event_data_identifier = identifiers.SQLTableIdentifier('event_data', 1)
+
+    event_object = TestEvent()
+    event_object.SetEventDataIdentifier(event_data_identifier)
+
+    formatters_manager.FormattersManager.RegisterFormatter(
+        TestEventFormatter)
+
+    expected_message = (
+        'Reporter <CRON> PID: 8442'
+        ' (pam_unix(cron:session): session closed for user root)')
+
+    message, _ = self._output_mediator.GetFormattedMessages(event_object)
+    self.assertEqual(message, expected_message)
+    self.assertEqual(
+        self._output_mediator.number_of_formatted_values_cache_hits, 0)
+    self.assertEqual(
+        self._output_mediator.number_of_formatted_values_cache_misses, 1)
+
+    # An event with the same event data is formatted from the cache.
+    event_object = TestEvent()
+    event_object.timestamp_desc = definitions.TIME_DESCRIPTION_MODIFICATION
+    event_object.SetEventDataIdentifier(event_data_identifier)
+
+    message, _ = self._output_mediator.GetFormattedMessages(event_object)
+    self.assertEqual(message, expected_message)
+    self.assertEqual(
+        self._output_mediator.number_of_formatted_values_cache_hits, 1)
+    self.assertEqual(
+        self._output_mediator.number_of_formatted_values_cache_misses, 1)
+
+    # The sources are cached separately per timestamp description.
+    self._output_mediator.GetFormattedSources(event_object)
+    self._output_mediator.GetFormattedSources(event_object)
+    self.assertEqual(
+        self._output_mediator.number_of_formatted_values_cache_hits, 2)
+    self.assertEqual(
+        self._output_mediator.number_of_formatted_values_cache_misses, 2)
+
+    formatters_manager.FormattersManager.DeregisterFormatter(
+        TestEventFormatter)
+
   def testGetFormattedSources(self):
     """Tests the GetFormattedSources function."""
     event_object = TestEvent()
@@ -140,6 +185,12 @@ class OutputMediatorTest(unittest.TestCase):
     username = self._output_mediator.GetUsername(event_object)
     self.assertEqual(username, 'root')
 
+  def testGetWindowsEventMessageCacheStatistics(self):
+    """Tests the GetWindowsEventMessageCacheStatistics function."""
+    cache_statistics = (
+        self._output_mediator.GetWindowsEventMessageCacheStatistics())
+    self.assertEqual(cache_statistics, (0, 0))
+
 
 if __name__ == '__main__':
   unittest.main()
@@ -78,6 +78,12 @@ class ParsersMediatorTest(test_lib.ParserTestCase):
     expected_display_name = 'OS:{0:s}'.format(test_path)
     self.assertEqual(display_name, expected_display_name)
 
+    # Events that contain the display name cannot be recorded.
+    parsers_mediator.StartRecordingEvents(10)
+    parsers_mediator.GetDisplayName(file_entry=file_entry)
+    recorded_events = parsers_mediator.StopRecordingEvents()
+    self.assertIsNone(recorded_events)
+
     gzip_path_spec = path_spec_factory.Factory.NewPathSpec(
         dfvfs_definitions.TYPE_INDICATOR_GZIP, parent=os_path_spec)
     file_entry = path_spec_resolver.Resolver.OpenFileEntry(gzip_path_spec)
@@ -194,7 +200,65 @@ class ParsersMediatorTest(test_lib.ParserTestCase):
       parsers_mediator.ProduceEventWithEventData(
           event_without_timestamp, event_data)
 
+    # Test that interleaved event data is only stored once.
+    first_event_data = events.EventData()
+    first_event_data.value = 'first'
+    second_event_data = events.EventData()
+    second_event_data.value = 'second'
+
+    produced_events = []
+    for timestamp, event_data in enumerate((
+        first_event_data, second_event_data, first_event_data)):
+      event = events.EventObject()
+      event.timestamp = timestamp
+      parsers_mediator.ProduceEventWithEventData(event, event_data)
+      produced_events.append(event)
+
+    self.assertEqual(storage_writer.number_of_events, 4)
+    self.assertEqual(len(parsers_mediator._event_data_identifiers), 3)
+
+    self.assertEqual(
+        produced_events[0].GetEventDataIdentifier(),
+        produced_events[2].GetEventDataIdentifier())
+    self.assertNotEqual(
+        produced_events[0].GetEventDataIdentifier(),
+        produced_events[1].GetEventDataIdentifier())
+
+    # The event data must not be changed by producing the event.
+    self.assertFalse(hasattr(first_event_data, 'parser'))
+
+    parsers_mediator.SetFileEntry(None)
+    self.assertEqual(len(parsers_mediator._event_data_identifiers), 0)
+
   # TODO: add tests for ProduceExtractionError.
+
+  def testProduceRecordedEvents(self):
+    """Tests the ProduceRecordedEvents method."""
+    session = sessions.Session()
+    storage_writer = fake_writer.FakeStorageWriter(session)
+    storage_writer.Open()
+    parsers_mediator = self._CreateParserMediator(storage_writer)
+
+    parsers_mediator.StartRecordingEvents(10)
+
+    event_data = events.EventData()
+    event_data.parser = 'test'
+
+    for timestamp in (1, 2):
+      event = events.EventObject()
+      event.timestamp = timestamp
+      parsers_mediator.ProduceEventWithEventData(event, event_data)
+
+    recorded_events = parsers_mediator.StopRecordingEvents()
+    self.assertEqual(len(recorded_events), 2)
+    self.assertEqual(storage_writer.number_of_events, 2)
+
+    parsers_mediator.ProduceRecordedEvents(recorded_events)
+    self.assertEqual(storage_writer.number_of_events, 4)
+
+    timestamps = [event.timestamp for event in storage_writer.GetEvents()]
+    self.assertEqual(timestamps, [1, 2, 1, 2])
+
   # TODO: add tests for RemoveEventAttribute.
 
   def testResetFileEntry(self):
@@ -232,6 +296,75 @@ class ParsersMediatorTest(test_lib.ParserTestCase):
 
     parsers_mediator.SignalAbort()
 
+  def testStopParserMeasurement(self):
+    """Tests the StartParserMeasurement and StopParserMeasurement functions."""
+    session = sessions.Session()
+    storage_writer = fake_writer.FakeStorageWriter(session)
+    storage_writer.Open()
+    parsers_mediator = self._CreateParserMediator(storage_writer)
+
+    parsers_mediator.StartParserMeasurement('test_parser')
+    parsers_mediator.StartParserMeasurement('test_plugin')
+    parsers_mediator._parser_chain_components = ['test_parser']
+
+    event = events.EventObject()
+    event.timestamp = 1
+    parsers_mediator.ProduceEventWithEventData(event, events.EventData())
+
+    parsers_mediator.StopParserMeasurement('test_plugin', False)
+    parsers_mediator.StopParserMeasurement(
+        'test_parser', True, number_of_read_bytes=1024)
+
+    parser_statistics = parsers_mediator.GetParserStatistics()
+    self.assertEqual(len(parser_statistics), 2)
+
+    self.assertEqual(parser_statistics[0].name, 'test_parser')
+    self.assertEqual(parser_statistics[0].number_of_attempted_files, 1)
+    self.assertEqual(parser_statistics[0].number_of_matched_files, 1)
+    self.assertEqual(parser_statistics[0].number_of_produced_events, 1)
+    self.assertEqual(parser_statistics[0].number_of_read_bytes, 1024)
+
+    self.assertEqual(parser_statistics[1].name, 'test_plugin')
+    self.assertEqual(parser_statistics[1].number_of_attempted_files, 1)
+    self.assertEqual(parser_statistics[1].number_of_matched_files, 0)
+    self.assertEqual(parser_statistics[1].number_of_produced_events, 0)
+
+    parsers_mediator.ResetParserStatistics()
+    parser_statistics = parsers_mediator.GetParserStatistics()
+    self.assertEqual(parser_statistics, [])
+
+  def testStopRecordingEvents(self):
+    """Tests the StartRecordingEvents and StopRecordingEvents functions."""
+    session = sessions.Session()
+    storage_writer = fake_writer.FakeStorageWriter(session)
+    storage_writer.Open()
+    parsers_mediator = self._CreateParserMediator(storage_writer)
+
+    recorded_events = parsers_mediator.StopRecordingEvents()
+    self.assertIsNone(recorded_events)
+
+    parsers_mediator.StartRecordingEvents(10)
+    recorded_events = parsers_mediator.StopRecordingEvents()
+    self.assertEqual(recorded_events, [])
+
+    # Events that depend on the file entry cannot be recorded.
+    parsers_mediator.StartRecordingEvents(10)
+    parsers_mediator.GetFileEntry()
+    recorded_events = parsers_mediator.StopRecordingEvents()
+    self.assertIsNone(recorded_events)
+
+    # Events that exceed the maximum number of events cannot be recorded.
+    parsers_mediator.StartRecordingEvents(1)
+
+    event_data = events.EventData()
+    for timestamp in (1, 2):
+      event = events.EventObject()
+      event.timestamp = timestamp
+      parsers_mediator.ProduceEventWithEventData(event, event_data)
+
+    recorded_events = parsers_mediator.StopRecordingEvents()
+    self.assertIsNone(recorded_events)
+
 
 if __name__ == '__main__':
   unittest.main()
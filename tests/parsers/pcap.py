@@ -16,6 +16,8 @@ from tests.parsers import test_lib
 class PcapParserTest(test_lib.ParserTestCase):
   """Tests for the PCAP parser."""
 
+  # pylint: disable=protected-access
+
   @shared_test_lib.skipUnlessHasTestFile(['test.pcap'])
   def testParse(self):
     """Tests the Parse function."""
@@ -26,13 +28,15 @@ class PcapParserTest(test_lib.ParserTestCase):
     #    Number of streams: 96 (TCP: 47, UDP: 39, ICMP: 0, Other: 10)
     #
     # For each stream 2 events are generated one for the start
-    # and one for the end time.
+    # and one for the end time. The events of the non-IP streams are
+    # generated when their packet is read and the events of the other
+    # streams when they expire at the end of the file.
 
     self.assertEqual(storage_writer.number_of_events, 192)
 
     events = list(storage_writer.GetEvents())
 
-    # Test stream 3 (event 6).
+    # Test stream 3 (event 26).
     #    Protocol:        TCP
     #    Source IP:       192.168.195.130
     #    Dest IP:         63.245.217.43
@@ -42,7 +46,7 @@ class PcapParserTest(test_lib.ParserTestCase):
     #    Starting Packet: 4
     #    Ending Packet:   6
 
-    event = events[6]
+    event = events[26]
     self.assertEqual(event.packet_count, 3)
     self.assertEqual(event.protocol, 'TCP')
     self.assertEqual(event.source_ip, '192.168.195.130')
@@ -53,7 +57,7 @@ class PcapParserTest(test_lib.ParserTestCase):
     self.assertEqual(event.first_packet_id, 4)
     self.assertEqual(event.last_packet_id, 6)
 
-    # Test stream 6 (event 12).
+    # Test stream 6 (event 32).
     #    Protocol:        UDP
     #    Source IP:       192.168.195.130
     #    Dest IP:         192.168.195.2
@@ -64,7 +68,7 @@ class PcapParserTest(test_lib.ParserTestCase):
     #    Ending Packet:   6
     #    Protocol Data:   DNS Query for  wpad.localdomain
 
-    event = events[12]
+    event = events[32]
     self.assertEqual(event.packet_count, 5)
     self.assertEqual(event.protocol, 'UDP')
     self.assertEqual(event.source_ip, '192.168.195.130')
@@ -98,6 +102,27 @@ class PcapParserTest(test_lib.ParserTestCase):
 
     self._TestGetMessageStrings(event, expected_message, expected_short_message)
 
+  @shared_test_lib.skipUnlessHasTestFile(['test.pcap'])
+  def testParseWithExpiredStreams(self):
+    """Tests the Parse function with streams that expire while parsing."""
+    parser = pcap.PcapParser()
+    parser._STREAM_IDLE_TIMEOUT = 1000000
+    storage_writer = self._ParseFile(['test.pcap'], parser)
+
+    # Streams without packets for more than 1 second are split.
+    self.assertEqual(storage_writer.number_of_events, 244)
+
+    parser = pcap.PcapParser()
+    parser._MAXIMUM_NUMBER_OF_STREAMS = 8
+    storage_writer = self._ParseFile(['test.pcap'], parser)
+
+    # The least recently active streams are split.
+    self.assertEqual(storage_writer.number_of_events, 264)
+
+    events = list(storage_writer.GetEvents())
+    number_of_packets = sum(event.packet_count for event in events[::2])
+    self.assertEqual(number_of_packets, 1434)
+
 
 if __name__ == '__main__':
   unittest.main()
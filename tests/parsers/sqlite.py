@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 """Tests for the SQLite database parser."""
 
+import os
 import unittest
 
 from plaso.lib import py2to3
@@ -112,6 +113,28 @@ class SQLiteParserTest(test_lib.ParserTestCase):
 
     self.assertEqual(expected_results, row_results)
 
+  @shared_test_lib.skipUnlessHasTestFile(['wal_database.db'])
+  def testTemporaryFilePath(self):
+    """Tests the temporary_file_path property."""
+    database_file = self._GetTestFilePath(['wal_database.db'])
+
+    database = sqlite.SQLiteDatabase('wal_database.db')
+    self.assertIsNone(database.temporary_file_path)
+
+    with open(database_file, 'rb') as database_file_object:
+      database.Open(database_file_object)
+
+    temporary_file_path = database.temporary_file_path
+    self.assertIsNotNone(temporary_file_path)
+    self.assertTrue(os.path.exists(temporary_file_path))
+    self.assertEqual(
+        database.copied_data_size, os.path.getsize(database_file))
+
+    database.Close()
+
+    self.assertIsNone(database.temporary_file_path)
+    self.assertFalse(os.path.exists(temporary_file_path))
+
 
 if __name__ == '__main__':
   unittest.main()
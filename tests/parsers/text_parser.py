@@ -4,6 +4,8 @@
 
 from __future__ import unicode_literals
 
+import io
+import re
 import unittest
 
 import pyparsing
@@ -108,6 +110,81 @@ class PyparsingSingleLineTextParserTest(unittest.TestCase):
     bytes_in = b'Ascii Open then...\x00\x99\x23'
     self.assertFalse(parser._IsText(bytes_in))
 
+  def testGetLineStructurePrefilters(self):
+    """Tests the _GetLineStructurePrefilters function."""
+    parser = text_parser.PyparsingSingleLineTextParser()
+    parser.LINE_STRUCTURE_PREFILTERS = {
+        'comment': '#[',
+        'line': re.compile(r'\d{4}-')}
+
+    prefilters = parser._GetLineStructurePrefilters()
+    self.assertEqual(len(prefilters), 2)
+
+    self.assertTrue(prefilters['comment']('#[ comment'))
+    self.assertFalse(prefilters['comment']('# comment'))
+    self.assertTrue(prefilters['line']('2018-01-01 line'))
+    self.assertFalse(prefilters['line']('line 2018-01-01'))
+
+  def testReadLines(self):
+    """Tests the _ReadLines function."""
+    parser = text_parser.PyparsingSingleLineTextParser()
+    parser._READ_BUFFER_SIZE = 64
+
+    file_object = io.BytesIO(b''.join([
+        b'first line\n', b'A' * 1000, b'\nthird line\n']))
+
+    lines = list(parser._ReadLines(file_object, 11, 'utf-8'))
+
+    expected_lines = [(1012, 'A' * 400), (1023, 'third line\n')]
+    self.assertEqual(lines, expected_lines)
+
+
+class EncodedTextReaderTest(unittest.TestCase):
+  """Tests for the encoded text reader."""
+
+  # pylint: disable=protected-access
+
+  def testReadEncodedLines(self):
+    """Tests the ReadEncodedLines function."""
+    file_object = io.BytesIO(b'first line\nsecond line\r\nthird')
+
+    text_reader = text_parser.EncodedTextReader(
+        buffer_size=8, encoding='utf-8')
+
+    lines = []
+    encoded_lines = text_reader.ReadEncodedLines(file_object)
+    while encoded_lines:
+      lines.extend(encoded_lines)
+      encoded_lines = text_reader.ReadEncodedLines(file_object)
+
+    expected_lines = [
+        (11, b'first line\n'), (13, b'second line\r\n'), (5, b'third')]
+    self.assertEqual(lines, expected_lines)
+
+  def testReadEncodedLinesWithMaximumLineLength(self):
+    """Tests the ReadEncodedLines function with a maximum line length."""
+    file_object = io.BytesIO(b''.join([
+        b'first line\n', b'A' * 1000, b'\nthird line\n', b'B' * 30]))
+
+    text_reader = text_parser.EncodedTextReader(
+        buffer_size=8, encoding='utf-8')
+
+    lines = []
+    encoded_lines = text_reader.ReadEncodedLines(
+        file_object, maximum_line_length=16)
+    while encoded_lines:
+      lines.extend(encoded_lines)
+      # The buffer only contains a partial line of the maximum line length.
+      self.assertLessEqual(len(text_reader._buffer), 16)
+      encoded_lines = text_reader.ReadEncodedLines(
+          file_object, maximum_line_length=16)
+
+    expected_lines = [
+        (11, b'first line\n'), (1001, b'A' * 16), (11, b'third line\n'),
+        (30, b'B' * 16)]
+    self.assertEqual(lines, expected_lines)
+    self.assertEqual(text_reader._current_offset, 1053)
+
 
 if __name__ == '__main__':
   unittest.main()
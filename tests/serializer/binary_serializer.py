@@ -0,0 +1,261 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the serializer object implementation using a binary format."""
+
+from __future__ import unicode_literals
+
+import collections
+import unittest
+
+from dfvfs.lib import definitions as dfvfs_definitions
+from dfvfs.path import fake_path_spec
+from dfvfs.path import factory as path_spec_factory
+
+import plaso
+from plaso.containers import event_sources
+from plaso.containers import events
+from plaso.containers import reports
+from plaso.containers import sessions
+from plaso.serializer import binary_serializer
+from plaso.serializer import json_serializer
+
+from tests import test_lib as shared_test_lib
+
+
+class BinaryAttributeContainerSerializerTest(shared_test_lib.BaseTestCase):
+  """Tests for the binary attribute container serializer object."""
+
+  # pylint: disable=protected-access
+
+  def testReadAndWriteSerializedAnalysisReport(self):
+    """Test ReadSerialized and WriteSerialized of AnalysisReport."""
+    expected_report_dict = {
+        'dude': [
+            ['Google Keep - notes and lists',
+             'hmjkmjkepdijhoojdojkdfohbdgmmhki']
+        ]
+    }
+
+    expected_analysis_report = reports.AnalysisReport(
+        plugin_name='chrome_extension_test', text='report text')
+    expected_analysis_report.report_dict = expected_report_dict
+    expected_analysis_report.time_compiled = 1431978243000000
+
+    serialized_data = (
+        binary_serializer.BinaryAttributeContainerSerializer.WriteSerialized(
+            expected_analysis_report))
+
+    self.assertIsNotNone(serialized_data)
+
+    analysis_report = (
+        binary_serializer.BinaryAttributeContainerSerializer.ReadSerialized(
+            serialized_data))
+
+    self.assertIsNotNone(analysis_report)
+    self.assertIsInstance(analysis_report, reports.AnalysisReport)
+
+    expected_analysis_report_dict = {
+        'plugin_name': 'chrome_extension_test',
+        'report_dict': expected_report_dict,
+        'text': 'report text',
+        'time_compiled': 1431978243000000}
+
+    analysis_report_dict = analysis_report.CopyToDict()
+    self.assertEqual(
+        sorted(analysis_report_dict.items()),
+        sorted(expected_analysis_report_dict.items()))
+
+  def testReadAndWriteSerializedEventObject(self):
+    """Test ReadSerialized and WriteSerialized of EventObject."""
+    test_file = self._GetTestFilePath(['ímynd.dd'])
+
+    volume_path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_OS, location=test_file)
+    path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_TSK, location='/',
+        parent=volume_path_spec)
+
+    expected_event = events.EventObject()
+    expected_event.data_type = 'test:event2'
+    expected_event.pathspec = path_spec
+    expected_event.timestamp = 1234124
+    expected_event.timestamp_desc = 'Written'
+
+    expected_event.binary_string = b'\xc0\x90\x90binary'
+    expected_event.empty_string = ''
+    expected_event.zero_integer = 0
+    expected_event.integer = 34
+    expected_event.negative_integer = -1
+    expected_event.large_integer = 2 ** 64
+    expected_event.float = -122.082203542683
+    expected_event.string = 'Normal string'
+    expected_event.long_string = 'And I am a unicorn. ' * 4
+    expected_event.my_list = ['asf', 4234, 2, 54, 'asf']
+    expected_event.my_dict = {
+        'a': 'not b', 'c': 34, 'list': ['sf', 234], 'an': [234, 32]}
+    expected_event.a_tuple = (
+        'some item', [234, 52, 15], {'a': 'not a', 'b': 'not b'}, 35)
+    expected_event.boolean = True
+    expected_event.null_value = None
+
+    serialized_data = (
+        binary_serializer.BinaryAttributeContainerSerializer.WriteSerialized(
+            expected_event))
+
+    self.assertIsNotNone(serialized_data)
+
+    event = (
+        binary_serializer.BinaryAttributeContainerSerializer.ReadSerialized(
+            serialized_data))
+
+    self.assertIsNotNone(event)
+    self.assertIsInstance(event, events.EventObject)
+
+    expected_event_dict = {
+        'a_tuple': (
+            'some item', [234, 52, 15], {'a': 'not a', 'b': 'not b'}, 35),
+        'binary_string': b'\xc0\x90\x90binary',
+        'boolean': True,
+        'data_type': 'test:event2',
+        'empty_string': '',
+        'integer': 34,
+        'float': -122.082203542683,
+        'large_integer': 2 ** 64,
+        'long_string': 'And I am a unicorn. ' * 4,
+        'my_dict': {
+            'a': 'not b',
+            'an': [234, 32],
+            'c': 34,
+            'list': ['sf', 234]
+        },
+        'my_list': ['asf', 4234, 2, 54, 'asf'],
+        'negative_integer': -1,
+        'pathspec': path_spec.comparable,
+        'string': 'Normal string',
+        'timestamp_desc': 'Written',
+        'timestamp': 1234124,
+        'zero_integer': 0
+    }
+
+    event_dict = event.CopyToDict()
+    path_spec = event_dict.get('pathspec', None)
+    if path_spec:
+      event_dict['pathspec'] = path_spec.comparable
+
+    self.assertEqual(
+        sorted(event_dict.items()),
+        sorted(expected_event_dict.items()))
+
+    json_string = (
+        json_serializer.JSONAttributeContainerSerializer.WriteSerialized(
+            expected_event))
+    self.assertLess(len(serialized_data), len(json_string))
+
+  def testReadAndWriteSerializedEventSource(self):
+    """Test ReadSerialized and WriteSerialized of EventSource."""
+    test_path_spec = fake_path_spec.FakePathSpec(location='/opt/plaso.txt')
+
+    expected_event_source = event_sources.EventSource(path_spec=test_path_spec)
+
+    serialized_data = (
+        binary_serializer.BinaryAttributeContainerSerializer.WriteSerialized(
+            expected_event_source))
+
+    self.assertIsNotNone(serialized_data)
+
+    event_source = (
+        binary_serializer.BinaryAttributeContainerSerializer.ReadSerialized(
+            serialized_data))
+
+    self.assertIsNotNone(event_source)
+    self.assertIsInstance(event_source, event_sources.EventSource)
+    self.assertEqual(event_source.path_spec.comparable,
+                     test_path_spec.comparable)
+
+    # Identically serialized path specifications are read into the same object.
+    event_source = (
+        binary_serializer.BinaryAttributeContainerSerializer.ReadSerialized(
+            serialized_data))
+
+    other_event_source = (
+        binary_serializer.BinaryAttributeContainerSerializer.ReadSerialized(
+            serialized_data))
+
+    self.assertIs(event_source.path_spec, other_event_source.path_spec)
+
+  def testReadAndWriteSerializedSession(self):
+    """Test ReadSerialized and WriteSerialized of Session."""
+    parsers_counter = collections.Counter()
+    parsers_counter['filestat'] = 3
+    parsers_counter['total'] = 3
+
+    expected_session = sessions.Session()
+    expected_session.product_name = 'plaso'
+    expected_session.product_version = plaso.__version__
+    expected_session.parsers_counter = parsers_counter
+
+    serialized_data = (
+        binary_serializer.BinaryAttributeContainerSerializer.WriteSerialized(
+            expected_session))
+
+    self.assertIsNotNone(serialized_data)
+
+    session = (
+        binary_serializer.BinaryAttributeContainerSerializer.ReadSerialized(
+            serialized_data))
+
+    self.assertIsNotNone(session)
+    self.assertIsInstance(session, sessions.Session)
+    self.assertIsInstance(session.parsers_counter, collections.Counter)
+
+    expected_session_dict = {
+        'aborted': False,
+        'analysis_reports_counter': session.analysis_reports_counter,
+        'debug_mode': False,
+        'event_labels_counter': session.event_labels_counter,
+        'identifier': session.identifier,
+        'parsers_counter': parsers_counter,
+        'preferred_encoding': 'utf-8',
+        'preferred_time_zone': 'UTC',
+        'product_name': 'plaso',
+        'product_version': plaso.__version__,
+        'start_time': session.start_time
+    }
+
+    session_dict = session.CopyToDict()
+    self.assertEqual(
+        sorted(session_dict.items()), sorted(expected_session_dict.items()))
+
+  def testReadSerializedWithUnsupportedData(self):
+    """Test ReadSerialized with unsupported data."""
+    serializer = binary_serializer.BinaryAttributeContainerSerializer
+
+    self.assertIsNone(serializer.ReadSerialized(b''))
+
+    with self.assertRaises(TypeError):
+      serializer.ReadSerialized(b'\x81')
+
+    with self.assertRaises(ValueError):
+      serializer.ReadSerialized(b'\x1f')
+
+    with self.assertRaises(ValueError):
+      serializer.ReadSerialized(b'\x0c\x25bogus\x00\x00\x00\x00')
+
+    event_tag = events.EventTag(comment='My first comment.')
+    serialized_data = serializer.WriteSerialized(event_tag)
+
+    with self.assertRaises(ValueError):
+      serializer.ReadSerialized(serialized_data[:-4])
+
+  def testWriteSerializedWithUnsupportedValue(self):
+    """Test WriteSerialized with an unsupported attribute value."""
+    event = events.EventObject()
+    event.unsupported = set()
+
+    with self.assertRaises(TypeError):
+      binary_serializer.BinaryAttributeContainerSerializer.WriteSerialized(
+          event)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the compression codecs."""
+
+from __future__ import unicode_literals
+
+import unittest
+
+from plaso.lib import definitions
+from plaso.storage import compression
+
+from tests import test_lib as shared_test_lib
+
+
+class CompressionCodecTestCase(shared_test_lib.BaseTestCase):
+  """Shared functionality for compression codec tests."""
+
+  _TEST_DATA = (
+      b'{"__container_type__": "event", "__type__": "AttributeContainer", '
+      b'"data_type": "fs:stat", "timestamp": 1234567890, '
+      b'"timestamp_desc": "Last Access Time"}')
+
+  def _TestCompressAndDecompress(self, codec):
+    """Tests the Compress and Decompress functions of a codec.
+
+    Args:
+      codec (CompressionCodec): compression codec.
+    """
+    compressed_data = codec.Compress(self._TEST_DATA)
+    self.assertIsNotNone(compressed_data)
+
+    data = codec.Decompress(compressed_data)
+    self.assertEqual(data, self._TEST_DATA)
+
+  def _TestCompressWithDictionary(self, codec_class):
+    """Tests compression with a shared dictionary.
+
+    Args:
+      codec_class (type): compression codec class.
+    """
+    samples = [
+        self._TEST_DATA.replace(b'1234567890', '{0:d}'.format(
+            1234567890 + index).encode('ascii'))
+        for index in range(1024)]
+
+    dictionary = codec_class.TrainDictionary(samples)
+    self.assertIsNotNone(dictionary)
+
+    codec = codec_class()
+    dictionary_codec = codec_class(dictionary=dictionary)
+
+    self._TestCompressAndDecompress(dictionary_codec)
+
+    compressed_data = codec.Compress(self._TEST_DATA)
+    dictionary_compressed_data = dictionary_codec.Compress(self._TEST_DATA)
+    self.assertLess(len(dictionary_compressed_data), len(compressed_data))
+
+
+class NoneCodecTest(CompressionCodecTestCase):
+  """Tests for the codec that stores data without compression."""
+
+  def testCompressAndDecompress(self):
+    """Tests the Compress and Decompress functions."""
+    codec = compression.NoneCodec()
+    self._TestCompressAndDecompress(codec)
+
+    self.assertEqual(codec.Compress(self._TEST_DATA), self._TEST_DATA)
+
+  def testInitializeWithDictionary(self):
+    """Tests the initialization with an unsupported dictionary."""
+    with self.assertRaises(ValueError):
+      compression.NoneCodec(dictionary=b'dictionary')
+
+    self.assertIsNone(compression.NoneCodec.TrainDictionary([self._TEST_DATA]))
+
+
+@unittest.skipIf(compression.lz4 is None, 'missing lz4 support')
+class LZ4CodecTest(CompressionCodecTestCase):
+  """Tests for the LZ4 compression codec."""
+
+  def testCompressAndDecompress(self):
+    """Tests the Compress and Decompress functions."""
+    codec = compression.LZ4Codec()
+    self._TestCompressAndDecompress(codec)
+
+    with self.assertRaises(IOError):
+      codec.Decompress(b'\xff\xff\xff\x7fbogus')
+
+  def testCompressWithDictionary(self):
+    """Tests compression with a shared dictionary."""
+    self._TestCompressWithDictionary(compression.LZ4Codec)
+
+
+@unittest.skipIf(compression.lzma is None, 'missing lzma support')
+class LZMACodecTest(CompressionCodecTestCase):
+  """Tests for the LZMA compression codec."""
+
+  def testCompressAndDecompress(self):
+    """Tests the Compress and Decompress functions."""
+    codec = compression.LZMACodec()
+    self._TestCompressAndDecompress(codec)
+
+    with self.assertRaises(IOError):
+      codec.Decompress(b'bogus')
+
+
+class ZlibCodecTest(CompressionCodecTestCase):
+  """Tests for the zlib compression codec."""
+
+  def testCompressAndDecompress(self):
+    """Tests the Compress and Decompress functions."""
+    codec = compression.ZlibCodec()
+    self._TestCompressAndDecompress(codec)
+
+    with self.assertRaises(IOError):
+      codec.Decompress(b'bogus')
+
+  @unittest.skipUnless(
+      compression.ZlibCodec.SUPPORTS_DICTIONARY,
+      'missing zlib dictionary support')
+  def testCompressWithDictionary(self):
+    """Tests compression with a shared dictionary."""
+    self._TestCompressWithDictionary(compression.ZlibCodec)
+
+    codec = compression.ZlibCodec(dictionary=b'dictionary')
+    compressed_data = codec.Compress(self._TEST_DATA)
+
+    with self.assertRaises(IOError):
+      compression.ZlibCodec().Decompress(compressed_data)
+
+  def testDecompressWithUnsupportedDictionary(self):
+    """Tests the Decompress function with an unsupported dictionary."""
+    codec = compression.ZlibCodec()
+    compressed_data = codec.Compress(self._TEST_DATA)
+
+    # Dictionaries are not supported by the zlib module of Python 2.
+    codec.SUPPORTS_DICTIONARY = False
+    codec.dictionary = b'dictionary'
+
+    with self.assertRaises(IOError):
+      codec.Decompress(compressed_data)
+
+
+@unittest.skipIf(compression.zstandard is None, 'missing zstandard support')
+class ZstdCodecTest(CompressionCodecTestCase):
+  """Tests for the Zstandard compression codec."""
+
+  def testCompressAndDecompress(self):
+    """Tests the Compress and Decompress functions."""
+    codec = compression.ZstdCodec()
+    self._TestCompressAndDecompress(codec)
+
+    with self.assertRaises(IOError):
+      codec.Decompress(b'bogus')
+
+  def testCompressWithDictionary(self):
+    """Tests compression with a shared dictionary."""
+    self._TestCompressWithDictionary(compression.ZstdCodec)
+
+
+class CompressionCodecsManagerTest(shared_test_lib.BaseTestCase):
+  """Tests for the compression codecs manager."""
+
+  # pylint: disable=protected-access
+
+  def testCodecRegistration(self):
+    """Tests the RegisterCodec and DeregisterCodec functions."""
+    number_of_codecs = len(
+        compression.CompressionCodecsManager._codec_classes)
+
+    compression.CompressionCodecsManager.DeregisterCodec(
+        compression.NoneCodec)
+    self.assertEqual(
+        len(compression.CompressionCodecsManager._codec_classes),
+        number_of_codecs - 1)
+
+    with self.assertRaises(KeyError):
+      compression.CompressionCodecsManager.DeregisterCodec(
+          compression.NoneCodec)
+
+    compression.CompressionCodecsManager.RegisterCodec(compression.NoneCodec)
+    self.assertEqual(
+        len(compression.CompressionCodecsManager._codec_classes),
+        number_of_codecs)
+
+    with self.assertRaises(KeyError):
+      compression.CompressionCodecsManager.RegisterCodec(
+          compression.NoneCodec)
+
+  def testGetCodec(self):
+    """Tests the GetCodec function."""
+    codec = compression.CompressionCodecsManager.GetCodec(
+        definitions.COMPRESSION_FORMAT_ZLIB)
+    self.assertIsInstance(codec, compression.ZlibCodec)
+
+    with self.assertRaises(ValueError):
+      compression.CompressionCodecsManager.GetCodec('bogus')
+
+  def testGetCompressionFormats(self):
+    """Tests the GetCompressionFormats function."""
+    compression_formats = (
+        compression.CompressionCodecsManager.GetCompressionFormats())
+    self.assertIn(definitions.COMPRESSION_FORMAT_NONE, compression_formats)
+    self.assertIn(definitions.COMPRESSION_FORMAT_ZLIB, compression_formats)
+
+  def testSupportsDictionary(self):
+    """Tests the SupportsDictionary function."""
+    self.assertFalse(
+        compression.CompressionCodecsManager.SupportsDictionary(
+            definitions.COMPRESSION_FORMAT_NONE))
+    self.assertFalse(
+        compression.CompressionCodecsManager.SupportsDictionary('bogus'))
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -121,18 +121,23 @@ class SerializedEventHeapTest(test_lib.StorageTestCase):
 
     self.assertEqual(len(event_heap._heap), 0)
 
-    test_timestamp, test_event_data = event_heap.PopEvent()
+    test_timestamp, test_event_data, test_attribute_values = (
+        event_heap.PopEvent())
     self.assertIsNone(test_timestamp)
     self.assertIsNone(test_event_data)
+    self.assertIsNone(test_attribute_values)
 
     event_heap.PushEvent(5134324321, b'event_data1')
-    event_heap.PushEvent(2345871286, b'event_data2')
+    event_heap.PushEvent(
+        2345871286, b'event_data2', attribute_values=('test:data', ))
 
     self.assertEqual(len(event_heap._heap), 2)
 
-    test_timestamp, test_event_data = event_heap.PopEvent()
+    test_timestamp, test_event_data, test_attribute_values = (
+        event_heap.PopEvent())
     self.assertEqual(test_timestamp, 2345871286)
     self.assertEqual(test_event_data, b'event_data2')
+    self.assertEqual(test_attribute_values, ('test:data', ))
 
     self.assertEqual(len(event_heap._heap), 1)
 
@@ -8,6 +8,7 @@ import unittest
 
 from plaso.containers import errors
 from plaso.containers import event_sources
+from plaso.containers import parser_statistics
 from plaso.containers import reports
 from plaso.containers import sessions
 from plaso.containers import tasks
@@ -105,6 +106,23 @@ class FakeStorageWriterTest(test_lib.StorageTestCase):
     with self.assertRaises(IOError):
       storage_writer.AddEventTag(event_tag)
 
+  def testAddParserStatistics(self):
+    """Tests the AddParserStatistics function."""
+    session = sessions.Session()
+    test_parser_statistics = parser_statistics.ParserStatistics(name='test')
+
+    storage_writer = fake_writer.FakeStorageWriter(session)
+    storage_writer.Open()
+
+    storage_writer.AddParserStatistics(test_parser_statistics)
+
+    self.assertEqual(len(storage_writer.parser_statistics), 1)
+
+    storage_writer.Close()
+
+    with self.assertRaises(IOError):
+      storage_writer.AddParserStatistics(test_parser_statistics)
+
   def testOpenClose(self):
     """Tests the Open and Close functions."""
     session = sessions.Session()
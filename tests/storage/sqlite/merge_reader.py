@@ -5,12 +5,19 @@
 from __future__ import unicode_literals
 
 import os
+import sqlite3
 import unittest
 
+from dfvfs.lib import definitions as dfvfs_definitions
+from dfvfs.path import factory as path_spec_factory
+
+from plaso.containers import events
+from plaso.containers import parser_statistics
 from plaso.containers import sessions
 from plaso.containers import tasks
 from plaso.lib import definitions
 from plaso.storage.sqlite import merge_reader
+from plaso.storage.sqlite import reader
 from plaso.storage.sqlite import writer
 
 from tests import test_lib as shared_test_lib
@@ -43,6 +50,46 @@ class SQLiteStorageMergeReaderTest(test_lib.StorageTestCase):
 
     storage_file.Close()
 
+  def _CreateTaskStorageFileWithEventData(
+      self, session, path, base_value,
+      serialization_format=definitions.SERIALIZER_FORMAT_JSON):
+    """Creates a task storage file with event data for testing.
+
+    Args:
+      session (Session): session the task storage is part of.
+      path (str): path to the task storage file that should be merged.
+      base_value (int): base of the test values stored in the event data.
+      serialization_format (Optional[str]): serialization format.
+    """
+    task = tasks.Task(session_identifier=session.identifier)
+
+    storage_file = writer.SQLiteStorageFileWriter(
+        session, path, serialization_format=serialization_format,
+        storage_type=definitions.STORAGE_TYPE_TASK, task=task)
+
+    storage_file.Open()
+
+    os_path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_OS, location='/tmp/image.raw')
+
+    for index in range(3):
+      event_data = events.EventData(data_type='test:event')
+      event_data.parser = 'test_parser'
+      event_data.pathspec = path_spec_factory.Factory.NewPathSpec(
+          dfvfs_definitions.TYPE_INDICATOR_TSK,
+          location='/file{0:d}'.format(index), parent=os_path_spec)
+      event_data.value = base_value + index
+      storage_file.AddEventData(event_data)
+
+      event = events.EventObject()
+      event.parser = 'test_parser'
+      event.timestamp = 1000000 * (3 - index)
+      event.timestamp_desc = definitions.TIME_DESCRIPTION_WRITTEN
+      event.SetEventDataIdentifier(event_data.GetIdentifier())
+      storage_file.AddEvent(event)
+
+    storage_file.Close()
+
   def testReadStorageMetadata(self):
     """Tests the _ReadStorageMetadata function."""
     session = sessions.Session()
@@ -84,6 +131,253 @@ class SQLiteStorageMergeReaderTest(test_lib.StorageTestCase):
 
       storage_writer.Close()
 
+  def testMergeAttributeContainersWithMaximum(self):
+    """Tests the MergeAttributeContainers function with a maximum."""
+    session = sessions.Session()
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      task_storage_path = os.path.join(temp_directory, 'task.sqlite')
+      self._CreateTaskStorageFile(session, task_storage_path)
+
+      session_storage_path = os.path.join(temp_directory, 'plaso.sqlite')
+      storage_writer = writer.SQLiteStorageFileWriter(
+          session, session_storage_path)
+
+      test_reader = merge_reader.SQLiteStorageMergeReader(
+          storage_writer, task_storage_path)
+
+      storage_writer.Open()
+
+      result = test_reader.MergeAttributeContainers(
+          maximum_number_of_containers=3)
+      self.assertFalse(result)
+      self.assertEqual(storage_writer.number_of_events, 3)
+      self.assertEqual(test_reader.number_of_merged_containers, 3)
+
+      result = test_reader.MergeAttributeContainers(
+          maximum_number_of_containers=3)
+      self.assertTrue(result)
+      self.assertEqual(storage_writer.number_of_events, 4)
+      self.assertEqual(test_reader.number_of_merged_containers, 4)
+
+      self.assertFalse(os.path.exists(task_storage_path))
+
+      storage_writer.Close()
+
+  def testMergeAttributeContainersSerialized(self):
+    """Tests the MergeAttributeContainers function without deserializing."""
+    session = sessions.Session()
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      session_storage_path = os.path.join(temp_directory, 'plaso.sqlite')
+      storage_writer = writer.SQLiteStorageFileWriter(
+          session, session_storage_path)
+
+      storage_writer.Open()
+
+      # Merge two task storage files to ensure event data row identifiers
+      # are updated.
+      for task_number in range(2):
+        task_storage_path = os.path.join(
+            temp_directory, 'task{0:d}.sqlite'.format(task_number))
+        self._CreateTaskStorageFileWithEventData(
+            sessions.Session(), task_storage_path, task_number * 10)
+
+        test_reader = merge_reader.SQLiteStorageMergeReader(
+            storage_writer, task_storage_path)
+
+        result = test_reader.MergeAttributeContainers()
+        self.assertTrue(result)
+
+      self.assertEqual(storage_writer.number_of_events, 6)
+      self.assertEqual(session.parsers_counter['test_parser'], 6)
+
+      storage_writer.Close()
+
+      storage_reader = reader.SQLiteStorageFileReader(session_storage_path)
+      test_events = list(storage_reader.GetSortedEvents())
+      self.assertEqual(len(test_events), 6)
+
+      # The attribute values of the event data are merged into the separate
+      # columns of the event table.
+      filter_conditions = [('data_type', '==', 'test:event')]
+      filtered_events = list(storage_reader.GetSortedEvents(
+          filter_conditions=filter_conditions))
+      self.assertEqual(len(filtered_events), 6)
+
+      filter_conditions = [('data_type', '==', 'test:bogus')]
+      filtered_events = list(storage_reader.GetSortedEvents(
+          filter_conditions=filter_conditions))
+      self.assertEqual(len(filtered_events), 0)
+
+      event_data_values = []
+      for event in test_events:
+        event_data = storage_reader.GetEventDataByIdentifier(
+            event.GetEventDataIdentifier())
+        event_data_values.append(event_data.value)
+
+        expected_location = '/file{0:d}'.format(event_data.value % 10)
+        self.assertEqual(event_data.pathspec.location, expected_location)
+
+      # The path specifications shared by the task storage files are stored
+      # once.
+      storage_file = storage_reader._storage_file
+      number_of_path_spec_nodes = storage_file._CountStoredAttributeContainers(
+          storage_file._CONTAINER_TYPE_PATH_SPEC)
+      self.assertEqual(number_of_path_spec_nodes, 4)
+
+      storage_reader.Close()
+
+      self.assertEqual(sorted(event_data_values), [0, 1, 2, 10, 11, 12])
+
+      # The events with the most recent timestamp reference the first event
+      # data of each task storage file.
+      self.assertEqual(sorted(event_data_values[-2:]), [0, 10])
+
+  def testMergeAttributeContainersWithParserStatistics(self):
+    """Tests the MergeAttributeContainers function with parser statistics."""
+    session = sessions.Session()
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      session_storage_path = os.path.join(temp_directory, 'plaso.sqlite')
+      storage_writer = writer.SQLiteStorageFileWriter(
+          session, session_storage_path)
+
+      storage_writer.Open()
+      storage_writer.WriteSessionStart()
+
+      for task_number in range(2):
+        task_storage_path = os.path.join(
+            temp_directory, 'task{0:d}.sqlite'.format(task_number))
+
+        task = tasks.Task(session_identifier=session.identifier)
+        task_storage_writer = writer.SQLiteStorageFileWriter(
+            session, task_storage_path,
+            storage_type=definitions.STORAGE_TYPE_TASK, task=task)
+
+        test_parser_statistics = parser_statistics.ParserStatistics(
+            name='test_parser')
+        test_parser_statistics.AddFile(
+            1.0 + task_number, True, number_of_read_bytes=1024)
+        test_parser_statistics.AddSlowestFile(
+            1.0 + task_number, '/file{0:d}'.format(task_number))
+
+        task_storage_writer.Open()
+        task_storage_writer.AddParserStatistics(test_parser_statistics)
+        task_storage_writer.Close()
+
+        test_reader = merge_reader.SQLiteStorageMergeReader(
+            storage_writer, task_storage_path)
+
+        result = test_reader.MergeAttributeContainers()
+        self.assertTrue(result)
+
+      # The parser statistics of a session are written on session completion.
+      storage_writer.WriteSessionCompletion()
+      storage_writer.Close()
+
+      storage_reader = reader.SQLiteStorageFileReader(session_storage_path)
+      stored_parser_statistics = list(storage_reader.GetParserStatistics())
+      storage_reader.Close()
+
+      self.assertEqual(len(stored_parser_statistics), 1)
+
+      test_parser_statistics = stored_parser_statistics[0]
+      self.assertEqual(test_parser_statistics.name, 'test_parser')
+      self.assertEqual(test_parser_statistics.cpu_time, 3.0)
+      self.assertEqual(test_parser_statistics.number_of_attempted_files, 2)
+      self.assertEqual(test_parser_statistics.number_of_read_bytes, 2048)
+      self.assertEqual(
+          test_parser_statistics.slowest_files,
+          [[2.0, '/file1'], [1.0, '/file0']])
+
+  def testMergeAttributeContainersWithUnsupportedTaskStorage(self):
+    """Tests the MergeAttributeContainers function with an unsupported file."""
+    session = sessions.Session()
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      task_storage_path = os.path.join(temp_directory, 'task.sqlite')
+      self._CreateTaskStorageFile(session, task_storage_path)
+
+      connection = sqlite3.connect(task_storage_path)
+      connection.execute((
+          'UPDATE metadata SET value = "bogus" '
+          'WHERE key = "serialization_format"'))
+      connection.commit()
+      connection.close()
+
+      session_storage_path = os.path.join(temp_directory, 'plaso.sqlite')
+      storage_writer = writer.SQLiteStorageFileWriter(
+          session, session_storage_path)
+
+      test_reader = merge_reader.SQLiteStorageMergeReader(
+          storage_writer, task_storage_path)
+
+      storage_writer.Open()
+
+      with self.assertRaises(IOError):
+        test_reader.MergeAttributeContainers()
+
+      self.assertEqual(test_reader.number_of_merged_containers, 0)
+
+      # The task storage file is not left behind in the merge directory.
+      self.assertFalse(os.path.exists(task_storage_path))
+
+      storage_writer.Close()
+
+  def testMergeAttributeContainersWithBinarySerializationFormat(self):
+    """Tests the MergeAttributeContainers function with binary serialization."""
+    session = sessions.Session()
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      session_storage_path = os.path.join(temp_directory, 'plaso.sqlite')
+      storage_writer = writer.SQLiteStorageFileWriter(
+          session, session_storage_path,
+          serialization_format=definitions.SERIALIZER_FORMAT_BINARY)
+
+      storage_writer.Open()
+
+      for task_number in range(2):
+        task_storage_path = os.path.join(
+            temp_directory, 'task{0:d}.sqlite'.format(task_number))
+        self._CreateTaskStorageFileWithEventData(
+            sessions.Session(), task_storage_path, task_number * 10,
+            serialization_format=definitions.SERIALIZER_FORMAT_BINARY)
+
+        test_reader = merge_reader.SQLiteStorageMergeReader(
+            storage_writer, task_storage_path)
+
+        result = test_reader.MergeAttributeContainers()
+        self.assertTrue(result)
+        self.assertEqual(
+            test_reader.serialization_format,
+            definitions.SERIALIZER_FORMAT_BINARY)
+
+      self.assertEqual(storage_writer.number_of_events, 6)
+
+      storage_writer.Close()
+
+      storage_reader = reader.SQLiteStorageFileReader(session_storage_path)
+
+      event_data_values = []
+      for event in storage_reader.GetSortedEvents():
+        event_data = storage_reader.GetEventDataByIdentifier(
+            event.GetEventDataIdentifier())
+        event_data_values.append(event_data.value)
+
+        expected_location = '/file{0:d}'.format(event_data.value % 10)
+        self.assertEqual(event_data.pathspec.location, expected_location)
+
+      storage_file = storage_reader._storage_file
+      number_of_path_spec_nodes = storage_file._CountStoredAttributeContainers(
+          storage_file._CONTAINER_TYPE_PATH_SPEC)
+      self.assertEqual(number_of_path_spec_nodes, 4)
+
+      storage_reader.Close()
+
+      self.assertEqual(sorted(event_data_values), [0, 1, 2, 10, 11, 12])
+      self.assertEqual(sorted(event_data_values[-2:]), [0, 10])
+
 
 if __name__ == '__main__':
   unittest.main()
@@ -7,12 +7,19 @@ from __future__ import unicode_literals
 import os
 import unittest
 
+from dfvfs.lib import definitions as dfvfs_definitions
+from dfvfs.path import factory as path_spec_factory
+
 from plaso.containers import errors
 from plaso.containers import event_sources
+from plaso.containers import events
+from plaso.containers import parser_statistics
 from plaso.containers import reports
 from plaso.containers import sessions
 from plaso.containers import tasks
 from plaso.lib import definitions
+from plaso.lib import timelib
+from plaso.storage import compression
 from plaso.storage.sqlite import sqlite_file
 
 from tests import test_lib as shared_test_lib
@@ -104,6 +111,54 @@ class SQLiteStorageFileTest(test_lib.StorageTestCase):
 
       storage_file.Close()
 
+  def testAddEventWithUncachedEventData(self):
+    """Tests the AddEvent function with uncached event data."""
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, 'plaso.sqlite')
+      storage_file = sqlite_file.SQLiteStorageFile()
+      storage_file.Open(path=temp_file, read_only=False)
+
+      event_data_identifiers = []
+      for index in range(3):
+        event_data = events.EventData(data_type='test:event_data')
+        event_data.parser = 'test_parser{0:d}'.format(index)
+        storage_file.AddEventData(event_data)
+
+        event_data_identifiers.append(event_data.GetIdentifier())
+
+      storage_file._WriteSerializedAttributeContainerList(
+          storage_file._CONTAINER_TYPE_EVENT_DATA)
+
+      # Remove the cached attribute values of the event data, as if they
+      # were evicted from the cache.
+      storage_file._event_data_attribute_values.clear()
+
+      for timestamp, event_data_identifier in enumerate(
+          event_data_identifiers):
+        event = events.EventObject()
+        event.timestamp = timestamp
+        event.timestamp_desc = definitions.TIME_DESCRIPTION_WRITTEN
+        event.SetEventDataIdentifier(event_data_identifier)
+        storage_file.AddEvent(event)
+
+      self.assertEqual(len(storage_file._events_with_uncached_event_data), 3)
+      self.assertEqual(storage_file._serialized_event_heap.number_of_events, 0)
+
+      storage_file.Close()
+
+      self.assertEqual(len(storage_file._events_with_uncached_event_data), 0)
+
+      storage_file = sqlite_file.SQLiteStorageFile()
+      storage_file.Open(path=temp_file)
+
+      filter_conditions = [('parser', '==', 'test_parser1')]
+      test_events = list(storage_file.GetSortedEvents(
+          filter_conditions=filter_conditions))
+      self.assertEqual(len(test_events), 1)
+      self.assertEqual(test_events[0].timestamp, 1)
+
+      storage_file.Close()
+
   # TODO: add tests for CheckSupportedFormat
 
   def testGetAnalysisReports(self):
@@ -177,6 +232,43 @@ class SQLiteStorageFileTest(test_lib.StorageTestCase):
 
   # TODO: add tests for GetEventSourceByIndex
 
+  def testGetEventTimeRanges(self):
+    """Tests the GetEventTimeRanges function."""
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, 'plaso.sqlite')
+      storage_file = sqlite_file.SQLiteStorageFile()
+      storage_file.Open(path=temp_file, read_only=False)
+
+      for timestamp in (3, 1, 4, 1, 3, 2, 1):
+        event = events.EventObject()
+        event.data_type = 'test:event'
+        event.timestamp = timestamp
+        event.timestamp_desc = 'Test Time'
+        storage_file.AddEvent(event)
+
+      storage_file.Close()
+
+      storage_file = sqlite_file.SQLiteStorageFile()
+      storage_file.Open(path=temp_file)
+
+      time_ranges = storage_file.GetEventTimeRanges(2)
+      time_ranges = [
+          (time_range.start_timestamp, time_range.end_timestamp)
+          for time_range in time_ranges]
+      self.assertEqual(time_ranges, [(1, 1), (2, 3), (4, 4)])
+
+      time_ranges = storage_file.GetEventTimeRanges(100)
+      self.assertEqual(len(time_ranges), 1)
+
+      number_of_events = 0
+      for time_range in storage_file.GetEventTimeRanges(1):
+        test_events = list(storage_file.GetSortedEvents(time_range=time_range))
+        number_of_events += len(test_events)
+
+      self.assertEqual(number_of_events, 7)
+
+      storage_file.Close()
+
   def testGetEventSources(self):
     """Tests the GetEventSources function."""
     event_source = event_sources.EventSource()
@@ -227,6 +319,45 @@ class SQLiteStorageFileTest(test_lib.StorageTestCase):
   # TODO: add tests for GetNumberOfAnalysisReports
   # TODO: add tests for GetNumberOfEventSources
 
+  def testGetParserStatistics(self):
+    """Tests the GetParserStatistics function."""
+    test_parser_statistics = parser_statistics.ParserStatistics(name='test')
+    test_parser_statistics.AddFile(0.5, True, number_of_read_bytes=1024)
+    test_parser_statistics.AddSlowestFile(0.5, '/test/file')
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, 'plaso.sqlite')
+      storage_file = sqlite_file.SQLiteStorageFile()
+      storage_file.Open(path=temp_file, read_only=False)
+
+      storage_file.AddParserStatistics(test_parser_statistics)
+
+      storage_file.Close()
+
+      storage_file = sqlite_file.SQLiteStorageFile()
+      storage_file.Open(path=temp_file)
+
+      stored_parser_statistics = list(storage_file.GetParserStatistics())
+      self.assertEqual(len(stored_parser_statistics), 1)
+      self.assertEqual(stored_parser_statistics[0].name, 'test')
+      self.assertEqual(stored_parser_statistics[0].number_of_read_bytes, 1024)
+      self.assertEqual(
+          stored_parser_statistics[0].slowest_files, [[0.5, '/test/file']])
+
+      storage_file.Close()
+
+  def testGetSessionCheckpoints(self):
+    """Tests the GetSessionCheckpoints function."""
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, 'plaso.sqlite')
+      storage_file = sqlite_file.SQLiteStorageFile()
+      storage_file.Open(path=temp_file, read_only=False)
+
+      session_checkpoints = list(storage_file.GetSessionCheckpoints())
+      self.assertEqual(session_checkpoints, [])
+
+      storage_file.Close()
+
   # TODO: add tests for GetSessions
 
   def testGetSortedEvents(self):
@@ -253,15 +384,411 @@ class SQLiteStorageFileTest(test_lib.StorageTestCase):
 
     # TODO: add test with time range.
 
+  def testGetSortedEventsWithFilterConditions(self):
+    """Tests the GetSortedEvents function with filter conditions."""
+    test_events = self._CreateTestEvents()
+
+    event_data = events.EventData(data_type='test:event_data')
+    event_data.parser = 'test_parser'
+
+    timestamp = timelib.Timestamp.CopyFromString('2010-05-06 07:08:09')
+    test_event = events.EventObject()
+    test_event.timestamp = timestamp
+    test_event.timestamp_desc = definitions.TIME_DESCRIPTION_WRITTEN
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, 'plaso.sqlite')
+      storage_file = sqlite_file.SQLiteStorageFile()
+      storage_file.Open(path=temp_file, read_only=False)
+
+      for event in test_events:
+        storage_file.AddEvent(event)
+
+      storage_file.AddEventData(event_data)
+      test_event.SetEventDataIdentifier(event_data.GetIdentifier())
+      storage_file.AddEvent(test_event)
+
+      storage_file.Close()
+
+      storage_file = sqlite_file.SQLiteStorageFile()
+      storage_file.Open(path=temp_file)
+
+      filter_conditions = [('data_type', '==', 'text:entry')]
+      test_events = list(storage_file.GetSortedEvents(
+          filter_conditions=filter_conditions))
+      self.assertEqual(len(test_events), 1)
+      self.assertEqual(test_events[0].hostname, 'nomachine')
+
+      # Test that the attribute values of the event data are stored.
+      filter_conditions = [
+          ('data_type', '==', 'test:event_data'),
+          ('parser', '==', 'test_parser')]
+      test_events = list(storage_file.GetSortedEvents(
+          filter_conditions=filter_conditions))
+      self.assertEqual(len(test_events), 1)
+      self.assertEqual(test_events[0].timestamp, timestamp)
+
+      timestamp = timelib.Timestamp.CopyFromString('2012-04-20 16:44:46')
+      filter_conditions = [('timestamp', '>', timestamp)]
+      test_events = list(storage_file.GetSortedEvents(
+          filter_conditions=filter_conditions))
+      self.assertEqual(len(test_events), 2)
+
+      # Test that conditions that cannot be evaluated are ignored.
+      filter_conditions = [
+          ('key_path', '==', 'MY AutoRun key'),
+          ('parser', '>', 'UNKNOWN')]
+      test_events = list(storage_file.GetSortedEvents(
+          filter_conditions=filter_conditions))
+      self.assertEqual(len(test_events), 5)
+
+      storage_file.Close()
+
+  def testGetSortedEventsWithEventData(self):
+    """Tests the GetSortedEventsWithEventData function."""
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, 'plaso.sqlite')
+      storage_file = sqlite_file.SQLiteStorageFile()
+      storage_file.Open(path=temp_file, read_only=False)
+
+      # Multiple events reference the same event data.
+      for index in range(3):
+        event_data = events.EventData(data_type='test:event_data')
+        event_data.value = index
+        storage_file.AddEventData(event_data)
+
+        for timestamp in (index + 10, 20 - index):
+          event = events.EventObject()
+          event.timestamp = timestamp
+          event.timestamp_desc = definitions.TIME_DESCRIPTION_WRITTEN
+          event.SetEventDataIdentifier(event_data.GetIdentifier())
+          storage_file.AddEvent(event)
+
+      storage_file.Close()
+
+      storage_file = sqlite_file.SQLiteStorageFile()
+      storage_file.Open(path=temp_file)
+
+      test_events = list(storage_file.GetSortedEventsWithEventData())
+      self.assertEqual(len(test_events), 6)
+      self.assertEqual(len(storage_file._event_data_cache), 3)
+
+      event_values = [
+          (event.timestamp, event.data_type, event.value)
+          for event in test_events]
+      self.assertEqual(event_values, [
+          (10, 'test:event_data', 0),
+          (11, 'test:event_data', 1),
+          (12, 'test:event_data', 2),
+          (18, 'test:event_data', 2),
+          (19, 'test:event_data', 1),
+          (20, 'test:event_data', 0)])
+
+      storage_file.Close()
+
+  def testGetSortedEventsWithBinarySerializationFormat(self):
+    """Tests the GetSortedEvents function with binary serialization."""
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, 'plaso.sqlite')
+      storage_file = sqlite_file.SQLiteStorageFile(
+          serialization_format=definitions.SERIALIZER_FORMAT_BINARY)
+      storage_file.Open(path=temp_file, read_only=False)
+
+      for event in self._CreateTestEvents():
+        storage_file.AddEvent(event)
+
+      storage_file.Close()
+
+      storage_file = sqlite_file.SQLiteStorageFile()
+      storage_file.Open(path=temp_file)
+
+      self.assertEqual(
+          storage_file.serialization_format,
+          definitions.SERIALIZER_FORMAT_BINARY)
+
+      test_events = list(storage_file.GetSortedEvents())
+      self.assertEqual(len(test_events), 4)
+
+      storage_file.Close()
+
+    with self.assertRaises(ValueError):
+      sqlite_file.SQLiteStorageFile(serialization_format='bogus')
+
+  def testGetSortedEventsWithEventRuns(self):
+    """Tests the GetSortedEvents function with sorted runs of events."""
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, 'plaso.sqlite')
+      storage_file = sqlite_file.SQLiteStorageFile(maximum_buffer_size=2048)
+      storage_file.Open(path=temp_file, read_only=False)
+
+      expected_timestamps = []
+      for index in range(64):
+        event = events.EventObject()
+        event.data_type = 'test:event'
+        event.timestamp = (index * 7919) % 1000
+        event.timestamp_desc = 'Test Time'
+        storage_file.AddEvent(event)
+
+        expected_timestamps.append(event.timestamp)
+
+      storage_file.Close()
+
+      storage_file = sqlite_file.SQLiteStorageFile()
+      storage_file.Open(path=temp_file)
+
+      event_runs = storage_file._GetEventRuns()
+      self.assertIsNotNone(event_runs)
+      self.assertGreater(len(event_runs), 1)
+
+      test_events = list(storage_file.GetSortedEvents())
+      timestamps = [event.timestamp for event in test_events]
+      self.assertEqual(timestamps, sorted(expected_timestamps))
+
+      row_identifiers = [
+          event.GetIdentifier().row_identifier for event in test_events]
+      self.assertEqual(sorted(row_identifiers), list(range(1, 65)))
+
+      storage_file.Close()
+
+  def testGetSortedEventsWithMergedEventRuns(self):
+    """Tests the GetSortedEvents function with more runs than merged at once."""
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, 'plaso.sqlite')
+      storage_file = sqlite_file.SQLiteStorageFile(maximum_buffer_size=1024)
+      storage_file.Open(path=temp_file, read_only=False)
+
+      expected_timestamps = []
+      for index in range(256):
+        event = events.EventObject()
+        event.data_type = 'test:event'
+        event.timestamp = (index * 7919) % 1000
+        event.timestamp_desc = 'Test Time'
+        storage_file.AddEvent(event)
+
+        expected_timestamps.append(event.timestamp)
+
+      storage_file.Close()
+
+      storage_file = sqlite_file.SQLiteStorageFile()
+      storage_file.Open(path=temp_file)
+
+      # Merging at most 2 runs at once requires multiple merge passes.
+      storage_file._MAXIMUM_NUMBER_OF_EVENT_RUNS = 2
+
+      event_runs = storage_file._GetEventRuns()
+      self.assertIsNotNone(event_runs)
+      self.assertGreater(len(event_runs), 4)
+
+      test_events = list(storage_file.GetSortedEvents())
+      timestamps = [event.timestamp for event in test_events]
+      self.assertEqual(timestamps, sorted(expected_timestamps))
+
+      row_identifiers = [
+          event.GetIdentifier().row_identifier for event in test_events]
+      self.assertEqual(sorted(row_identifiers), list(range(1, 257)))
+
+      # Events with the same timestamp are returned in the order they were
+      # stored, as when the runs are merged at once.
+      storage_file._MAXIMUM_NUMBER_OF_EVENT_RUNS = len(event_runs)
+
+      test_events = list(storage_file.GetSortedEvents())
+      self.assertEqual([
+          event.GetIdentifier().row_identifier
+          for event in test_events], row_identifiers)
+
+      storage_file.Close()
+
+  def testGetSortedEventsWithCompressionFormats(self):
+    """Tests the GetSortedEvents function with compression formats."""
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, 'plaso.sqlite')
+      storage_file = sqlite_file.SQLiteStorageFile(
+          compression_format=definitions.COMPRESSION_FORMAT_ZLIB,
+          compression_formats={
+              'event': definitions.COMPRESSION_FORMAT_NONE},
+          compression_dictionaries=True)
+      storage_file.Open(path=temp_file, read_only=False)
+
+      for event in self._CreateTestEvents():
+        storage_file.AddEvent(event)
+
+      for _ in range(3):
+        storage_file.AddError(errors.ExtractionError(message='Test error'))
+
+      storage_file.Close()
+
+      storage_file = sqlite_file.SQLiteStorageFile()
+      storage_file.Open(path=temp_file)
+
+      self.assertEqual(
+          storage_file.compression_format,
+          definitions.COMPRESSION_FORMAT_ZLIB)
+      self.assertEqual(
+          storage_file._GetCompressionFormat('event'),
+          definitions.COMPRESSION_FORMAT_NONE)
+
+      # Preset dictionaries are only supported by zlib on Python 3.
+      if compression.ZlibCodec.SUPPORTS_DICTIONARY:
+        self.assertIn(
+            'extraction_error', storage_file._compression_dictionaries)
+      self.assertNotIn('event', storage_file._compression_dictionaries)
+
+      test_events = list(storage_file.GetSortedEvents())
+      self.assertEqual(len(test_events), 4)
+
+      test_errors = list(storage_file.GetErrors())
+      self.assertEqual(len(test_errors), 3)
+      self.assertEqual(test_errors[0].message, 'Test error')
+
+      storage_file.Close()
+
+    with self.assertRaises(ValueError):
+      sqlite_file.SQLiteStorageFile(compression_format='bogus')
+
+    with self.assertRaises(ValueError):
+      sqlite_file.SQLiteStorageFile(compression_formats={
+          'bogus': definitions.COMPRESSION_FORMAT_NONE})
+
+  def testGetEventDataWithPathSpecs(self):
+    """Tests the GetEventData function with path specifications."""
+    os_path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_OS, location='/tmp/image.raw')
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, 'plaso.sqlite')
+      storage_file = sqlite_file.SQLiteStorageFile()
+      storage_file.Open(path=temp_file, read_only=False)
+
+      for location in ('/a_file', '/another_file', '/a_file'):
+        path_spec = path_spec_factory.Factory.NewPathSpec(
+            dfvfs_definitions.TYPE_INDICATOR_TSK, location=location,
+            parent=os_path_spec)
+
+        event_data = events.EventData(data_type='test:event_data')
+        event_data.pathspec = path_spec
+        storage_file.AddEventData(event_data)
+
+        # The path specification of the event data is not changed.
+        self.assertIs(event_data.pathspec, path_spec)
+
+        event_source = event_sources.EventSource(path_spec=path_spec)
+        storage_file.AddEventSource(event_source)
+
+      storage_file.Close()
+
+      storage_file = sqlite_file.SQLiteStorageFile()
+      storage_file.Open(path=temp_file)
+
+      # The parent path specification and every distinct path specification
+      # are stored once.
+      number_of_path_spec_nodes = storage_file._CountStoredAttributeContainers(
+          storage_file._CONTAINER_TYPE_PATH_SPEC)
+      self.assertEqual(number_of_path_spec_nodes, 3)
+
+      locations = [
+          event_data.pathspec.location
+          for event_data in storage_file.GetEventData()]
+      self.assertEqual(locations, ['/a_file', '/another_file', '/a_file'])
+
+      event_source = storage_file.GetEventSourceByIndex(1)
+      self.assertEqual(event_source.path_spec.location, '/another_file')
+      self.assertEqual(
+          event_source.path_spec.parent.comparable, os_path_spec.comparable)
+
+      storage_file.Close()
+
   # TODO: add tests for HasAnalysisReports
   # TODO: add tests for HasErrors
   # TODO: add tests for HasEventTags
 
-  # TODO: add tests for Open and Close
+  def testOpen(self):
+    """Tests the Open function."""
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, 'plaso.sqlite')
+      storage_file = sqlite_file.SQLiteStorageFile(
+          storage_type=definitions.STORAGE_TYPE_SESSION)
+      storage_file.Open(path=temp_file, read_only=False)
+
+      # A session store uses the default synchronous mode of SQLite (FULL).
+      storage_file._cursor.execute('PRAGMA synchronous')
+      self.assertEqual(storage_file._cursor.fetchone()[0], 2)
+
+      storage_file.Close()
+
+      temp_file = os.path.join(temp_directory, 'task.sqlite')
+      storage_file = sqlite_file.SQLiteStorageFile(
+          storage_type=definitions.STORAGE_TYPE_TASK)
+      storage_file.Open(path=temp_file, read_only=False)
+
+      storage_file._cursor.execute('PRAGMA synchronous')
+      self.assertEqual(storage_file._cursor.fetchone()[0], 0)
+
+      storage_file.Close()
+
+  # TODO: add tests for Close
 
   # TODO: add tests for ReadPreprocessingInformation
   # TODO: add tests for WritePreprocessingInformation
 
+  def testWriteSessionCheckpoint(self):
+    """Tests the WriteSessionCheckpoint function."""
+    path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_OS, location='/tmp/test.txt')
+
+    session = sessions.Session()
+    session.parsers_counter['test'] += 1
+
+    task = tasks.Task(session_identifier=session.identifier)
+    task.path_spec = path_spec
+    task.storage_file_size = 10
+
+    session_checkpoint = session.CreateSessionCheckpoint()
+    session_checkpoint.completed_path_specs = [path_spec]
+    session_checkpoint.first_event_source_index = 0
+    session_checkpoint.pending_merge_tasks = [task]
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, 'plaso.sqlite')
+      storage_file = sqlite_file.SQLiteStorageFile()
+      storage_file.Open(path=temp_file, read_only=False)
+
+      event_source = event_sources.EventSource(path_spec=path_spec)
+      storage_file.AddEventSource(event_source)
+
+      storage_file.WriteSessionCheckpoint(session_checkpoint)
+
+      event_source = event_sources.EventSource(path_spec=path_spec)
+      storage_file.AddEventSource(event_source)
+
+      # Simulate an interrupted session by closing the database connection
+      # without committing.
+      storage_file._connection.close()
+
+      storage_file = sqlite_file.SQLiteStorageFile()
+      storage_file.Open(path=temp_file)
+
+      # Only the event source written before the checkpoint was committed.
+      self.assertEqual(storage_file.GetNumberOfEventSources(), 1)
+
+      session_checkpoints = list(storage_file.GetSessionCheckpoints())
+      self.assertEqual(len(session_checkpoints), 1)
+
+      stored_session_checkpoint = session_checkpoints[0]
+      self.assertEqual(stored_session_checkpoint.identifier, session.identifier)
+      self.assertEqual(
+          stored_session_checkpoint.parsers_counter['test'], 1)
+      self.assertEqual(
+          stored_session_checkpoint.completed_path_specs[0].comparable,
+          path_spec.comparable)
+
+      pending_merge_tasks = stored_session_checkpoint.pending_merge_tasks
+      self.assertEqual(len(pending_merge_tasks), 1)
+      self.assertEqual(pending_merge_tasks[0].identifier, task.identifier)
+      self.assertEqual(
+          pending_merge_tasks[0].path_spec.comparable, path_spec.comparable)
+
+      storage_file.Close()
+
   def testWriteSessionStartAndCompletion(self):
     """Tests the WriteSessionStart and WriteSessionCompletion functions."""
     session = sessions.Session()
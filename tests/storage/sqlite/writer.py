@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the storage writer for SQLite storage files."""
+
+from __future__ import unicode_literals
+
+import os
+import unittest
+
+from plaso.containers import sessions
+from plaso.containers import tasks
+from plaso.lib import definitions
+from plaso.storage.sqlite import writer
+
+from tests import test_lib as shared_test_lib
+from tests.storage import test_lib
+
+
+class SQLiteStorageFileWriterTest(test_lib.StorageTestCase):
+  """Tests for the SQLite-based storage file writer."""
+
+  def testStartTaskStorage(self):
+    """Tests the StartTaskStorage function."""
+    session = sessions.Session()
+    task = tasks.Task(session_identifier=session.identifier)
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      session_storage_path = os.path.join(temp_directory, 'plaso.sqlite')
+      storage_writer = writer.SQLiteStorageFileWriter(
+          session, session_storage_path,
+          serialization_format=definitions.SERIALIZER_FORMAT_BINARY)
+
+      storage_writer.Open()
+      storage_writer.Close()
+
+      # Test that the task storage uses the serialization format of
+      # an existing storage file, before the storage writer is opened.
+      storage_writer = writer.SQLiteStorageFileWriter(
+          session, session_storage_path,
+          serialization_format=definitions.SERIALIZER_FORMAT_JSON)
+
+      storage_writer.StartTaskStorage()
+
+      try:
+        self.assertEqual(
+            storage_writer.serialization_format,
+            definitions.SERIALIZER_FORMAT_BINARY)
+
+        task_storage_writer = storage_writer.CreateTaskStorage(task)
+        self.assertEqual(
+            task_storage_writer.serialization_format,
+            definitions.SERIALIZER_FORMAT_BINARY)
+
+      finally:
+        storage_writer.StopTaskStorage(abort=True)
+
+
+if __name__ == '__main__':
+  unittest.main()
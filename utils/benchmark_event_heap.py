@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Script to benchmark the deduplication stage of the psort export.
+
+The events are read from a storage file, in chronological order, and pushed
+onto and popped from the psort event heap per timestamp, as done by psort to
+deduplicate and MACB group events, to determine the cost per event.
+"""
+
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import argparse
+import sys
+import time
+
+from plaso.multi_processing import psort
+from plaso.storage import factory as storage_factory
+
+
+def Main():
+  """The main program function.
+
+  Returns:
+    bool: True if successful or False if not.
+  """
+  argument_parser = argparse.ArgumentParser(description=(
+      'Benchmarks the psort event deduplication on a storage file.'))
+
+  argument_parser.add_argument(
+      '--maximum_number_of_events', '--maximum-number-of-events',
+      dest='maximum_number_of_events', type=int, default=0, help=(
+          'maximum number of events to read, where 0 represents no limit.'))
+
+  argument_parser.add_argument(
+      'storage_file', type=str, help='path of the storage file.')
+
+  options = argument_parser.parse_args()
+
+  try:
+    storage_reader = (
+        storage_factory.StorageFactory.CreateStorageReaderForFile(
+            options.storage_file))
+  except IOError as exception:
+    print('Unable to open storage file with error: {0!s}'.format(exception))
+    return False
+
+  if not storage_reader:
+    print('Unsupported storage file: {0:s}'.format(options.storage_file))
+    return False
+
+  # The events are read before the benchmark, so that reading the events
+  # from storage is not part of the measured time.
+  events_per_timestamp = []
+  last_timestamp = None
+  number_of_events = 0
+
+  for event in storage_reader.GetSortedEventsWithEventData():
+    if (options.maximum_number_of_events and
+        number_of_events >= options.maximum_number_of_events):
+      break
+
+    if event.timestamp != last_timestamp:
+      events_per_timestamp.append([])
+      last_timestamp = event.timestamp
+
+    events_per_timestamp[-1].append(event)
+    number_of_events += 1
+
+  storage_reader.Close()
+
+  if not number_of_events:
+    print('No events in storage file.')
+    return True
+
+  event_heap = psort.PsortEventHeap()
+  number_of_unique_events = 0
+
+  start_time = time.time()
+  for events in events_per_timestamp:
+    if len(events) == 1:
+      number_of_unique_events += 1
+
+    for event in events:
+      event_heap.PushEvent(event)
+
+    for _ in event_heap.PopEvents():
+      pass
+
+  deduplication_time = time.time() - start_time
+
+  print('Number of events\t\t: {0:d}'.format(number_of_events))
+  print('Number of timestamps\t\t: {0:d}'.format(len(events_per_timestamp)))
+  print('Number of unique events\t\t: {0:d}'.format(number_of_unique_events))
+  print('Deduplication time (s)\t\t: {0:.3f}'.format(deduplication_time))
+  print('Time per event (us)\t\t: {0:.3f}'.format(
+      deduplication_time * 1000000.0 / number_of_events))
+
+  return True
+
+
+if __name__ == '__main__':
+  if not Main():
+    sys.exit(1)
+  else:
+    sys.exit(0)
@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Script to benchmark the attribute container serializers.
+
+The attribute containers are read from a storage file and serialized and
+deserialized with every supported serializer, to compare the time needed to
+encode and decode them and the size of the serialized data.
+"""
+
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import argparse
+import sys
+import time
+
+from plaso.serializer import binary_serializer
+from plaso.serializer import json_serializer
+from plaso.storage.sqlite import sqlite_file
+
+
+class SerializerBenchmark(object):
+  """Serializer benchmark.
+
+  Attributes:
+    decode_time (float): time in seconds spent deserializing.
+    encode_time (float): time in seconds spent serializing.
+    name (str): name of the serializer.
+    number_of_containers (int): number of attribute containers serialized.
+    serialized_data_size (int): size of the serialized data in bytes.
+  """
+
+  def __init__(self, name, serializer, encoding=None):
+    """Initializes a serializer benchmark.
+
+    Args:
+      name (str): name of the serializer.
+      serializer (AttributeContainerSerializer): serializer.
+      encoding (Optional[str]): encoding of the serialized data, if
+          the serializer produces strings instead of bytes.
+    """
+    super(SerializerBenchmark, self).__init__()
+    self._encoding = encoding
+    self._serializer = serializer
+    self.decode_time = 0.0
+    self.encode_time = 0.0
+    self.name = name
+    self.number_of_containers = 0
+    self.serialized_data_size = 0
+
+  def Run(self, attribute_container):
+    """Serializes and deserializes an attribute container.
+
+    Args:
+      attribute_container (AttributeContainer): attribute container.
+    """
+    start_time = time.time()
+    serialized_data = self._serializer.WriteSerialized(attribute_container)
+    if self._encoding:
+      serialized_data = serialized_data.encode(self._encoding)
+    self.encode_time += time.time() - start_time
+
+    start_time = time.time()
+    if self._encoding:
+      serialized_data = serialized_data.decode(self._encoding)
+    self._serializer.ReadSerialized(serialized_data)
+    self.decode_time += time.time() - start_time
+
+    self.number_of_containers += 1
+    self.serialized_data_size += len(serialized_data)
+
+
+def Main():
+  """The main program function.
+
+  Returns:
+    bool: True if successful or False if not.
+  """
+  argument_parser = argparse.ArgumentParser(description=(
+      'Benchmarks the attribute container serializers on a storage file.'))
+
+  argument_parser.add_argument(
+      '--maximum_number_of_containers', '--maximum-number-of-containers',
+      dest='maximum_number_of_containers', type=int, default=0, help=(
+          'maximum number of attribute containers to read per container '
+          'type, where 0 represents no limit.'))
+
+  argument_parser.add_argument(
+      'storage_file', type=str, help='path of the storage file.')
+
+  options = argument_parser.parse_args()
+
+  storage_file = sqlite_file.SQLiteStorageFile()
+  try:
+    storage_file.Open(path=options.storage_file)
+  except IOError as exception:
+    print('Unable to open storage file with error: {0!s}'.format(exception))
+    return False
+
+  generators = [
+      ('event_source', storage_file.GetEventSources),
+      ('event_data', storage_file.GetEventData),
+      ('event', storage_file.GetEvents),
+      ('event_tag', storage_file.GetEventTags),
+      ('extraction_error', storage_file.GetErrors),
+      ('analysis_report', storage_file.GetAnalysisReports)]
+
+  for container_type, generator in generators:
+    benchmarks = [
+        SerializerBenchmark(
+            'binary', binary_serializer.BinaryAttributeContainerSerializer),
+        SerializerBenchmark(
+            'json', json_serializer.JSONAttributeContainerSerializer,
+            encoding='utf-8')]
+
+    for index, attribute_container in enumerate(generator()):
+      if (options.maximum_number_of_containers and
+          index >= options.maximum_number_of_containers):
+        break
+
+      for benchmark in benchmarks:
+        benchmark.Run(attribute_container)
+
+    if not benchmarks[0].number_of_containers:
+      continue
+
+    print('{0:s} ({1:d} attribute containers)'.format(
+        container_type, benchmarks[0].number_of_containers))
+    print('\t{0:<8s}\t{1:>10s}\t{2:>10s}\t{3:>12s}'.format(
+        'format', 'encode (s)', 'decode (s)', 'size (bytes)'))
+
+    for benchmark in benchmarks:
+      print('\t{0:<8s}\t{1:10.3f}\t{2:10.3f}\t{3:12d}'.format(
+          benchmark.name, benchmark.encode_time, benchmark.decode_time,
+          benchmark.serialized_data_size))
+
+    print('')
+
+  storage_file.Close()
+
+  return True
+
+
+if __name__ == '__main__':
+  if not Main():
+    sys.exit(1)
+  else:
+    sys.exit(0)
@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Script to benchmark text parsers, such as the syslog, iis and sccm parsers.
+
+A text file is parsed multiple times with a parser, where the events are
+written to a fake storage writer, to determine the cost per line.
+"""
+
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import argparse
+import os
+import sys
+import time
+
+from dfvfs.lib import definitions as dfvfs_definitions
+from dfvfs.path import factory as path_spec_factory
+from dfvfs.resolver import resolver as path_spec_resolver
+
+from plaso.containers import sessions
+from plaso.engine import knowledge_base
+from plaso.lib import errors
+from plaso.parsers import manager as parsers_manager
+from plaso.parsers import mediator as parsers_mediator
+from plaso.storage.fake import writer as fake_writer
+
+
+def Main():
+  """The main program function.
+
+  Returns:
+    bool: True if successful or False if not.
+  """
+  argument_parser = argparse.ArgumentParser(description=(
+      'Benchmarks a text parser on a text file.'))
+
+  argument_parser.add_argument(
+      '--number_of_iterations', '--number-of-iterations',
+      dest='number_of_iterations', type=int, default=5, help=(
+          'number of times the file is parsed.'))
+
+  argument_parser.add_argument(
+      '--parser', dest='parser', type=str, default='syslog', help=(
+          'name of the text parser, for example: iis, sccm or syslog.'))
+
+  argument_parser.add_argument(
+      'source', type=str, help='path of the text file.')
+
+  options = argument_parser.parse_args()
+
+  if not os.path.isfile(options.source):
+    print('No such file: {0:s}'.format(options.source))
+    return False
+
+  parser = parsers_manager.ParsersManager.GetParserObjectByName(
+      options.parser)
+  if not parser:
+    print('No such parser: {0:s}'.format(options.parser))
+    return False
+
+  with open(options.source, 'rb') as file_object:
+    number_of_lines = sum(1 for _ in file_object)
+
+  path_spec = path_spec_factory.Factory.NewPathSpec(
+      dfvfs_definitions.TYPE_INDICATOR_OS, location=options.source)
+  file_entry = path_spec_resolver.Resolver.OpenFileEntry(path_spec)
+
+  knowledge_base_object = knowledge_base.KnowledgeBase()
+
+  number_of_events = 0
+  parse_time = 0.0
+
+  for _ in range(options.number_of_iterations):
+    storage_writer = fake_writer.FakeStorageWriter(sessions.Session())
+    storage_writer.Open()
+
+    parser_mediator = parsers_mediator.ParserMediator(
+        storage_writer, knowledge_base_object)
+    parser_mediator.SetFileEntry(file_entry)
+
+    file_object = file_entry.GetFileObject()
+
+    start_time = time.time()
+    try:
+      parser.Parse(parser_mediator, file_object)
+    except errors.UnableToParseFile as exception:
+      print('Unable to parse file with error: {0!s}'.format(exception))
+      return False
+    finally:
+      file_object.close()
+
+    parse_time += time.time() - start_time
+    number_of_events = storage_writer.number_of_events
+
+  if not number_of_lines:
+    print('No lines in file.')
+    return True
+
+  print('Number of lines\t\t\t: {0:d}'.format(number_of_lines))
+  print('Number of events\t\t: {0:d}'.format(number_of_events))
+  print('Number of iterations\t\t: {0:d}'.format(options.number_of_iterations))
+  print('Parse time (s)\t\t\t: {0:.3f}'.format(
+      parse_time / options.number_of_iterations))
+  print('Time per line (us)\t\t: {0:.3f}'.format(
+      parse_time * 1000000.0 / (
+          number_of_lines * options.number_of_iterations)))
+
+  return True
+
+
+if __name__ == '__main__':
+  if not Main():
+    sys.exit(1)
+  else:
+    sys.exit(0)
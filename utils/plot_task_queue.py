@@ -44,7 +44,9 @@ def Main():
     print('No such directory: {0:s}'.format(options.profile_path))
     return False
 
-  names = ['time', 'queued', 'processing', 'to_merge', 'abandoned', 'total']
+  names = [
+      'time', 'queued', 'processing', 'to_merge', 'abandoned', 'total',
+      'to_merge_size']
 
   glob_expression = os.path.join(options.profile_path, 'task_queue-*.csv.gz')
   for csv_file_name in glob.glob(glob_expression):